@@ -0,0 +1,913 @@
+#PURPOSE
+#Stand-in for the arcpy site package--just the functions and classes that vtDataRail_SendFreight.py
+#uses--backed by SQLite files instead of geodatabases. Used by vtDataRail_BenchmarkFreight.py to
+#run SendFreight on a machine w/o ArcGIS (or w/o access to enterprise geodatabases).
+
+#README NOTES
+#This module is NOT arcpy. It is only put in front of arcpy (via PYTHONPATH) for a process that
+#vtDataRail_BenchmarkFreight.py starts. Never copy it next to a script that should use the real
+#arcpy.
+#
+#A "geodatabase" is one SQLite file whose path ends w/ .gdb, .sde, or .sqlite (e.g.,
+#C:\bench\source.sde). Paths can use "\" or "/". A geodatabase has a schema prefix (e.g.,
+#"SPOKE.GIS.") that is added to the name of each data object created in it, like an enterprise
+#geodatabase; set it to "" to act like a file geodatabase.
+#
+#Each geodatabase file has:
+#   -a gdb_meta table (the schema prefix)
+#   -a gdb_items table (one row per feature dataset, feature class, table, and raster dataset w/
+#    its type, feature dataset, and a JSON description: fields, shape type, indexes, raster size, etc.)
+#   -a d_<NAME> table per feature class or table (OBJECTID is the SQLite rowid; geometry is WKB
+#    in a SHAPE column; dates are ISO-format text)
+#   -an r_<NAME> table per raster dataset (one row of 8-bit pixels per raster row)
+#
+#The database is in WAL mode, so cursors that read (each on its own connection) aren't
+#blocked by (and don't block) inserts, updates, and deletes, including ones from other
+#processes (e.g., SendFreight's worker processes).
+#
+#Functions w/ lower-case names (create_geodatabase(), create_data_object(), etc.) aren't
+#arcpy functions; they're used by vtDataRail_BenchmarkFreight.py to generate data.
+#
+#CALL PROFILING: if any of these environment variables is set, every call to the stand-in
+#(functions, cursor creation, cursor rows, and each change of env.workspace) is counted and
+#timed, and calls can be slowed down to act like a geodatabase across a WAN:
+#   STANDIN_LATENCY_MS   Milliseconds added to each call that would be a round trip to the
+#                        geodatabase (e.g., 50). Calls in LOCAL_CALLS (cursor rows, messages,
+#                        etc.) aren't slowed down unless STANDIN_LATENCIES says so.
+#   STANDIN_LATENCIES    JSON dictionary of milliseconds for particular calls (keys are call
+#                        names as in CALL PROFILE; e.g., {"GetCount_management":200}).
+#   STANDIN_CALLS_PATH   File that each process appends its calls to when it exits (JSON lines
+#                        w/ "pid" and "calls": {call name: [count, seconds]}). Seconds include
+#                        the added latency.
+#Only the outermost call is counted (e.g., Copy_management()'s cursors aren't). Worker
+#processes of a multiprocessing pool write their own lines when the pool is closed.
+
+#IMPORTS
+import os, re, json, time, sqlite3, datetime, itertools, atexit, threading, multiprocessing.util
+
+#CONSTANTS
+#GDB_SUFFIXES STORES THE ENDINGS OF PATHS THAT ARE STAND-IN GEODATABASES (SQLITE FILES)
+GDB_SUFFIXES = (".gdb", ".sde", ".sqlite")
+#FIELD_TYPES STORES ARCPY FIELD-TYPE NAMES (ListFields()) FOR AddField_management() FIELD-TYPE KEYWORDS
+FIELD_TYPES = {"TEXT":"String","LONG":"Integer","SHORT":"SmallInteger","DOUBLE":"Double","FLOAT":"Single","DATE":"Date","BLOB":"Blob","GUID":"Guid"}
+#SHAPE_TOKENS STORES CURSOR FIELD-TOKENS THAT READ/WRITE GEOMETRY (AS WKB)
+SHAPE_TOKENS = ["SHAPE","SHAPE@","SHAPE@WKB"]
+#BUSY_SECONDS IS HOW LONG A CONNECTION WAITS FOR ANOTHER CONNECTION'S WRITE TO FINISH
+BUSY_SECONDS = 120
+#PROFILED_FUNCTIONS STORES THE NAMES OF THE ARCPY FUNCTIONS THAT ARE COUNTED WHEN CALLS ARE PROFILED (SEE README NOTES).
+#CREATING A Raster, Point, OR arcpy.da OBJECT IS COUNTED TOO (arcpy.da ONES AS "da.<CLASS>").
+PROFILED_FUNCTIONS = ["AddMessage","AddWarning","AddError","GetMessages","Exists","Describe","ListFields","ListIndexes","ListDatasets","ListFeatureClasses","ListTables","ListRasters","AddFieldDelimiters",
+                      "GetCount_management","DeleteRows_management","Append_management","Copy_management","Delete_management","Rename_management","CreateFeatureDataset_management",
+                      "CreateTable_management","CreateFeatureclass_management","AddField_management","AddIndex_management","ChangePrivileges_management",
+                      "RasterToNumPyArray","NumPyArrayToRaster","CreateScratchName","DefineProjection_management","Mosaic_management"]
+#PROFILED_CURSOR_METHODS STORES THE METHODS (ROWS) OF CURSOR CLASSES THAT ARE COUNTED WHEN CALLS ARE PROFILED
+PROFILED_CURSOR_METHODS = {"SearchCursor":["next"],"InsertCursor":["insertRow"],"UpdateCursor":["next","updateRow","deleteRow"]}
+#LOCAL_CALLS STORES CALLS THAT DON'T MAKE A ROUND TRIP TO THE GEODATABASE IN ARCPY (ROWS ARE FETCHED/SENT IN BATCHES),
+#SO STANDIN_LATENCY_MS ISN'T ADDED TO THEM
+LOCAL_CALLS = ["AddMessage","AddWarning","AddError","GetMessages","AddFieldDelimiters","CreateScratchName","NumPyArrayToRaster","Point",
+               "da.SearchCursor.next","da.InsertCursor.insertRow","da.UpdateCursor.next","da.UpdateCursor.updateRow","da.UpdateCursor.deleteRow"]
+
+#OTHER VARIABLES
+#messages STORES MESSAGES OF TOOLS THAT HAVE RUN (SEE GetMessages())
+messages = []
+#connections STORES EACH THREAD'S WRITE CONNECTION TO EACH GEODATABASE (SQLITE CONNECTIONS CAN'T BE SHARED BY THREADS).
+#KEYS ARE [PROCESS ID, THREAD ID, GEODATABASE PATH].
+connections = {}
+#scratch_rasters STORES RASTER BLOCKS THAT HAVE BEEN SAVED TO SCRATCH NAMES (SEE NumPyArrayToRaster()). KEYS ARE
+#SCRATCH NAMES.
+scratch_rasters = {}
+#scratch_count STORES THE NUMBER OF SCRATCH NAMES HANDED OUT (SEE CreateScratchName())
+scratch_count = [0]
+#latency_seconds STORES THE LATENCY ADDED TO EACH ROUND-TRIP CALL (SEE STANDIN_LATENCY_MS IN README NOTES)
+latency_seconds = float(os.environ.get("STANDIN_LATENCY_MS", "") or 0) / 1000.0
+#call_latencies STORES THE LATENCY (SECONDS) ADDED TO PARTICULAR CALLS (SEE STANDIN_LATENCIES IN README NOTES)
+call_latencies = dict([[k, float(v) / 1000.0] for k, v in json.loads(os.environ.get("STANDIN_LATENCIES", "") or "{}").items()])
+#calls_path STORES THE FILE THAT CALLS ARE WRITTEN TO (SEE STANDIN_CALLS_PATH IN README NOTES)
+calls_path = os.environ.get("STANDIN_CALLS_PATH", "")
+#is_profiling STORES WHETHER CALLS ARE PROFILED
+is_profiling = latency_seconds > 0 or len(call_latencies) > 0 or calls_path != ""
+#call_profile STORES [PROCESS ID, {CALL NAME: [COUNT, SECONDS]}] OF THE CALLS MADE BY THE PROCESS. THE PROCESS ID IS None
+#ONCE THE CALLS HAVE BEEN WRITTEN.
+call_profile = [None, {}]
+#call_lock STORES A LOCK SO THAT THREADS CAN COUNT CALLS AT THE SAME TIME
+call_lock = threading.Lock()
+#call_depth STORES EACH THREAD'S DEPTH OF NESTED CALLS (ONLY THE OUTERMOST CALL IS COUNTED)
+call_depth = threading.local()
+
+#THIS CLASS STANDS IN FOR arcpy.env. A CHANGE OF workspace IS COUNTED AS A CALL ("env.workspace") WHEN CALLS ARE
+#PROFILED.
+class Environment(object):
+   def __init__(self):
+      self.workspace = None
+      self.scratchGDB = "in_memory"
+      self.scratchFolder = os.getcwd()
+      self.overwriteOutput = False
+   def __setattr__(self, the_name, the_value):
+      if is_profiling == True and the_name == "workspace" and the_value != None and the_value != getattr(self, "workspace", None):
+         call_start = time.time()
+         add_latency("env.workspace")
+         count_call("env.workspace", time.time() - call_start)
+      object.__setattr__(self, the_name, the_value)
+env = Environment()
+
+#THIS CLASS STANDS IN FOR arcpy.ExecuteError (A TOOL FAILED)
+class ExecuteError(Exception):
+   pass
+
+#THIS CLASS STANDS IN FOR A TOOL'S arcpy Result OBJECT
+class Result(object):
+   def __init__(self, the_outputs):
+      self.outputs = the_outputs
+   def getOutput(self, i):
+      return self.outputs[i]
+
+def AddMessage(the_message):
+   messages.append(the_message)
+
+def AddWarning(the_message):
+   messages.append("WARNING: " + the_message)
+
+def AddError(the_message):
+   messages.append("ERROR: " + the_message)
+
+def GetMessages(severity = 0):
+   return "\n".join(messages[-20:])
+
+#THIS FUNCTION SPLITS A PATH INTO [GEODATABASE PATH, LIST OF NAMES UNDER THE GEODATABASE]. RELATIVE PATHS ARE UNDER
+#   env.workspace. RETURNS [None, []] IF THE PATH ISN'T IN A GEODATABASE.
+#   THE ARGUMENT IS THE PATH.
+def split_path(the_path):
+   the_parts = the_path.replace("\\", "/").split("/")
+   k = 0
+   while k < len(the_parts):
+      if the_parts[k].lower().endswith(GDB_SUFFIXES):
+         return ["/".join(the_parts[0:k + 1]), [i for i in the_parts[k + 1:] if i != ""]]
+      k += 1
+   if env.workspace != None and the_path != env.workspace and split_path(env.workspace)[0] != None:
+      return split_path(env.workspace + "/" + the_path)
+   return [None, []]
+
+#THIS FUNCTION RETURNS THE CALLING THREAD'S WRITE CONNECTION TO A GEODATABASE (OPENING IT IF NEEDED).
+#   THE ARGUMENT IS THE GEODATABASE PATH (SEE split_path()).
+def connect(the_gdb):
+   the_key = (os.getpid(), threading.current_thread().ident, the_gdb)
+   if the_key not in connections:
+      if not os.path.exists(the_gdb):
+         raise ExecuteError("ERROR 000732: Workspace " + the_gdb + " does not exist")
+      connections[the_key] = sqlite3.connect(the_gdb, timeout = BUSY_SECONDS)
+   return connections[the_key]
+
+#THIS FUNCTION RETURNS THE SCHEMA PREFIX OF A GEODATABASE
+def get_prefix(the_gdb):
+   return connect(the_gdb).execute("SELECT v FROM gdb_meta WHERE k = 'prefix'").fetchone()[0]
+
+#THIS FUNCTION RETURNS A NAME W/O SCHEMA PREFIX
+def get_bare_name(the_name):
+   return the_name[the_name.rfind(".") + 1:]
+
+#THIS FUNCTION RETURNS THE NAME OF THE SQLITE TABLE THAT HOLDS A DATA OBJECT'S ROWS (PIXELS IF A RASTER DATASET)
+def get_table_name(the_item):
+   if the_item["type"] == "RasterDataset":
+      return "r_" + re.sub("[^A-Za-z0-9_]", "_", the_item["name"].upper())
+   return "d_" + re.sub("[^A-Za-z0-9_]", "_", the_item["name"].upper())
+
+#THIS FUNCTION RETURNS A GEODATABASE ITEM (A DICTIONARY W/ KEYS "name", "type", "fds", AND "meta") BY NAME (W/ OR W/O
+#   SCHEMA PREFIX; NOT CASE-SENSITIVE), OR None IF THERE ISN'T ONE.
+def find_item(the_gdb, the_name):
+   the_connection = connect(the_gdb)
+   for a_name in (the_name, get_prefix(the_gdb) + get_bare_name(the_name)):
+      the_row = the_connection.execute("SELECT name, type, fds, meta FROM gdb_items WHERE uname = ?", [a_name.upper()]).fetchone()
+      if the_row != None:
+         return {"name":the_row[0],"type":the_row[1],"fds":the_row[2],"meta":json.loads(the_row[3])}
+   return None
+
+#THIS FUNCTION RETURNS [GEODATABASE PATH, ITEM] FOR A PATH. THE ITEM IS None IF THE PATH DOESN'T EXIST, AND A
+#   "Workspace" ITEM IF THE PATH IS A GEODATABASE. A PATH THAT ENDS W/ "Band_1" UNDER A RASTER DATASET IS A "RasterBand"
+#   ITEM.
+def resolve(the_path):
+   the_gdb, the_names = split_path(the_path)
+   if the_gdb == None or not os.path.exists(the_gdb):
+      return [the_gdb, None]
+   if len(the_names) == 0:
+      return [the_gdb, {"name":os.path.basename(the_gdb),"type":"Workspace","fds":None,"meta":{}}]
+   if len(the_names) > 1 and the_names[-1].upper() == "BAND_1":
+      the_item = find_item(the_gdb, the_names[-2])
+      if the_item != None and the_item["type"] == "RasterDataset":
+         the_item = dict(the_item)
+         the_item["type"] = "RasterBand"
+         return [the_gdb, the_item]
+   return [the_gdb, find_item(the_gdb, the_names[-1])]
+
+#THIS FUNCTION RETURNS [GEODATABASE PATH, ITEM] FOR A PATH, OR RAISES ExecuteError IF IT DOESN'T EXIST
+def resolve_existing(the_path):
+   the_gdb, the_item = resolve(the_path)
+   if the_item == None:
+      raise ExecuteError("ERROR 000732: Dataset " + str(the_path) + " does not exist or is not supported")
+   return [the_gdb, the_item]
+
+#THIS FUNCTION SAVES AN ITEM'S DESCRIPTION (meta) INTO ITS GEODATABASE
+def save_meta(the_gdb, the_item):
+   the_connection = connect(the_gdb)
+   the_connection.execute("UPDATE gdb_items SET meta = ? WHERE name = ?", [json.dumps(the_item["meta"]), the_item["name"]])
+   the_connection.commit()
+
+#THIS FUNCTION ADDS AN ITEM TO A GEODATABASE (AND CREATES ITS SQLITE TABLE) AND RETURNS IT.
+#   THE FIRST ARGUMENT IS THE GEODATABASE PATH.
+#   THE SECOND ARGUMENT IS THE ITEM'S NAME W/ SCHEMA PREFIX.
+#   THE THIRD ARGUMENT IS THE ITEM'S TYPE ("FeatureDataset", "FeatureClass", "Table", OR "RasterDataset").
+#   THE FOURTH ARGUMENT IS THE NAME OF THE ITEM'S FEATURE DATASET (None IF STAND-ALONE).
+#   THE FIFTH ARGUMENT IS THE ITEM'S DESCRIPTION.
+def add_item(the_gdb, the_name, the_type, the_fds, the_meta):
+   the_connection = connect(the_gdb)
+   if find_item(the_gdb, the_name) != None:
+      raise ExecuteError("ERROR 000258: Output " + the_name + " already exists")
+   the_item = {"name":the_name,"type":the_type,"fds":the_fds,"meta":the_meta}
+   the_connection.execute("INSERT INTO gdb_items VALUES (?, ?, ?, ?, ?)", [the_name, the_name.upper(), the_type, the_fds, json.dumps(the_meta)])
+   if the_type in ("FeatureClass", "Table"):
+      the_columns = ["OBJECTID INTEGER PRIMARY KEY"] + ['"' + i["name"].upper() + '"' for i in the_meta["fields"] if i["type"] != "OID"]
+      the_connection.execute("CREATE TABLE " + get_table_name(the_item) + " (" + ", ".join(the_columns) + ")")
+   elif the_type == "RasterDataset":
+      the_connection.execute("CREATE TABLE " + get_table_name(the_item) + " (r INTEGER PRIMARY KEY, pixels BLOB)")
+   the_connection.commit()
+   return the_item
+
+#THIS FUNCTION CREATES A STAND-IN GEODATABASE (REPLACING ANY FILE AT THE PATH). NOT AN ARCPY FUNCTION.
+#   THE FIRST ARGUMENT IS THE PATH (MUST END W/ ONE OF GDB_SUFFIXES).
+#   THE SECOND ARGUMENT IS THE SCHEMA PREFIX OF DATA OBJECTS CREATED IN IT (E.G., "HUB.GIS."), OR "".
+def create_geodatabase(the_gdb, the_prefix = ""):
+   the_gdb = split_path(the_gdb)[0]
+   for the_key in [i for i in connections if i[2] == the_gdb]:
+      connections.pop(the_key).close()
+   for a_path in (the_gdb, the_gdb + "-wal", the_gdb + "-shm"):
+      if os.path.exists(a_path):
+         os.remove(a_path)
+   the_connection = sqlite3.connect(the_gdb)
+   the_connection.execute("PRAGMA journal_mode = WAL")
+   the_connection.execute("CREATE TABLE gdb_meta (k TEXT PRIMARY KEY, v TEXT)")
+   the_connection.execute("INSERT INTO gdb_meta VALUES ('prefix', ?)", [the_prefix])
+   the_connection.execute("CREATE TABLE gdb_items (name TEXT, uname TEXT PRIMARY KEY, type TEXT, fds TEXT, meta TEXT)")
+   the_connection.commit()
+   the_connection.close()
+
+#THIS FUNCTION CREATES A FEATURE CLASS OR TABLE IN A STAND-IN GEODATABASE AND FILLS IT. NOT AN ARCPY FUNCTION.
+#   THE FIRST ARGUMENT IS THE GEODATABASE PATH.
+#   THE SECOND ARGUMENT IS THE NAME (W/O SCHEMA PREFIX).
+#   THE THIRD ARGUMENT IS "FeatureClass" OR "Table".
+#   THE FOURTH ARGUMENT IS A LIST OF [FIELD NAME, FIELD TYPE (E.G., "Integer", "String", "Date", "Double")] LISTS.
+#   THE FIFTH ARGUMENT IS THE NAME OF THE FEATURE DATASET (W/O SCHEMA PREFIX; CREATED IF NEEDED), OR None.
+#   THE SIXTH ARGUMENT IS THE SHAPE TYPE OF A FEATURE CLASS ("Point", "Polyline", OR "Polygon").
+#   THE SEVENTH ARGUMENT IS AN ITERABLE OF ROWS: VALUES OF THE FIELDS (AND THEN WKB GEOMETRY, IF A FEATURE CLASS).
+#   RETURNS THE NUMBER OF ROWS ADDED.
+def create_data_object(the_gdb, the_name, the_type, the_fields, fds_name = None, shape_type = None, the_rows = []):
+   the_gdb = split_path(the_gdb)[0]
+   the_prefix = get_prefix(the_gdb)
+   the_meta = {"fields":[{"name":"OBJECTID","type":"OID"}] + [{"name":i[0],"type":i[1]} for i in the_fields],"indexes":[]}
+   if the_type == "FeatureClass":
+      the_meta["fields"].append({"name":"SHAPE","type":"Geometry"})
+      the_meta["shape_type"] = shape_type
+      the_meta["spatial_reference"] = "NAD_1983_StatePlane_Vermont_FIPS_4400"
+   the_fds = None
+   if fds_name != None:
+      if find_item(the_gdb, fds_name) == None:
+         add_item(the_gdb, the_prefix + fds_name, "FeatureDataset", None, {"spatial_reference":"NAD_1983_StatePlane_Vermont_FIPS_4400"})
+      the_fds = the_prefix + fds_name
+   the_item = add_item(the_gdb, the_prefix + the_name, the_type, the_fds, the_meta)
+   the_columns = [i["name"] for i in the_meta["fields"] if i["type"] != "OID"]
+   the_connection = connect(the_gdb)
+   the_count = [0]
+   def count_rows(the_row):
+      the_count[0] += 1
+      return [to_sqlite(i) for i in the_row]
+   the_connection.executemany("INSERT INTO " + get_table_name(the_item) + " (" + ", ".join(['"' + i.upper() + '"' for i in the_columns]) + ") VALUES (" + ", ".join(["?"] * len(the_columns)) + ")", itertools.imap(count_rows, the_rows))
+   the_connection.commit()
+   return the_count[0]
+
+#THIS FUNCTION CREATES A RASTER DATASET (1 BAND, 8-BIT UNSIGNED PIXELS) IN A STAND-IN GEODATABASE. NOT AN ARCPY
+#   FUNCTION.
+#   THE FIRST ARGUMENT IS THE GEODATABASE PATH.
+#   THE SECOND ARGUMENT IS THE NAME (W/O SCHEMA PREFIX).
+#   THE THIRD AND FOURTH ARGUMENTS ARE THE NUMBER OF COLUMNS AND ROWS.
+#   THE FIFTH ARGUMENT IS A FUNCTION THAT RETURNS THE PIXELS (A STRING OF BYTES, ONE PER COLUMN) OF A GIVEN ROW NUMBER.
+#   THE SIXTH ARGUMENT IS THE CELL SIZE.
+def create_raster_dataset(the_gdb, the_name, the_width, the_height, row_pixels, cell_size = 1.0):
+   the_gdb = split_path(the_gdb)[0]
+   the_meta = {"width":the_width,"height":the_height,"cell":cell_size,"xmin":0.0,"ymin":0.0,"pixel_type":"U8","spatial_reference":"NAD_1983_StatePlane_Vermont_FIPS_4400"}
+   the_item = add_item(the_gdb, get_prefix(the_gdb) + the_name, "RasterDataset", None, the_meta)
+   the_connection = connect(the_gdb)
+   the_connection.executemany("INSERT INTO " + get_table_name(the_item) + " VALUES (?, ?)", ((r, buffer(row_pixels(r))) for r in xrange(the_height)))
+   the_connection.commit()
+
+#THIS FUNCTION RETURNS A VALUE AS IT IS STORED IN SQLITE (DATES AS ISO-FORMAT TEXT, BINARY AS BLOBS)
+def to_sqlite(the_value):
+   if isinstance(the_value, (datetime.datetime, datetime.date)):
+      return the_value.isoformat(" ")
+   if isinstance(the_value, bytearray):
+      return buffer(the_value)
+   if isinstance(the_value, Geometry):
+      return buffer(the_value.WKB)
+   return the_value
+
+#THIS FUNCTION RETURNS A VALUE READ FROM SQLITE AS ARCPY WOULD RETURN IT
+#   THE FIRST ARGUMENT IS THE VALUE.
+#   THE SECOND ARGUMENT IS THE FIELD'S TYPE ("Date", "Geometry", ETC.).
+def from_sqlite(the_value, the_type):
+   if the_value == None:
+      return None
+   if the_type == "Date" and isinstance(the_value, basestring):
+      for a_format in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+         try:
+            return datetime.datetime.strptime(the_value, a_format)
+         except ValueError:
+            pass
+      return the_value
+   if the_type == "Geometry" or isinstance(the_value, buffer):
+      return bytearray(the_value)
+   return the_value
+
+#THIS CLASS STANDS IN FOR AN arcpy Geometry OBJECT (ONLY ITS WKB AND POINT COUNT)
+class Geometry(object):
+   def __init__(self, the_wkb):
+      self.WKB = bytearray(the_wkb)
+      self.pointCount = max(1, (len(self.WKB) - 9) // 16)
+
+#THIS CLASS STANDS IN FOR AN arcpy Field OBJECT
+class Field(object):
+   def __init__(self, the_field):
+      self.name = the_field["name"]
+      self.aliasName = the_field["name"]
+      self.type = the_field["type"]
+      self.length = the_field.get("length") or 255
+      self.editable = the_field["type"] not in ("OID", "GlobalID")
+      self.required = the_field["type"] in ("OID", "Geometry")
+      self.isNullable = not self.required
+      self.domain = ""
+
+#THIS CLASS STANDS IN FOR AN arcpy Index OBJECT
+class Index(object):
+   def __init__(self, the_index, the_item):
+      self.name = the_index["name"]
+      self.isUnique = the_index.get("unique", False)
+      self.isAscending = True
+      self.fields = [Field(i) for i in the_item["meta"]["fields"] if i["name"].upper() in [j.upper() for j in the_index["fields"]]]
+
+#THIS CLASS STANDS IN FOR AN arcpy SpatialReference OBJECT
+class SpatialReference(object):
+   def __init__(self, the_name):
+      self.name = the_name
+      self.factoryCode = 0
+
+#THIS CLASS STANDS IN FOR AN arcpy Extent OBJECT
+class Extent(object):
+   def __init__(self, x_min, y_min, x_max, y_max):
+      self.XMin = x_min
+      self.YMin = y_min
+      self.XMax = x_max
+      self.YMax = y_max
+
+#THIS CLASS STANDS IN FOR AN arcpy Point OBJECT
+class Point(object):
+   def __init__(self, X = None, Y = None, Z = None, M = None):
+      self.X = X
+      self.Y = Y
+      self.Z = Z
+      self.M = M
+
+#THIS CLASS STANDS IN FOR AN OBJECT RETURNED BY arcpy.Describe()
+class Description(object):
+   pass
+
+def Exists(the_path):
+   return resolve(the_path)[1] != None
+
+def Describe(the_path):
+   the_gdb, the_item = resolve(the_path)
+   if the_item == None:
+      raise IOError('"' + str(the_path) + '" does not exist')
+   the_meta = the_item["meta"]
+   d = Description()
+   d.catalogPath = the_path
+   d.name = the_item["name"]
+   d.baseName = get_bare_name(the_item["name"])
+   d.dataType = the_item["type"]
+   if the_item["type"] == "Workspace":
+      if get_prefix(the_gdb) != "":
+         d.workspaceType = "RemoteDatabase"
+      else:
+         d.workspaceType = "LocalDatabase"
+      d.connectionProperties = Description()
+      return d
+   if the_item["type"] in ("FeatureClass", "Table"):
+      d.fields = [Field(i) for i in the_meta["fields"]]
+      d.indexes = [Index(i, the_item) for i in the_meta.get("indexes", [])]
+      d.hasOID = True
+      d.OIDFieldName = "OBJECTID"
+      d.isVersioned = the_meta.get("versioned", False)
+      d.isArchived = the_meta.get("archived", False)
+      d.relationshipClassNames = []
+      d.editorTrackingEnabled = the_meta.get("edited_at_field") != None
+      d.editedAtFieldName = the_meta.get("edited_at_field") or ""
+      d.createdAtFieldName = the_meta.get("created_at_field") or ""
+   if the_item["type"] == "FeatureClass":
+      d.shapeType = the_meta.get("shape_type")
+      d.shapeFieldName = "SHAPE"
+      d.hasZ = False
+      d.hasM = False
+      d.lengthFieldName = ""
+      d.areaFieldName = ""
+      d.featureType = "Simple"
+      d.spatialReference = SpatialReference(the_meta.get("spatial_reference"))
+   if the_item["type"] == "FeatureDataset":
+      d.spatialReference = SpatialReference(the_meta.get("spatial_reference"))
+   if the_item["type"] in ("RasterDataset", "RasterBand"):
+      d.width = the_meta["width"]
+      d.height = the_meta["height"]
+      d.bandCount = 1
+      d.pixelType = the_meta["pixel_type"]
+      d.meanCellWidth = the_meta["cell"]
+      d.meanCellHeight = the_meta["cell"]
+      d.spatialReference = SpatialReference(the_meta.get("spatial_reference"))
+   return d
+
+def ListFields(the_path, wild_card = None, field_type = None):
+   return [Field(i) for i in resolve_existing(the_path)[1]["meta"]["fields"]]
+
+def ListIndexes(the_path, wild_card = None):
+   the_item = resolve_existing(the_path)[1]
+   return [Index(i, the_item) for i in the_item["meta"].get("indexes", [])] + [Index({"name":"FDO_OBJECTID","fields":["OBJECTID"],"unique":True}, the_item)]
+
+#THIS FUNCTION RETURNS NAMES OF ITEMS OF A GIVEN TYPE IN env.workspace (IN THE ORDER THEY WERE CREATED) THAT MATCH A
+#   WILDCARD.
+#   THE FIRST ARGUMENT IS THE ITEM TYPE.
+#   THE SECOND ARGUMENT IS THE WILDCARD (E.G., "*PARCELS"), OR None.
+#   THE THIRD ARGUMENT IS THE NAME OF A FEATURE DATASET (ONLY ITS FEATURE CLASSES ARE LISTED), "" (ONLY STAND-ALONE
+#      ITEMS), OR None (ALL).
+def list_items(the_type, wild_card = None, fds_name = None):
+   the_gdb = split_path(env.workspace)[0]
+   the_connection = connect(the_gdb)
+   if fds_name != None and fds_name != "":
+      the_fds = find_item(the_gdb, fds_name)
+      if the_fds == None:
+         return []
+      the_names = [i[0] for i in the_connection.execute("SELECT name FROM gdb_items WHERE type = ? AND fds = ? ORDER BY rowid", [the_type, the_fds["name"]])]
+   elif fds_name == "":
+      the_names = [i[0] for i in the_connection.execute("SELECT name FROM gdb_items WHERE type = ? AND fds IS NULL ORDER BY rowid", [the_type])]
+   else:
+      the_names = [i[0] for i in the_connection.execute("SELECT name FROM gdb_items WHERE type = ? ORDER BY rowid", [the_type])]
+   if wild_card in (None, "", "*"):
+      return the_names
+   the_pattern = re.compile("^" + re.escape(wild_card).replace("\\*", ".*") + "$", re.IGNORECASE)
+   return [i for i in the_names if the_pattern.match(i) or the_pattern.match(get_bare_name(i))]
+
+def ListDatasets(wild_card = None, feature_type = None):
+   return list_items("FeatureDataset", wild_card)
+
+def ListFeatureClasses(wild_card = None, feature_type = None, feature_dataset = None):
+   if feature_dataset == None:
+      feature_dataset = ""
+   return list_items("FeatureClass", wild_card, feature_dataset)
+
+def ListTables(wild_card = None, table_type = None):
+   return list_items("Table", wild_card)
+
+def ListRasters(wild_card = None, raster_type = None):
+   return list_items("RasterDataset", wild_card)
+
+def AddFieldDelimiters(the_datasource, the_field):
+   return the_field
+
+#THIS FUNCTION RETURNS [LIST OF SQLITE COLUMN EXPRESSIONS, LIST OF FIELD TYPES] FOR CURSOR FIELD-TOKENS
+#   THE FIRST ARGUMENT IS THE ITEM (FEATURE CLASS OR TABLE).
+#   THE SECOND ARGUMENT IS THE LIST OF FIELD NAMES/TOKENS (E.G., "OID@", "SHAPE@WKB").
+def get_columns(the_item, the_fields):
+   field_types = dict([[i["name"].upper(), i["type"]] for i in the_item["meta"]["fields"]])
+   the_columns = []
+   the_types = []
+   for a_field in the_fields:
+      the_token = a_field.upper()
+      if the_token in ("OID@", "OBJECTID"):
+         the_columns.append("OBJECTID")
+         the_types.append("OID")
+      elif the_token in SHAPE_TOKENS:
+         the_columns.append('"SHAPE"')
+         the_types.append("Geometry")
+      elif the_token in field_types:
+         the_columns.append('"' + the_token + '"')
+         the_types.append(field_types[the_token])
+      else:
+         raise RuntimeError("A column was specified that does not exist: " + a_field)
+   return [the_columns, the_types]
+
+#THIS CLASS HOLDS WHAT ALL STAND-IN CURSORS HAVE IN COMMON: USE IN A with STATEMENT, AND CLOSING WHEN DELETED
+class Cursor(object):
+   def __enter__(self):
+      return self
+   def __exit__(self, the_type, the_value, the_traceback):
+      self.close()
+   def __del__(self):
+      try:
+         self.close()
+      except:
+         pass
+   def close(self):
+      pass
+
+#THIS CLASS STANDS IN FOR arcpy.da.SearchCursor. ROWS ARE STREAMED FROM ITS OWN (READ) CONNECTION.
+class SearchCursor(Cursor):
+   def __init__(self, in_table, field_names, where_clause = None, spatial_reference = None, explode_to_points = False, sql_clause = (None, None)):
+      the_gdb, the_item = resolve_existing(in_table)
+      if isinstance(field_names, basestring):
+         field_names = [field_names]
+      if list(field_names) == ["*"]:
+         field_names = [i["name"] for i in the_item["meta"]["fields"]]
+      self.fields = tuple(field_names)
+      the_columns, self.types = get_columns(the_item, field_names)
+      the_sql = "SELECT " + ", ".join(the_columns) + " FROM " + get_table_name(the_item)
+      if where_clause:
+         the_sql += " WHERE " + where_clause
+      if sql_clause != None and sql_clause[1]:
+         the_sql += " " + sql_clause[1]
+      self.connection = sqlite3.connect(the_gdb, timeout = BUSY_SECONDS)
+      self.rows = self.connection.execute(the_sql)
+   def __iter__(self):
+      return self
+   def next(self):
+      if self.rows == None:
+         raise StopIteration
+      the_row = self.rows.fetchone()
+      if the_row == None:
+         self.close()
+         raise StopIteration
+      return tuple([from_sqlite(the_row[k], self.types[k]) for k in range(len(the_row))])
+   def reset(self):
+      raise RuntimeError("reset() isn't supported by the stand-in")
+   def close(self):
+      if self.connection != None:
+         self.rows = None
+         self.connection.close()
+         self.connection = None
+
+#THIS CLASS STANDS IN FOR arcpy.da.InsertCursor. ROWS ARE COMMITTED WHEN THE CURSOR IS DELETED.
+class InsertCursor(Cursor):
+   def __init__(self, in_table, field_names):
+      the_gdb, the_item = resolve_existing(in_table)
+      if isinstance(field_names, basestring):
+         field_names = [field_names]
+      self.fields = tuple(field_names)
+      the_columns = get_columns(the_item, field_names)[0]
+      self.sql = "INSERT INTO " + get_table_name(the_item) + " (" + ", ".join(the_columns) + ") VALUES (" + ", ".join(["?"] * len(the_columns)) + ")"
+      self.connection = connect(the_gdb)
+   def insertRow(self, the_row):
+      return self.connection.execute(self.sql, [to_sqlite(i) for i in the_row]).lastrowid
+   def close(self):
+      if self.connection != None:
+         self.connection.commit()
+         self.connection = None
+
+#THIS CLASS STANDS IN FOR arcpy.da.UpdateCursor. CHANGES ARE COMMITTED WHEN THE CURSOR IS DELETED.
+class UpdateCursor(Cursor):
+   def __init__(self, in_table, field_names, where_clause = None, spatial_reference = None, explode_to_points = False, sql_clause = (None, None)):
+      the_gdb, the_item = resolve_existing(in_table)
+      if isinstance(field_names, basestring):
+         field_names = [field_names]
+      self.fields = tuple(field_names)
+      self.columns, self.types = get_columns(the_item, field_names)
+      self.table_name = get_table_name(the_item)
+      the_sql = "SELECT OBJECTID, " + ", ".join(self.columns) + " FROM " + self.table_name
+      if where_clause:
+         the_sql += " WHERE " + where_clause
+      if sql_clause != None and sql_clause[1]:
+         the_sql += " " + sql_clause[1]
+      self.connection = connect(the_gdb)
+      #(OBJECTIDS ARE READ UP FRONT SO THAT UPDATES AND DELETES DON'T DISTURB THE SELECT)
+      self.rows = iter(self.connection.execute(the_sql).fetchall())
+      self.current_oid = None
+   def __iter__(self):
+      return self
+   def next(self):
+      the_row = self.rows.next()
+      self.current_oid = the_row[0]
+      return [from_sqlite(the_row[k + 1], self.types[k]) for k in range(len(self.types))]
+   def updateRow(self, the_row):
+      self.connection.execute("UPDATE " + self.table_name + " SET " + ", ".join([i + " = ?" for i in self.columns]) + " WHERE OBJECTID = ?", [to_sqlite(i) for i in the_row] + [self.current_oid])
+   def deleteRow(self):
+      self.connection.execute("DELETE FROM " + self.table_name + " WHERE OBJECTID = ?", [self.current_oid])
+   def close(self):
+      if self.connection != None:
+         self.connection.commit()
+         self.connection = None
+
+#THIS CLASS STANDS IN FOR arcpy.da.Editor (EDITS AREN'T VERSIONED IN THE STAND-IN, SO IT DOES NOTHING)
+class Editor(object):
+   def __init__(self, the_workspace):
+      self.workspace = the_workspace
+      self.isEditing = False
+   def startEditing(self, with_undo = True, multiuser_mode = True):
+      self.isEditing = True
+   def stopEditing(self, save_changes = True):
+      self.isEditing = False
+   def startOperation(self):
+      pass
+   def stopOperation(self):
+      pass
+   def abortOperation(self):
+      pass
+   def __enter__(self):
+      self.startEditing()
+      return self
+   def __exit__(self, the_type, the_value, the_traceback):
+      self.stopEditing(the_type == None)
+
+#THIS CLASS STANDS IN FOR THE arcpy.da MODULE
+class DataAccess(object):
+   SearchCursor = SearchCursor
+   InsertCursor = InsertCursor
+   UpdateCursor = UpdateCursor
+   Editor = Editor
+da = DataAccess()
+
+def GetCount_management(in_rows):
+   the_gdb, the_item = resolve_existing(in_rows)
+   return Result([str(connect(the_gdb).execute("SELECT COUNT(*) FROM " + get_table_name(the_item)).fetchone()[0])])
+
+def DeleteRows_management(in_rows):
+   the_gdb, the_item = resolve_existing(in_rows)
+   the_connection = connect(the_gdb)
+   the_connection.execute("DELETE FROM " + get_table_name(the_item))
+   the_connection.commit()
+   return Result([in_rows])
+
+def Append_management(inputs, target, schema_type = "TEST", field_mapping = None, subtype = None):
+   if isinstance(inputs, basestring):
+      inputs = inputs.split(";")
+   target_fields = dict([[i["name"].upper(), i["name"]] for i in resolve_existing(target)[1]["meta"]["fields"] if i["type"] != "OID"])
+   for an_input in inputs:
+      the_fields = [i["name"] for i in resolve_existing(an_input)[1]["meta"]["fields"] if i["type"] != "OID" and i["name"].upper() in target_fields]
+      the_cursor = InsertCursor(target, the_fields)
+      for a_row in SearchCursor(an_input, the_fields):
+         the_cursor.insertRow(a_row)
+      the_cursor.close()
+   return Result([target])
+
+def Copy_management(in_data, out_data, data_type = None):
+   source_gdb, source_item = resolve_existing(in_data)
+   target_gdb, the_names = split_path(out_data)
+   the_fds = None
+   if len(the_names) > 1:
+      the_fds = resolve_existing(target_gdb + "/" + the_names[-2])[1]["name"]
+   the_item = add_item(target_gdb, get_prefix(target_gdb) + get_bare_name(the_names[-1]), source_item["type"], the_fds, source_item["meta"])
+   the_connection = connect(target_gdb)
+   if source_item["type"] in ("FeatureClass", "Table"):
+      the_fields = [i["name"] for i in source_item["meta"]["fields"] if i["type"] != "OID"]
+      the_cursor = InsertCursor(out_data, the_fields)
+      for a_row in SearchCursor(in_data, the_fields):
+         the_cursor.insertRow(a_row)
+      the_cursor.close()
+   elif source_item["type"] == "RasterDataset":
+      the_reader = sqlite3.connect(source_gdb, timeout = BUSY_SECONDS)
+      the_connection.executemany("INSERT INTO " + get_table_name(the_item) + " VALUES (?, ?)", the_reader.execute("SELECT r, pixels FROM " + get_table_name(source_item)))
+      the_reader.close()
+      the_connection.commit()
+   for an_index in source_item["meta"].get("indexes", []):
+      create_sqlite_index(target_gdb, the_item, an_index)
+   return Result([out_data])
+
+def Delete_management(in_data, data_type = None):
+   if in_data in scratch_rasters:
+      del scratch_rasters[in_data]
+      return Result([in_data])
+   the_gdb, the_item = resolve_existing(in_data)
+   the_connection = connect(the_gdb)
+   if the_item["type"] in ("FeatureClass", "Table", "RasterDataset"):
+      the_connection.execute("DROP TABLE " + get_table_name(the_item))
+   the_connection.execute("DELETE FROM gdb_items WHERE name = ?", [the_item["name"]])
+   the_connection.commit()
+   return Result([in_data])
+
+def Rename_management(in_data, out_data, data_type = None):
+   the_gdb, the_item = resolve_existing(in_data)
+   new_name = get_prefix(the_gdb) + get_bare_name(out_data.replace("\\", "/").split("/")[-1])
+   if find_item(the_gdb, new_name) != None:
+      raise ExecuteError("ERROR 000012: " + new_name + " already exists")
+   the_connection = connect(the_gdb)
+   new_item = dict(the_item)
+   new_item["name"] = new_name
+   if the_item["type"] in ("FeatureClass", "Table", "RasterDataset"):
+      the_connection.execute("ALTER TABLE " + get_table_name(the_item) + " RENAME TO " + get_table_name(new_item))
+   the_connection.execute("UPDATE gdb_items SET name = ?, uname = ? WHERE name = ?", [new_name, new_name.upper(), the_item["name"]])
+   if the_item["type"] == "FeatureDataset":
+      the_connection.execute("UPDATE gdb_items SET fds = ? WHERE fds = ?", [new_name, the_item["name"]])
+   the_connection.commit()
+   return Result([out_data])
+
+def CreateFeatureDataset_management(out_dataset_path, out_name, spatial_reference = None):
+   the_gdb = split_path(out_dataset_path)[0]
+   add_item(the_gdb, get_prefix(the_gdb) + out_name, "FeatureDataset", None, {"spatial_reference":"NAD_1983_StatePlane_Vermont_FIPS_4400"})
+   return Result([out_dataset_path + "\\" + get_prefix(the_gdb) + out_name])
+
+#THIS FUNCTION RETURNS THE DESCRIPTION OF A NEW FEATURE CLASS OR TABLE MADE FROM A TEMPLATE (NO INDEXES OR SETTINGS)
+def get_template_meta(the_template):
+   if the_template == None or the_template == "":
+      return {"fields":[{"name":"OBJECTID","type":"OID"}],"indexes":[]}
+   the_meta = dict(resolve_existing(the_template)[1]["meta"])
+   the_meta["indexes"] = []
+   the_meta.pop("versioned", None)
+   the_meta.pop("archived", None)
+   return the_meta
+
+def CreateTable_management(out_path, out_name, template = None, config_keyword = None):
+   the_gdb = split_path(out_path)[0]
+   the_item = add_item(the_gdb, get_prefix(the_gdb) + out_name, "Table", None, get_template_meta(template))
+   return Result([out_path + "\\" + the_item["name"]])
+
+def CreateFeatureclass_management(out_path, out_name, geometry_type = None, template = None, has_m = None, has_z = None, spatial_reference = None, *other_arguments):
+   the_gdb, the_names = split_path(out_path)
+   the_fds = None
+   if len(the_names) > 0:
+      the_fds = resolve_existing(out_path)[1]["name"]
+   the_meta = get_template_meta(template)
+   if template == None or template == "":
+      the_meta["fields"].append({"name":"SHAPE","type":"Geometry"})
+   if geometry_type != None:
+      the_meta["shape_type"] = geometry_type.capitalize()
+   the_item = add_item(the_gdb, get_prefix(the_gdb) + out_name, "FeatureClass", the_fds, the_meta)
+   return Result([out_path + "\\" + the_item["name"]])
+
+def AddField_management(in_table, field_name, field_type, field_precision = None, field_scale = None, field_length = None, field_alias = None, field_is_nullable = None, field_is_required = None, field_domain = None):
+   the_gdb, the_item = resolve_existing(in_table)
+   the_item["meta"]["fields"].append({"name":field_name,"type":FIELD_TYPES.get(field_type.upper(), field_type),"length":field_length})
+   connect(the_gdb).execute("ALTER TABLE " + get_table_name(the_item) + ' ADD COLUMN "' + field_name.upper() + '"')
+   save_meta(the_gdb, the_item)
+   return Result([in_table])
+
+#THIS FUNCTION CREATES A SQLITE INDEX FOR A STAND-IN INDEX (SO THAT WHERE CLAUSES ON INDEXED FIELDS ARE FAST)
+def create_sqlite_index(the_gdb, the_item, the_index):
+   index_name = "i_" + re.sub("[^A-Za-z0-9_]", "_", the_item["name"].upper() + "_" + the_index["name"].upper())
+   the_connection = connect(the_gdb)
+   the_connection.execute("CREATE INDEX IF NOT EXISTS " + index_name + " ON " + get_table_name(the_item) + " (" + ", ".join(['"' + i.upper() + '"' for i in the_index["fields"]]) + ")")
+   the_connection.commit()
+
+def AddIndex_management(in_table, fields, index_name, unique = "NON_UNIQUE", ascending = "NON_ASCENDING"):
+   the_gdb, the_item = resolve_existing(in_table)
+   if isinstance(fields, basestring):
+      fields = fields.split(";")
+   the_index = {"name":index_name,"fields":list(fields),"unique":unique == "UNIQUE"}
+   the_item["meta"].setdefault("indexes", []).append(the_index)
+   save_meta(the_gdb, the_item)
+   create_sqlite_index(the_gdb, the_item, the_index)
+   return Result([in_table])
+
+def ChangePrivileges_management(in_dataset, user, View = None, Edit = None):
+   messages.append("Granted " + str(View) + "/" + str(Edit) + " on " + in_dataset + " to " + user)
+   return Result([in_dataset])
+
+#THIS CLASS STANDS IN FOR AN arcpy Raster OBJECT
+class Raster(object):
+   def __init__(self, the_path):
+      the_item = resolve_existing(the_path)[1]
+      if the_item["type"] != "RasterDataset":
+         raise RuntimeError("ERROR 000732: " + the_path + " isn't a raster dataset")
+      the_meta = the_item["meta"]
+      self.width = the_meta["width"]
+      self.height = the_meta["height"]
+      self.bandCount = 1
+      self.pixelType = the_meta["pixel_type"]
+      self.noDataValue = the_meta.get("nodata")
+      self.meanCellWidth = the_meta["cell"]
+      self.meanCellHeight = the_meta["cell"]
+      self.extent = Extent(the_meta["xmin"], the_meta["ymin"], the_meta["xmin"] + the_meta["width"] * the_meta["cell"], the_meta["ymin"] + the_meta["height"] * the_meta["cell"])
+      self.spatialReference = SpatialReference(the_meta["spatial_reference"])
+
+#THIS CLASS STANDS IN FOR A NUMPY ARRAY OF A BLOCK OF RASTER PIXELS: A LIST OF ROWS (STRINGS OF 8-BIT PIXELS)
+class PixelBlock(object):
+   def __init__(self, the_rows):
+      self.rows = the_rows
+      self.shape = (len(the_rows), len(the_rows[0]) if len(the_rows) > 0 else 0)
+      self.dtype = "uint8"
+   def tostring(self):
+      return "".join(self.rows)
+
+#THIS FUNCTION RETURNS [FIRST COLUMN, FIRST ROW (FROM THE TOP)] OF A BLOCK OF A RASTER DATASET
+#   THE FIRST ARGUMENT IS THE RASTER DATASET'S DESCRIPTION (meta).
+#   THE SECOND ARGUMENT IS THE BLOCK'S LOWER-LEFT CORNER (Point).
+#   THE THIRD ARGUMENT IS THE BLOCK'S NUMBER OF ROWS.
+def get_block_origin(the_meta, lower_left_corner, row_count):
+   first_column = int(round((lower_left_corner.X - the_meta["xmin"]) / the_meta["cell"]))
+   bottom_row = int(round((the_meta["ymin"] + the_meta["height"] * the_meta["cell"] - lower_left_corner.Y) / the_meta["cell"]))
+   return [first_column, bottom_row - row_count]
+
+def RasterToNumPyArray(in_raster, lower_left_corner = None, ncols = None, nrows = None, nodata_to_value = None):
+   the_gdb, the_item = resolve_existing(in_raster)
+   the_meta = the_item["meta"]
+   if lower_left_corner == None:
+      lower_left_corner = Point(the_meta["xmin"], the_meta["ymin"])
+   if ncols == None:
+      ncols = the_meta["width"]
+   if nrows == None:
+      nrows = the_meta["height"]
+   first_column, first_row = get_block_origin(the_meta, lower_left_corner, nrows)
+   the_reader = sqlite3.connect(the_gdb, timeout = BUSY_SECONDS)
+   try:
+      the_rows = [str(i[0])[first_column:first_column + ncols] for i in the_reader.execute("SELECT pixels FROM " + get_table_name(the_item) + " WHERE r >= ? AND r < ? ORDER BY r", [first_row, first_row + nrows])]
+   finally:
+      the_reader.close()
+   return PixelBlock(the_rows)
+
+#THIS CLASS IS A BLOCK OF PIXELS W/ ITS LOWER-LEFT CORNER (SEE NumPyArrayToRaster())
+class BlockRaster(object):
+   def __init__(self, the_array, lower_left_corner):
+      self.array = the_array
+      self.lower_left_corner = lower_left_corner
+   def save(self, the_path):
+      scratch_rasters[the_path] = self
+
+def NumPyArrayToRaster(in_array, lower_left_corner = None, x_cell_size = None, y_cell_size = None, value_to_nodata = None):
+   return BlockRaster(in_array, lower_left_corner)
+
+def CreateScratchName(prefix = "", suffix = "", data_type = "", workspace = None):
+   scratch_count[0] += 1
+   return str(workspace) + "\\" + prefix + str(os.getpid()) + "_" + str(scratch_count[0]) + suffix
+
+def DefineProjection_management(in_dataset, coor_system):
+   return Result([in_dataset])
+
+def Mosaic_management(inputs, target, mosaic_type = "LAST", colormap = "FIRST", *other_arguments):
+   the_gdb, the_item = resolve_existing(target)
+   the_connection = connect(the_gdb)
+   for an_input in inputs:
+      the_block = scratch_rasters[an_input]
+      first_column, first_row = get_block_origin(the_item["meta"], the_block.lower_left_corner, len(the_block.array.rows))
+      for k in range(len(the_block.array.rows)):
+         the_pixels = str(the_connection.execute("SELECT pixels FROM " + get_table_name(the_item) + " WHERE r = ?", [first_row + k]).fetchone()[0])
+         the_pixels = the_pixels[0:first_column] + the_block.array.rows[k] + the_pixels[first_column + len(the_block.array.rows[k]):]
+         the_connection.execute("UPDATE " + get_table_name(the_item) + " SET pixels = ? WHERE r = ?", [buffer(the_pixels), first_row + k])
+   the_connection.commit()
+   return Result([target])
+
+#CALL PROFILE (SEE README NOTES)
+
+#THIS FUNCTION SLEEPS FOR THE LATENCY OF A CALL
+#   THE ARGUMENT IS THE CALL NAME.
+def add_latency(the_name):
+   if the_name in call_latencies:
+      the_seconds = call_latencies[the_name]
+   elif the_name in LOCAL_CALLS:
+      the_seconds = 0
+   else:
+      the_seconds = latency_seconds
+   if the_seconds > 0:
+      time.sleep(the_seconds)
+
+#THIS FUNCTION COUNTS A CALL. THE FIRST CALL IN A PROCESS (INCLUDING A FORKED WORKER PROCESS, WHICH STARTS W/ A COPY OF
+#   ITS PARENT'S COUNTS) STARTS THE PROCESS'S COUNTS AND ARRANGES FOR THEM TO BE WRITTEN WHEN IT EXITS.
+#   THE FIRST ARGUMENT IS THE CALL NAME.
+#   THE SECOND ARGUMENT IS THE SECONDS THE CALL TOOK.
+def count_call(the_name, the_seconds):
+   with call_lock:
+      if call_profile[0] != os.getpid():
+         call_profile[0] = os.getpid()
+         call_profile[1] = {}
+         atexit.register(write_calls)
+         #(WORKER PROCESSES OF A POOL EXIT W/O RUNNING atexit FUNCTIONS, BUT DO RUN multiprocessing FINALIZERS)
+         multiprocessing.util.Finalize(None, write_calls, exitpriority = 0)
+      the_counts = call_profile[1].setdefault(the_name, [0, 0.0])
+      the_counts[0] += 1
+      the_counts[1] += the_seconds
+
+#THIS FUNCTION APPENDS THE PROCESS'S CALLS TO calls_path (ONCE)
+def write_calls():
+   with call_lock:
+      if call_profile[0] != os.getpid() or calls_path == "":
+         return
+      call_profile[0] = None
+      the_file = open(calls_path, "a")
+      the_file.write(json.dumps({"pid":os.getpid(),"calls":dict([[k, [v[0], round(v[1], 6)]] for k, v in call_profile[1].items()])}, sort_keys = True) + "\n")
+      the_file.close()
+
+#THIS FUNCTION RETURNS A FUNCTION THAT CALLS ANOTHER FUNCTION, COUNTING AND SLOWING DOWN THE CALL (UNLESS IT IS
+#   NESTED IN ANOTHER COUNTED CALL).
+#   THE FIRST ARGUMENT IS THE CALL NAME.
+#   THE SECOND ARGUMENT IS THE FUNCTION.
+def profile_function(the_name, the_function):
+   def profiled_function(*the_arguments, **keyword_arguments):
+      if getattr(call_depth, "depth", 0) > 0:
+         return the_function(*the_arguments, **keyword_arguments)
+      call_depth.depth = 1
+      call_start = time.time()
+      try:
+         add_latency(the_name)
+         return the_function(*the_arguments, **keyword_arguments)
+      finally:
+         call_depth.depth = 0
+         count_call(the_name, time.time() - call_start)
+   profiled_function.__name__ = the_function.__name__
+   return profiled_function
+
+if is_profiling == True:
+   for a_name in PROFILED_FUNCTIONS:
+      globals()[a_name] = profile_function(a_name, globals()[a_name])
+   for a_class in (SearchCursor, InsertCursor, UpdateCursor, Editor):
+      a_class.__init__ = profile_function("da." + a_class.__name__, a_class.__init__)
+      for a_method in PROFILED_CURSOR_METHODS.get(a_class.__name__, []):
+         setattr(a_class, a_method, profile_function("da." + a_class.__name__ + "." + a_method, getattr(a_class, a_method)))
+   for a_class in (Raster, Point):
+      a_class.__init__ = profile_function(a_class.__name__, a_class.__init__)
@@ -0,0 +1,480 @@
+#PURPOSE
+#Measures how fast vtDataRail_SendFreight.py sends freight, w/o live geodatabases: generates
+#synthetic source and target geodatabases, runs SendFreight against them w/ a stand-in for arcpy,
+#and records (and checks for regressions in) how long each run takes.
+
+#README NOTES
+#The stand-in for arcpy (standin\arcpy.py) keeps each geodatabase in a SQLite file and only
+#implements what vtDataRail_SendFreight.py uses (see its README NOTES). SendFreight is run
+#unchanged in its own Python process w/ the stand-in in front of arcpy, so its transfer engine
+#(listing, fingerprinting, cursors, loads, logging) is what is measured; the stand-in's SQLite
+#storage is a fixed cost that is the same from one benchmark run to the next. Results are for
+#catching regressions (and comparing settings)--not for predicting how long a train takes
+#against enterprise geodatabases.
+#
+#Each scenario (see SCENARIOS in the script's constants) is a spoke source-geodatabase w/
+#synthetic data objects and an empty hub target-geodatabase. Each scenario is run w/ these
+#strategies, in this order:
+#   copy          Target doesn't have the data objects yet; they're copied in.
+#   reload        Target has the data objects; all rows are re-loaded (raster datasets re-copied).
+#   detect        Data objects are set to DETECT_CHANGES (raster_load_strategy "delta") w/ an
+#                 empty state store; source and target are both fingerprinted (no changes).
+#   detect_warm   Same as detect, but the state store has the fingerprints from detect, so only
+#                 the source is read.
+#
+#Every run's result is appended to a results file (JSON lines; see results_path in the
+#script's major variables) w/ the run's wall-clock seconds and SendFreight's own metrics (see
+#metrics_dir in vtDataRail_SendFreight.py): seconds per phase of the run and per phase of the
+#freight cars, and rows moved. A run is a regression if it took more than
+#regression_tolerance longer than the last result (in the results file, or in a baseline
+#results-file) for the same scenario, strategy, and settings. The script exits w/ status 1 if
+#any run is a regression or fails, so it can gate a build.
+#
+#CALL PROFILING: on a WAN-attached enterprise geodatabase, most of a train's time is round
+#trips to the geodatabase (listing, Describe, workspace switches, a cursor per freight car,
+#etc.), not rows. Run w/ --latency (e.g., 50 milliseconds per round trip) to have the stand-in
+#add latency to every call that would be a round trip, and/or w/ --calls to just count calls
+#(see CALL PROFILING in standin\arcpy.py's README NOTES). Each run's result then has the
+#count and seconds (including latency) of each call made by SendFreight (and its worker
+#processes), and the calls that took the most time are printed after the run. Call counts
+#don't depend on the machine, so a profiled run is also a regression if it makes more calls
+#of any kind than its baseline--a guard against new per-freight-car round trips. Profiled
+#runs are only compared w/ profiled runs w/ the same latency.
+#
+#Generating the large scenarios takes a while (and disk space: table_10m is about 1 GB per
+#geodatabase). Run the small ones (e.g., table_10k, small_tables) on every change and the large
+#ones before a release.
+
+#HOW TO USE
+#   Run in Python 2.7 (the same Python that runs vtDataRail_SendFreight.py; ArcGIS isn't needed).
+#   vtDataRail_SendFreight.py is expected in ..\vtDataRail_SendFreight\.
+#
+#   To run all scenarios and strategies:
+#      python vtDataRail_BenchmarkFreight.py
+#
+#   To run some of them:
+#      python vtDataRail_BenchmarkFreight.py --scenarios table_10k small_tables --strategies copy detect
+#
+#   To see which calls dominate a train against a geodatabase 50 milliseconds away (and
+#   check call counts against the last profiled run):
+#      python vtDataRail_BenchmarkFreight.py --scenarios small_tables fdatasets --latency 50
+#
+#   To compare against a saved baseline (e.g., results from the last release) instead of the
+#   last results in the results file:
+#      python vtDataRail_BenchmarkFreight.py --baseline release.results.jsonl
+
+#PSEUDO CODE
+#   Set major variables (via script arguments).
+#
+#   For each scenario:
+#      Create a stand-in spoke source-geodatabase w/ A_README and A_XCHANGE_PARAMETERS tables,
+#      and the scenario's tables, feature datasets/feature classes, and raster datasets
+#      Create a stand-in hub target-geodatabase w/ A_README and A_XCHANGE_LOG tables
+#      For each strategy:
+#         Set A_XCHANGE_PARAMETERS directives (DETECT_CHANGES for detect strategies, none
+#         otherwise) and clear the state store for detect
+#         Write a copy of vtDataRail_SendFreight.py w/ major variables set for the run
+#         Run it w/ the stand-in in front of arcpy (w/ latency/call counting if profiling),
+#         timing the run
+#         Read SendFreight's metrics (and calls) of the run
+#         Compare the result w/ the baseline and append it to the results file
+#      Delete the scenario's work directory (unless --keep)
+#
+#   Print a summary; exit w/ status 1 if any run failed or is a regression.
+
+#IMPORTS
+print "IMPORTING MODULES..."
+import sys, os, re, time, datetime, json, struct, shutil, argparse, platform, subprocess
+
+#********** SET MAJOR VARIABLES HERE **********
+print "SETTING MAJOR VARIABLES..."
+#
+#work_dir
+#   Directory where scenarios' geodatabases and SendFreight copies are made (each scenario in
+#   its own subdirectory, deleted after the scenario unless run w/ --keep). If "", a
+#   directory named work in the script's directory.
+work_dir = r""
+#
+#results_path
+#   Results file (JSON lines) that each run's result is appended to. If "",
+#   vtDataRail_BenchmarkFreight.results.jsonl in the script's directory.
+results_path = r""
+#
+#regression_tolerance
+#   A run is a regression if it takes more than this fraction longer than its baseline
+#   (e.g., 0.25 is 25% longer). Runs that take less than REGRESSION_MIN_SECONDS more than
+#   their baseline are never regressions (timing noise).
+regression_tolerance = 0.25
+#
+#sendfreight_settings
+#   Major variables of vtDataRail_SendFreight.py to set for every run, as a dictionary.
+#   Keys are variable names; values are Python source (e.g., '"chunked"' for a string). For
+#   example, to benchmark chunked loads w/ 2 worker processes:
+#      sendfreight_settings = {"load_strategy":'"chunked"',"parallel_workers":"2"}
+#   Results of runs w/ different settings aren't compared w/ each other.
+sendfreight_settings = {}
+#
+#latency_ms
+#   Milliseconds of latency that the stand-in adds to each call that would be a round trip to
+#   the geodatabase (see CALL PROFILING in README NOTES). If more than 0, calls are profiled.
+#   Can be set w/ --latency.
+latency_ms = 0
+#
+#call_latencies
+#   Milliseconds of latency for particular calls, as a dictionary (keys are call names as
+#   listed after a profiled run; e.g., {"GetCount_management":200}). Overrides latency_ms for
+#   those calls.
+call_latencies = {}
+#********** END OF SECTION FOR SETTING MAJOR VARIABLES **********
+
+#CONSTANTS
+print "SETTING CONSTANTS..."
+#SCENARIOS STORES THE DATA OBJECTS GENERATED IN EACH SCENARIO'S SOURCE GEODATABASE. KEYS ARE SCENARIO NAMES.
+#VALUES ARE DICTIONARIES W/ ANY OF THESE KEYS:
+#   tables         NUMBER OF STAND-ALONE TABLES
+#   fdatasets      NUMBER OF FEATURE DATASETS
+#   fclasses       NUMBER OF (POINT) FEATURE CLASSES IN EACH FEATURE DATASET
+#   rows           NUMBER OF ROWS IN EACH TABLE AND FEATURE CLASS
+#   rasters        NUMBER OF RASTER DATASETS
+#   raster_size    NUMBER OF COLUMNS (AND ROWS) OF EACH RASTER DATASET
+SCENARIOS = {"table_10k":{"tables":1,"rows":10000},
+             "table_1m":{"tables":1,"rows":1000000},
+             "table_10m":{"tables":1,"rows":10000000},
+             "small_tables":{"tables":500,"rows":20},
+             "fdatasets":{"fdatasets":2,"fclasses":5,"rows":20000},
+             "rasters":{"rasters":2,"raster_size":8192}}
+#SCENARIO_ORDER STORES THE ORDER IN WHICH SCENARIOS ARE RUN (SMALLEST FIRST)
+SCENARIO_ORDER = ["table_10k","small_tables","fdatasets","rasters","table_1m","table_10m"]
+#STRATEGIES STORES THE STRATEGIES THAT EACH SCENARIO IS RUN W/, IN ORDER (SEE README NOTES). EACH STRATEGY DEPENDS ON
+#THE ONES BEFORE IT.
+STRATEGIES = ["copy","reload","detect","detect_warm"]
+#STRATEGY_SETTINGS STORES MAJOR VARIABLES OF vtDataRail_SendFreight.py THAT ARE SET FOR A STRATEGY (SEE
+#sendfreight_settings)
+STRATEGY_SETTINGS = {"detect":{"raster_load_strategy":'"delta"'},"detect_warm":{"raster_load_strategy":'"delta"'}}
+#SOURCE_PREFIX AND TARGET_PREFIX ARE THE SCHEMA PREFIXES OF THE STAND-IN GEODATABASES (LIKE ENTERPRISE GEODATABASES)
+SOURCE_PREFIX = "SPOKE.GIS."
+TARGET_PREFIX = "HUB.GIS."
+#TABLE_FIELDS STORES [NAME, TYPE] OF EACH FIELD OF A GENERATED TABLE OR FEATURE CLASS. ID IS THE SORT FIELD.
+TABLE_FIELDS = [["ID","Integer"],["NAME","String"],["VALUE","Double"],["UPDATED","Date"]]
+#REGRESSION_MIN_SECONDS IS HOW MANY SECONDS LONGER THAN ITS BASELINE A RUN MUST TAKE TO BE A REGRESSION
+REGRESSION_MIN_SECONDS = 1.0
+#PROFILE_TOP_CALLS IS THE NUMBER OF CALLS (THOSE THAT TOOK THE MOST TIME) PRINTED AFTER A PROFILED RUN
+PROFILE_TOP_CALLS = 10
+#STANDIN_VARIABLES STORES THE ENVIRONMENT VARIABLES THAT TURN ON CALL PROFILING IN THE STAND-IN
+STANDIN_VARIABLES = ["STANDIN_LATENCY_MS","STANDIN_LATENCIES","STANDIN_CALLS_PATH"]
+#FIRST_DATE IS THE UPDATED VALUE OF THE FIRST GENERATED ROW (EACH ROW AFTER IS A MINUTE LATER)
+FIRST_DATE = datetime.datetime(2019, 1, 1)
+
+#OTHER VARIABLES
+print "SETTING OTHER VARIABLES..."
+#script_dir STORES THE SCRIPT'S DIRECTORY
+script_dir = sys.path[0]
+#standin_dir STORES THE DIRECTORY OF THE STAND-IN FOR arcpy
+standin_dir = os.path.join(script_dir, "standin")
+#sendfreight_path STORES THE PATH OF vtDataRail_SendFreight.py
+sendfreight_path = os.path.join(os.path.dirname(script_dir), "vtDataRail_SendFreight", "vtDataRail_SendFreight.py")
+if work_dir == "":
+   work_dir = os.path.join(script_dir, "work")
+if results_path == "":
+   results_path = os.path.join(script_dir, "vtDataRail_BenchmarkFreight.results.jsonl")
+#(THE STAND-IN FOR arcpy IS ONLY IMPORTED BY THIS SCRIPT TO GENERATE DATA)
+sys.path.insert(0, standin_dir)
+import arcpy
+
+#FUNCTIONS
+
+#THIS FUNCTION RETURNS THE TIME IN A PRESENTABLE TEXT FORMAT YYYYMMDD-HHMM
+def tell_the_time():
+   return time.strftime("%Y%m%d-%H%M")
+
+#THIS FUNCTION PRINTS A NOTE W/ THE TIME
+def make_note(the_note):
+   print tell_the_time() + "  " + the_note
+
+#THIS FUNCTION RETURNS THE GENERATED VALUES OF ROW NUMBER k OF A TABLE (SEE TABLE_FIELDS)
+def get_table_row(k):
+   return [k, "Name of row " + str(k), k * 0.25, FIRST_DATE + datetime.timedelta(minutes = k)]
+
+#THIS FUNCTION RETURNS THE GENERATED VALUES OF ROW NUMBER k OF A (POINT) FEATURE CLASS: TABLE VALUES AND WKB GEOMETRY
+def get_fclass_row(k):
+   return get_table_row(k) + [bytearray(struct.pack("<BIdd", 1, 1, 440000.0 + (k % 1000) * 10.0, 50000.0 + (k // 1000) * 10.0))]
+
+#THIS FUNCTION RETURNS A FUNCTION THAT RETURNS THE PIXELS (A STRING) OF A ROW OF A GENERATED RASTER-DATASET
+#   THE ARGUMENT IS THE NUMBER OF COLUMNS.
+def get_pixel_rows(the_width):
+   the_pattern = "".join([chr(i % 256) for i in range(the_width + 256)])
+   return lambda r: the_pattern[(r * 7) % 256:(r * 7) % 256 + the_width]
+
+#THIS FUNCTION CREATES A SCENARIO'S SOURCE (SPOKE) AND TARGET (HUB) GEODATABASES.
+#   THE FIRST ARGUMENT IS THE SCENARIO (SEE SCENARIOS).
+#   THE SECOND ARGUMENT IS THE PATH OF THE SOURCE GEODATABASE.
+#   THE THIRD ARGUMENT IS THE PATH OF THE TARGET GEODATABASE.
+#   RETURNS A LIST OF A_XCHANGE_PARAMETERS ROWS THAT SET ALL OF THE SOURCE'S DATA OBJECTS TO DETECT_CHANGES.
+def create_geodatabases(the_scenario, source_gdb, target_gdb):
+   readme_fields = [["PROTOCOL","String"],["DB_TYPE","String"],["CONSTRAINTS","String"],["NOTE","String"]]
+   arcpy.create_geodatabase(source_gdb, SOURCE_PREFIX)
+   arcpy.create_data_object(source_gdb, "A_README", "Table", readme_fields, the_rows = [["EGC Geospatial Data Exchange Protocol", "SPOKE", "", "Benchmark source"]])
+   arcpy.create_data_object(source_gdb, "A_XCHANGE_PARAMETERS", "Table", [["OBJECT_NAME","String"],["IS_FDATASET","SmallInteger"],["DIRECTIVE","String"],["SORT_FIELD","String"],["NOTE","String"]])
+   arcpy.create_geodatabase(target_gdb, TARGET_PREFIX)
+   arcpy.create_data_object(target_gdb, "A_README", "Table", readme_fields, the_rows = [["EGC Geospatial Data Exchange Protocol", "HUB", "", "Benchmark target"]])
+   arcpy.create_data_object(target_gdb, "A_XCHANGE_LOG", "Table", [["DATE","String"],["NOTE","String"]])
+   the_directives = []
+   the_rows = the_scenario.get("rows", 0)
+   for k in range(the_scenario.get("tables", 0)):
+      the_name = "BENCH_TABLE_" + str(k + 1)
+      arcpy.create_data_object(source_gdb, the_name, "Table", TABLE_FIELDS, the_rows = (get_table_row(j) for j in xrange(the_rows)))
+      the_directives.append([SOURCE_PREFIX + the_name, 0, "DETECT_CHANGES", "ID", ""])
+   for k in range(the_scenario.get("fdatasets", 0)):
+      fds_name = "BENCH_FDS_" + str(k + 1)
+      for j in range(the_scenario.get("fclasses", 0)):
+         arcpy.create_data_object(source_gdb, fds_name + "_FC_" + str(j + 1), "FeatureClass", TABLE_FIELDS, fds_name, "Point", (get_fclass_row(n) for n in xrange(the_rows)))
+      the_directives.append([SOURCE_PREFIX + fds_name, 1, "DETECT_CHANGES", "ID", ""])
+   for k in range(the_scenario.get("rasters", 0)):
+      the_name = "BENCH_RASTER_" + str(k + 1)
+      arcpy.create_raster_dataset(source_gdb, the_name, the_scenario["raster_size"], the_scenario["raster_size"], get_pixel_rows(the_scenario["raster_size"]))
+      the_directives.append([SOURCE_PREFIX + the_name, 0, "DETECT_CHANGES", "", ""])
+   return the_directives
+
+#THIS FUNCTION REPLACES THE ROWS OF THE SOURCE GEODATABASE'S A_XCHANGE_PARAMETERS TABLE.
+#   THE FIRST ARGUMENT IS THE PATH OF THE SOURCE GEODATABASE.
+#   THE SECOND ARGUMENT IS A LIST OF ROWS (OBJECT_NAME, IS_FDATASET, DIRECTIVE, SORT_FIELD, NOTE).
+def set_directives(source_gdb, the_directives):
+   params_table = source_gdb + "\\" + SOURCE_PREFIX + "A_XCHANGE_PARAMETERS"
+   arcpy.DeleteRows_management(params_table)
+   the_cursor = arcpy.da.InsertCursor(params_table, ["OBJECT_NAME","IS_FDATASET","DIRECTIVE","SORT_FIELD","NOTE"])
+   for a_row in the_directives:
+      the_cursor.insertRow(a_row)
+   del the_cursor
+
+#THIS FUNCTION WRITES A COPY OF vtDataRail_SendFreight.py W/ MAJOR VARIABLES SET, AND RETURNS ITS PATH.
+#   THE FIRST ARGUMENT IS THE DIRECTORY TO WRITE IT IN.
+#   THE SECOND ARGUMENT IS A DICTIONARY OF MAJOR VARIABLES (SEE sendfreight_settings).
+def write_sendfreight(the_dir, the_settings):
+   the_file = open(sendfreight_path, "rb")
+   the_source = the_file.read()
+   the_file.close()
+   for the_name, the_value in sorted(the_settings.items()):
+      the_source, the_count = re.subn(r"(?m)^" + re.escape(the_name) + r" = .*?(\r?)$", lambda m: the_name + " = " + the_value + m.group(1), the_source, 1)
+      if the_count != 1:
+         raise ValueError("vtDataRail_SendFreight.py doesn't have a major variable named " + the_name)
+   if not os.path.exists(the_dir):
+      os.makedirs(the_dir)
+   the_path = os.path.join(the_dir, "vtDataRail_SendFreight.py")
+   the_file = open(the_path, "wb")
+   the_file.write(the_source)
+   the_file.close()
+   return the_path
+
+#THIS FUNCTION RETURNS THE PATH OF A FILE THAT vtDataRail_SendFreight.py WRITES INTO ITS DIRECTORY (IT JOINS PATHS W/
+#   "\", SO THE SAME STRING IS USED HERE).
+#   THE FIRST ARGUMENT IS THE DIRECTORY OF THE COPY OF vtDataRail_SendFreight.py.
+#   THE SECOND ARGUMENT IS THE FILE NAME.
+def get_sendfreight_file(the_dir, the_name):
+   return the_dir + "\\" + the_name
+
+#THIS FUNCTION RUNS A COPY OF vtDataRail_SendFreight.py W/ THE STAND-IN FOR arcpy, AND RETURNS ITS RESULT: A DICTIONARY
+#   W/ THESE KEYS:
+#      seconds        WALL-CLOCK SECONDS OF THE RUN (INCLUDING PYTHON START-UP)
+#      completed      True IF SENDFREIGHT WROTE METRICS OF A COMPLETED RUN
+#      run_seconds    SECONDS OF THE RUN PER SENDFREIGHT'S METRICS
+#      phases         SECONDS OF EACH PHASE OF THE RUN PER SENDFREIGHT'S METRICS
+#      car_phases     SECONDS OF EACH PHASE OF FREIGHT CARS (SUMMED OVER FREIGHT CARS)
+#      cars           NUMBER OF FREIGHT CARS SENT
+#      rows           ROWS MOVED (SUMMED OVER FREIGHT CARS)
+#      bytes          APPROXIMATE BYTES MOVED (SUMMED OVER FREIGHT CARS)
+#      calls          IF PROFILED, COUNT AND SECONDS OF EACH CALL TO THE STAND-IN (SUMMED OVER PROCESSES), AS A DICTIONARY
+#                     OF [COUNT, SECONDS]; OTHERWISE None
+#   THE FIRST ARGUMENT IS THE PATH OF THE COPY OF vtDataRail_SendFreight.py.
+#   THE SECOND ARGUMENT IS THE PATH OF A FILE TO WRITE SENDFREIGHT'S OUTPUT INTO.
+#   THE THIRD ARGUMENT IS THE PROFILE (A DICTIONARY W/ KEYS "latency_ms" AND "latencies"), OR None TO NOT PROFILE CALLS.
+def run_sendfreight(the_path, output_path, the_profile = None):
+   the_dir = os.path.dirname(the_path)
+   metrics_path = get_sendfreight_file(the_dir, "vtDataRail_SendFreight.metrics.json")
+   if os.path.exists(metrics_path):
+      os.remove(metrics_path)
+   calls_path = os.path.join(the_dir, "standin_calls.jsonl")
+   if os.path.exists(calls_path):
+      os.remove(calls_path)
+   the_environment = dict([[k, v] for k, v in os.environ.items() if k not in STANDIN_VARIABLES])
+   the_environment["PYTHONPATH"] = os.pathsep.join([standin_dir] + [i for i in [os.environ.get("PYTHONPATH", "")] if i != ""])
+   if the_profile != None:
+      the_environment["STANDIN_LATENCY_MS"] = str(the_profile["latency_ms"])
+      the_environment["STANDIN_LATENCIES"] = json.dumps(the_profile["latencies"])
+      the_environment["STANDIN_CALLS_PATH"] = calls_path
+   the_output = open(output_path, "w")
+   run_start = time.time()
+   try:
+      subprocess.call([sys.executable, the_path], stdout = the_output, stderr = subprocess.STDOUT, env = the_environment, cwd = the_dir)
+   finally:
+      the_output.close()
+   the_result = {"seconds":round(time.time() - run_start, 3),"completed":False,"run_seconds":None,"phases":{},"car_phases":{},"cars":0,"rows":0,"bytes":0,"calls":None}
+   if the_profile != None:
+      the_result["calls"] = read_calls(calls_path)
+   if os.path.exists(metrics_path):
+      the_file = open(metrics_path)
+      the_metrics = json.load(the_file)
+      the_file.close()
+      the_result["completed"] = the_metrics["completed"]
+      the_result["run_seconds"] = the_metrics["seconds"]
+      the_result["phases"] = the_metrics["phases"]
+      the_result["cars"] = len(the_metrics["cars"])
+      for a_car in the_metrics["cars"]:
+         for the_phase, the_seconds in a_car["phases"].items():
+            the_result["car_phases"][the_phase] = round(the_result["car_phases"].get(the_phase, 0) + the_seconds, 3)
+         if a_car["rows"] != None:
+            the_result["rows"] += a_car["rows"]
+         if a_car["bytes"] != None:
+            the_result["bytes"] += a_car["bytes"]
+   return the_result
+
+#THIS FUNCTION READS A FILE OF CALLS WRITTEN BY THE STAND-IN'S PROCESSES (SEE STANDIN_CALLS_PATH IN
+#   standin\arcpy.py) AND RETURNS THE COUNT AND SECONDS OF EACH CALL, SUMMED OVER PROCESSES.
+#   THE ARGUMENT IS THE PATH OF THE FILE.
+def read_calls(the_path):
+   the_calls = {}
+   if not os.path.exists(the_path):
+      return the_calls
+   the_file = open(the_path)
+   for a_line in the_file:
+      if a_line.strip() != "":
+         for the_name, the_counts in json.loads(a_line)["calls"].items():
+            the_sums = the_calls.setdefault(the_name, [0, 0.0])
+            the_sums[0] += the_counts[0]
+            the_sums[1] = round(the_sums[1] + the_counts[1], 6)
+   the_file.close()
+   return the_calls
+
+#THIS FUNCTION PRINTS THE CALLS OF A PROFILED RUN THAT TOOK THE MOST TIME (SEE PROFILE_TOP_CALLS)
+#   THE ARGUMENT IS THE RUN'S CALLS (SEE run_sendfreight()).
+def print_calls(the_calls):
+   print "   %-40s %10s %12s %12s" % ("CALL", "COUNT", "SECONDS", "MS/CALL")
+   for the_name, the_counts in sorted(the_calls.items(), key = lambda i: -i[1][1])[0:PROFILE_TOP_CALLS]:
+      print "   %-40s %10d %12.3f %12.3f" % (the_name, the_counts[0], the_counts[1], 1000.0 * the_counts[1] / the_counts[0])
+   print "   %-40s %10d %12.3f" % ("(ALL CALLS)", sum([i[0] for i in the_calls.values()]), sum([i[1] for i in the_calls.values()]))
+
+#THIS FUNCTION READS A RESULTS FILE (JSON LINES) AND RETURNS THE LAST RESULT FOR EACH [SCENARIO, STRATEGY, SETTINGS] KEY
+#   (SEE get_result_key()).
+#   THE ARGUMENT IS THE PATH OF THE RESULTS FILE.
+def read_baselines(the_path):
+   the_baselines = {}
+   if not os.path.exists(the_path):
+      return the_baselines
+   the_file = open(the_path)
+   for a_line in the_file:
+      if a_line.strip() != "":
+         the_result = json.loads(a_line)
+         if the_result.get("completed") == True:
+            the_baselines[get_result_key(the_result)] = the_result
+   the_file.close()
+   return the_baselines
+
+#THIS FUNCTION RETURNS THE KEY THAT A RESULT IS COMPARED UNDER: ITS SCENARIO, SCENARIO DEFINITION, STRATEGY,
+#   SENDFREIGHT SETTINGS, AND PROFILE (AS A JSON STRING).
+def get_result_key(the_result):
+   return json.dumps([the_result["scenario"], the_result["definition"], the_result["strategy"], the_result["settings"], the_result.get("profile")], sort_keys = True)
+
+#THIS FUNCTION RETURNS A DESCRIPTION OF HOW A RESULT COMPARES W/ ITS BASELINE, AND True IF IT IS A REGRESSION (SEE
+#   regression_tolerance; A PROFILED RUN IS ALSO A REGRESSION IF IT MADE MORE CALLS OF ANY KIND THAN ITS BASELINE).
+#   THE FIRST ARGUMENT IS THE RESULT.
+#   THE SECOND ARGUMENT IS THE BASELINE RESULT, OR None.
+def compare_result(the_result, the_baseline):
+   if the_baseline == None:
+      return ["no baseline", False]
+   the_change = the_result["seconds"] - the_baseline["seconds"]
+   the_description = "%+.1f%% vs. %s (%.3f s)" % (100.0 * the_change / max(the_baseline["seconds"], 0.001), the_baseline["timestamp"], the_baseline["seconds"])
+   more_calls = []
+   if the_result.get("calls") != None and the_baseline.get("calls") != None:
+      for the_name in sorted(the_result["calls"]):
+         baseline_count = the_baseline["calls"].get(the_name, [0])[0]
+         if the_result["calls"][the_name][0] > baseline_count:
+            more_calls.append(the_name + " " + str(baseline_count) + " -> " + str(the_result["calls"][the_name][0]))
+   if len(more_calls) > 0:
+      the_description += "; more calls: " + ", ".join(more_calls)
+   if (the_change > REGRESSION_MIN_SECONDS and the_result["seconds"] > the_baseline["seconds"] * (1 + regression_tolerance)) or len(more_calls) > 0:
+      return ["REGRESSION: " + the_description, True]
+   return [the_description, False]
+
+#THIS FUNCTION READS THE SCRIPT'S COMMAND-LINE ARGUMENTS
+def get_arguments():
+   the_parser = argparse.ArgumentParser(description = "Benchmarks vtDataRail_SendFreight.py against synthetic stand-in geodatabases (see README NOTES in the script).")
+   the_parser.add_argument("--scenarios", nargs = "+", choices = SCENARIO_ORDER, default = SCENARIO_ORDER, help = "Scenarios to run (default: all).")
+   the_parser.add_argument("--strategies", nargs = "+", choices = STRATEGIES, default = STRATEGIES, help = "Strategies to time (default: all). Strategies that a strategy depends on are run anyway, w/o being recorded.")
+   the_parser.add_argument("--baseline", help = "Results file to compare against (default: the results file that results are appended to).")
+   the_parser.add_argument("--keep", action = "store_true", help = "Don't delete scenarios' work directories.")
+   the_parser.add_argument("--latency", type = float, default = latency_ms, help = "Milliseconds of latency to add to each round-trip call to the stand-in; profiles calls (default: latency_ms).")
+   the_parser.add_argument("--calls", action = "store_true", help = "Profile (count) calls to the stand-in, even w/o latency.")
+   return the_parser.parse_args()
+
+#MAIN
+if __name__ == "__main__":
+   the_arguments = get_arguments()
+   if not os.path.exists(sendfreight_path):
+      make_note("Can't find vtDataRail_SendFreight.py at " + sendfreight_path + ".")
+      sys.exit(2)
+   if the_arguments.baseline != None:
+      the_baselines = read_baselines(the_arguments.baseline)
+   else:
+      the_baselines = read_baselines(results_path)
+   the_profile = None
+   if the_arguments.latency > 0 or len(call_latencies) > 0 or the_arguments.calls == True:
+      the_profile = {"latency_ms":the_arguments.latency,"latencies":call_latencies}
+   the_summary = []
+   problem_count = 0
+   for scenario_name in [i for i in SCENARIO_ORDER if i in the_arguments.scenarios]:
+      the_scenario = SCENARIOS[scenario_name]
+      scenario_dir = os.path.join(work_dir, scenario_name)
+      if os.path.exists(scenario_dir):
+         shutil.rmtree(scenario_dir)
+      os.makedirs(scenario_dir)
+      source_gdb = os.path.join(scenario_dir, "source.sde")
+      target_gdb = os.path.join(scenario_dir, "target.sde")
+      make_note("Generating scenario " + scenario_name + " " + json.dumps(the_scenario, sort_keys = True) + "...")
+      generate_start = time.time()
+      the_directives = create_geodatabases(the_scenario, source_gdb, target_gdb)
+      make_note("Generated in " + str(round(time.time() - generate_start, 1)) + " seconds.")
+      #EACH STRATEGY IS RUN BY THE SAME COPY OF SENDFREIGHT (ITS STATE STORE AND CATALOG CACHE CARRY OVER), UP TO THE LAST
+      #STRATEGY THAT IS RECORDED
+      last_strategy = max([STRATEGIES.index(i) for i in the_arguments.strategies])
+      run_dir = os.path.join(scenario_dir, "run")
+      for strategy_name in STRATEGIES[0:last_strategy + 1]:
+         the_settings = {"source_gdb":'r"' + source_gdb + '"',"target_gdb":'r"' + target_gdb + '"',"metrics_dir":'r"' + run_dir + '"'}
+         the_settings.update(STRATEGY_SETTINGS.get(strategy_name, {}))
+         the_settings.update(sendfreight_settings)
+         if strategy_name in ("detect", "detect_warm"):
+            set_directives(source_gdb, the_directives)
+         else:
+            set_directives(source_gdb, [])
+         if strategy_name == "detect":
+            state_store_path = get_sendfreight_file(run_dir, "vtDataRail_SendFreight.state.sqlite")
+            if os.path.exists(state_store_path):
+               os.remove(state_store_path)
+         make_note("Running " + scenario_name + " / " + strategy_name + "...")
+         the_result = run_sendfreight(write_sendfreight(run_dir, the_settings), os.path.join(scenario_dir, strategy_name + ".out"), the_profile)
+         if strategy_name not in the_arguments.strategies:
+            continue
+         the_result.update({"timestamp":datetime.datetime.now().isoformat(),"host":platform.node(),"python":platform.python_version(),"scenario":scenario_name,"definition":the_scenario,"strategy":strategy_name,"profile":the_profile,"settings":dict([[k, v] for k, v in the_settings.items() if k not in ("source_gdb", "target_gdb", "metrics_dir")])})
+         if the_result["completed"] == True:
+            the_comparison, is_regression = compare_result(the_result, the_baselines.get(get_result_key(the_result)))
+         else:
+            the_comparison, is_regression = ["FAILED (see " + os.path.join(scenario_dir, strategy_name + ".out") + ")", True]
+            the_arguments.keep = True
+         if is_regression == True:
+            problem_count += 1
+         make_note(scenario_name + " / " + strategy_name + ": " + str(the_result["seconds"]) + " seconds, " + str(the_result["cars"]) + " freight car(s), " + str(the_result["rows"]) + " rows moved. " + the_comparison)
+         if the_result["calls"] != None:
+            print_calls(the_result["calls"])
+         the_summary.append([scenario_name, strategy_name, the_result, the_comparison])
+         the_file = open(results_path, "a")
+         the_file.write(json.dumps(the_result, sort_keys = True) + "\n")
+         the_file.close()
+      if the_arguments.keep != True:
+         shutil.rmtree(scenario_dir)
+
+   #PRINT SUMMARY
+   print "***** BENCHMARK RESULTS (" + results_path + ") *****"
+   print "%-14s %-12s %10s %10s %12s  %s" % ("SCENARIO", "STRATEGY", "SECONDS", "CARS", "ROWS", "COMPARED W/ BASELINE")
+   for a_line in the_summary:
+      print "%-14s %-12s %10.3f %10d %12d  %s" % (a_line[0], a_line[1], a_line[2]["seconds"], a_line[2]["cars"], a_line[2]["rows"], a_line[3])
+   if problem_count > 0:
+      make_note(str(problem_count) + " run(s) failed or regressed.")
+      sys.exit(1)
@@ -43,12 +43,58 @@
 #are populated with Null values, AND fields of the source geodatabase that aren't reflected
 #in the target geodatabase don't carry their values to the target.
 #
+#When load_strategy is "delta" (see the script's major variables), a feature class or table
+#that already exists in the target geodatabase and has a SORT_FIELD in A_XCHANGE_PARAMETERS
+#only gets the rows that are new, different, or gone (matched by SORT_FIELD value) inserted,
+#updated, or deleted. Updated target-rows keep their values in fields that aren't reflected in
+#the source geodatabase. The number of rows inserted, updated, and deleted is noted in the log
+#and in A_XCHANGE_LOG.
+#
+#When load_strategy is "chunked", rows are copied in chunks (in OBJECTID order) and each
+#chunk is committed on its own; the rows/second of each chunk is noted in the log. If the
+#script stops in the middle of a load (e.g., lost connection), the next run picks up after
+#the last committed chunk, as long as the source data-object still has the same row count
+#and last OBJECTID. Otherwise (or if the script's state store is deleted), the load starts
+#over. Chunked loads keep rows in the target geodatabase that were committed before the
+#script stopped, so the target data-object is incomplete until the load is finished. Each
+#chunk is loaded in its own edit session, so a chunk that fails leaves none of its rows
+#behind; if the target data-object doesn't have just the rows recorded as loaded, the load
+#starts over.
+#
+#When load_strategy is "swap", source rows are loaded into a staging copy of the target
+#data-object (named w/ STAGE_NEW_SUFFIX, created w/ the target data-object as a template, and
+#w/ its attribute indexes) while the target data-object stays in use. The staging copy's row
+#count and fingerprint are checked against the source data-object, and then it is swapped in
+#the same way as a staged raster-dataset (see stage_raster_reloads). Privileges aren't carried
+#over from the old data object (see swap_viewers), and neither are metadata, relationship
+#classes, or versioning.
+#
 #When a raster dataset is pushed/pulled and it already exists in the target geodatabase, an
 #exclusive lock is required for the target-geodatabase connection because the script
 #deletes the target raster-dataset and then replaces it by copying from source geodatabase.
 #An "exclusive lock" means that no other users can be connected to the data object.
 #Consult with a DBA for more info.
 #
+#When stage_raster_reloads is True (see the script's major variables), a raster dataset that
+#is re-loaded is copied into the target geodatabase under a staging name (w/ STAGE_NEW_SUFFIX)
+#while the target raster-dataset stays in use. Then the target raster-dataset is renamed (w/
+#STAGE_OLD_SUFFIX), the staged copy is renamed to the target raster-dataset's name, and the
+#old raster-dataset is deleted. Renames are tried several times (see SWAP_ATTEMPTS). If the
+#target raster-dataset can't be renamed (e.g., it's locked), the staged copy is deleted and
+#the target raster-dataset is left as it was. Staged copies and old raster-datasets that are
+#left behind (e.g., script stopped during a swap) are cleaned up on the next run.
+#
+#When raster_load_strategy is "delta" (see the script's major variables), a raster dataset
+#that already exists in the target geodatabase isn't deleted. Instead, source and target are
+#compared block by block (blocks of RASTER_BLOCK_SIZE x RASTER_BLOCK_SIZE pixels), and only
+#blocks that differ are mosaicked into the target raster-dataset. The block digests of what
+#was delivered are kept in the state store, so an unchanged source raster-dataset doesn't
+#need its target read (or isn't read at all if its A_XCHANGE_DIGEST entry matches). If the
+#raster datasets don't line up (size, band count, pixel type, NoData value, extent, cell
+#size, or spatial reference differ), the target raster-dataset is re-loaded. Mosaicking
+#doesn't write NoData over a pixel that has a value, so if a pixel of the target has a value
+#that's NoData in the source, the target raster-dataset is re-loaded too.
+#
 #Source-geodatabase multi-versioned data-objects that don't already exist in the target
 #geodatabase are pushed/pulled as non-versioned data-objects in the target. AVOID
 #PUSHING/PULLING DATA TO MULTI-VERSIONED TARGET-GEODATABASE DATA-OBJECTS; DOING SO MIGHT
@@ -59,9 +105,173 @@
 #as opposed to loaded by row). Make sure that metadata is kept current in both the source
 #data-object and its target counterpart.
 #
+#Freight cars can be sent by several worker processes at the same time (see parallel_workers
+#and max_cars_per_target in the script's major variables). Feature datasets that need to be
+#created in the target geodatabase are always created before any freight car leaves. Notes and
+#A_XCHANGE_LOG entries are written by the main process as each freight car arrives, so the log
+#file and A_XCHANGE_LOG table get the same entries as when freight cars are sent one at a time
+#(although not necessarily in the same order).
+#
+#A_XCHANGE_LOG entries are buffered and inserted in batches (one insert cursor per batch): every
+#hub_log_batch_cars freight cars (see the script's major variables), at the end of the train,
+#and when the train stops w/ an error condition. A freight car is only recorded as logged in
+#the run journal once its entry has been inserted.
+#
+#A hub's A_XCHANGE_LOG table can be kept from growing w/o end (see hub_log_months in the
+#script's major variables). At the end of a run, entries older than the retention period are
+#rolled into a compact summary table named A_XCHANGE_LOG_SUMMARY (created in the hub
+#geodatabase if needed): one row per data object per month w/ the number of deliveries and the
+#date and note of the last one. The rolled-up entries are then deleted from A_XCHANGE_LOG.
+#A_XCHANGE_LOG gets an index on its DATE field, and A_XCHANGE_LOG_SUMMARY one on its
+#OBJECT_NAME and MONTH fields. A_XCHANGE_LOG's schema isn't changed; the data object that an
+#entry is about is taken from the entry's note.
+#
+#Before the train leaves, the date each data object was last delivered to a hub is looked up
+#(from A_XCHANGE_LOG and A_XCHANGE_LOG_SUMMARY) and shown in the train plan. If a data object
+#was delivered on a later day than the state store's fingerprint of it was recorded (e.g., by
+#another script or from another source geodatabase), that fingerprint isn't trusted and the
+#target data-object is read (see state_store_days in the script's major variables). The date
+#on the A_XCHANGE_LOG entries that the script writes is kept in the state store too, so its
+#own entries (e.g., written after midnight, when buffered entries are flushed) don't count as
+#later deliveries. Only
+#entries dated on or after the day of the oldest state-store record (fingerprint or watermark)
+#of the train's data objects are read, by A_XCHANGE_LOG's DATE index (see hub_date_literal);
+#if the state store has no records of them, nothing is looked up.
+#
+#When a data object is set to DETECT_CHANGES, the source and target data-objects are compared
+#by reading their rows once (in sort-field order) and making a fingerprint of each: a digest
+#of all rows plus a digest of each chunk of rows. Only data (attribute values of fields that
+#both data-objects have, and geometry) is compared--not schema. When changes are detected,
+#the sort-field ranges of chunks that differ are noted in the log.
+#
+#The fingerprint of each DETECT_CHANGES data-object as delivered to the target geodatabase is
+#kept in a state store (vtDataRail_SendFreight.state.sqlite) in the script's directory. On the
+#next run, if the source data-object's fingerprint matches the stored one, the target
+#data-object isn't read (see state_store_days in the script's major variables). The state store
+#can be deleted at any time; DETECT_CHANGES data-objects are then compared to the target again.
+#
+#When a data object is set to INCREMENTAL (a feature class or table w/ editor tracking), only
+#source rows edited since the last delivery are read: rows whose watermark field (see
+#watermark_field in the script's major variables, or "INCREMENTAL:<FIELD>" as the directive)
+#is at or after the watermark (highest watermark-field value delivered, kept in the state
+#store). They are upserted into the target data-object by SORT_FIELD (the key field; values
+#must be unique and not null): updated if the key is already there, otherwise inserted.
+#Rows deleted from the source aren't noticed by the watermark, so every reconcile_days the
+#keys of both data-objects are read (key field only) and compared: target rows whose key
+#isn't in the source are deleted, and source rows whose key isn't in the target are
+#inserted. The first time (or if the state store is deleted, or if the hub's A_XCHANGE_LOG
+#shows the data object was delivered by something else since), all rows are loaded per
+#load_strategy and the watermark is started. Source rows w/ a Null watermark-value (e.g.,
+#rows that haven't been edited since editor tracking was turned on) are only loaded then, or
+#by key reconciliation if their key is missing in the target. Between key reconciliations,
+#the target data-object can have more rows than the source (a "row counts don't match" note).
+#
+#If the source data-object of an INCREMENTAL data-object is archived (geodatabase archiving,
+#w/ an archive class named like the data object plus ARCHIVE_CLASS_SUFFIX; e.g.,
+#SPOKE.GIS.PARCELS_H), and use_archive_tables is True, the increment is read from the archive
+#class instead (the watermark field isn't used): row versions that started (GDB_FROM_DATE) or
+#ended (GDB_TO_DATE) at or after the watermark (the latest of those dates delivered). Current
+#versions are upserted into the target by SORT_FIELD, and keys whose versions all ended (rows
+#deleted, or whose key was changed) are deleted from the target, so keys don't need to be
+#reconciled. Neither data-object is read in full (except the first time). If archiving is
+#turned on or off, all rows are loaded the next time and a new watermark is started.
+#
+#When all rows of a feature class or table are streamed from the source to the target (load
+#strategy "reload", and the staging copy of load strategy "swap"), the source can be read in a
+#background thread while the target is written, so that waiting on one geodatabase overlaps
+#waiting on the other (roughly twice as fast between servers that are far apart, w/ the
+#stand-in for arcpy; it hasn't been proven w/ arcpy yet). Set pipeline_queue_mb to more than
+#0 to turn it on: rows are handed over in batches through a queue that holds about
+#pipeline_queue_mb of rows; when it's full, reading waits for writing to catch up. By
+#default (0), rows are read and written on one thread (and a staging copy is filled w/
+#Append).
+#
+#A very large feature class or table can be re-loaded by several workers at once. If a data
+#object that already exists in the target geodatabase has at least partition_rows rows, its
+#rows are split into partition_workers OBJECTID ranges w/ about the same number of rows each,
+#and each range is read and written by its own worker process w/ its own cursors (and its own
+#connections to both geodatabases; arcpy shares one connection per process, and its cursors
+#aren't safe to use from several threads). Each worker process can take up to
+#pipeline_queue_mb of memory for its read-ahead queue. Both can be set per data object w/
+#optional PARTITION_ROWS and PARTITION_WORKERS fields (integers) in A_XCHANGE_PARAMETERS; a
+#null value uses the major variable. Each partition's throughput is noted. The source is
+#counted when it's split; after all partitions are loaded, the target is counted, and if its
+#row count doesn't match the source's, the freight car isn't "verified". (A partitioned
+#staging copy, w/ load strategy "swap", must match that count too, and is still fingerprinted
+#before it's swapped in.) Rows are only partitioned into an enterprise target-geodatabase: a
+#file geodatabase allows only one writer per table. Versioned targets aren't partitioned,
+#since the partitions can't share an edit session; freight cars sent by worker processes
+#(see parallel_workers) aren't partitioned, since a worker process can't start its own; and
+#new data-objects are copied whole.
+#
+#A source geodatabase can optionally publish a fingerprint digest of each of its feature
+#classes, tables, and raster datasets in a non-spatial table named A_XCHANGE_DIGEST. When the script is run w/
+#--write-digest, it doesn't send freight; it creates (if needed) and updates the source
+#geodatabase's A_XCHANGE_DIGEST table instead. Run it that way after edits (e.g., as a
+#scheduled task on the spoke). When a hub pulls from a source geodatabase that has an
+#A_XCHANGE_DIGEST table (see use_digest_table in the script's major variables), a
+#DETECT_CHANGES data-object (or, if raster_load_strategy is "delta", raster dataset) whose
+#A_XCHANGE_DIGEST entry matches what was last delivered isn't read at all.
+#
+#Each run is recorded in a run journal (in the state store) w/ the state of each freight car:
+#planned, started, loaded (data object copied/loaded), verified (source and target row counts
+#match), and logged (A_XCHANGE_LOG entry written, if target is a hub). If the script stops in
+#the middle of a run (e.g., a network outage), run it again w/ --resume: freight cars that were
+#logged in the interrupted run are skipped, and freight cars that were started but not logged
+#are verified again (source and target are compared, w/o trusting the state store); only
+#freight cars that don't match are sent again. Freight cars that weren't started are sent as
+#usual.
+#
+#Freight can also be sent by worker processes on several hosts. Run the script w/ --publish
+#(once per source/target pair, e.g., from each pair's copy of the script): it plans the train
+#and starts the run as usual, but instead of sending the freight cars, it publishes them into a
+#freight queue in the state store, along w/ the pair's settings that sending depends on (see
+#QUEUE_SETTINGS in the script). Then run the script w/ --work on any number of hosts (and any
+#number of times on each host): each worker claims the next queued freight car (of any pair,
+#up to max_cars_per_target at a time per target container), sends it, logs it in the hub's
+#A_XCHANGE_LOG table and the run journal, and reports the result in the queue. A worker
+#claims a freight car under a lease of lease_minutes, which it renews while the freight car is
+#being sent; if the worker dies, its lease runs out and the freight car is claimed again by
+#another worker (which verifies it again first, as w/ --resume). A freight car whose lease
+#ran out QUEUE_ATTEMPTS times, or that encountered an error condition, is marked failed (and
+#its run stays unfinished, so it can be published again w/ --resume). The worker that
+#finishes a run's last freight car records the run as completed. A worker stops when the
+#queue has been empty for worker_idle_minutes. For this, set state_store_dir to a shared
+#folder that every host can reach (on a file share that supports file locking), and keep the
+#geodatabase connection files at the same paths on every host. Each worker writes its own log
+#file and metrics files, named for its host and process ID (e.g.,
+#vtDataRail_SendFreight.worker-HOST-1234.log), so that workers don't write (or rotate) each
+#other's; a worker deletes other workers' files that haven't been written for WORKER_FILE_DAYS
+#days.
+#
+#Before the train leaves, the script plans it: each freight car's cost (seconds) is estimated
+#from the source data-object's row count (or a raster dataset's size), whether it already
+#exists in the target geodatabase, and whether it is set to DETECT_CHANGES. A data object that
+#was sent before is estimated from how long it took last time (kept in the state store), w/o
+#reading it again. When sending w/ several worker processes, freight cars are started longest
+#first, and the train's total time is estimated for that schedule (see window_minutes in the
+#script's major variables). Source data-objects w/o a previous timing are only counted when
+#the estimate is used (w/ --dry-run, several worker processes, or window_minutes). Run the script w/ --dry-run to only write the plan (JSON) to a file
+#(vtDataRail_SendFreight.plan.json) in the script's directory, w/o sending freight or creating
+#feature datasets in the target geodatabase.
+#
+#The script keeps a cache of each geodatabase's catalog of data objects in a file
+#(vtDataRail_SendFreight.catalog.json) in the script's directory, so that data objects don't
+#have to be listed from scratch every run (see catalog_cache_hours in the script's major
+#variables). The cache file can be deleted at any time; it is re-created on the next run.
+#
+#At the end of a run, the script writes metrics of the run into metrics_dir (see the script's
+#major variables): how long each phase of the run (including A_XCHANGE_LOG writes) took and,
+#for each freight car, how long each phase (compare, copy, delete, append, count, etc.) took
+#and how many rows and bytes were moved. They're written as a Prometheus textfile (vtDataRail_SendFreight.prom, for the
+#node_exporter textfile collector) and as a JSON summary (vtDataRail_SendFreight.metrics.json).
+#
 #This script logs its activity to a log file (vtDataRail_SendFreight.log) which is written into the
-#script's directory at execution time. Periodically truncate or delete the log file to
-#preserve disk space.
+#script's directory at execution time. Notes are written by a background thread, about once a
+#second. The log file is rotated (compressed into vtDataRail_SendFreight.YYYYMMDD-HHMMSS.log.gz
+#files, of which the newest few are kept) when it gets too big or too old; see log_max_mb,
+#log_rotate_days, and log_keep in the script's major variables. Set log_format to "json" for a
+#JSON-lines log instead of a plain-text one.
 #
 #Run this script directly in Python--not in ArcGIS Desktop (ArcToolbox). In ArcToolbox (for
 #an unknown reason), the script sometimes has a problem with getting a correct result from
@@ -71,6 +281,25 @@
 #   Run in Python (not in ArcGIS Desktop); set major variables in script's section that is
 #   commented w/:
 #      #********** SET MAJOR VARIABLES HERE **********.
+#
+#   To update the source geodatabase's A_XCHANGE_DIGEST table instead of sending freight, run
+#   w/ --write-digest, optionally followed by names (w/ schema prefix) of data objects to
+#   update (all feature classes, tables, and raster datasets if no names are given). For
+#   example:
+#      python vtDataRail_SendFreight.py --write-digest GISADMIN.ROADS GISADMIN.PARCELS
+#
+#   To see the train plan (JSON) w/o sending freight, run w/ --dry-run:
+#      python vtDataRail_SendFreight.py --dry-run
+#
+#   To pick up where an interrupted run left off (see the run journal in README NOTES), run
+#   w/ --resume:
+#      python vtDataRail_SendFreight.py --resume
+#
+#   To send freight w/ worker processes on several hosts (see README NOTES), publish each
+#   source/target pair's freight cars into the freight queue w/ --publish (optionally w/
+#   --resume), and run workers w/ --work:
+#      python vtDataRail_SendFreight.py --publish
+#      python vtDataRail_SendFreight.py --work
 
 #HISTORY
 #   DATE         ORGANIZATION     PROGRAMMER          NOTES
@@ -102,6 +331,10 @@
 #
 #   Verify connectivity to each geodatabase.
 #
+#   Get a catalog of pre-existing data-objects in each geodatabase (see below), using the
+#   catalog cache for parts of a catalog that haven't changed. Feature classes of feature
+#   datasets that need listing are listed concurrently (if parallel_workers is more than 1).
+#
 #   Verify that source geodatabase has an A_README table and determine if source geodatabase
 #   is a SPOKE geodatabase or a HUB geodatabase.
 #
@@ -114,31 +347,18 @@
 #   If the target geodatabase is a HUB geodatabase, verify existence of its A_XCHANGE_LOG
 #   table.
 #
-#   Get lists of pre-existing data-objects for easy searching/finding:
-#      List of source feature-classes w/ schema prefixes
-#      List of source feature-class schema-prefixes
-#      List of source feature-classes w/o schema prefixes
-#      List of source corresponding feature-datasets w/ schema prefixes, "" if N/A
-#      List of source corresponding feature-dataset schema prefixes, "" if N/A
-#      List of source corresponding feature-datasets w/o schema prefixes, "" if N/A
-#      List of source tables w/ schema prefixes (except for from A_README, A_XCHANGE_PARAMETERS, and A_XCHANGE_LOG tables)
-#      List of source-table schema-prefixes (except for from A_README, A_XCHANGE_PARAMETERS, and A_XCHANGE_LOG tables)
-#      List of source tables w/o schema prefixes (except for from A_README, A_XCHANGE_PARAMETERS, and A_XCHANGE_LOG tables)
-#      List of source raster-datasets w/ schema prefixes
-#      List of source-raster-dataset schema-prefixes
-#      List of source raster-datasets w/o schema prefixes
-#      List of target feature-classes w/ schema prefixes
-#      List of target feature-class schema-prefixes
-#      List of target feature-classes w/o schema prefixes
-#      List of target corresponding feature-datasets w/ schema prefixes, "" if N/A
-#      List of target corresponding feature-dataset schema prefixes, "" if N/A
-#      List of target corresponding feature-datasets w/o schema prefixes, "" if N/A
-#      List of target tables w/ schema prefixes (except for from A_README, A_XCHANGE_PARAMETERS, and A_XCHANGE_LOG tables)
-#      List of target-table schema-prefixes (except for from A_README, A_XCHANGE_PARAMETERS, and A_XCHANGE_LOG tables)
-#      List of target tables w/o schema prefixes (except for from A_README, A_XCHANGE_PARAMETERS, and A_XCHANGE_LOG tables)
-#      List of target raster-datasets w/ schema prefixes
-#      List of target-raster-dataset schema-prefixes
-#      List of target raster-datasets w/o schema prefixes
+#   Each geodatabase's catalog of pre-existing data-objects is for easy searching/finding
+#   (except for A_README, A_XCHANGE_PARAMETERS, and A_XCHANGE_LOG tables). A catalog has one
+#   record per data object (feature class, table, raster dataset), which stores:
+#      Name w/ schema prefix
+#      Schema prefix
+#      Name w/o schema prefix
+#      Containing feature-dataset w/ schema prefix, "" if N/A
+#      Containing feature-dataset schema prefix, "" if N/A
+#      Containing feature-dataset w/o schema prefix, "" if N/A
+#   A catalog finds records by name w/o schema prefix, by name w/ schema prefix, and by
+#   feature dataset (not case-sensitive) w/o searching through lists. A catalog also tracks
+#   the geodatabase's feature datasets, including empty feature-datasets.
 #
 #   Make a list called "freight_cars" to store dictionary objects that manage each data-object transfer.
 #
@@ -162,7 +382,16 @@
 #                                          is "fclass" or "table".
 #
 #         sort_field                       If "detect_changes" is True, set to field to sort
-#                                          for change detection. Otherwise, set to None.
+#                                          for change detection. If "watermark_field" isn't
+#                                          None, set to the key field. Otherwise, set to None.
+#
+#         watermark_field                  If the data object is set to INCREMENTAL, the
+#                                          watermark field (editor tracking's last-edited
+#                                          date). Otherwise, set to None.
+#
+#         partitioning                     [partition_rows, partition_workers] for the data
+#                                          object (PARTITION_ROWS and PARTITION_WORKERS of
+#                                          A_XCHANGE_PARAMETERS if it has them).
 #
 #         already_there                    Boolean to indicate if data object already exists on
 #                                          target side.
@@ -193,31 +422,139 @@
 #               Create it
 #            Add object to freight_cars list
 #
-#   For each freight_cars item:
-#      If the data object doesn't already exist in the target, copy it to target
+#   Resolve full names (source and target feature-datasets, pre-existing target data-object, or
+#   the name a new stand-alone target data-object is expected to get) of each freight_cars item.
+#
+#   If target geodatabase is a HUB geodatabase and the state store has records of freight_cars
+#   items, look up the date each freight_cars item was last delivered (from A_XCHANGE_LOG and
+#   A_XCHANGE_LOG_SUMMARY entries since the oldest of those records).
+#
+#   Plan the train: estimate each freight_cars item's cost (from the item's timing from
+#   previous runs, or else, if the estimate is used, from source row-count or raster size,
+#   already_there, and detect_changes). If
+#   parallel_workers is more than 1, order freight_cars items longest first. Estimate the
+#   train's total time and check it against window_minutes. If run w/ --dry-run, write the
+#   plan (JSON) and stop.
+#
+#   Start a run in the run journal (state store) w/ each freight_cars item "planned". If run w/
+#   --resume and the last run between the geodatabases didn't complete, continue that run
+#   instead:
+#      Skip freight_cars items that were logged
+#      For freight_cars items that were started but not logged, compare source and target:
+#         If they match, write the A_XCHANGE_LOG entry (if needed) and skip the item
+#         Otherwise, send the item again
+#
+#   If run w/ --publish, publish the freight_cars items (w/ the pair's QUEUE_SETTINGS) into the
+#   state store's freight queue instead of sending them (an item that is already queued or
+#   leased for the pair isn't published again), and skip to the end. If run w/ --work (instead
+#   of all of the above), until the freight queue has been empty for worker_idle_minutes:
+#      Claim the next queued item (or an item whose lease ran out) whose target container
+#      has fewer than max_cars_per_target items leased; renew the lease while it's sent
+#      Take on the item's QUEUE_SETTINGS
+#      If the run journal shows the item was logged, or started and it matches (as w/
+#      --resume), don't send it again; otherwise, send it (as below)
+#      Write its A_XCHANGE_LOG entry (if needed) and record it as "logged" in run journal
+#      Record item as done (or failed) in the freight queue; if it was its run's last item,
+#      record the run as completed in run journal
+#   and then write the worker's metrics (into files of its own).
+#
+#   For each freight_cars item (one at a time, or on a pool of worker processes if
+#   parallel_workers is more than 1):
+#      Record item as "started" in run journal
+#      If the data object doesn't already exist in the target, copy it to target (if
+#      watermark_field isn't None, record the source's highest watermark-field value, or
+#      latest archive date, read before the copy, in state store)
 #      Otherwise:
 #         If the data object is a feature class or a table:
+#            If watermark_field isn't None (INCREMENTAL):
+#               If the hub's last delivery of the data object is later than the day the state
+#               store's watermark was recorded, forget that watermark
+#               If there's a watermark and the source data-object is archived, upsert current
+#               versions from the archive class that started since the watermark into the
+#               target (by sort_field), and delete keys whose versions all ended since it
+#               Or if there's a watermark, upsert source rows edited since the watermark into
+#               the target (by sort_field); every reconcile_days, also reconcile keys
+#               (delete target rows whose key isn't in source, insert source rows whose key
+#               isn't in target)
+#               Otherwise, load all rows (per load_strategy)
+#               Record the highest watermark-field value (or archive date) read in state store
 #            If detect_changes is True:
+#               If the hub's last delivery of the data object is later than the day the state
+#               store's fingerprint was recorded, forget that fingerprint
+#               Fingerprint source; if it matches state store's fingerprint of what was
+#               delivered, changes aren't detected (target isn't read)
 #               If changes are detected between source and target:
-#                  Delete target-rows and then append from source to target
+#                  If load_strategy is "delta":
+#                     Insert/update/delete target rows that differ from source (by sort_field)
+#                  If load_strategy is "chunked":
+#                     Delete target-rows (unless resuming an interrupted load) and then
+#                     insert source rows in committed chunks, recording progress in state store
+#                  If load_strategy is "swap":
+#                     Stream (or append) source rows to a staging copy of the target
+#                     data-object (in OBJECTID-range partitions if the source has at least
+#                     partition_rows rows), verify its row count and fingerprint, and swap it in for
+#                     the target data-object
+#                  Otherwise:
+#                     Delete target-rows and then stream rows from source to target (if
+#                     pipeline_queue_mb isn't 0, read in a background thread, through a
+#                     bounded queue, while the target is written), counting rows and bytes
+#                     along the way; if the source has at
+#                     least partition_rows rows (and the target is an enterprise geodatabase
+#                     and isn't versioned), stream it in OBJECTID-range partitions, one worker
+#                     process per partition, and then count the target
+#                  Record source fingerprint in state store
 #               Otherwise:
 #                  Make note that changes weren't found
 #            Otherwise:
-#               Delete target-rows and then append from source to target
+#               Delete target-rows and then stream rows from source to target (if
+#               pipeline_queue_mb isn't 0, read in a background thread, through a bounded
+#               queue, while the target is written), counting rows and bytes along the way (in OBJECTID-range partitions if the
+#               source has at least partition_rows rows and the target isn't versioned)
 #         Otherwise (it's a raster):
-#            Delete the raster dataset from the target geodatabase
-#            Copy the raster dataset from the source geodatabase to the target geodatabase
-#      If data object is a feature class or table, capture:
+#            If raster_load_strategy is "delta":
+#               Fingerprint source block by block; if it matches state store's fingerprint of
+#               what was delivered, changes aren't detected (target isn't read)
+#               Otherwise, if source and target line up, write the blocks that differ into
+#               the target raster-dataset and record source fingerprint in state store
+#            If raster_load_strategy isn't "delta" (or the raster datasets don't line up, or a
+#            pixel became NoData):
+#               If stage_raster_reloads is True:
+#                  Copy the raster dataset from the source geodatabase to the target
+#                  geodatabase under a staging name
+#                  Swap names of the target raster-dataset and the staged copy, and then
+#                  delete the old raster-dataset
+#               Otherwise:
+#                  Delete the raster dataset from the target geodatabase
+#                  Copy the raster dataset from the source geodatabase to the target geodatabase
+#      If data object is a feature class or table, capture (from counts made during the load,
+#      if any; otherwise, by counting rows):
 #         source-geodatabase row-count
 #         target-geodatabase row-count
-#      If target geodatabase is a HUB geodatabase:
-#         Write an entry in target geodatabase's A_XCHANGE_LOG to note the push/pull
+#      Record item as "loaded" in run journal, and then as "verified" if row counts match
+#      Buffer the item's A_XCHANGE_LOG entry. Every hub_log_batch_cars items (and at the end of
+#      the train, or if an item fails):
+#         If target geodatabase is a HUB geodatabase:
+#            Write buffered entries in target geodatabase's A_XCHANGE_LOG (one insert cursor)
+#            to note the push/pull
+#         Record buffered items as "logged" in run journal
+#
+#   If target geodatabase is a HUB geodatabase and hub_log_months is more than 0:
+#      Roll A_XCHANGE_LOG entries older than hub_log_months months into A_XCHANGE_LOG_SUMMARY
+#      (one row per data object per month), and delete them from A_XCHANGE_LOG
+#
+#   Record the run as completed in the run journal.
+#
+#   Write metrics of the run (phase timings; each freight_cars item's phase timings, rows, and
+#   bytes) as a Prometheus textfile and a JSON summary.
+#
+#   Update the catalog cache (parts of the target catalog that received new data-objects are
+#   marked out of date).
 #
 #   Prepare and send an email w/ info collected during script execution.
 
 #IMPORTS
 print "IMPORTING MODULES..."
-import arcpy, sys, time, smtplib
+import arcpy, sys, os, time, datetime, json, re, sqlite3, argparse, struct, array, hashlib, smtplib, traceback, multiprocessing, Queue, threading, gzip, glob, atexit, socket
 
 #********** SET MAJOR VARIABLES HERE **********
 print "SETTING MAJOR VARIABLES..."
@@ -291,6 +628,274 @@ email_from = ""
 #      ["name1@domain1","name2@domain2"]
 #
 to_list = []
+#
+#parallel_workers
+#   The number of worker processes that send freight cars at the same time. Set to an
+#   integer. Set to 1 to send freight cars one at a time, in the order in which the train
+#   is lined up (this is how the script has always worked).
+#
+#   When set to more than 1, each worker process opens its own connections to the source
+#   and target geodatabases. Check that the target geodatabase (and the DBA) can handle
+#   that many concurrent connections/loads before raising this setting.
+parallel_workers = 1
+#
+#max_cars_per_target
+#   When parallel_workers is more than 1, the maximum number of freight cars that can be
+#   sent at the same time into the same target container. A target container is a target
+#   feature-dataset OR the target geodatabase's collection of stand-alone feature-classes,
+#   tables, and raster datasets. Set to an integer (1 or more).
+#
+#   Loading several feature classes of the same feature dataset at the same time can cause
+#   schema-lock contention (particularly in file geodatabases); keep this setting low
+#   if that happens.
+max_cars_per_target = 2
+#
+#hub_log_batch_cars
+#   A_XCHANGE_LOG entries (when the target geodatabase is a hub) are buffered and written
+#   in one batch (one insert cursor) every this many freight cars, as well as at the end of
+#   the train and when a freight car fails. Set to 1 to write each entry as its freight car
+#   arrives.
+hub_log_batch_cars = 20
+#
+#hub_log_months
+#   Number of months of entries (the current month plus this many previous months) that a
+#   hub's A_XCHANGE_LOG table keeps. At the end of a run, older entries are rolled into the
+#   hub's A_XCHANGE_LOG_SUMMARY table (one row per data object per month) and deleted from
+#   A_XCHANGE_LOG (see README NOTES). Set to 0 to keep all entries in A_XCHANGE_LOG.
+#
+#   The connection to the target geodatabase must have permission to delete rows from the
+#   A_XCHANGE_LOG table (and, the first time, to create the A_XCHANGE_LOG_SUMMARY table).
+hub_log_months = 0
+#
+#hub_date_literal
+#   How a date is written in a where clause of the target geodatabase when its A_XCHANGE_LOG
+#   DATE field is a date field; "%s" is replaced w/ the date as YYYY-MM-DD. Set per the
+#   target geodatabase's database (see watermark_literal). Not used when the DATE field is a
+#   text field (dates are then looked up one day at a time, as MM/DD/YYYY).
+hub_date_literal = "date '%s'"
+#
+#window_minutes
+#   Length (minutes) of the maintenance window that the script runs in. Before the train
+#   leaves, the script estimates how long it will take (see the train plan in README
+#   NOTES); if the estimate is longer than the window, a warning is noted (and emailed).
+#   Set to 0 to not check the estimate against a window.
+window_minutes = 0
+#
+#catalog_cache_hours
+#   The script keeps a catalog of each geodatabase's data objects in a cache file
+#   (vtDataRail_SendFreight.catalog.json, in the script's directory) so that it doesn't
+#   have to list all data objects of both geodatabases every time it runs. Set to the
+#   maximum age (number of hours) of a cached listing of a geodatabase's stand-alone
+#   data-objects or of a feature dataset's feature classes. Feature datasets are always
+#   listed, so new feature-datasets are always found. A file geodatabase's catalog is
+#   taken from the cache when the file geodatabase's list of data objects hasn't changed.
+#
+#   In an enterprise geodatabase, a stand-alone data-object (or a feature class in an
+#   existing feature dataset) that is added by someone else isn't found until the cached
+#   listing is older than this setting. Set to 0 to list everything every time.
+catalog_cache_hours = 12
+#
+#load_strategy
+#   How rows of a feature class or table that already exists in the target geodatabase
+#   are refreshed. Set to one of these strings:
+#
+#      "reload"    Delete all target rows and then stream all source rows into the target
+#                  data-object (rows and bytes are counted as they're streamed).
+#
+#      "delta"     For data objects that have a SORT_FIELD in A_XCHANGE_PARAMETERS (i.e.,
+#                  DETECT_CHANGES directive), use SORT_FIELD as a key: insert source rows
+#                  whose key isn't in the target, delete target rows whose key isn't in the
+#                  source, and update target rows that are different from the source row
+#                  w/ the same key. Nothing else is touched, so a versioned target doesn't
+#                  get a delete and re-insert of every row. SORT_FIELD values must be unique
+#                  and not null; otherwise, all rows are re-loaded. Data objects w/o a
+#                  SORT_FIELD are always re-loaded.
+#
+#      "chunked"   Delete all target rows and then copy source rows in chunks (in
+#                  OBJECTID order), committing each chunk (see chunk_rows and
+#                  chunk_seconds). Progress is kept in the script's state store, so a load
+#                  that is interrupted (e.g., lost connection) picks up after the last
+#                  committed chunk the next time the script runs, instead of starting over.
+#                  Recommended for very large tables and feature classes.
+#
+#      "swap"      Load source rows into a new, non-versioned staging copy of the target
+#                  data-object (same schema, in the same container), verify it (row count
+#                  and fingerprint must match the source), and then swap names (see
+#                  README NOTES). The target data-object is never empty while it loads.
+#                  Versioned target data-objects, and target data-objects in relationship
+#                  classes, are re-loaded instead. If the staging copy doesn't verify or
+#                  can't be swapped in (e.g., it's locked), all rows are re-loaded instead.
+load_strategy = "reload"
+#
+#swap_viewers
+#   When load_strategy is "swap", a swapped-in data object is a new data object, so
+#   privileges granted on the old one are gone. Set to a list of users/roles that are
+#   granted view (SELECT) privilege on the staging copy before it is swapped in, for example:
+#      swap_viewers = ["GIS_VIEWER","PUBLIC_ROLE"]
+swap_viewers = []
+#
+#raster_load_strategy
+#   How a raster dataset that already exists in the target geodatabase is refreshed:
+#
+#      "reload"    Delete the target raster-dataset and copy the source raster-dataset
+#                  (requires an exclusive lock).
+#
+#      "delta"     Compare the raster datasets block by block and only write the blocks
+#                  that differ into the target raster-dataset (see README NOTES).
+#                  Recommended for large raster datasets that get small corrections.
+raster_load_strategy = "reload"
+#
+#stage_raster_reloads
+#   Set to True to re-load a raster dataset (see raster_load_strategy) by copying the source
+#   raster-dataset into the target geodatabase under a staging name first (while the target
+#   raster-dataset stays in use), and then swapping names (see README NOTES). Only the swap
+#   needs the target raster-dataset to be free of locks, and if it can't be swapped in, the
+#   target raster-dataset is left as it was. Set to False to delete the target
+#   raster-dataset and then copy the source raster-dataset.
+stage_raster_reloads = False
+#
+#chunk_rows
+#   When load_strategy is "chunked", the number of rows in the first chunk of a load. Set to
+#   an integer.
+chunk_rows = 50000
+#
+#chunk_seconds
+#   When load_strategy is "chunked", chunks are sized so that each chunk takes about this
+#   many seconds to load (the size of the next chunk is adjusted per the throughput of the
+#   last one, between a tenth of chunk_rows and 10 times chunk_rows). Set to 0 to keep
+#   every chunk at chunk_rows.
+chunk_seconds = 60
+#
+#pipeline_queue_mb
+#   When rows are streamed from a source data-object to a target data-object, the source can
+#   be read in a background thread into a queue that holds about this many megabytes of rows
+#   (see README NOTES). Set to 0 to read and write on one thread (e.g., 16 to turn it on).
+pipeline_queue_mb = 0
+#
+#partition_rows
+#   A feature class or table that already exists in the target geodatabase and has at least
+#   this many rows (in the source geodatabase) has its rows re-loaded in OBJECTID-range
+#   partitions, each read and written by its own worker process (see README NOTES). Set to an
+#   integer. Set to 0 to never partition rows. Can be set per data object w/ the optional
+#   PARTITION_ROWS field of A_XCHANGE_PARAMETERS.
+partition_rows = 0
+#
+#partition_workers
+#   The number of partitions (worker processes) that rows of a data object are split into when
+#   partitioned (see partition_rows). Set to an integer (2 or more). Each worker process opens
+#   its own connections to both geodatabases; check that the geodatabases can handle that
+#   many connections. Can be set per data object w/ the optional PARTITION_WORKERS field of
+#   A_XCHANGE_PARAMETERS.
+partition_workers = 4
+#
+#state_store_days
+#   The script keeps a state store (vtDataRail_SendFreight.state.sqlite, in the script's
+#   directory or state_store_dir) w/ a fingerprint of each DETECT_CHANGES data-object as
+#   last delivered to the target geodatabase. On the next run, only the source data-object is read and checked
+#   against that fingerprint; the target data-object is only read if the source doesn't
+#   match (or there isn't a fingerprint yet). Set to the maximum age (number of days) of a
+#   fingerprint that is trusted w/o reading the target data-object. When the target is
+#   read and matches, the fingerprint's age starts over.
+#
+#   Edits made directly to a target data-object aren't noticed until its fingerprint is
+#   older than this setting. Set to 0 to always read both data-objects (no state store).
+state_store_days = 7
+#
+#state_store_dir
+#   The folder of the state store (and its run journal and freight queue). Set to "" for
+#   the script's directory. To send freight w/ workers on several hosts (--publish and
+#   --work; see README NOTES), set to a shared folder that every host can reach, for
+#   example r"\\gisserver\datarail". A shared folder must support file locking (SQLite).
+state_store_dir = r""
+#
+#lease_minutes
+#   How long a worker (--work) holds a freight car that it claimed from the freight queue
+#   before another worker can claim it. A worker renews its lease (from a background
+#   thread) every 1/LEASE_RENEWALS of this while it sends the freight car, so a freight car
+#   is only claimed again if its worker dies or loses its connection to the state store.
+#   Set to an integer (or decimal) number of minutes.
+lease_minutes = 10
+#
+#worker_idle_minutes
+#   How long a worker (--work) keeps checking the freight queue for new freight cars (every
+#   QUEUE_POLL_SECONDS) after the queue has run out of freight cars that it can claim,
+#   before it stops. While freight cars are leased by other workers, it keeps checking
+#   anyway (their leases might run out). Set to 0 to stop as soon as nothing is queued or
+#   leased.
+worker_idle_minutes = 0
+#
+#use_digest_table
+#   A source geodatabase can publish a fingerprint digest of its data objects in an
+#   A_XCHANGE_DIGEST table (which this script maintains when run w/ --write-digest against
+#   the source geodatabase). Set to True to use the source geodatabase's A_XCHANGE_DIGEST
+#   table (if it has one): a DETECT_CHANGES data-object whose A_XCHANGE_DIGEST entry
+#   matches the fingerprint of what was last delivered (see state_store_days) isn't read at
+#   all. Set to False to ignore A_XCHANGE_DIGEST tables.
+#
+#   Only set to True if the source geodatabase's A_XCHANGE_DIGEST table is kept up to date
+#   (i.e., --write-digest is run after edits); otherwise, changes can be missed.
+use_digest_table = True
+#
+#watermark_field
+#   The watermark field of INCREMENTAL data-objects (see README NOTES) whose
+#   A_XCHANGE_PARAMETERS directive doesn't name one (a directive of "INCREMENTAL:<FIELD>"
+#   names one). Usually the last-edited-date field of editor tracking. Must be a date or
+#   number field of the source data-object.
+watermark_field = "last_edited_date"
+#
+#watermark_literal
+#   How a date watermark is written in a where clause of the source geodatabase; "%s" is
+#   replaced w/ the watermark as YYYY-MM-DD HH:MM:SS. Set per the source geodatabase's
+#   database:
+#      File geodatabase:              "date '%s'"
+#      SQL Server:                    "'%s'"
+#      Oracle, PostgreSQL, DB2:       "TIMESTAMP '%s'"
+watermark_literal = "date '%s'"
+#
+#reconcile_days
+#   How often (number of days) the keys of an INCREMENTAL data-object are reconciled, so that
+#   rows deleted from the source are deleted from the target (see README NOTES). Set to 0 to
+#   reconcile keys every run.
+reconcile_days = 7
+#
+#use_archive_tables
+#   Set to True to read the increment of an INCREMENTAL data-object from its archive class if
+#   its source data-object is archived (see README NOTES). Set to False to always use the
+#   watermark field.
+use_archive_tables = True
+#
+#log_max_mb
+#   The log file (vtDataRail_SendFreight.log) is rotated when it reaches this size (in MB): it
+#   is compressed into a vtDataRail_SendFreight.YYYYMMDD-HHMMSS.log.gz file next to it, and
+#   a new log file is started. Set to 0 to not rotate the log file by size.
+log_max_mb = 10
+#
+#log_rotate_days
+#   The log file is also rotated when a note is written in a different period of this many
+#   days than the log file was last written in (e.g., set to 1 to start a new log file each
+#   day, or 7 to start one each week). Set to 0 to not rotate the log file by age.
+log_rotate_days = 0
+#
+#log_keep
+#   Number of rotated (compressed) log files to keep. Older ones are deleted.
+log_keep = 5
+#
+#log_format
+#   Format of notes in the log file. Set to one of these strings:
+#
+#      "text"      One line per note: time (YYYYMMDD-HHMM), 2 spaces, and the note.
+#
+#      "json"      One JSON object per line (JSON lines) w/ these keys: "time" (ISO format),
+#                  "note", "printed" (true if the note was also printed), and "emailed" (true
+#                  if the note was also added to the email notification).
+log_format = "text"
+#
+#metrics_dir
+#   Directory that metrics of each run are written into (see README NOTES): a Prometheus
+#   textfile (vtDataRail_SendFreight.prom) and a JSON summary
+#   (vtDataRail_SendFreight.metrics.json). To have node_exporter pick up the metrics, set to
+#   its textfile-collector directory. If "", the script's directory.
+metrics_dir = r""
 #********** END OF SECTION FOR SETTING MAJOR VARIABLES **********
 
 #CONSTANTS
@@ -299,6 +904,94 @@ print "SETTING CONSTANTS..."
 IGNORE_PARAM = ["IGNORE_M","IGNORE_Z","IGNORE_POINTID","IGNORE_EXTENSION_PROPERTIES","IGNORE_SUBTYPES","IGNORE_RELATIONSHIPCLASSES","IGNORE_REPRESENTATIONCLASSES","IGNORE_FIELDALIAS"]
 #IGNORE_PARAM_T STORES IGNORE OPTIONS FOR NON-SPATIAL (TABLE) DATA COMPARISON
 IGNORE_PARAM_T = ["IGNORE_EXTENSION_PROPERTIES","IGNORE_SUBTYPES","IGNORE_RELATIONSHIPCLASSES","IGNORE_FIELDALIAS"]
+#SPECIAL_TABLES STORES NAMES OF EGC GEOSPATIAL DATA EXCHANGE PROTOCOL TABLES, WHICH AREN'T PUSHED/PULLED AS DATA OBJECTS
+SPECIAL_TABLES = ["A_README","A_XCHANGE_PARAMETERS","A_XCHANGE_LOG","A_XCHANGE_DIGEST","A_XCHANGE_LOG_SUMMARY"]
+#DIGEST_TABLE_FIELDS STORES [NAME, TYPE, LENGTH] OF EACH FIELD OF AN A_XCHANGE_DIGEST TABLE (SEE write_digest_table())
+DIGEST_TABLE_FIELDS = [["OBJECT_NAME","TEXT",255],["DIGEST","TEXT",32],["ROW_COUNT","LONG",None],["FIELDS_DIGEST","TEXT",32],["UPDATED","DATE",None]]
+#LOG_SUMMARY_TABLE_FIELDS STORES [NAME, TYPE, LENGTH] OF EACH FIELD OF AN A_XCHANGE_LOG_SUMMARY TABLE (SEE
+#compact_hub_log()). MONTH IS YYYY-MM.
+LOG_SUMMARY_TABLE_FIELDS = [["OBJECT_NAME","TEXT",255],["MONTH","TEXT",7],["DELIVERIES","LONG",None],["LAST_DATE","DATE",None],["LAST_NOTE","TEXT",1000]]
+#LOG_INDEXES STORES [INDEX NAME, LIST OF FIELDS] OF THE INDEX THAT EACH HUB LOG-TABLE GETS (SEE add_log_index())
+LOG_INDEXES = {"A_XCHANGE_LOG":["XCHANGE_LOG_DATE_IDX",["DATE"]],"A_XCHANGE_LOG_SUMMARY":["XCHANGE_LOG_SUM_IDX",["OBJECT_NAME","MONTH"]]}
+#LOG_NOTE_PATTERN MATCHES THE A_XCHANGE_LOG NOTES WRITTEN BY THIS SCRIPT (SEE send_freight_car()); ITS "name" GROUP IS
+#THE DATA OBJECT'S NAME (W/ FEATURE DATASET AND/OR SCHEMA PREFIX)
+LOG_NOTE_PATTERN = re.compile(r"^(?:Copied in new (?:feature-class|table|raster-dataset)|Refreshed rows of (?:feature class|table)|Refreshed raster-dataset) (?P<name>\S+)")
+#LOG_OTHER_NAME IS THE A_XCHANGE_LOG_SUMMARY OBJECT_NAME OF ROLLED-UP ENTRIES W/ NOTES THAT DON'T NAME A DATA OBJECT
+LOG_OTHER_NAME = "(OTHER)"
+#LOG_LOOKUP_DAYS IS THE NUMBER OF DAYS LOOKED UP IN A HUB'S A_XCHANGE_LOG BY ONE QUERY WHEN ITS DATE FIELD IS A TEXT FIELD
+#(SEE get_log_date_clauses())
+LOG_LOOKUP_DAYS = 100
+#FINGERPRINT_CHUNK_BITS SETS THE AVERAGE NUMBER OF ROWS (2 ** FINGERPRINT_CHUNK_BITS) IN A CHUNK OF A DATA OBJECT'S
+#FINGERPRINT (SEE fingerprint_object()). CHUNK DIGESTS TELL WHERE (WHICH SORT-FIELD RANGES) 2 DATA OBJECTS DIFFER.
+FINGERPRINT_CHUNK_BITS = 14
+#DELTA_MAX_KEY_RANGES IS THE MAXIMUM NUMBER OF KEY RANGES THAT ARE TURNED INTO A WHERE CLAUSE WHEN APPLYING A DELTA
+#(SEE get_key_range_clause()). IF CHANGES ARE SCATTERED OVER MORE KEY-RANGES THAN THIS, ALL ROWS ARE READ.
+DELTA_MAX_KEY_RANGES = 100
+#INCREMENTAL_KEYS_PER_CLAUSE IS THE MAXIMUM NUMBER OF KEY VALUES IN ONE WHERE CLAUSE WHEN WRITING AN INCREMENT (SEE
+#get_key_list_clause())
+INCREMENTAL_KEYS_PER_CLAUSE = 500
+#WATERMARK_FIELD_TYPES STORES THE FIELD TYPES THAT A WATERMARK FIELD CAN BE
+WATERMARK_FIELD_TYPES = ["Date","Integer","SmallInteger","Double","Single"]
+#ARCHIVE_CLASS_SUFFIX IS ADDED TO THE NAME OF AN ARCHIVED DATA-OBJECT TO GET THE NAME OF ITS ARCHIVE CLASS
+ARCHIVE_CLASS_SUFFIX = "_H"
+#ARCHIVE_FROM_FIELD AND ARCHIVE_TO_FIELD ARE THE FIELDS OF AN ARCHIVE CLASS W/ THE DATES A ROW VERSION STARTED AND ENDED
+ARCHIVE_FROM_FIELD = "GDB_FROM_DATE"
+ARCHIVE_TO_FIELD = "GDB_TO_DATE"
+#ARCHIVE_OPEN_DATE IS THE ARCHIVE CLASS' GDB_TO_DATE OF A CURRENT ROW-VERSION (ONE THAT HASN'T ENDED)
+ARCHIVE_OPEN_DATE = "9999-12-31 23:59:59"
+#PIPELINE_BATCHES IS THE NUMBER OF BATCHES OF ROWS THAT THE QUEUE OF A RowReader HOLDS (EACH ABOUT 1/PIPELINE_BATCHES OF
+#pipeline_queue_mb), AND PIPELINE_BATCH_ROWS IS THE MOST ROWS IN A BATCH
+PIPELINE_BATCHES = 8
+PIPELINE_BATCH_ROWS = 1000
+#PARTITION_PARAM_FIELDS STORES THE OPTIONAL FIELDS OF AN A_XCHANGE_PARAMETERS TABLE THAT SET A DATA OBJECT'S PARTITIONING
+#(SEE get_partitioning())
+PARTITION_PARAM_FIELDS = ["PARTITION_ROWS","PARTITION_WORKERS"]
+#STAGE_NEW_SUFFIX AND STAGE_OLD_SUFFIX ARE ADDED TO A TARGET DATA-OBJECT'S NAME FOR ITS STAGED COPY AND FOR THE OLD
+#DATA-OBJECT WHILE THEY ARE SWAPPED (SEE swap_staged_object())
+STAGE_NEW_SUFFIX = "_SF_NEW"
+STAGE_OLD_SUFFIX = "_SF_OLD"
+#SWAP_ATTEMPTS IS THE NUMBER OF TIMES A RENAME OF A STAGED SWAP IS TRIED (E.G., WHILE A LOCK IS RELEASED), W/
+#SWAP_WAIT_SECONDS BETWEEN TRIES
+SWAP_ATTEMPTS = 5
+SWAP_WAIT_SECONDS = 10
+#RASTER_BLOCK_SIZE IS THE WIDTH AND HEIGHT (PIXELS) OF A BLOCK OF A RASTER DATASET'S FINGERPRINT (SEE fingerprint_raster())
+RASTER_BLOCK_SIZE = 512
+#RASTER_PIXEL_DTYPES STORES THE NUMPY DATA TYPE OF A BLOCK OF EACH RASTER PIXEL-TYPE (SEE apply_raster_delta())
+RASTER_PIXEL_DTYPES = {"U1":"uint8","U2":"uint8","U4":"uint8","U8":"uint8","S8":"int8","U16":"uint16","S16":"int16","U32":"uint32","S32":"int32","F32":"float32","F64":"float64"}
+#FINGERPRINT_MODULUS IS THE MODULUS OF THE SUM OF ROW DIGESTS THAT MAKES A FINGERPRINT'S DIGEST (128 BITS)
+FINGERPRINT_MODULUS = 2 ** 128
+#JOURNAL_STATES STORES THE STATES OF A FREIGHT CAR IN THE RUN JOURNAL, IN ORDER (SEE update_journal())
+JOURNAL_STATES = ["planned","started","loaded","verified","logged"]
+#JOURNAL_DAYS IS THE NUMBER OF DAYS THAT COMPLETED RUNS ARE KEPT IN THE RUN JOURNAL (SEE start_run()), AND THAT DONE OR
+#FAILED FREIGHT CARS ARE KEPT IN THE FREIGHT QUEUE (SEE publish_freight_cars())
+JOURNAL_DAYS = 30
+#QUEUE_SETTINGS STORES THE MAJOR VARIABLES THAT ARE PUBLISHED W/ A FREIGHT CAR INTO THE FREIGHT QUEUE AND TAKEN ON BY
+#THE WORKER THAT SENDS IT (SEE publish_freight_cars() AND send_queued_car()); OTHER MAJOR VARIABLES ARE THE WORKER'S OWN
+QUEUE_SETTINGS = ["source_gdb","target_gdb","load_strategy","swap_viewers","raster_load_strategy","stage_raster_reloads","chunk_rows","chunk_seconds","state_store_days","use_digest_table","watermark_literal","reconcile_days","use_archive_tables"]
+#QUEUE_STATES STORES THE STATES OF A FREIGHT CAR IN THE FREIGHT QUEUE (SEE claim_queued_car())
+QUEUE_STATES = ["queued","leased","done","failed"]
+#QUEUE_ATTEMPTS IS THE NUMBER OF TIMES A FREIGHT CAR CAN BE CLAIMED FROM THE FREIGHT QUEUE (I.E., ITS LEASE CAN RUN OUT
+#AND IT CAN BE CLAIMED AGAIN) BEFORE IT IS MARKED FAILED
+QUEUE_ATTEMPTS = 3
+#QUEUE_POLL_SECONDS IS HOW OFTEN A WORKER CHECKS THE FREIGHT QUEUE WHEN IT HAS NO FREIGHT CAR THAT IT CAN CLAIM
+QUEUE_POLL_SECONDS = 15
+#LEASE_RENEWALS IS HOW MANY TIMES PER lease_minutes A WORKER RENEWS ITS LEASE ON A FREIGHT CAR (SEE LeaseKeeper)
+LEASE_RENEWALS = 3
+#WORKER_FILE_DAYS IS HOW MANY DAYS A WORKER'S OWN LOG AND METRICS FILES ARE KEPT AFTER THEY WERE LAST WRITTEN (SEE
+#clear_worker_files())
+WORKER_FILE_DAYS = 30
+#PLANNER_* CONSTANTS ARE THE TRAIN PLANNER'S DEFAULT RATES FOR ESTIMATING HOW LONG A FREIGHT CAR TAKES (SEE
+#estimate_car_cost()), USED FOR DATA OBJECTS THAT HAVEN'T BEEN SENT BEFORE (OTHERWISE, THEIR LAST TIMING IS USED):
+#   PLANNER_CAR_SECONDS                    SECONDS OF OVERHEAD PER FREIGHT CAR
+#   PLANNER_ROWS_PER_SECOND                ROWS COPIED/LOADED PER SECOND
+#   PLANNER_FINGERPRINT_ROWS_PER_SECOND    ROWS FINGERPRINTED PER SECOND (CHANGE DETECTION)
+#   PLANNER_RASTER_BYTES_PER_SECOND        RASTER BYTES (UNCOMPRESSED) COPIED PER SECOND
+PLANNER_CAR_SECONDS = 5
+PLANNER_ROWS_PER_SECOND = 2000
+PLANNER_FINGERPRINT_ROWS_PER_SECOND = 10000
+PLANNER_RASTER_BYTES_PER_SECOND = 10 * 2 ** 20
+#LOG_FLUSH_SECONDS IS HOW LONG THE LOG WRITER (SEE NoteWriter) GATHERS NOTES BEFORE WRITING THEM TO THE LOG FILE AT ONCE
+LOG_FLUSH_SECONDS = 1
 
 #OTHER VARIABLES
 print "SETTING OTHER VARIABLES..."
@@ -310,6 +1003,33 @@ if email_server != "":
    email_switch = True
 else:
    email_switch = False
+#note_buffer IS SET TO A LIST IN WORKER PROCESSES (PARALLEL SENDING). NOTES MADE IN A WORKER PROCESS
+#ARE COLLECTED IN THE LIST AND HANDED BACK TO THE MAIN PROCESS, WHICH OWNS THE LOG FILE AND EMAIL
+#CONTENT. IN THE MAIN PROCESS, note_buffer STAYS None AND NOTES ARE WRITTEN RIGHT AWAY.
+note_buffer = None
+#car_starts IS SET TO A multiprocessing.Queue IN WORKER PROCESSES (PARALLEL SENDING; SEE start_car_worker()). A WORKER
+#PROCESS REPORTS EACH FREIGHT CAR IT STARTS ON IT, SO THAT THE MAIN PROCESS CAN TELL WHICH FREIGHT CAR WAS LOST IF THE
+#WORKER PROCESS DIES.
+car_starts = None
+#log_path IS THE PATH OF THE SCRIPT'S LOG FILE
+log_path = sys.path[0] + "\\vtDataRail_SendFreight.log"
+#log_writer IS THE MAIN PROCESS'S LOG WRITER (SEE NoteWriter). IT'S STARTED W/ THE FIRST NOTE THAT IS WRITTEN.
+log_writer = None
+#run_phases STORES SECONDS SPENT IN EACH PHASE OF THE RUN (SEE add_phase_time()). car_phases STORES SECONDS SPENT IN
+#EACH PHASE OF THE FREIGHT CAR THAT IS BEING SENT (send_freight_car() STARTS IT OVER FOR EACH FREIGHT CAR).
+#car_metrics STORES METRICS OF EACH FREIGHT CAR THAT HAS BEEN SENT (SEE get_car_metrics()). ALL ARE WRITTEN AT THE END
+#OF THE RUN (SEE write_metrics()).
+run_phases = {}
+car_phases = {}
+car_metrics = []
+#hub_log_buffer STORES [FREIGHT CAR, A_XCHANGE_LOG NOTE (None IF NOTHING WAS SENT)] LISTS OF FREIGHT CARS THAT HAVE
+#ARRIVED BUT AREN'T LOGGED YET (SEE log_freight_car() AND flush_hub_log())
+hub_log_buffer = []
+#state_store_path IS THE PATH OF THE SCRIPT'S STATE STORE (SEE open_state_store() AND state_store_dir)
+if state_store_dir != "":
+   state_store_path = state_store_dir + "\\vtDataRail_SendFreight.state.sqlite"
+else:
+   state_store_path = sys.path[0] + "\\vtDataRail_SendFreight.state.sqlite"
 
 #FUNCTIONS
 
@@ -318,25 +1038,7 @@ else:
 #   FOR EXAMPLE:
 #      20171201-1433
 def tell_the_time():
-   the_year = str(time.localtime().tm_year)
-   the_month = str(time.localtime().tm_mon)
-   the_day = str(time.localtime().tm_mday)
-   the_hour = str(time.localtime().tm_hour)
-   the_minute = str(time.localtime().tm_min)
-   #FORMAT THE MONTH TO HAVE 2 CHARACTERS
-   while len(the_month) < 2:
-      the_month = "0" + the_month
-   #FORMAT THE DAY TO HAVE 2 CHARACTERS
-   while len(the_day) < 2:
-      the_day = "0" + the_day
-   #FORMAT THE HOUR TO HAVE 2 CHARACTERS
-   while len(the_hour) < 2:
-      the_hour = "0" + the_hour
-   #FORMAT THE MINUTE TO HAVE 2 CHARACTERS
-   while len(the_minute) < 2:
-      the_minute = "0" + the_minute
-   the_output = the_year + the_month + the_day + "-" + the_hour + the_minute
-   return the_output
+   return time.strftime("%Y%m%d-%H%M")
 
 #THIS FUNCTION SIMPLY TAKES A STRING ARGUMENT AND THEN
 #   WRITES THE GIVEN STRING INTO THE SCRIPT'S LOG FILE.
@@ -350,9 +1052,21 @@ def tell_the_time():
 def make_note(the_note, print_it = False, email_it = False):
    the_note = tell_the_time() + "  " + the_note
    the_note += "\n"
-   log_file = open(sys.path[0] + "\\vtDataRail_SendFreight.log", "a")
-   log_file.write(the_note)
-   log_file.close()
+   #IN A WORKER PROCESS, HAND THE NOTE BACK TO THE MAIN PROCESS
+   if note_buffer != None:
+      note_buffer.append([the_note, print_it, email_it])
+   else:
+      write_note(the_note, print_it, email_it)
+
+#THIS FUNCTION WRITES A NOTE THAT HAS ALREADY BEEN PREPARED BY make_note() (TIME ADDED AND
+#   \n ADDED) INTO THE SCRIPT'S LOG FILE (BY WAY OF THE LOG WRITER, SEE NoteWriter), AND PRINTS IT
+#   AND/OR ADDS IT TO EMAIL CONTENT PER THE SECOND AND THIRD ARGUMENTS (SAME AS make_note()).
+def write_note(the_note, print_it = False, email_it = False):
+   global log_writer
+   if log_writer == None:
+      log_writer = NoteWriter(log_path)
+      atexit.register(log_writer.close)
+   log_writer.write(the_note, print_it, email_it)
    if print_it == True:
       print the_note
       arcpy.AddMessage(the_note)
@@ -360,6 +1074,117 @@ def make_note(the_note, print_it = False, email_it = False):
       global email_content
       email_content += the_note
 
+#THIS CLASS WRITES NOTES INTO A LOG FILE FROM A BACKGROUND THREAD, SO THAT MAKING A NOTE DOESN'T WAIT ON THE DISK.
+#   NOTES ARE QUEUED AND WRITTEN IN BATCHES (ALL NOTES MADE W/IN LOG_FLUSH_SECONDS OF A BATCH'S FIRST NOTE) TO A LOG
+#   FILE THAT IS KEPT OPEN. BEFORE A BATCH IS WRITTEN, THE LOG FILE IS ROTATED IF IT'S TOO BIG OR TOO OLD (SEE
+#   log_max_mb, log_rotate_days, AND rotate_log()). close() WRITES ANY NOTES THAT ARE STILL QUEUED (IT'S CALLED WHEN
+#   THE SCRIPT EXITS).
+class NoteWriter(object):
+   def __init__(self, the_path):
+      self.path = the_path
+      self.file = None
+      self.notes = Queue.Queue()
+      self.thread = threading.Thread(target = self.run)
+      self.thread.daemon = True
+      self.thread.start()
+
+   #QUEUES A NOTE THAT HAS ALREADY BEEN PREPARED BY make_note() (SAME ARGUMENTS AS write_note())
+   def write(self, the_note, print_it = False, email_it = False):
+      self.notes.put([the_note, print_it, email_it])
+
+   #WRITES NOTES THAT ARE STILL QUEUED, CLOSES THE LOG FILE, AND STOPS THE THREAD
+   def close(self):
+      if self.thread.is_alive() == True:
+         self.notes.put(None)
+         self.thread.join()
+
+   #THE THREAD: WAITS FOR A NOTE, GATHERS NOTES FOR LOG_FLUSH_SECONDS, AND WRITES THEM, UNTIL None IS QUEUED
+   def run(self):
+      the_end = False
+      while the_end == False:
+         the_notes = [self.notes.get()]
+         flush_time = time.time() + LOG_FLUSH_SECONDS
+         while the_notes[-1] != None and time.time() < flush_time:
+            try:
+               the_notes.append(self.notes.get(True, flush_time - time.time()))
+            except Queue.Empty:
+               break
+         if the_notes[-1] == None:
+            the_end = True
+            the_notes.pop()
+         try:
+            self.write_notes(the_notes)
+         except:
+            print "Couldn't write " + str(len(the_notes)) + " note(s) to log file " + self.path + ": " + str(sys.exc_info()[1])
+      if self.file != None:
+         self.file.close()
+         self.file = None
+
+   #WRITES A BATCH OF NOTES ([NOTE, print_it, email_it] LISTS) TO THE LOG FILE, ROTATING IT FIRST IF NEEDED
+   def write_notes(self, the_notes):
+      if len(the_notes) == 0:
+         return
+      if is_log_due(self.path) == True:
+         if self.file != None:
+            self.file.close()
+            self.file = None
+         rotate_log(self.path)
+      if self.file == None:
+         self.file = open(self.path, "a")
+      self.file.write("".join([format_log_note(i[0], i[1], i[2]) for i in the_notes]))
+      self.file.flush()
+
+#THIS FUNCTION RETURNS A NOTE THAT HAS ALREADY BEEN PREPARED BY make_note() (TIME ADDED AND \n ADDED) AS A LINE OF THE
+#   LOG FILE PER log_format: THE NOTE ITSELF FOR "text", OR A JSON OBJECT FOR "json".
+#   THE SECOND AND THIRD ARGUMENTS ARE THE SAME AS make_note()'S.
+def format_log_note(the_note, print_it = False, email_it = False):
+   if log_format != "json":
+      return the_note
+   #(A PREPARED NOTE STARTS W/ THE TIME, YYYYMMDD-HHMM, AND 2 SPACES)
+   the_time = the_note[0:4] + "-" + the_note[4:6] + "-" + the_note[6:8] + "T" + the_note[9:11] + ":" + the_note[11:13]
+   the_text = the_note[15:].rstrip("\n")
+   if isinstance(the_text, str):
+      the_text = the_text.decode("utf-8", "replace")
+   return json.dumps({"time":the_time,"note":the_text,"printed":print_it,"emailed":email_it}) + "\n"
+
+#THIS FUNCTION RETURNS A NUMBER THAT IDENTIFIES THE PERIOD OF log_rotate_days DAYS (LOCAL TIME) THAT A GIVEN TIME IS IN.
+#   THE FIRST ARGUMENT IS THE TIME (SECONDS SINCE EPOCH).
+def get_log_period(the_time):
+   the_date = datetime.date.fromtimestamp(the_time)
+   return the_date.toordinal() // max(1, log_rotate_days)
+
+#THIS FUNCTION RETURNS True IF A LOG FILE SHOULD BE ROTATED BEFORE MORE NOTES ARE WRITTEN TO IT: IF IT HAS REACHED
+#   log_max_mb, OR IF IT WAS LAST WRITTEN IN AN EARLIER PERIOD OF log_rotate_days DAYS. OTHERWISE, RETURNS False.
+#   THE FIRST ARGUMENT IS THE PATH OF THE LOG FILE.
+def is_log_due(the_path):
+   if os.path.exists(the_path) == False:
+      return False
+   if log_max_mb > 0 and os.path.getsize(the_path) >= log_max_mb * 1048576:
+      return True
+   if log_rotate_days > 0 and get_log_period(os.path.getmtime(the_path)) != get_log_period(time.time()):
+      return True
+   return False
+
+#THIS FUNCTION ROTATES A LOG FILE: COMPRESSES IT INTO A <NAME>.YYYYMMDD-HHMMSS.log.gz FILE NEXT TO IT, DELETES IT, AND
+#   DELETES ALL BUT THE NEWEST log_keep COMPRESSED LOG-FILES.
+#   THE FIRST ARGUMENT IS THE PATH OF THE LOG FILE (ENDING W/ .log).
+def rotate_log(the_path):
+   the_base = the_path[0:-4]
+   the_input = open(the_path, "rb")
+   the_output = gzip.open(the_base + "." + time.strftime("%Y%m%d-%H%M%S") + ".log.gz", "wb")
+   while True:
+      the_data = the_input.read(1048576)
+      if the_data == "":
+         break
+      the_output.write(the_data)
+   the_output.close()
+   the_input.close()
+   os.remove(the_path)
+   #(ROTATED LOG-FILES' NAMES SORT BY TIME)
+   the_archives = sorted(glob.glob(the_base + ".*.log.gz"))
+   for i in the_archives[0:max(0, len(the_archives) - log_keep)]:
+      os.remove(i)
+
 #THIS FUNCTION RETURNS SCHEMA PREFIX (DATABASE.OWNER.) FROM A GIVEN DATA-OBJECT NAME (FEATURE CLASS, TABLE, OR RASTER DATASET)
 #   IF THE DATA OBJECT HAS NO SCHEMA PREFIX (E.G., FILE-GEODATABASE FEATURE-CLASS), RETURNS ""
 def get_schema_prefix(the_data_object):
@@ -378,660 +1203,2737 @@ def get_name(the_data_object):
    else:
       return the_data_object[i + 1:len(the_data_object)]
 
-#THIS FUNCTION DELETES ROWS OF A TARGET DATA-OBJECT AND APPENDS ROWS TO TARGET DATA-OBJECT FROM SOURCE DATA-OBJECT
+#THIS FUNCTION DELETES ROWS OF A TARGET DATA-OBJECT AND STREAMS ROWS TO TARGET DATA-OBJECT FROM SOURCE DATA-OBJECT
+#   (SEE stream_rows()).
+#   IF load_strategy IS "delta" AND A KEY FIELD IS GIVEN, ONLY ROWS THAT ARE NEW, DIFFERENT, OR GONE ARE INSERTED, UPDATED,
+#   OR DELETED (SEE apply_delta()) INSTEAD. IF A DELTA CAN'T BE APPLIED, ALL ROWS ARE RE-LOADED.
 #   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT
 #   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT
-def load_rows(source_obj, target_obj):
+#   THE THIRD ARGUMENT IS OPTIONAL. THE KEY FIELD (THE FREIGHT CAR'S sort_field).
+#   THE FOURTH ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   THE FIFTH ARGUMENT IS OPTIONAL. KEY RANGES WHERE THE DATA OBJECTS DIFFER (SEE compare_objects()), IF KNOWN.
+#   THE SIXTH ARGUMENT IS OPTIONAL. THE SOURCE DATA-OBJECT'S FINGERPRINT (SEE compare_objects()), IF KNOWN.
+#   THE SEVENTH ARGUMENT IS OPTIONAL. IF GIVEN, THE INCREMENT OF AN INCREMENTAL DATA-OBJECT (SEE load_increment()); ONLY
+#      SOURCE ROWS EDITED SINCE THE WATERMARK ARE LOADED. IF THE INCREMENT CAN'T BE LOADED, ALL ROWS ARE RE-LOADED.
+#   IF load_strategy IS "chunked", ROWS ARE LOADED IN COMMITTED, RESUMABLE CHUNKS (SEE load_rows_in_chunks()).
+#   IF load_strategy IS "swap", ROWS ARE LOADED INTO A STAGING COPY THAT IS SWAPPED IN (SEE load_rows_by_swap()). IF IT
+#   CAN'T BE SWAPPED IN, ALL ROWS ARE RE-LOADED.
+#   THE EIGHTH ARGUMENT IS OPTIONAL. THE FREIGHT CAR'S PARTITIONING (SEE get_partitioning()); WHEN ALL ROWS ARE STREAMED
+#      (RE-LOADED, OR INTO A STAGING COPY), A LARGE SOURCE DATA-OBJECT'S ROWS ARE STREAMED IN PARTITIONS (SEE
+#      get_partitions()).
+#   RETURNS A DICTIONARY THAT DESCRIBES THE LOAD (SEE describe_load()), W/ THESE KEYS:
+#      strategy     "reload", "partitioned", "delta", "chunked", "swap", "incremental", OR "archive"
+#      inserted     NUMBER OF ROWS INSERTED (None IF RE-LOADED)
+#      updated      NUMBER OF ROWS UPDATED (None IF NOT A DELTA, INCREMENTAL, OR ARCHIVE)
+#      deleted      NUMBER OF ROWS DELETED (None IF NOT A DELTA, OR IF INCREMENTAL AND KEYS WEREN'T RECONCILED)
+#      chunks       NUMBER OF CHUNKS (None IF NOT CHUNKED)
+#      source_rows  NUMBER OF SOURCE ROWS, IF COUNTED ALONG THE WAY (OTHERWISE None)
+#      target_rows  NUMBER OF TARGET ROWS AFTER THE LOAD, IF COUNTED ALONG THE WAY (OTHERWISE None)
+#      bytes        APPROXIMATE NUMBER OF BYTES STREAMED (SEE get_row_bytes()), IF COUNTED (OTHERWISE None)
+#      since        IF INCREMENTAL OR ARCHIVE, THE WATERMARK THAT ROWS WERE EDITED SINCE (SEE format_watermark())
+#      partitions   IF PARTITIONED (OR SWAP W/ A PARTITIONED STAGING COPY), THE NUMBER OF PARTITIONS
+def load_rows(source_obj, target_obj, key_field = None, non_spatial = False, key_ranges = None, source_fingerprint = None, the_increment = None, the_partitioning = None):
+   if the_increment != None:
+      the_load = load_increment(source_obj, target_obj, key_field, non_spatial, the_increment)
+      if the_load != None:
+         return the_load
+      make_note("Couldn't load an increment of " + target_obj + " (key field " + str(key_field) + " must be in both data-objects and have unique, non-null values, and watermark field " + the_increment["watermark_field"] + " must be a date or number field of the source data-object, unless it is archived). Re-loading all rows instead.", True, True)
+   if load_strategy == "delta" and key_field != None:
+      phase_start = time.time()
+      the_load = apply_delta(source_obj, target_obj, key_field, non_spatial, key_ranges)
+      add_phase_time(car_phases, "delta", phase_start)
+      if the_load != None:
+         return the_load
+      make_note("Couldn't apply a delta to " + target_obj + " (key field " + key_field + " must be in both data-objects and have unique, non-null values). Re-loading all rows instead.", True, True)
+   if load_strategy == "chunked":
+      return load_rows_in_chunks(source_obj, target_obj, non_spatial)
+   if load_strategy == "swap":
+      the_load = load_rows_by_swap(source_obj, target_obj, non_spatial, source_fingerprint, the_partitioning)
+      if the_load != None:
+         return the_load
+      make_note("Couldn't swap in a staging copy of " + target_obj + ". Re-loading all rows instead.", True, True)
+   return stream_rows(source_obj, target_obj, non_spatial, the_partitioning)
+
+#THIS FUNCTION DELETES ROWS OF A TARGET DATA-OBJECT AND STREAMS ALL ROWS OF A SOURCE DATA-OBJECT INTO IT (SEE copy_rows();
+#   IN AN EDIT SESSION IF THE TARGET DATA-OBJECT IS VERSIONED). ONLY FIELDS THAT ARE IN BOTH DATA-OBJECTS ARE WRITTEN. ROWS
+#   AND BYTES ARE COUNTED AS THEY'RE STREAMED, SO THE DATA OBJECTS DON'T NEED TO BE COUNTED AFTERWARDS.
+#   IF THE SOURCE DATA-OBJECT IS LARGE ENOUGH TO BE PARTITIONED (SEE get_partitions()) AND THE TARGET DATA-OBJECT ISN'T
+#   VERSIONED (PARTITIONS CAN'T SHARE AN EDIT SESSION), ITS ROWS ARE STREAMED IN PARTITIONS BY SEVERAL WORKER PROCESSES
+#   (SEE copy_partitions()) INSTEAD, AND THE TARGET DATA-OBJECT IS COUNTED AFTERWARDS TO VERIFY THE MERGED LOAD AGAINST
+#   THE SOURCE ROW-COUNT THAT THE PARTITIONS WERE SPLIT FROM.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE THIRD ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   THE FOURTH ARGUMENT IS OPTIONAL. THE FREIGHT CAR'S PARTITIONING (SEE get_partitioning()).
+#   RETURNS A DICTIONARY THAT DESCRIBES THE LOAD (SEE load_rows()).
+def stream_rows(source_obj, target_obj, non_spatial = False, the_partitioning = None):
+   target_fields = get_fingerprint_fields(target_obj)
+   source_fields = get_fingerprint_fields(source_obj, target_fields)
+   target_fields = get_fingerprint_fields(target_obj, source_fields)
+   if non_spatial == False:
+      source_fields.append("SHAPE@")
+      target_fields.append("SHAPE@")
+   target_versioned = getattr(arcpy.Describe(target_obj), "isVersioned", False)
+   the_partitions = None
+   if target_versioned == False:
+      the_partitions = get_partitions(source_obj, the_partitioning)
+   phase_start = time.time()
    arcpy.DeleteRows_management(target_obj)
-   arcpy.Append_management(source_obj, target_obj, "NO_TEST")
+   phase_start = add_phase_time(car_phases, "delete", phase_start)
+   if the_partitions != None:
+      bytes_streamed = copy_partitions(source_obj, source_fields, target_obj, target_fields, the_partitions[0])[1]
+      phase_start = add_phase_time(car_phases, "append", phase_start)
+      target_row_count = int(get_count(target_obj))
+      add_phase_time(car_phases, "count", phase_start)
+      return {"strategy":"partitioned","inserted":None,"updated":None,"deleted":None,"chunks":None,"source_rows":the_partitions[1],"target_rows":target_row_count,"bytes":bytes_streamed,"partitions":len(the_partitions[0])}
+   the_editor = None
+   if target_versioned == True:
+      the_editor = arcpy.da.Editor(target_gdb)
+      the_editor.startEditing(False, True)
+      the_editor.startOperation()
+   try:
+      rows_streamed, bytes_streamed = copy_rows(source_obj, source_fields, target_obj, target_fields)
+      if the_editor != None:
+         the_editor.stopOperation()
+         the_editor.stopEditing(True)
+   except:
+      if the_editor != None:
+         the_editor.abortOperation()
+         the_editor.stopEditing(False)
+      raise
+   add_phase_time(car_phases, "append", phase_start)
+   return {"strategy":"reload","inserted":None,"updated":None,"deleted":None,"chunks":None,"source_rows":rows_streamed,"target_rows":rows_streamed,"bytes":bytes_streamed}
+
+#THIS FUNCTION RETURNS A FREIGHT CAR'S PARTITIONING: A LIST [THRESHOLD (ROWS), NUMBER OF PARTITIONS] (SEE partition_rows AND
+#   partition_workers). EACH IS TAKEN FROM THE DATA OBJECT'S A_XCHANGE_PARAMETERS ROW (SEE PARTITION_PARAM_FIELDS) IF IT HAS
+#   A VALUE THERE, OTHERWISE FROM THE MAJOR VARIABLE.
+#   THE FIRST ARGUMENT IS OPTIONAL. THE DATA OBJECT'S PARTITION_ROWS VALUE (None IF NULL OR N/A).
+#   THE SECOND ARGUMENT IS OPTIONAL. THE DATA OBJECT'S PARTITION_WORKERS VALUE (None IF NULL OR N/A).
+def get_partitioning(rows_value = None, workers_value = None):
+   the_partitioning = [partition_rows, partition_workers]
+   if rows_value != None:
+      the_partitioning[0] = int(rows_value)
+   if workers_value != None:
+      the_partitioning[1] = int(workers_value)
+   return the_partitioning
+
+#THIS FUNCTION RETURNS THE NUMBER OF PARTITIONS THAT A DATA OBJECT'S ROWS ARE STREAMED IN PER A FREIGHT CAR'S PARTITIONING:
+#   1 (NOT PARTITIONED) IF THE THRESHOLD IS 0 OR THE DATA OBJECT HAS FEWER ROWS THAN THE THRESHOLD, OTHERWISE THE
+#   PARTITIONING'S NUMBER OF PARTITIONS (BUT NO MORE THAN THE ROW COUNT).
+#   THE FIRST ARGUMENT IS THE DATA OBJECT'S ROW COUNT.
+#   THE SECOND ARGUMENT IS THE FREIGHT CAR'S PARTITIONING (SEE get_partitioning()), OR None.
+def get_partition_count(row_count, the_partitioning):
+   if the_partitioning == None or the_partitioning[0] <= 0 or row_count < the_partitioning[0]:
+      return 1
+   return max(1, min(the_partitioning[1], row_count))
+
+#THIS FUNCTION RETURNS THE OBJECTID-RANGE PARTITIONS (SEE get_oid_partitions()) THAT A SOURCE DATA-OBJECT'S ROWS ARE
+#   STREAMED IN PER A FREIGHT CAR'S PARTITIONING (SEE get_partition_count()), OR None IF THEY AREN'T PARTITIONED. THE
+#   SOURCE DATA-OBJECT IS ONLY COUNTED IF THE PARTITIONING CAN SPLIT IT. ROWS AREN'T PARTITIONED IF THIS IS A WORKER
+#   PROCESS (SEE parallel_workers; IT CAN'T START PARTITION WORKERS) OR IF THE TARGET GEODATABASE ISN'T AN ENTERPRISE
+#   GEODATABASE (A FILE GEODATABASE ALLOWS ONLY ONE WRITER PER TABLE).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE FREIGHT CAR'S PARTITIONING (SEE get_partitioning()), OR None.
+#   RETURNS A LIST: [LIST OF PARTITIONS, SOURCE DATA-OBJECT'S ROW COUNT (TO VERIFY THE MERGED LOAD AGAINST)]
+def get_partitions(source_obj, the_partitioning):
+   if the_partitioning == None or the_partitioning[0] <= 0 or the_partitioning[1] <= 1:
+      return None
+   phase_start = time.time()
+   row_count = int(get_count(source_obj))
+   partition_count = get_partition_count(row_count, the_partitioning)
+   the_partitions = None
+   if partition_count > 1:
+      if multiprocessing.current_process().daemon == True:
+         make_note("Not partitioning " + source_obj + " (" + str(row_count) + " rows): it's sent by a worker process, which can't start partition workers.", True)
+         partition_count = 1
+      elif getattr(arcpy.Describe(target_gdb), "workspaceType", None) != "RemoteDatabase":
+         make_note("Not partitioning " + source_obj + " (" + str(row_count) + " rows): the target geodatabase allows only one writer per table.", True)
+         partition_count = 1
+   if partition_count > 1:
+      the_partitions = get_oid_partitions(source_obj, row_count, partition_count)
+   add_phase_time(car_phases, "partition", phase_start)
+   if the_partitions == None or len(the_partitions) < 2:
+      return None
+   make_note("Split " + source_obj + " (" + str(row_count) + " rows) into " + str(len(the_partitions)) + " OBJECTID-range partitions: " + ", ".join(["[" + str(i[0]) + " .. " + str(i[1]) + "]" for i in the_partitions]) + ".", True)
+   return [the_partitions, row_count]
+
+#THIS FUNCTION SPLITS A DATA OBJECT'S ROWS INTO OBJECTID RANGES (PARTITIONS) W/ ABOUT THE SAME NUMBER OF ROWS EACH. ONLY
+#   OBJECTIDS ARE READ (IN OBJECTID ORDER), SO GAPS IN OBJECTIDS DON'T UNBALANCE THE PARTITIONS. THE FIRST PARTITION'S
+#   WHERE CLAUSE HAS NO LOWER BOUND AND THE LAST ONE'S HAS NO UPPER BOUND, SO TOGETHER THEY SELECT EVERY ROW.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS THE DATA OBJECT'S ROW COUNT.
+#   THE THIRD ARGUMENT IS THE NUMBER OF PARTITIONS.
+#   RETURNS A LIST OF PARTITIONS IN OBJECTID ORDER, EACH A LIST: [FIRST OBJECTID, LAST OBJECTID, WHERE CLAUSE (None IF THERE'S
+#   ONLY ONE PARTITION)]
+def get_oid_partitions(the_object, row_count, partition_count):
+   oid_field = arcpy.AddFieldDelimiters(the_object, arcpy.Describe(the_object).OIDFieldName)
+   partition_size = max(1, (row_count + partition_count - 1) // partition_count)
+   the_partitions = []
+   k = 0
+   the_cursor = arcpy.da.SearchCursor(the_object, ["OID@"], sql_clause = (None, "ORDER BY " + oid_field))
+   for a_row in the_cursor:
+      if k % partition_size == 0 and len(the_partitions) < partition_count:
+         the_partitions.append([a_row[0], a_row[0], None])
+      else:
+         the_partitions[-1][1] = a_row[0]
+      k += 1
+   del the_cursor
+   k = 0
+   while k < len(the_partitions):
+      the_clauses = []
+      if k > 0:
+         the_clauses.append(oid_field + " >= " + str(the_partitions[k][0]))
+      if k < len(the_partitions) - 1:
+         the_clauses.append(oid_field + " < " + str(the_partitions[k + 1][0]))
+      if len(the_clauses) > 0:
+         the_partitions[k][2] = " AND ".join(the_clauses)
+      k += 1
+   return the_partitions
+
+#THIS FUNCTION STREAMS ALL ROWS OF A SOURCE DATA-OBJECT INTO A TARGET DATA-OBJECT IN PARTITIONS (SEE get_oid_partitions()).
+#   EACH PARTITION IS READ AND WRITTEN BY ITS OWN WORKER PROCESS (SEE copy_partition_in_worker()), W/ ITS OWN CURSORS AND
+#   ITS OWN CONNECTIONS TO BOTH GEODATABASES, SO THAT ONE LARGE DATA-OBJECT IS LOADED OVER SEVERAL CONNECTIONS AT THE SAME
+#   TIME. WORKERS REPORT THROUGH A QUEUE; WHEN ALL WORKERS ARE DONE, THEIR ROW AND BYTE COUNTS ARE MERGED AND EACH
+#   PARTITION'S THROUGHPUT IS NOTED. IF A WORKER FAILS (OR ITS PROCESS EXITS W/O REPORTING), THE OTHER WORKERS FINISH
+#   THEIR PARTITIONS AND THEN AN EXCEPTION IS RAISED.
+#   THE FIRST TO FOURTH ARGUMENTS ARE THE SAME AS copy_rows()'S.
+#   THE FIFTH ARGUMENT IS THE LIST OF PARTITIONS.
+#   RETURNS A LIST: [ROWS STREAMED, APPROXIMATE BYTES STREAMED (SEE get_row_bytes())]
+def copy_partitions(source_obj, source_fields, target_obj, target_fields, the_partitions):
+   the_results = multiprocessing.Queue()
+   the_workers = []
+   k = 0
+   while k < len(the_partitions):
+      the_worker = {"partition":the_partitions[k],"rows":0,"bytes":0,"seconds":None,"error":None,"done":False}
+      the_worker["process"] = multiprocessing.Process(target = copy_partition_in_worker, args = [source_obj, source_fields, target_obj, target_fields, the_partitions[k][2], k, the_results, pipeline_queue_mb])
+      the_worker["process"].daemon = True
+      the_worker["process"].start()
+      the_workers.append(the_worker)
+      k += 1
+   #WAIT FOR EVERY WORKER TO REPORT (OR FOR ITS PROCESS TO EXIT W/O REPORTING)
+   workers_left = len(the_workers)
+   while workers_left > 0:
+      exited_workers = [i for i in the_workers if i["done"] == False and i["process"].exitcode != None]
+      try:
+         the_result = the_results.get(True, 5)
+      except Queue.Empty:
+         #(A WORKER THAT HAD EXITED BEFORE THE WAIT WOULD HAVE REPORTED BY NOW)
+         for a_worker in exited_workers:
+            a_worker["error"] = "Worker process exited (exit code " + str(a_worker["process"].exitcode) + ") w/o reporting."
+            a_worker["done"] = True
+            workers_left -= 1
+         continue
+      the_worker = the_workers[the_result[0]]
+      the_worker["rows"], the_worker["bytes"], the_worker["seconds"], the_worker["error"] = the_result[1:]
+      the_worker["done"] = True
+      workers_left -= 1
+   for a_worker in the_workers:
+      a_worker["process"].join()
+   rows_streamed = 0
+   bytes_streamed = 0
+   the_error = None
+   k = 0
+   while k < len(the_workers):
+      the_worker = the_workers[k]
+      k += 1
+      if the_worker["error"] != None:
+         make_note("Partition " + str(k) + " of " + str(len(the_workers)) + " of " + target_obj + " (OBJECTID " + str(the_worker["partition"][0]) + " to " + str(the_worker["partition"][1]) + ") failed:\n" + the_worker["error"], True, True)
+         if the_error == None:
+            the_error = "Partition " + str(k) + " of " + str(len(the_workers)) + " of " + target_obj + " failed."
+         continue
+      rows_streamed += the_worker["rows"]
+      bytes_streamed += the_worker["bytes"]
+      partition_time = max(the_worker["seconds"], 0.001)
+      make_note("Loaded partition " + str(k) + " of " + str(len(the_workers)) + " of " + target_obj + ": OBJECTID " + str(the_worker["partition"][0]) + " to " + str(the_worker["partition"][1]) + ", " + str(the_worker["rows"]) + " rows in " + str(round(partition_time, 1)) + " seconds (" + str(int(the_worker["rows"] / partition_time)) + " rows/second).", True)
+   if the_error != None:
+      raise Exception(the_error)
+   return [rows_streamed, bytes_streamed]
+
+#THIS FUNCTION IS RUN IN A WORKER PROCESS OF copy_partitions() TO STREAM ONE PARTITION'S ROWS (SEE copy_rows()). IT PUTS
+#   A LIST ON THE RESULT QUEUE: [PARTITION'S INDEX, ROWS STREAMED, APPROXIMATE BYTES STREAMED, SECONDS, ERROR (None, OR A
+#   DESCRIPTION OF THE ERROR)].
+#   THE FIRST TO FOURTH ARGUMENTS ARE THE SAME AS copy_rows()'S.
+#   THE FIFTH ARGUMENT IS THE PARTITION'S WHERE CLAUSE.
+#   THE SIXTH ARGUMENT IS THE PARTITION'S INDEX (IN THE LIST OF PARTITIONS).
+#   THE SEVENTH ARGUMENT IS THE RESULT QUEUE (A multiprocessing.Queue).
+#   THE EIGHTH ARGUMENT IS THE MAIN PROCESS'S pipeline_queue_mb.
+def copy_partition_in_worker(source_obj, source_fields, target_obj, target_fields, where_clause, the_index, the_results, queue_mb):
+   global pipeline_queue_mb
+   pipeline_queue_mb = queue_mb
+   the_start = time.time()
+   try:
+      rows_streamed, bytes_streamed = copy_rows(source_obj, source_fields, target_obj, target_fields, where_clause)
+      the_results.put([the_index, rows_streamed, bytes_streamed, time.time() - the_start, None])
+   except:
+      the_results.put([the_index, 0, 0, time.time() - the_start, traceback.format_exc() + "arcpy Messages:  " + arcpy.GetMessages()])
+
+#THIS FUNCTION STREAMS ALL ROWS OF A SOURCE DATA-OBJECT INTO A TARGET DATA-OBJECT W/ AN INSERT CURSOR. IF pipeline_queue_mb
+#   ISN'T 0, THE SOURCE ROWS ARE READ IN A BACKGROUND THREAD (SEE RowReader) WHILE THEY ARE WRITTEN; OTHERWISE, THEY ARE READ
+#   W/ A SEARCH CURSOR ON THIS THREAD, ONE ROW AT A TIME.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE LIST OF SOURCE FIELDS TO READ.
+#   THE THIRD ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE FOURTH ARGUMENT IS THE LIST OF TARGET FIELDS TO WRITE (SAME ORDER AS THE SOURCE FIELDS).
+#   THE FIFTH ARGUMENT IS OPTIONAL. A WHERE CLAUSE THAT SELECTS THE SOURCE ROWS TO STREAM (E.G., A PARTITION'S); ALL ROWS IF
+#      None.
+#   RETURNS A LIST: [ROWS STREAMED, APPROXIMATE BYTES STREAMED (SEE get_row_bytes())]
+def copy_rows(source_obj, source_fields, target_obj, target_fields, where_clause = None):
+   insert_cursor = arcpy.da.InsertCursor(target_obj, target_fields)
+   rows_streamed = 0
+   bytes_streamed = 0
+   try:
+      if pipeline_queue_mb > 0:
+         the_reader = RowReader(source_obj, source_fields, where_clause)
+         try:
+            for a_batch in the_reader.batches():
+               for a_row in a_batch[0]:
+                  insert_cursor.insertRow(a_row)
+               rows_streamed += len(a_batch[0])
+               bytes_streamed += a_batch[1]
+         except:
+            the_reader.stop()
+            raise
+      else:
+         the_cursor = arcpy.da.SearchCursor(source_obj, source_fields, where_clause)
+         try:
+            for a_row in the_cursor:
+               bytes_streamed += get_row_bytes(a_row)
+               insert_cursor.insertRow(a_row)
+               rows_streamed += 1
+         finally:
+            del the_cursor
+   finally:
+      del insert_cursor
+   return [rows_streamed, bytes_streamed]
+
+#THIS CLASS READS ALL ROWS OF A DATA OBJECT W/ A SEARCH CURSOR FROM A BACKGROUND THREAD INTO A BOUNDED QUEUE, SO THAT
+#   READING A SOURCE DATA-OBJECT OVERLAPS WRITING A TARGET DATA-OBJECT (SEE copy_rows()). ROWS ARE QUEUED IN BATCHES OF UP
+#   TO PIPELINE_BATCH_ROWS ROWS OR ABOUT 1/PIPELINE_BATCHES OF pipeline_queue_mb; WHEN PIPELINE_BATCHES BATCHES ARE QUEUED,
+#   THE THREAD WAITS FOR ONE TO BE TAKEN. batches() YIELDS THE BATCHES AND THEN RAISES ANY ERROR THAT THE THREAD HAD.
+#   stop() STOPS THE THREAD (E.G., IF WRITING FAILED). IF A WHERE CLAUSE IS GIVEN, ONLY THE ROWS IT SELECTS ARE READ.
+class RowReader(object):
+   def __init__(self, the_object, the_fields, where_clause = None):
+      self.object = the_object
+      self.fields = the_fields
+      self.where_clause = where_clause
+      self.queue = Queue.Queue(PIPELINE_BATCHES)
+      self.stopping = threading.Event()
+      self.error = None
+      self.thread = threading.Thread(target = self.run)
+      self.thread.daemon = True
+      self.thread.start()
+
+   #YIELDS BATCHES OF ROWS ([LIST OF ROWS, APPROXIMATE BYTES (SEE get_row_bytes())]) AS THEY'RE READ, UNTIL ALL ROWS ARE READ
+   def batches(self):
+      the_batch = self.queue.get()
+      while the_batch != None:
+         yield the_batch
+         the_batch = self.queue.get()
+      self.thread.join()
+      if self.error != None:
+         raise self.error[0], self.error[1], self.error[2]
+
+   #STOPS THE THREAD (ROWS THAT ARE STILL QUEUED OR UNREAD ARE DROPPED)
+   def stop(self):
+      self.stopping.set()
+      self.thread.join()
+
+   #QUEUES A BATCH (OR None, AFTER THE LAST BATCH), WAITING WHILE THE QUEUE IS FULL. RETURNS False IF THE THREAD IS STOPPED.
+   def put(self, the_batch):
+      while self.stopping.is_set() == False:
+         try:
+            self.queue.put(the_batch, True, 1)
+            return True
+         except Queue.Full:
+            pass
+      return False
+
+   #THE THREAD: READS ROWS INTO BATCHES AND QUEUES THEM, THEN QUEUES None
+   def run(self):
+      batch_bytes = pipeline_queue_mb * 1048576 / PIPELINE_BATCHES
+      try:
+         the_cursor = arcpy.da.SearchCursor(self.object, self.fields, self.where_clause)
+         try:
+            the_batch = [[], 0]
+            for a_row in the_cursor:
+               the_batch[0].append(a_row)
+               the_batch[1] += get_row_bytes(a_row)
+               if len(the_batch[0]) >= PIPELINE_BATCH_ROWS or the_batch[1] >= batch_bytes:
+                  if self.put(the_batch) == False:
+                     return
+                  the_batch = [[], 0]
+            if len(the_batch[0]) > 0 and self.put(the_batch) == False:
+               return
+         finally:
+            del the_cursor
+      except:
+         self.error = sys.exc_info()
+      self.put(None)
+
+#THIS FUNCTION RETURNS THE APPROXIMATE SIZE IN BYTES OF A ROW READ W/ A CURSOR: THE LENGTH OF TEXT AND BINARY VALUES,
+#   16 BYTES PER VERTEX OF GEOMETRY, AND 8 BYTES FOR ANY OTHER VALUE THAT ISN'T NULL.
+#   THE FIRST ARGUMENT IS THE ROW (A LIST OR TUPLE OF VALUES).
+def get_row_bytes(the_row):
+   the_bytes = 0
+   for a_value in the_row:
+      if a_value == None:
+         continue
+      elif isinstance(a_value, (basestring, bytearray, buffer)):
+         the_bytes += len(a_value)
+      elif hasattr(a_value, "pointCount"):
+         the_bytes += 16 * a_value.pointCount
+      else:
+         the_bytes += 8
+   return the_bytes
+
+#THIS FUNCTION RETURNS A DESCRIPTION OF A LOAD (SEE load_rows()) TO ADD TO NOTES: "" IF ALL ROWS WERE RE-LOADED,
+#   OTHERWISE THE DELTA'S SIZE OR THE NUMBER OF CHUNKS. FOR EXAMPLE:
+#      " (delta: 3 inserted, 1 updated, 0 deleted)"
+#      " (chunked: 250000 rows in 5 chunks)"
+#      " (partitioned: 2000000 rows in 4 OBJECTID ranges)"
+#      " (swapped in staging copy w/ 250000 rows)"
+#      " (incremental since 2019-09-25 22:14:03: 12 inserted, 240 updated, 3 deleted by key reconciliation)"
+#      " (from archive since 2019-09-25 22:14:03: 12 inserted, 240 updated, 3 deleted)"
+def describe_load(the_load):
+   if the_load["strategy"] == "delta":
+      return " (delta: " + str(the_load["inserted"]) + " inserted, " + str(the_load["updated"]) + " updated, " + str(the_load["deleted"]) + " deleted)"
+   if the_load["strategy"] == "chunked":
+      return " (chunked: " + str(the_load["inserted"]) + " rows in " + str(the_load["chunks"]) + " chunks)"
+   if the_load["strategy"] == "partitioned":
+      return " (partitioned: " + str(the_load["source_rows"]) + " rows in " + str(the_load["partitions"]) + " OBJECTID ranges)"
+   if the_load["strategy"] == "swap":
+      if the_load.get("partitions") != None:
+         return " (swapped in staging copy w/ " + str(the_load["inserted"]) + " rows, loaded in " + str(the_load["partitions"]) + " partitions)"
+      return " (swapped in staging copy w/ " + str(the_load["inserted"]) + " rows)"
+   if the_load["strategy"] == "incremental":
+      the_description = " (incremental since " + the_load["since"] + ": " + str(the_load["inserted"]) + " inserted, " + str(the_load["updated"]) + " updated"
+      if the_load["deleted"] != None:
+         the_description += ", " + str(the_load["deleted"]) + " deleted by key reconciliation"
+      return the_description + ")"
+   if the_load["strategy"] == "archive":
+      return " (from archive since " + the_load["since"] + ": " + str(the_load["inserted"]) + " inserted, " + str(the_load["updated"]) + " updated, " + str(the_load["deleted"]) + " deleted)"
+   return ""
+
+#THIS FUNCTION RETURNS A COPY OF A GIVEN WKB GEOMETRY (WELL-KNOWN BINARY, AS A STRING) W/O Z-VALUES AND/OR
+#   M-VALUES. COORDINATES ARE COPIED AS BYTES (NOT CONVERTED), SO A 2D COPY OF A 3D GEOMETRY IS BYTE-FOR-BYTE
+#   THE SAME AS THE WKB OF THE SAME GEOMETRY STORED W/O Z-VALUES.
+#   THE SECOND AND THIRD ARGUMENTS ARE BOOLEANS TO INDICATE IF Z-VALUES AND M-VALUES ARE KEPT.
+def strip_wkb(the_wkb, keep_z = False, keep_m = False):
+   the_output = []
+   strip_wkb_part(str(the_wkb), 0, keep_z, keep_m, the_output)
+   return "".join(the_output)
+
+#THIS FUNCTION IS USED BY strip_wkb() TO COPY ONE WKB GEOMETRY (WHICH CAN BE A PART OF A MULTI-PART GEOMETRY).
+#   THE FIRST ARGUMENT IS THE WKB STRING. THE SECOND ARGUMENT IS THE POSITION OF THE GEOMETRY IN THE WKB STRING.
+#   THE THIRD AND FOURTH ARGUMENTS ARE THE SAME AS strip_wkb()'S. THE FIFTH ARGUMENT IS A LIST THAT COLLECTS OUTPUT.
+#   RETURNS THE POSITION AFTER THE GEOMETRY.
+def strip_wkb_part(the_wkb, pos, keep_z, keep_m, the_output):
+   if the_wkb[pos] == "\x01":
+      the_order = "<"
+   else:
+      the_order = ">"
+   the_type = struct.unpack(the_order + "I", the_wkb[pos + 1:pos + 5])[0]
+   has_z = the_type & 0x80000000 != 0
+   has_m = the_type & 0x40000000 != 0
+   the_type = the_type & 0x0FFFFFFF
+   if the_type >= 3000:
+      has_z = True
+      has_m = True
+   elif the_type >= 2000:
+      has_m = True
+   elif the_type >= 1000:
+      has_z = True
+   the_type = the_type % 1000
+   dims = 2 + int(has_z) + int(has_m)
+   kept_dims = [0, 1]
+   new_type = the_type
+   if has_z and keep_z:
+      kept_dims.append(2)
+      new_type += 1000
+   if has_m and keep_m:
+      kept_dims.append(dims - 1)
+      new_type += 2000
+   the_output.append(the_wkb[pos] + struct.pack(the_order + "I", new_type))
+   pos += 5
+   #POINT
+   if the_type == 1:
+      point_counts = [1]
+   #LINESTRING
+   elif the_type == 2:
+      point_counts = [struct.unpack(the_order + "I", the_wkb[pos:pos + 4])[0]]
+   #POLYGON (RINGS)
+   elif the_type == 3:
+      point_counts = []
+      ring_count = struct.unpack(the_order + "I", the_wkb[pos:pos + 4])[0]
+      the_output.append(the_wkb[pos:pos + 4])
+      pos += 4
+      k = 0
+      while k < ring_count:
+         point_count = struct.unpack(the_order + "I", the_wkb[pos:pos + 4])[0]
+         pos = strip_wkb_coordinates(the_wkb, pos, point_count, dims, kept_dims, True, the_output)
+         k += 1
+      return pos
+   #MULTI-PART GEOMETRIES AND GEOMETRY COLLECTIONS
+   else:
+      part_count = struct.unpack(the_order + "I", the_wkb[pos:pos + 4])[0]
+      the_output.append(the_wkb[pos:pos + 4])
+      pos += 4
+      k = 0
+      while k < part_count:
+         pos = strip_wkb_part(the_wkb, pos, keep_z, keep_m, the_output)
+         k += 1
+      return pos
+   return strip_wkb_coordinates(the_wkb, pos, point_counts[0], dims, kept_dims, the_type != 1, the_output)
+
+#THIS FUNCTION IS USED BY strip_wkb_part() TO COPY A SEQUENCE OF COORDINATES, KEEPING ONLY GIVEN DIMENSIONS.
+#   RETURNS THE POSITION AFTER THE COORDINATES.
+def strip_wkb_coordinates(the_wkb, pos, point_count, dims, kept_dims, has_count, the_output):
+   if has_count == True:
+      the_output.append(the_wkb[pos:pos + 4])
+      pos += 4
+   end_pos = pos + point_count * dims * 8
+   if len(kept_dims) == dims:
+      the_output.append(the_wkb[pos:end_pos])
+   else:
+      the_values = array.array("d")
+      the_values.fromstring(the_wkb[pos:end_pos])
+      kept_values = array.array("d", [0.0]) * (point_count * len(kept_dims))
+      k = 0
+      while k < len(kept_dims):
+         kept_values[k::len(kept_dims)] = the_values[kept_dims[k]::dims]
+         k += 1
+      the_output.append(kept_values.tostring())
+   return end_pos
+
+#THIS FUNCTION RETURNS A GIVEN ATTRIBUTE VALUE AS A NORMALIZED STRING FOR FINGERPRINTING
+#   (SO THAT THE SAME VALUE READ FROM DIFFERENT KINDS OF GEODATABASES MAKES THE SAME STRING).
+def normalize_value(the_value):
+   if the_value == None:
+      return "\x00"
+   elif isinstance(the_value, unicode):
+      return the_value.encode("utf-8")
+   elif isinstance(the_value, float):
+      #(WHOLE-NUMBER FLOATS ARE NORMALIZED AS INTEGERS SO THAT 5.0 AND 5 ARE THE SAME)
+      if the_value.is_integer():
+         return str(int(the_value))
+      return repr(the_value)
+   elif isinstance(the_value, datetime.datetime):
+      return the_value.isoformat()
+   elif isinstance(the_value, (bytearray, buffer)):
+      return str(the_value)
+   else:
+      return str(the_value)
+
+#THIS FUNCTION RETURNS THE NAMES OF A TABLE'S OR FEATURE CLASS'S FIELDS THAT ARE FINGERPRINTED (SEE
+#   fingerprint_object()): ALL FIELDS EXCEPT FOR OBJECTID, GEOMETRY, GLOBALID, RASTER, AND GEOMETRY-DERIVED
+#   (SHAPE LENGTH AND AREA) FIELDS. NAMES ARE SORTED (ALL-CAPS ORDER).
+#   THE FIRST ARGUMENT IS THE TABLE OR FEATURE CLASS.
+#   THE SECOND ARGUMENT IS OPTIONAL. IF GIVEN, A LIST OF FIELD NAMES OF ANOTHER TABLE OR FEATURE CLASS; ONLY FIELDS
+#      THAT ARE IN BOTH ARE RETURNED (NOT CASE-SENSITIVE; NAMES ARE RETURNED AS SPELLED IN THE FIRST ARGUMENT).
+def get_fingerprint_fields(the_table, other_field_names = None):
+   the_description = arcpy.Describe(the_table)
+   derived_names = []
+   for an_attribute in ("lengthFieldName", "areaFieldName"):
+      if hasattr(the_description, an_attribute) and getattr(the_description, an_attribute) not in (None, ""):
+         derived_names.append(get_name(getattr(the_description, an_attribute)).upper())
+   if other_field_names != None:
+      other_field_names = [i.upper() for i in other_field_names]
+   the_field_names = []
+   for a_field in arcpy.ListFields(the_table):
+      the_name = a_field.name.upper()
+      if a_field.type in ("OID", "Geometry", "GlobalID", "Raster") or get_name(the_name) in derived_names:
+         continue
+      if the_name.startswith("SHAPE.") or the_name.startswith("SHAPE_"):
+         continue
+      if other_field_names != None and the_name not in other_field_names:
+         continue
+      the_field_names.append(a_field.name)
+   the_field_names.sort(key = lambda i: i.upper())
+   return the_field_names
+
+#THIS FUNCTION STREAMS THROUGH A TABLE OR FEATURE CLASS W/ A CURSOR AND RETURNS ITS FINGERPRINT: A DICTIONARY
+#   W/ THESE KEYS:
+#      digest       DIGEST (HEX STRING) OF THE DATA OBJECT'S ROWS. EACH ROW'S NORMALIZED ATTRIBUTE-VALUES AND
+#                   GEOMETRY ARE HASHED (MD5); THE DIGEST IS MADE FROM THE SUM OF ROW DIGESTS, SO IT DOESN'T
+#                   DEPEND ON THE ORDER IN WHICH ROWS ARE READ.
+#      row_count    NUMBER OF ROWS.
+#      chunks       IF A SORT FIELD IS GIVEN, A LIST OF [FIRST SORT-VALUE, LAST SORT-VALUE, ROW COUNT, DIGEST] LISTS
+#                   (DATE SORT-VALUES AS ISO-FORMAT STRINGS), ONE PER CHUNK OF ROWS IN SORT-FIELD ORDER. CHUNK BOUNDARIES
+#                   ARE PICKED BY SORT VALUE (WHERE A HASH OF THE SORT VALUE ENDS W/ FINGERPRINT_CHUNK_BITS ZERO
+#                   BITS), SO AN INSERTED OR DELETED ROW ONLY CHANGES THE CHUNK IT'S IN. OTHERWISE, None.
+#      fields       NAMES OF FINGERPRINTED FIELDS.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS OPTIONAL. THE SORT FIELD.
+#   THE THIRD ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   THE FOURTH ARGUMENT IS A LIST OF IGNORE OPTIONS (IGNORE_PARAM OR IGNORE_PARAM_T). "IGNORE_Z" AND "IGNORE_M"
+#      DROP Z-VALUES AND M-VALUES FROM GEOMETRY BEFORE HASHING.
+#   THE FIFTH ARGUMENT IS OPTIONAL. NAMES OF FIELDS TO FINGERPRINT (DEFAULT IS get_fingerprint_fields()).
+def fingerprint_object(the_object, sort_field = None, non_spatial = False, ignore_options = [], field_names = None):
+   if field_names == None:
+      field_names = get_fingerprint_fields(the_object)
+   the_cursor_fields = list(field_names)
+   #GEOMETRY IS READ AS WKB
+   if non_spatial == False:
+      the_cursor_fields.append("SHAPE@WKB")
+   strip_options = get_strip_options(the_object, non_spatial, ignore_options)
+   if sort_field != None:
+      the_cursor_fields.insert(0, sort_field)
+   the_fingerprint = None
+   #1ST TRY: STREAM IN SORT-FIELD ORDER AS SORTED BY THE DATABASE. IF THE DATABASE'S ORDER ISN'T PYTHON'S ORDER
+   #(E.G., CASE-INSENSITIVE COLLATION), 2ND TRY: SORT ROW DIGESTS IN MEMORY.
+   for sort_in_memory in (False, True):
+      if sort_field != None and sort_in_memory == False:
+         the_cursor = arcpy.da.SearchCursor(the_object, the_cursor_fields, sql_clause = (None, "ORDER BY " + sort_field))
+      else:
+         the_cursor = arcpy.da.SearchCursor(the_object, the_cursor_fields)
+      the_total = 0
+      row_count = 0
+      the_keyed_digests = []
+      the_chunks = []
+      out_of_order = False
+      previous_key = None
+      for a_row in the_cursor:
+         row_digest = get_row_digest(a_row[int(sort_field != None):], non_spatial, strip_options)
+         the_total = (the_total + row_digest) % FINGERPRINT_MODULUS
+         row_count += 1
+         if sort_field != None:
+            if sort_in_memory == True:
+               the_keyed_digests.append((a_row[0], row_digest))
+               continue
+            if row_count > 1 and a_row[0] < previous_key:
+               out_of_order = True
+               break
+            add_to_chunks(the_chunks, a_row[0], row_count == 1 or a_row[0] != previous_key, row_digest)
+            previous_key = a_row[0]
+      del the_cursor
+      if out_of_order == True:
+         continue
+      if sort_field != None and sort_in_memory == True:
+         the_keyed_digests.sort()
+         k = 0
+         while k < len(the_keyed_digests):
+            add_to_chunks(the_chunks, the_keyed_digests[k][0], k == 0 or the_keyed_digests[k][0] != the_keyed_digests[k - 1][0], the_keyed_digests[k][1])
+            k += 1
+         del the_keyed_digests
+      the_fingerprint = {"digest":hashlib.md5("%032x:%d" % (the_total, row_count)).hexdigest(),"row_count":row_count,"chunks":None,"fields":field_names}
+      if sort_field != None:
+         the_fingerprint["chunks"] = [[i[0], i[1], i[2], "%032x" % i[3]] for i in the_chunks]
+      break
+   return the_fingerprint
+
+#THIS FUNCTION RETURNS None IF A DATA OBJECT'S GEOMETRY IS HASHED AS IS (SEE get_row_digest()), OR A LIST OF 2 BOOLEANS
+#   [KEEP Z-VALUES, KEEP M-VALUES] IF GEOMETRY NEEDS TO BE STRIPPED (SEE strip_wkb()). GEOMETRY ONLY NEEDS TO BE STRIPPED
+#   IF THE DATA OBJECT HAS Z-VALUES OR M-VALUES AND THEY ARE IGNORED.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   THE THIRD ARGUMENT IS A LIST OF IGNORE OPTIONS (IGNORE_PARAM OR IGNORE_PARAM_T).
+def get_strip_options(the_object, non_spatial = False, ignore_options = []):
+   if non_spatial == True:
+      return None
+   the_description = arcpy.Describe(the_object)
+   if (getattr(the_description, "hasZ", False) and "IGNORE_Z" in ignore_options) or (getattr(the_description, "hasM", False) and "IGNORE_M" in ignore_options):
+      return ["IGNORE_Z" not in ignore_options, "IGNORE_M" not in ignore_options]
+   return None
+
+#THIS FUNCTION RETURNS A ROW DIGEST (INTEGER): THE MD5 HASH OF A ROW'S NORMALIZED VALUES (SEE normalize_value()).
+#   THE FIRST ARGUMENT IS THE ROW'S VALUES. IF THE DATA OBJECT IS SPATIAL, THE LAST VALUE IS ITS GEOMETRY AS WKB.
+#   THE SECOND ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   THE THIRD ARGUMENT IS THE DATA OBJECT'S get_strip_options().
+def get_row_digest(the_values, non_spatial = False, strip_options = None):
+   the_values = list(the_values)
+   if non_spatial == False and the_values[-1] != None:
+      if strip_options != None:
+         the_values[-1] = strip_wkb(the_values[-1], strip_options[0], strip_options[1])
+      else:
+         the_values[-1] = str(the_values[-1])
+   return int(hashlib.md5("\x1f".join([normalize_value(i) for i in the_values])).hexdigest(), 16)
+
+#THIS FUNCTION IS USED BY fingerprint_object() TO ADD A ROW DIGEST TO A FINGERPRINT'S CHUNKS (ROWS IN SORT-FIELD ORDER).
+#   THE FIRST ARGUMENT IS THE LIST OF CHUNKS ([FIRST SORT-VALUE, LAST SORT-VALUE, ROW COUNT, SUM OF ROW DIGESTS] LISTS).
+#   THE SECOND ARGUMENT IS THE ROW'S SORT VALUE.
+#   THE THIRD ARGUMENT IS A BOOLEAN TO INDICATE IF THE SORT VALUE IS DIFFERENT FROM THE PREVIOUS ROW'S (A NEW CHUNK CAN
+#      ONLY START WHERE THE SORT VALUE CHANGES).
+#   THE FOURTH ARGUMENT IS THE ROW DIGEST (INTEGER).
+def add_to_chunks(the_chunks, the_key, new_key, row_digest):
+   #SORT VALUES ARE KEPT AS NUMBERS/STRINGS (SO THAT RANGES SORT AND CAN BE QUERIED), DATES AS ISO-FORMAT STRINGS
+   if isinstance(the_key, (datetime.datetime, datetime.date)):
+      the_key = the_key.isoformat()
+   if new_key == True:
+      if len(the_chunks) == 0 or int(hashlib.md5(normalize_value(the_key)).hexdigest()[-8:], 16) % (2 ** FINGERPRINT_CHUNK_BITS) == 0:
+         the_chunks.append([the_key, the_key, 0, 0])
+   the_chunk = the_chunks[-1]
+   the_chunk[1] = the_key
+   the_chunk[2] += 1
+   the_chunk[3] = (the_chunk[3] + row_digest) % FINGERPRINT_MODULUS
+
+#THIS FUNCTION COMPARES 2 FINGERPRINTS (SEE fingerprint_object()).
+#   RETURNS A LIST: [True IF FINGERPRINTS ARE THE SAME (False OTHERWISE), DESCRIPTION OF WHERE THEY DIFFER ("" IF SAME)].
+#   THE DESCRIPTION LISTS SORT-VALUE RANGES OF CHUNKS THAT DIFFER (IF FINGERPRINTS HAVE CHUNKS).
+def compare_fingerprints(fingerprint_a, fingerprint_b):
+   if fingerprint_a["digest"] == fingerprint_b["digest"] and fingerprint_a["row_count"] == fingerprint_b["row_count"]:
+      return [True, ""]
+   the_description = "Row counts: " + str(fingerprint_a["row_count"]) + " and " + str(fingerprint_b["row_count"]) + "."
+   if fingerprint_a["chunks"] != None and fingerprint_b["chunks"] != None:
+      chunks_a = set([tuple(i) for i in fingerprint_a["chunks"]])
+      chunks_b = set([tuple(i) for i in fingerprint_b["chunks"]])
+      the_ranges = get_differing_ranges(fingerprint_a, fingerprint_b)
+      the_description += " " + str(len(chunks_a.symmetric_difference(chunks_b))) + " of " + str(len(chunks_a.union(chunks_b))) + " chunks differ"
+      if len(the_ranges) > 0:
+         the_description += ", in sort-field range(s): " + ", ".join(["[" + normalize_value(i[0]) + " .. " + normalize_value(i[1]) + "]" for i in the_ranges[0:10]])
+         if len(the_ranges) > 10:
+            the_description += " (and " + str(len(the_ranges) - 10) + " more)"
+      the_description += "."
+   return [False, the_description]
+
+#THIS FUNCTION RETURNS SORT-VALUE RANGES (LIST OF [FIRST SORT-VALUE, LAST SORT-VALUE] LISTS) OF
+#   CHUNKS THAT ARE IN ONLY ONE OF 2 GIVEN FINGERPRINTS. OVERLAPPING RANGES ARE MERGED.
+def get_differing_ranges(fingerprint_a, fingerprint_b):
+   chunks_a = set([tuple(i) for i in fingerprint_a["chunks"]])
+   chunks_b = set([tuple(i) for i in fingerprint_b["chunks"]])
+   the_ranges = []
+   for a_chunk in sorted(chunks_a.symmetric_difference(chunks_b), key = lambda i: (i[0], i[1])):
+      if len(the_ranges) > 0 and a_chunk[0] <= the_ranges[-1][1]:
+         if a_chunk[1] > the_ranges[-1][1]:
+            the_ranges[-1][1] = a_chunk[1]
+      else:
+         the_ranges.append([a_chunk[0], a_chunk[1]])
+   return the_ranges
 
 #THIS FUNCTION COMPARES 2 FEATURECLASSES OR 2 TABLES AND REPORTS ON WHETHER THEY ARE THE SAME DATA.
+#   THE DATA OBJECTS ARE FINGERPRINTED (SEE fingerprint_object()) OVER THE FIELDS THAT THEY HAVE IN COMMON, HONORING
+#   IGNORE_PARAM (OR IGNORE_PARAM_T) OPTIONS. ONLY DATA (ATTRIBUTE VALUES AND GEOMETRY) IS COMPARED; SCHEMA ISN'T.
 #   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
 #   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
 #   THE THIRD ARGUMENT IS A BUSINESS-FIELD NAME FOR FIELD TO BE USED FOR SORTING THE DATA OBJECTS
 #      FOR COMPARING.
 #   THE FOURTH ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
 #      (True IF TABLE, False IF NOT TABLE)
-#   RETURNS "same" IF THE DATA OBJECTS ARE THE SAME.
-#   RETURNS "different" IF THE DATA OBJECTS ARE DIFFERENT.
-#   RETURNS "error" IF SOMETHING GOES WRONG, LIKE THE BUSINESS FIELD NOT EXISTING IN ONE OF THE DATA OBJECTS
-def compare_objects(source_obj = "", target_obj = "", sort_field = "", non_spatial = False):
+#   THE FIFTH ARGUMENT IS OPTIONAL. THE DATA OBJECT'S KEY IN THE STATE STORE (SEE get_delivered_fingerprint()). IF
+#      GIVEN, THE SOURCE DATA-OBJECT'S FINGERPRINT IS FIRST CHECKED AGAINST THE FINGERPRINT OF WHAT WAS LAST DELIVERED
+#      TO (OR VERIFIED IN) THE TARGET. IF THEY MATCH AND THE STATE STORE'S ENTRY ISN'T OLDER THAN state_store_days,
+#      THE TARGET DATA-OBJECT ISN'T READ. WHEN THE TARGET IS READ AND IS THE SAME, THE STATE STORE'S ENTRY IS UPDATED.
+#   THE SIXTH ARGUMENT IS OPTIONAL. THE SOURCE DATA-OBJECT'S ENTRY IN THE SOURCE GEODATABASE'S A_XCHANGE_DIGEST TABLE
+#      (SEE read_digest_table()). IF GIVEN (AND THE STATE STORE IS USED), IT IS CHECKED AGAINST THE FINGERPRINT OF WHAT
+#      WAS LAST DELIVERED BEFORE ANY DATA IS READ. IF THEY MATCH, NEITHER DATA OBJECT IS READ.
+#   RETURNS A LIST: [RESULT, DESCRIPTION OF THE COMPARISON ("" IF N/A), SORT-FIELD RANGES WHERE THE DATA OBJECTS DIFFER
+#   (SEE get_differing_ranges(); None IF N/A), THE SOURCE DATA-OBJECT'S FINGERPRINT (None IF N/A)]. RESULT IS:
+#      "same" IF THE DATA OBJECTS ARE THE SAME.
+#      "different" IF THE DATA OBJECTS ARE DIFFERENT.
+#      "error" IF SOMETHING GOES WRONG, LIKE THE BUSINESS FIELD NOT EXISTING IN ONE OF THE DATA OBJECTS
+def compare_objects(source_obj = "", target_obj = "", sort_field = "", non_spatial = False, state_key = None, published_digest = None):
    try:
-      #IF DATA OBJECT IS SPATIAL
       if non_spatial == False:
-         the_result = arcpy.FeatureCompare_management(target_obj, source_obj, sort_field, "ALL", IGNORE_PARAM, "0 METERS", 0, 0, "#", "OBJECTID")
-         if the_result.getOutput(1) == "false":
-            return "different"
-         else:
-            return "same"
-      #OTHERWISE, IT MUST BE NON-SPATIAL
+         ignore_options = IGNORE_PARAM
       else:
-         the_result = arcpy.TableCompare_management(target_obj, source_obj, sort_field, "ALL", IGNORE_PARAM_T, "#", "OBJECTID")
-         if the_result.getOutput(1) == "false":
-            return "different"
-         else:
-            return "same"
+         ignore_options = IGNORE_PARAM_T
+      target_fields = get_fingerprint_fields(target_obj)
+      source_fields = get_fingerprint_fields(source_obj, target_fields)
+      target_fields = get_fingerprint_fields(target_obj, source_fields)
+      #FINGERPRINT OF WHAT WAS LAST DELIVERED (IF IT ISN'T TOO OLD TO BE TRUSTED)
+      the_delivery = get_trusted_delivery(state_key)
+      #IF THE SOURCE GEODATABASE PUBLISHES THAT THE SOURCE IS WHAT WAS LAST DELIVERED, NO DATA NEEDS TO BE READ
+      if the_delivery != None and published_digest != None:
+         if published_digest["digest"] == the_delivery[0]["digest"] and published_digest["row_count"] == the_delivery[0]["row_count"] and published_digest["fields_digest"] == get_fields_digest(the_delivery[0]["fields"]):
+            return ["same", "Source's A_XCHANGE_DIGEST entry (updated " + str(published_digest["updated"]) + ") matches what was delivered/verified on " + time.strftime("%Y%m%d-%H%M", time.localtime(the_delivery[1])) + " (no data read).", None, None]
+      source_fingerprint = fingerprint_object(source_obj, sort_field, non_spatial, ignore_options, source_fields)
+      #IF THE SOURCE IS WHAT WAS LAST DELIVERED, THE TARGET DOESN'T NEED TO BE READ
+      if the_delivery != None:
+         if the_delivery[0]["fields"] == source_fingerprint["fields"] and compare_fingerprints(source_fingerprint, the_delivery[0])[0] == True:
+            return ["same", "Source matches what was delivered/verified on " + time.strftime("%Y%m%d-%H%M", time.localtime(the_delivery[1])) + " (target not read).", None, source_fingerprint]
+      target_fingerprint = fingerprint_object(target_obj, sort_field, non_spatial, ignore_options, target_fields)
+      the_comparison = compare_fingerprints(source_fingerprint, target_fingerprint)
+      if the_comparison[0] == True:
+         if state_key != None:
+            save_delivered_fingerprint(state_key, source_fingerprint)
+         return ["same", "Source matches target.", None, source_fingerprint]
+      else:
+         return ["different", the_comparison[1], get_differing_ranges(source_fingerprint, target_fingerprint), source_fingerprint]
    except:
-      return "error"
+      return ["error", "", None, None]
 
-#THIS FUNCTION TAKES A DATA OBJECT AND RETURNS ITS ROW COUNT (AS STRING).
-def get_count(the_data_object):
-   return arcpy.GetCount_management(the_data_object).getOutput(0)
+#THIS FUNCTION OPENS (AND CREATES, IF NEEDED) THE SCRIPT'S STATE STORE: A SQLITE DATABASE (state_store_path) IN THE
+#   SCRIPT'S DIRECTORY THAT KEEPS TRACK OF WHAT HAS BEEN DELIVERED TO TARGET GEODATABASES. IT CAN BE OPENED BY SEVERAL
+#   PROCESSES AT THE SAME TIME (WORKER PROCESSES WAIT FOR EACH OTHER'S WRITES).
+#   RETURNS A sqlite3 CONNECTION. TABLES:
+#      delivered_fingerprints    FINGERPRINT (SEE fingerprint_object()) OF EACH DATA OBJECT AS LAST DELIVERED TO (OR
+#                                VERIFIED IN) A TARGET GEODATABASE, BY SOURCE GEODATABASE, TARGET GEODATABASE, AND
+#                                SOURCE DATA-OBJECT NAME. recorded IS THE TIME (SECONDS SINCE EPOCH) IT WAS RECORDED.
+#      load_progress             PROGRESS OF CHUNKED LOADS THAT HAVEN'T FINISHED (SEE load_rows_in_chunks()), BY TARGET
+#                                DATA-OBJECT (FULL PATH).
+#      runs                      RUN JOURNAL: ONE ROW PER RUN (SEE start_run()). finished IS NULL IF THE RUN DIDN'T
+#                                COMPLETE.
+#      run_cars                  RUN JOURNAL: STATE (SEE JOURNAL_STATES) AND A_XCHANGE_LOG NOTE OF EACH FREIGHT CAR OF A
+#                                RUN, BY SOURCE DATA-OBJECT NAME.
+#      watermarks                WATERMARK (SEE format_watermark()) OF EACH INCREMENTAL DATA-OBJECT AS LAST DELIVERED TO A
+#                                TARGET GEODATABASE, AND WHEN ITS KEYS WERE LAST RECONCILED (SEE load_increment()), BY
+#                                SOURCE GEODATABASE, TARGET GEODATABASE, AND SOURCE DATA-OBJECT NAME.
+#      car_timings               HOW LONG THE LAST FREIGHT CAR OF EACH DATA OBJECT TOOK TO SEND (AND ITS SOURCE ROW-COUNT),
+#                                BY SOURCE GEODATABASE, TARGET GEODATABASE, AND SOURCE DATA-OBJECT NAME (SEE
+#                                estimate_car_cost()).
+#      hub_log_dates             DATE (YYYY-MM-DD) OF THE LAST A_XCHANGE_LOG ENTRY THAT THE SCRIPT WROTE FOR EACH DATA
+#                                OBJECT (SEE flush_hub_log()), BY SOURCE GEODATABASE, TARGET GEODATABASE, AND SOURCE
+#                                DATA-OBJECT NAME.
+def open_state_store():
+   the_connection = sqlite3.connect(state_store_path, 60)
+   the_connection.execute("CREATE TABLE IF NOT EXISTS delivered_fingerprints (source_gdb TEXT, target_gdb TEXT, object_name TEXT, fingerprint TEXT, recorded REAL, PRIMARY KEY (source_gdb, target_gdb, object_name))")
+   the_connection.execute("CREATE TABLE IF NOT EXISTS load_progress (target_obj TEXT PRIMARY KEY, progress TEXT, recorded REAL)")
+   the_connection.execute("CREATE TABLE IF NOT EXISTS runs (run_id INTEGER PRIMARY KEY AUTOINCREMENT, source_gdb TEXT, target_gdb TEXT, started REAL, finished REAL)")
+   the_connection.execute("CREATE TABLE IF NOT EXISTS run_cars (run_id INTEGER, object_name TEXT, state TEXT, log_note TEXT, updated REAL, PRIMARY KEY (run_id, object_name))")
+   the_connection.execute("CREATE TABLE IF NOT EXISTS car_timings (source_gdb TEXT, target_gdb TEXT, object_name TEXT, row_count INTEGER, seconds REAL, recorded REAL, PRIMARY KEY (source_gdb, target_gdb, object_name))")
+   the_connection.execute("CREATE TABLE IF NOT EXISTS watermarks (source_gdb TEXT, target_gdb TEXT, object_name TEXT, watermark TEXT, reconciled REAL, recorded REAL, PRIMARY KEY (source_gdb, target_gdb, object_name))")
+   the_connection.execute("CREATE TABLE IF NOT EXISTS hub_log_dates (source_gdb TEXT, target_gdb TEXT, object_name TEXT, logged TEXT, PRIMARY KEY (source_gdb, target_gdb, object_name))")
+   the_connection.execute("CREATE TABLE IF NOT EXISTS freight_queue (queue_id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER, source_gdb TEXT, target_gdb TEXT, object_name TEXT, target_container TEXT, container_cap INTEGER, car TEXT, settings TEXT, hub_log_table TEXT, state TEXT, worker TEXT, lease_expires REAL, attempts INTEGER, result TEXT, published REAL, updated REAL)")
+   return the_connection
 
-#THIS FUNCTION SENDS A GIVEN MESSAGE TO AN EMAIL DISTRIBUTION-LIST
-#   THE FIRST ARGUMENT IS THE EMAIL'S SUBJECT STRING
-#   THE SECOND ARGUMENT IS THE EMAIL'S MESSAGE-CONTENT STRING
-def send_email(the_subject = "", the_message = ""):
-   the_header = 'From:  "Python" <' + email_from + '>\n'
-   the_header += "To:  VT DataRail Tools User\n"
-   the_header += "Subject:  " + the_subject + "\n"
-   #INSTANTIATE AN SMTP OBJECT
-   smtp_serv = smtplib.SMTP(email_server + ":" + email_port)
-   #SEND THE EMAIL
-   smtp_serv.sendmail(email_from, to_list, the_header + the_message)
-   #QUIT THE SERVER CONNECTION
-   smtp_serv.quit()
+#THIS FUNCTION RETURNS THE STATE STORE'S FINGERPRINT OF A DATA OBJECT AS LAST DELIVERED TO (OR VERIFIED IN) A TARGET
+#   GEODATABASE: A LIST [FINGERPRINT, TIME RECORDED (SECONDS SINCE EPOCH)], OR None IF THERE ISN'T ONE.
+#   THE ARGUMENT IS THE DATA OBJECT'S KEY: A LIST [SOURCE GEODATABASE, TARGET GEODATABASE, SOURCE DATA-OBJECT NAME].
+def get_delivered_fingerprint(state_key):
+   the_connection = open_state_store()
+   try:
+      the_row = the_connection.execute("SELECT fingerprint, recorded FROM delivered_fingerprints WHERE source_gdb = ? AND target_gdb = ? AND object_name = ?", state_key).fetchone()
+   finally:
+      the_connection.close()
+   if the_row == None:
+      return None
+   return [json.loads(the_row[0]), the_row[1]]
 
-#THIS FUNCTION RETURNS A LIST OF FIELD NAMES OF A GIVEN TABLE OR FEATURE CLASS, EXCLUDING FIELD NAMED OBJECTID AND FIELD NAMES THAT BEGIN WITH SHAPE
-#  ARGUMENT 1: THE TABLE OR FEATURE CLASS.
-#  ARGUMENT 2: OPTIONAL. A LIST OF FIELD NAMES TO BE EXCLUDED FROM THE OUTPUT LIST. MUST USE ALL-CAPS.
-def get_field_names(the_table, exclude_list = None):
-   the_fields = arcpy.ListFields(the_table)
-   the_field_names = []
-   for i in the_fields:
-      if i.name.upper() != "OBJECTID" and i.name.upper()[0:4] != "SHAPE":
-         if exclude_list:
-            if i.name.upper() not in exclude_list:
-               the_field_names.append(i.name)
-         else:
-            the_field_names.append(i.name)
-   return the_field_names
+#THIS FUNCTION RETURNS THE STATE STORE'S FINGERPRINT OF A DATA OBJECT AS LAST DELIVERED (SEE get_delivered_fingerprint())
+#   IF IT ISN'T OLDER THAN state_store_days, OTHERWISE None.
+#   THE ARGUMENT IS THE DATA OBJECT'S KEY IN THE STATE STORE, OR None IF THE STATE STORE ISN'T USED.
+def get_trusted_delivery(state_key):
+   if state_key == None:
+      return None
+   the_delivery = get_delivered_fingerprint(state_key)
+   if the_delivery != None and time.time() - the_delivery[1] >= state_store_days * 86400:
+      return None
+   return the_delivery
 
-#THIS FUNCTION TAKES A LIST OBJECT (1ST ARGUMENT) AND A STRING (2ND ARGUMENT)
-#   FINDS THE FIRST LIST ITEM EQUAL TO THE GIVEN STRING (NOT CASE-SENSITIVE)
-#   RETURNS THE INDEX OF THAT LIST ITEM
-#   RETURNS -1 IF STRING WASN'T FOUND IN LIST
-def get_index(the_list, the_string):
-   found_it = False
-   i = 0
-   while i < len(the_list) and found_it == False:
-      if the_list[i].upper() == the_string.upper():
-         found_it = True
-      else:
-         i += 1
-   if found_it == True:
-      return i
+#THIS FUNCTION RECORDS THE FINGERPRINT OF A DATA OBJECT AS DELIVERED TO (OR VERIFIED IN) A TARGET GEODATABASE IN THE
+#   STATE STORE.
+#   THE FIRST ARGUMENT IS THE DATA OBJECT'S KEY (SEE get_delivered_fingerprint()).
+#   THE SECOND ARGUMENT IS THE SOURCE DATA-OBJECT'S FINGERPRINT.
+def save_delivered_fingerprint(state_key, the_fingerprint):
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("INSERT OR REPLACE INTO delivered_fingerprints VALUES (?, ?, ?, ?, ?)", state_key + [json.dumps(the_fingerprint), time.time()])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION REMOVES THE FINGERPRINT OF A DATA OBJECT AS DELIVERED TO A TARGET GEODATABASE FROM THE STATE STORE
+#   (E.G., THE TARGET DATA-OBJECT HAS BEEN DELIVERED SINCE BY SOMETHING ELSE).
+#   THE ARGUMENT IS THE DATA OBJECT'S KEY (SEE get_delivered_fingerprint()).
+def clear_delivered_fingerprint(state_key):
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("DELETE FROM delivered_fingerprints WHERE source_gdb = ? AND target_gdb = ? AND object_name = ?", state_key)
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION RECORDS THE DATE OF THE A_XCHANGE_LOG ENTRIES THAT WERE JUST WRITTEN FOR FREIGHT CARS IN THE STATE STORE.
+#   THE FIRST ARGUMENT IS THE LIST OF FREIGHT CARS.
+#   THE SECOND ARGUMENT IS THE DATE (YYYY-MM-DD).
+def save_hub_log_dates(the_cars, the_date):
+   the_connection = open_state_store()
+   try:
+      for i in the_cars:
+         the_connection.execute("INSERT OR REPLACE INTO hub_log_dates VALUES (?, ?, ?, ?)", [source_gdb, target_gdb, i["source_prefix"] + i["name"], the_date])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION RETURNS THE LAST DAY (YYYY-MM-DD) ON WHICH A DATA OBJECT IS KNOWN TO HAVE BEEN DELIVERED BY THE SCRIPT
+#   SINCE A STATE-STORE RECORD OF IT (FINGERPRINT OR WATERMARK): THE LATER OF THE DAY THE RECORD WAS RECORDED AND THE
+#   DATE OF THE LAST A_XCHANGE_LOG ENTRY THE SCRIPT WROTE FOR THE DATA OBJECT (SEE save_hub_log_dates()). A LATER DELIVERY
+#   IN A HUB'S A_XCHANGE_LOG WAS MADE BY SOMETHING ELSE.
+#   THE FIRST ARGUMENT IS THE DATA OBJECT'S KEY (SEE get_delivered_fingerprint()).
+#   THE SECOND ARGUMENT IS THE TIME THE RECORD WAS RECORDED (SECONDS SINCE EPOCH).
+def get_own_delivery_date(state_key, recorded):
+   the_connection = open_state_store()
+   try:
+      the_row = the_connection.execute("SELECT logged FROM hub_log_dates WHERE source_gdb = ? AND target_gdb = ? AND object_name = ?", state_key).fetchone()
+   finally:
+      the_connection.close()
+   the_date = time.strftime("%Y-%m-%d", time.localtime(recorded))
+   if the_row != None and the_row[0] > the_date:
+      return the_row[0]
+   return the_date
+
+#THIS FUNCTION RETURNS THE STATE STORE'S WATERMARK OF AN INCREMENTAL DATA-OBJECT AS LAST DELIVERED TO A TARGET
+#   GEODATABASE: A LIST [WATERMARK (SEE format_watermark(); None IF ALL WATERMARK-VALUES WERE NULL), TIME KEYS WERE LAST
+#   RECONCILED, TIME RECORDED (SECONDS SINCE EPOCH)], OR None IF THERE ISN'T ONE.
+#   THE ARGUMENT IS THE DATA OBJECT'S KEY (SEE get_delivered_fingerprint()).
+def get_watermark(state_key):
+   the_connection = open_state_store()
+   try:
+      the_row = the_connection.execute("SELECT watermark, reconciled, recorded FROM watermarks WHERE source_gdb = ? AND target_gdb = ? AND object_name = ?", state_key).fetchone()
+   finally:
+      the_connection.close()
+   if the_row == None:
+      return None
+   return [json.loads(the_row[0]), the_row[1], the_row[2]]
+
+#THIS FUNCTION RECORDS THE WATERMARK OF AN INCREMENTAL DATA-OBJECT AS DELIVERED TO A TARGET GEODATABASE IN THE STATE STORE.
+#   THE FIRST ARGUMENT IS THE DATA OBJECT'S KEY (SEE get_delivered_fingerprint()).
+#   THE SECOND ARGUMENT IS THE WATERMARK (SEE format_watermark()), OR None.
+#   THE THIRD ARGUMENT IS THE TIME KEYS WERE LAST RECONCILED (SECONDS SINCE EPOCH).
+def save_watermark(state_key, the_watermark, reconciled):
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?, ?, ?)", state_key + [json.dumps(the_watermark), reconciled, time.time()])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION REMOVES THE WATERMARK OF AN INCREMENTAL DATA-OBJECT FROM THE STATE STORE (ALL ROWS ARE LOADED NEXT TIME).
+#   THE ARGUMENT IS THE DATA OBJECT'S KEY (SEE get_delivered_fingerprint()).
+def clear_watermark(state_key):
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("DELETE FROM watermarks WHERE source_gdb = ? AND target_gdb = ? AND object_name = ?", state_key)
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION RETURNS THE STATE STORE'S PROGRESS OF AN UNFINISHED CHUNKED LOAD INTO A TARGET DATA-OBJECT, OR None IF
+#   THERE ISN'T ONE. PROGRESS IS A DICTIONARY W/ THESE KEYS:
+#      source_obj          FULL PATH OF THE SOURCE DATA-OBJECT
+#      source_row_count    SOURCE DATA-OBJECT'S ROW COUNT WHEN THE LOAD STARTED
+#      source_max_oid      SOURCE DATA-OBJECT'S LAST OBJECTID WHEN THE LOAD STARTED
+#      last_oid            LAST OBJECTID (SOURCE) OF THE LAST COMMITTED CHUNK (None IF NO CHUNK HAS BEEN COMMITTED)
+#      rows_loaded         NUMBER OF ROWS IN COMMITTED CHUNKS
+#   THE ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+def get_load_progress(target_obj):
+   the_connection = open_state_store()
+   try:
+      the_row = the_connection.execute("SELECT progress FROM load_progress WHERE target_obj = ?", [target_obj]).fetchone()
+   finally:
+      the_connection.close()
+   if the_row == None:
+      return None
+   return json.loads(the_row[0])
+
+#THIS FUNCTION RECORDS THE PROGRESS OF A CHUNKED LOAD INTO A TARGET DATA-OBJECT IN THE STATE STORE.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE PROGRESS (SEE get_load_progress()).
+def save_load_progress(target_obj, the_progress):
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("INSERT OR REPLACE INTO load_progress VALUES (?, ?, ?)", [target_obj, json.dumps(the_progress), time.time()])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION REMOVES THE PROGRESS OF A CHUNKED LOAD INTO A TARGET DATA-OBJECT FROM THE STATE STORE (LOAD FINISHED).
+#   THE ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+def clear_load_progress(target_obj):
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("DELETE FROM load_progress WHERE target_obj = ?", [target_obj])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION STARTS A RUN IN THE RUN JOURNAL (FOR source_gdb AND target_gdb) AND REMOVES COMPLETED RUNS THAT ARE
+#   OLDER THAN JOURNAL_DAYS.
+#   RETURNS THE RUN'S ID.
+def start_run():
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("DELETE FROM run_cars WHERE run_id IN (SELECT run_id FROM runs WHERE finished < ?)", [time.time() - JOURNAL_DAYS * 86400])
+      the_connection.execute("DELETE FROM runs WHERE finished < ?", [time.time() - JOURNAL_DAYS * 86400])
+      run_id = the_connection.execute("INSERT INTO runs (source_gdb, target_gdb, started) VALUES (?, ?, ?)", [source_gdb, target_gdb, time.time()]).lastrowid
+      the_connection.commit()
+   finally:
+      the_connection.close()
+   return run_id
+
+#THIS FUNCTION RETURNS THE LAST RUN IN THE RUN JOURNAL FOR source_gdb AND target_gdb IF IT DIDN'T COMPLETE, OR None IF
+#   IT DID (OR IF THERE ISN'T ONE). THE RUN IS A LIST [RUN ID, TIME STARTED (SECONDS SINCE EPOCH), DICTIONARY OF
+#   FREIGHT CARS], WHERE THE DICTIONARY HAS A [STATE, A_XCHANGE_LOG NOTE] LIST PER SOURCE DATA-OBJECT NAME.
+def get_unfinished_run():
+   the_connection = open_state_store()
+   try:
+      the_run = the_connection.execute("SELECT run_id, started, finished FROM runs WHERE source_gdb = ? AND target_gdb = ? ORDER BY run_id DESC LIMIT 1", [source_gdb, target_gdb]).fetchone()
+      if the_run == None or the_run[2] != None:
+         return None
+      the_cars = {}
+      for a_row in the_connection.execute("SELECT object_name, state, log_note FROM run_cars WHERE run_id = ?", [the_run[0]]):
+         the_cars[a_row[0]] = [a_row[1], a_row[2]]
+   finally:
+      the_connection.close()
+   return [the_run[0], the_run[1], the_cars]
+
+#THIS FUNCTION RECORDS FREIGHT CARS AS "planned" IN A RUN OF THE RUN JOURNAL (FREIGHT CARS ALREADY IN THE RUN ARE LEFT
+#   AS THEY ARE) AND SETS EACH FREIGHT CAR'S "run_id" KEY (SEE update_journal()).
+#   THE FIRST ARGUMENT IS THE RUN'S ID.
+#   THE SECOND ARGUMENT IS THE LIST OF FREIGHT CARS.
+def plan_run(run_id, the_cars):
+   the_connection = open_state_store()
+   try:
+      for i in the_cars:
+         i["run_id"] = run_id
+         the_connection.execute("INSERT OR IGNORE INTO run_cars VALUES (?, ?, ?, ?, ?)", [run_id, i["source_prefix"] + i["name"], "planned", None, time.time()])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION RECORDS A FREIGHT CAR'S STATE IN THE RUN JOURNAL. NOTHING IS RECORDED IF THE FREIGHT CAR ISN'T PART OF A
+#   RUN (NO "run_id" KEY).
+#   THE FIRST ARGUMENT IS THE FREIGHT CAR.
+#   THE SECOND ARGUMENT IS THE STATE (SEE JOURNAL_STATES).
+#   THE THIRD ARGUMENT IS OPTIONAL. THE FREIGHT CAR'S A_XCHANGE_LOG NOTE (KEPT SO THAT IT CAN BE WRITTEN ON --resume).
+def update_journal(i, the_state, log_note = None):
+   if i.get("run_id") == None:
+      return
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("UPDATE run_cars SET state = ?, log_note = COALESCE(?, log_note), updated = ? WHERE run_id = ? AND object_name = ?", [the_state, log_note, time.time(), i["run_id"], i["source_prefix"] + i["name"]])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION RECORDS A RUN AS COMPLETED IN THE RUN JOURNAL.
+#   THE ARGUMENT IS THE RUN'S ID.
+def finish_run(run_id):
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("UPDATE runs SET finished = ? WHERE run_id = ?", [time.time(), run_id])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION RETURNS A FREIGHT CAR'S ENTRY IN ITS RUN OF THE RUN JOURNAL: A LIST [STATE, A_XCHANGE_LOG NOTE], OR None IF
+#   THE FREIGHT CAR ISN'T PART OF A RUN.
+#   THE ARGUMENT IS THE FREIGHT CAR.
+def get_journal_entry(i):
+   if i.get("run_id") == None:
+      return None
+   the_connection = open_state_store()
+   try:
+      the_row = the_connection.execute("SELECT state, log_note FROM run_cars WHERE run_id = ? AND object_name = ?", [i["run_id"], i["source_prefix"] + i["name"]]).fetchone()
+   finally:
+      the_connection.close()
+   if the_row == None:
+      return None
+   return [the_row[0], the_row[1]]
+
+#THIS FUNCTION PUBLISHES FREIGHT CARS INTO THE STATE STORE'S FREIGHT QUEUE (SEE --publish IN README NOTES), EACH W/ THE
+#   MAJOR VARIABLES IN QUEUE_SETTINGS, THE HUB'S A_XCHANGE_LOG TABLE, AND max_cars_per_target, AS "queued". A FREIGHT CAR
+#   WHOSE DATA OBJECT IS ALREADY QUEUED OR LEASED FOR source_gdb AND target_gdb (E.G., FROM AN EARLIER RUN THAT HASN'T BEEN
+#   WORKED YET) ISN'T PUBLISHED AGAIN. DONE AND FAILED FREIGHT CARS OLDER THAN JOURNAL_DAYS ARE DELETED FROM THE QUEUE.
+#   THE FIRST ARGUMENT IS THE LIST OF FREIGHT CARS (NAMES RESOLVED; PART OF A RUN OF THE RUN JOURNAL), IN THE ORDER IN
+#      WHICH THEY SHOULD BE CLAIMED.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE HUB'S A_XCHANGE_LOG TABLE, OR None IF TARGET ISN'T A HUB.
+#   RETURNS THE NUMBER OF FREIGHT CARS PUBLISHED.
+def publish_freight_cars(the_cars, hub_log_table):
+   the_settings = json.dumps(dict([[k, globals()[k]] for k in QUEUE_SETTINGS]))
+   the_count = 0
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("DELETE FROM freight_queue WHERE state IN ('done', 'failed') AND updated < ?", [time.time() - JOURNAL_DAYS * 86400])
+      for i in the_cars:
+         object_name = i["source_prefix"] + i["name"]
+         if the_connection.execute("SELECT COUNT(*) FROM freight_queue WHERE source_gdb = ? AND target_gdb = ? AND object_name = ? AND state IN ('queued', 'leased')", [source_gdb, target_gdb, object_name]).fetchone()[0] > 0:
+            make_note(i["name"] + " is already in the freight queue (not published again).", True, True)
+            continue
+         the_connection.execute("INSERT INTO freight_queue (run_id, source_gdb, target_gdb, object_name, target_container, container_cap, car, settings, hub_log_table, state, attempts, published, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'queued', 0, ?, ?)", [i["run_id"], source_gdb, target_gdb, object_name, i["target_container"], max(1, max_cars_per_target), json.dumps(i, default = str), the_settings, hub_log_table, time.time(), time.time()])
+         the_count += 1
+      the_connection.commit()
+   finally:
+      the_connection.close()
+   return the_count
+
+#THIS FUNCTION CLAIMS THE NEXT FREIGHT CAR OF THE FREIGHT QUEUE FOR A WORKER (SEE --work IN README NOTES): THE FIRST
+#   PUBLISHED FREIGHT CAR THAT IS "queued", OR "leased" W/ A LEASE THAT HAS RUN OUT (ITS WORKER DIED), WHOSE TARGET
+#   CONTAINER HAS FEWER THAN ITS max_cars_per_target FREIGHT CARS LEASED. THE FREIGHT CAR IS LEASED TO THE WORKER FOR
+#   lease_minutes. THE QUEUE IS LOCKED WHILE A FREIGHT CAR IS CLAIMED, SO THAT TWO WORKERS CAN'T CLAIM THE SAME FREIGHT
+#   CAR. FIRST, FREIGHT CARS WHOSE LEASE HAS RUN OUT QUEUE_ATTEMPTS TIMES ARE MARKED "failed".
+#   THE ARGUMENT IS THE WORKER'S NAME (HOST AND PROCESS ID).
+#   RETURNS A DICTIONARY W/ THESE KEYS, OR None IF NO FREIGHT CAR CAN BE CLAIMED:
+#      queue_id          THE FREIGHT CAR'S ID IN THE FREIGHT QUEUE
+#      car               THE FREIGHT CAR (SEE send_freight_car())
+#      settings          DICTIONARY OF THE MAJOR VARIABLES PUBLISHED W/ THE FREIGHT CAR (SEE QUEUE_SETTINGS)
+#      hub_log_table     FULL PATH OF THE HUB'S A_XCHANGE_LOG TABLE, OR None
+#      attempts          NUMBER OF TIMES THE FREIGHT CAR HAS BEEN CLAIMED (INCLUDING THIS TIME)
+#      last_worker       IF THE FREIGHT CAR'S LEASE HAD RUN OUT, THE WORKER THAT HELD IT, OTHERWISE None
+def claim_queued_car(worker_name):
+   the_time = time.time()
+   the_connection = open_state_store()
+   the_connection.isolation_level = None
+   try:
+      the_connection.execute("BEGIN IMMEDIATE")
+      try:
+         the_connection.execute("UPDATE freight_queue SET state = 'failed', result = ? || worker || ').', lease_expires = NULL, updated = ? WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?", ["Lease ran out " + str(QUEUE_ATTEMPTS) + " times (last held by worker ", the_time, the_time, QUEUE_ATTEMPTS])
+         the_row = the_connection.execute("SELECT queue_id, car, settings, hub_log_table, attempts, state, worker FROM freight_queue q WHERE (state = 'queued' OR (state = 'leased' AND lease_expires < ?)) AND (SELECT COUNT(*) FROM freight_queue l WHERE l.state = 'leased' AND l.lease_expires >= ? AND l.target_gdb = q.target_gdb AND l.target_container = q.target_container) < container_cap ORDER BY queue_id LIMIT 1", [the_time, the_time]).fetchone()
+         if the_row != None:
+            the_connection.execute("UPDATE freight_queue SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1, updated = ? WHERE queue_id = ?", [worker_name, the_time + lease_minutes * 60, the_time, the_row[0]])
+         the_connection.execute("COMMIT")
+      except:
+         the_connection.execute("ROLLBACK")
+         raise
+   finally:
+      the_connection.close()
+   if the_row == None:
+      return None
+   the_entry = {"queue_id":the_row[0],"car":json.loads(the_row[1]),"settings":json.loads(the_row[2]),"hub_log_table":the_row[3],"attempts":the_row[4] + 1,"last_worker":None}
+   if the_row[5] == "leased":
+      the_entry["last_worker"] = the_row[6]
+   return the_entry
+
+#THIS FUNCTION RENEWS A WORKER'S LEASE ON A FREIGHT CAR OF THE FREIGHT QUEUE FOR lease_minutes (SEE LeaseKeeper).
+#   THE FIRST ARGUMENT IS THE FREIGHT CAR'S ID IN THE FREIGHT QUEUE.
+#   THE SECOND ARGUMENT IS THE WORKER'S NAME.
+#   RETURNS True IF THE LEASE WAS RENEWED, OR False IF THE WORKER NO LONGER HOLDS IT (IT RAN OUT AND THE FREIGHT CAR WAS
+#   CLAIMED BY ANOTHER WORKER OR MARKED "failed").
+def renew_lease(queue_id, worker_name):
+   the_connection = open_state_store()
+   try:
+      the_count = the_connection.execute("UPDATE freight_queue SET lease_expires = ? WHERE queue_id = ? AND state = 'leased' AND worker = ?", [time.time() + lease_minutes * 60, queue_id, worker_name]).rowcount
+      the_connection.commit()
+   finally:
+      the_connection.close()
+   return the_count == 1
+
+#THIS FUNCTION REPORTS THE RESULT OF A FREIGHT CAR THAT A WORKER CLAIMED FROM THE FREIGHT QUEUE, IF THE WORKER STILL HOLDS
+#   ITS LEASE. IF THE FREIGHT CAR IS "done" AND IT WAS THE LAST FREIGHT CAR OF ITS RUN THAT WASN'T DONE, THE RUN IS RECORDED
+#   AS COMPLETED IN THE RUN JOURNAL (SEE finish_run()).
+#   THE FIRST ARGUMENT IS THE FREIGHT CAR'S ENTRY (SEE claim_queued_car()).
+#   THE SECOND ARGUMENT IS THE WORKER'S NAME.
+#   THE THIRD ARGUMENT IS THE FREIGHT CAR'S NEW STATE: "done" OR "failed".
+#   THE FOURTH ARGUMENT IS THE RESULT (A NOTE, OR A DESCRIPTION OF THE ERROR CONDITION).
+#   RETURNS True IF THE RESULT WAS REPORTED, OR False IF THE WORKER NO LONGER HELD THE LEASE.
+def complete_queued_car(the_entry, worker_name, the_state, the_result):
+   run_done = False
+   the_connection = open_state_store()
+   try:
+      the_count = the_connection.execute("UPDATE freight_queue SET state = ?, result = ?, lease_expires = NULL, updated = ? WHERE queue_id = ? AND state = 'leased' AND worker = ?", [the_state, the_result, time.time(), the_entry["queue_id"], worker_name]).rowcount
+      if the_count == 1 and the_state == "done" and the_entry["car"].get("run_id") != None:
+         run_done = the_connection.execute("SELECT COUNT(*) FROM freight_queue WHERE run_id = ? AND state != 'done'", [the_entry["car"]["run_id"]]).fetchone()[0] == 0
+      the_connection.commit()
+   finally:
+      the_connection.close()
+   if run_done == True:
+      finish_run(the_entry["car"]["run_id"])
+      make_note("Run " + str(the_entry["car"]["run_id"]) + " (" + source_gdb + " to " + target_gdb + ") completed.", True, True)
+   return the_count == 1
+
+#THIS FUNCTION RETURNS THE NUMBER OF FREIGHT CARS OF THE FREIGHT QUEUE IN EACH STATE (SEE QUEUE_STATES) AS A DICTIONARY.
+def get_queue_counts():
+   the_counts = dict([[i, 0] for i in QUEUE_STATES])
+   the_connection = open_state_store()
+   try:
+      for a_row in the_connection.execute("SELECT state, COUNT(*) FROM freight_queue GROUP BY state"):
+         the_counts[a_row[0]] = a_row[1]
+   finally:
+      the_connection.close()
+   return the_counts
+
+#THIS CLASS HOLDS A WORKER'S LEASE ON A FREIGHT CAR OF THE FREIGHT QUEUE (SEE claim_queued_car()) WHILE THE FREIGHT CAR IS
+#   SENT: A BACKGROUND THREAD RENEWS THE LEASE (SEE renew_lease()) EVERY 1/LEASE_RENEWALS OF lease_minutes. A RENEWAL THAT
+#   FAILS (E.G., THE STATE STORE IS LOCKED) IS TRIED AGAIN NEXT TIME. stop() STOPS THE THREAD AND RETURNS False IF THE LEASE
+#   WAS LOST, OTHERWISE True.
+class LeaseKeeper(object):
+   def __init__(self, queue_id, worker_name):
+      self.queue_id = queue_id
+      self.worker_name = worker_name
+      self.kept = True
+      self.stopping = threading.Event()
+      self.thread = threading.Thread(target = self.run)
+      self.thread.daemon = True
+      self.thread.start()
+
+   #STOPS THE THREAD. RETURNS True IF THE LEASE WAS HELD THE WHOLE TIME.
+   def stop(self):
+      self.stopping.set()
+      self.thread.join()
+      return self.kept
+
+   #THE THREAD: RENEWS THE LEASE UNTIL IT IS STOPPED OR THE LEASE IS LOST
+   def run(self):
+      while self.kept == True and self.stopping.wait(lease_minutes * 60.0 / LEASE_RENEWALS) != True:
+         try:
+            self.kept = renew_lease(self.queue_id, self.worker_name)
+         except:
+            pass
+
+#THIS FUNCTION RETURNS THE FULL PATH OF A FREIGHT CAR'S SOURCE DATA-OBJECT. ONLY FOR A FREIGHT CAR WHOSE NAMES HAVE
+#   BEEN RESOLVED.
+def get_source_path(i):
+   if i["fds"] != None:
+      return source_gdb + "\\" + i["source_fds_name"] + "\\" + i["source_prefix"] + i["name"]
+   return source_gdb + "\\" + i["source_prefix"] + i["name"]
+
+#THIS FUNCTION RETURNS THE FULL PATHS [SOURCE, TARGET] OF A FREIGHT CAR'S DATA OBJECTS. ONLY FOR A FREIGHT CAR WHOSE
+#   NAMES HAVE BEEN RESOLVED AND WHOSE DATA OBJECT IS ALREADY IN THE TARGET GEODATABASE.
+def get_car_paths(i):
+   if i["fds"] != None:
+      return [get_source_path(i), target_gdb + "\\" + i["target_fds_name"] + "\\" + i["target_name"]]
+   return [get_source_path(i), target_gdb + "\\" + i["target_name"]]
+
+#THIS FUNCTION RECORDS HOW LONG A FREIGHT CAR TOOK TO SEND IN THE STATE STORE (SEE estimate_car_cost()).
+#   THE FIRST ARGUMENT IS THE FREIGHT CAR.
+#   THE SECOND ARGUMENT IS THE SOURCE DATA-OBJECT'S ROW COUNT (None FOR A RASTER DATASET).
+#   THE THIRD ARGUMENT IS THE NUMBER OF SECONDS.
+def save_car_timing(i, row_count, the_seconds):
+   the_connection = open_state_store()
+   try:
+      the_connection.execute("INSERT OR REPLACE INTO car_timings VALUES (?, ?, ?, ?, ?, ?)", [source_gdb, target_gdb, i["source_prefix"] + i["name"], row_count, the_seconds, time.time()])
+      the_connection.commit()
+   finally:
+      the_connection.close()
+
+#THIS FUNCTION RETURNS WHEN THE OLDEST STATE-STORE RECORD THAT A HUB'S A_XCHANGE_LOG IS CHECKED AGAINST (SEE
+#   send_freight_car()) WAS RECORDED (SECONDS SINCE EPOCH), OR None IF THERE ISN'T ONE: FINGERPRINTS NOT OLDER THAN
+#   state_store_days AND WATERMARKS OF DATA OBJECTS SENT BETWEEN source_gdb AND target_gdb.
+#   THE ARGUMENT IS THE LIST OF SOURCE DATA-OBJECT NAMES (W/ SCHEMA PREFIX).
+def get_oldest_state_record(object_names):
+   the_times = []
+   the_connection = open_state_store()
+   try:
+      for a_row in the_connection.execute("SELECT object_name, recorded FROM watermarks WHERE source_gdb = ? AND target_gdb = ?", [source_gdb, target_gdb]):
+         if a_row[0] in object_names:
+            the_times.append(a_row[1])
+      if state_store_days > 0:
+         for a_row in the_connection.execute("SELECT object_name, recorded FROM delivered_fingerprints WHERE source_gdb = ? AND target_gdb = ? AND recorded > ?", [source_gdb, target_gdb, time.time() - state_store_days * 86400]):
+            if a_row[0] in object_names:
+               the_times.append(a_row[1])
+   finally:
+      the_connection.close()
+   if len(the_times) == 0:
+      return None
+   return min(the_times)
+
+#THIS FUNCTION RETURNS THE STATE STORE'S TIMINGS OF FREIGHT CARS SENT BETWEEN source_gdb AND target_gdb: A DICTIONARY
+#   W/ A [SOURCE ROW-COUNT, SECONDS] LIST PER SOURCE DATA-OBJECT NAME.
+def get_car_timings():
+   the_timings = {}
+   the_connection = open_state_store()
+   try:
+      for a_row in the_connection.execute("SELECT object_name, row_count, seconds FROM car_timings WHERE source_gdb = ? AND target_gdb = ?", [source_gdb, target_gdb]):
+         the_timings[a_row[0]] = [a_row[1], a_row[2]]
+   finally:
+      the_connection.close()
+   return the_timings
+
+#THIS FUNCTION RETURNS THE SIZE (BYTES, UNCOMPRESSED) OF A RASTER DATASET, OR None IF IT CAN'T BE DETERMINED.
+#   THE ARGUMENT IS THE FULL PATH OF THE RASTER DATASET.
+def get_raster_size(the_raster):
+   try:
+      the_band = arcpy.Describe(the_raster + "\\Band_1")
+      bits_per_pixel = int(the_band.pixelType[1:])
+      return int(the_band.width * the_band.height * arcpy.Describe(the_raster).bandCount * bits_per_pixel / 8)
+   except:
+      return None
+
+#THIS FUNCTION ESTIMATES HOW LONG A FREIGHT CAR WILL TAKE TO SEND. IF THE DATA OBJECT WAS SENT BEFORE (SEE
+#   get_car_timings()), ITS LAST TIMING IS USED, W/ THE ROW COUNT RECORDED W/ IT (THE SOURCE DATA-OBJECT ISN'T READ).
+#   OTHERWISE, THE ESTIMATE IS MADE W/ THE PLANNER_* CONSTANTS: ROWS ARE LOADED (AND DELETED FIRST IF THE DATA OBJECT IS
+#   ALREADY THERE), AND ROWS OF BOTH DATA-OBJECTS ARE FINGERPRINTED IF detect_changes IS True (ASSUMING A CHANGE IS
+#   DETECTED). IF ALL ROWS OF A DATA OBJECT THAT IS ALREADY THERE ARE RE-LOADED IN PARTITIONS (SEE get_partition_count()),
+#   LOADING THEM TAKES 1/PARTITIONS AS LONG.
+#   THE FIRST ARGUMENT IS THE FREIGHT CAR (NAMES RESOLVED).
+#   THE SECOND ARGUMENT IS THE DICTIONARY OF TIMINGS (SEE get_car_timings()).
+#   THE THIRD ARGUMENT IS OPTIONAL. A BOOLEAN TO INDICATE IF THE SOURCE DATA-OBJECT CAN BE COUNTED (OR A RASTER DATASET'S
+#      SIZE READ) TO ESTIMATE A FREIGHT CAR W/O A TIMING. IF False, SUCH A FREIGHT CAR IS ESTIMATED AT
+#      PLANNER_CAR_SECONDS W/ BASIS "none".
+#   RETURNS A DICTIONARY W/ THESE KEYS:
+#      rows       SOURCE ROW-COUNT (None FOR A RASTER DATASET, OR IF NOT COUNTED)
+#      bytes      RASTER DATASET'S SIZE (None IF NOT A RASTER DATASET OR IF UNKNOWN)
+#      partitions NUMBER OF PARTITIONS ITS ROWS ARE LOADED IN (1 IF NOT PARTITIONED)
+#      seconds    ESTIMATED SECONDS
+#      basis      "history" IF ESTIMATED FROM THE LAST TIMING, "model" IF ESTIMATED W/ THE PLANNER_* CONSTANTS, "none" IF
+#                 NOT ESTIMATED
+def estimate_car_cost(i, the_timings, read_sizes = True):
+   the_cost = {"rows":None,"bytes":None,"partitions":1,"seconds":PLANNER_CAR_SECONDS,"basis":"model"}
+   source_obj = get_source_path(i)
+   the_timing = the_timings.get(i["source_prefix"] + i["name"])
+   can_partition = i["type"] != "raster" and i["already_there"] == True and i["watermark_field"] == None and (load_strategy in ("reload", "swap") or (load_strategy == "delta" and i["sort_field"] == None))
+   if the_timing != None:
+      the_cost["rows"] = the_timing[0]
+      if the_cost["rows"] != None and can_partition == True:
+         the_cost["partitions"] = get_partition_count(the_cost["rows"], i.get("partitioning"))
+      the_cost["seconds"] = round(the_timing[1], 1)
+      the_cost["basis"] = "history"
+      return the_cost
+   if read_sizes == False:
+      the_cost["basis"] = "none"
+      return the_cost
+   if i["type"] == "raster":
+      the_cost["bytes"] = get_raster_size(source_obj)
+      if the_cost["bytes"] != None:
+         the_cost["seconds"] += the_cost["bytes"] / float(PLANNER_RASTER_BYTES_PER_SECOND)
    else:
-      return -1
+      the_cost["rows"] = int(get_count(source_obj))
+      if can_partition == True:
+         the_cost["partitions"] = get_partition_count(the_cost["rows"], i.get("partitioning"))
+      #(AN INCREMENTAL DATA-OBJECT THAT IS ALREADY THERE ONLY MOVES ROWS EDITED SINCE THE LAST DELIVERY)
+      if i["already_there"] == False or i["watermark_field"] == None:
+         the_cost["seconds"] += the_cost["rows"] / float(PLANNER_ROWS_PER_SECOND) / the_cost["partitions"]
+      if i["already_there"] == True and i["watermark_field"] == None:
+         the_cost["seconds"] += the_cost["rows"] / float(PLANNER_ROWS_PER_SECOND)
+         if i["detect_changes"] == True:
+            the_cost["seconds"] += 2 * the_cost["rows"] / float(PLANNER_FINGERPRINT_ROWS_PER_SECOND)
+   the_cost["seconds"] = round(the_cost["seconds"], 1)
+   return the_cost
 
-#THIS FUNCTION CREATES AND RETURNS A DICTIONAIRY OBJECT (A FREIGHT CAR) TO ADD TO freight_cars LIST
-def create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix):
-   return {"source_prefix":source_prefix,"fds":fds,"name":name,"type":type,"detect_changes":detect_changes,"sort_field":sort_field,"already_there":already_there,"target_prefix":target_prefix}
-
-try:
-   #VERIFY GEODATABASE CONNECTIONS
-   make_note("Verifying geodatabase connections...")
-   if arcpy.Exists(source_gdb) != True:
-      make_note("Can't connect to source geodatabase:  " + source_gdb, True, True)
-      sys.exit()
-   if arcpy.Exists(target_gdb) != True:
-      make_note("Can't connect to target geodatabase:  " + target_gdb, True, True)
-      sys.exit()
-   make_note("Source geodatabase: " + source_gdb, True, True)
-   make_note("Target geodatabase: " + target_gdb, True, True)
-
-   #READ AND ANALYZE SOURCE-GEODATABASE'S A_README TABLE
-   make_note("Reading and analyzing source-geodatabase's A_README table...")
-   arcpy.env.workspace = source_gdb
-   the_tables = arcpy.ListTables()
-   found_it = False
-   i = 0
-   while found_it == False and i < len(the_tables):
-      if get_name(the_tables[i]).upper() == "A_README":
-         found_it = True
-      else:
-         i += 1
-   if found_it == True:
-      the_cursor = arcpy.da.SearchCursor(the_tables[i], ["PROTOCOL","DB_TYPE","CONSTRAINTS","NOTE"])
-      the_row = the_cursor.next()
-      if the_row[0].strip().upper() != "EGC GEOSPATIAL DATA EXCHANGE PROTOCOL":
-         make_note("Source geodatabase's A_README table isn't attributed for EGC Geospatial Data Exchange Protocol. Check its A_README table's PROTOCOL field.", True, True)
-         sys.exit()
-      if the_row[1].strip().upper() == "HUB":
-         source_db_type = "hub"
-      elif the_row[1].strip().upper() == "SPOKE":
-         source_db_type = "spoke"
-      else:
-         make_note("Source geodatabase's A_README table isn't properly attributed. DB_TYPE field should be 'hub' or 'spoke'.", True, True)
-         sys.exit()
-      del the_cursor
-      del the_row
-      make_note("Source geodatabase is a " + source_db_type + " geodatabase.", True, True)
+#THIS FUNCTION PLANS THE TRAIN: IT ESTIMATES EACH FREIGHT CAR'S COST (SEE estimate_car_cost(); SETS EACH FREIGHT CAR'S
+#   "cost" KEY), ORDERS THE FREIGHT CARS, AND ESTIMATES THE TRAIN'S TOTAL TIME. W/ SEVERAL WORKER PROCESSES, FREIGHT CARS
+#   ARE ORDERED LONGEST FIRST (LONGEST-PROCESSING-TIME-FIRST SCHEDULING), AND EACH FREIGHT CAR IS ASSIGNED TO THE WORKER
+#   THAT IS FREE FIRST (THE ESTIMATE DOESN'T ACCOUNT FOR max_cars_per_target).
+#   THE FIRST ARGUMENT IS THE LIST OF FREIGHT CARS (NAMES RESOLVED).
+#   THE SECOND ARGUMENT IS THE NUMBER OF WORKER PROCESSES.
+#   THE THIRD ARGUMENT IS OPTIONAL. A BOOLEAN TO INDICATE IF SOURCE DATA-OBJECTS W/O A TIMING CAN BE READ TO ESTIMATE
+#      THEIR COST (SEE estimate_car_cost()). COUNTING EVERY SOURCE DATA-OBJECT IS ONLY WORTH IT IF THE ESTIMATE IS USED
+#      (A DRY RUN, SEVERAL WORKER PROCESSES, OR A window_minutes CHECK).
+#   RETURNS A LIST: [FREIGHT CARS IN THE ORDER IN WHICH THEY SHOULD BE STARTED, THE PLAN (A DICTIONARY THAT CAN BE
+#   WRITTEN AS JSON)].
+def plan_train(the_cars, worker_count, read_sizes = True):
+   the_timings = get_car_timings()
+   for i in the_cars:
+      i["cost"] = estimate_car_cost(i, the_timings, read_sizes)
+   if worker_count > 1:
+      the_cars = sorted(the_cars, key = lambda i: i["cost"]["seconds"], reverse = True)
    else:
-      make_note("Source geodatabase doesn't have an A_README table, which is required.", True, True)
-      sys.exit()
-
-   #IF SOURCE GEODATABASE IS A SPOKE GEODATABASE, VERIFY EXISTENCE OF ITS A_XCHANGE_PARAMETERS TABLE
-   #(GET ITS NAME. FIND OUT IF IT HAS ROWS.)
-   params_table_name = ""
-   params_table_has_rows = False
-   if source_db_type == "spoke":
-      make_note("Verifying source geodatabase (spoke) has an A_XCHANGE_PARAMETERS table...")
-      found_it = False
-      i = 0
-      while found_it == False and i < len(the_tables):
-         if get_name(the_tables[i]).upper() == "A_XCHANGE_PARAMETERS":
-            params_table_name = the_tables[i]
-            if int(get_count(the_tables[i])) > 0:
-               params_table_has_rows = True
-            found_it = True
-         else:
-            i += 1
-      if found_it != True:
-         make_note("Source geodatabase doesn't have an A_XCHANGE_PARAMETERS table, which is required for a spoke geodatabase (can be an empty table if optional special directives aren't used).", True, True)
-         sys.exit()
+      worker_count = 1
+   worker_times = [0] * worker_count
+   the_plan = {"source_gdb":source_gdb,"target_gdb":target_gdb,"planned":tell_the_time(),"workers":worker_count,"cars":[]}
+   for i in the_cars:
+      k = worker_times.index(min(worker_times))
+      the_plan["cars"].append({"name":i["source_prefix"] + i["name"],"fds":i["fds"],"type":i["type"],"already_there":i["already_there"],"detect_changes":i["detect_changes"],"sort_field":i["sort_field"],"watermark_field":i["watermark_field"],"rows":i["cost"]["rows"],"bytes":i["cost"]["bytes"],"partitions":i["cost"]["partitions"],"estimated_seconds":i["cost"]["seconds"],"basis":i["cost"]["basis"],"worker":k + 1,"estimated_start":round(worker_times[k], 1),"last_delivered":i["last_delivered"]})
+      worker_times[k] += i["cost"]["seconds"]
+   the_plan["estimated_seconds"] = round(max(worker_times), 1)
+   the_plan["window_minutes"] = window_minutes
+   return [the_cars, the_plan]
 
-   #READ AND ANALYZE TARGET-GEODATABASE'S A_README TABLE
-   make_note("Reading and analyzing target-geodatabase's A_README table...")
-   arcpy.env.workspace = target_gdb
-   the_tables = arcpy.ListTables()
-   found_it = False
-   i = 0
-   while found_it == False and i < len(the_tables):
-      if get_name(the_tables[i]).upper() == "A_README":
-         found_it = True
-      else:
-         i += 1
-   if found_it == True:
-      the_cursor = arcpy.da.SearchCursor(the_tables[i], ["PROTOCOL","DB_TYPE","CONSTRAINTS","NOTE"])
-      the_row = the_cursor.next()
-      if the_row[0].strip().upper() != "EGC GEOSPATIAL DATA EXCHANGE PROTOCOL":
-         make_note("Target geodatabase's A_README table isn't attributed for EGC Geospatial Data Exchange Protocol. Check its A_README table's PROTOCOL field.", True, True)
-         sys.exit()
-      if the_row[1].strip().upper() == "HUB":
-         target_db_type = "hub"
-      elif the_row[1].strip().upper() == "SPOKE":
-         target_db_type = "spoke"
-      else:
-         make_note("Target geodatabase's A_README table isn't properly attributed. DB_TYPE field should be 'hub' or 'spoke'.", True, True)
-         sys.exit()
+#THIS FUNCTION VERIFIES AGAIN A FREIGHT CAR THAT WAS STARTED BUT NOT LOGGED IN AN INTERRUPTED RUN (SEE --resume): THE
+#   SOURCE AND TARGET DATA-OBJECTS ARE COMPARED (W/O TRUSTING THE STATE STORE, SINCE THE TARGET MIGHT HAVE BEEN LEFT
+#   HALF-LOADED). RASTER DATASETS AREN'T COMPARED, AND INCREMENTAL DATA-OBJECTS AREN'T EITHER (SENDING AN INCREMENT AGAIN
+#   IS CHEAPER, AND ITS WATERMARK ISN'T RECORDED UNTIL IT IS WRITTEN).
+#   THE ARGUMENT IS THE FREIGHT CAR (NAMES RESOLVED).
+#   RETURNS True IF THE TARGET DATA-OBJECT MATCHES THE SOURCE DATA-OBJECT, OTHERWISE False.
+def reverify_freight_car(i):
+   if i["type"] == "raster" or i["already_there"] == False or i["watermark_field"] != None:
+      return False
+   source_obj, target_obj = get_car_paths(i)
+   return compare_objects(source_obj, target_obj, i["sort_field"], i["type"] == "table")[0] == "same"
+
+#THIS FUNCTION RETURNS A DIGEST (HEX STRING) OF A LIST OF FIELD NAMES (NOT CASE-SENSITIVE), SO THAT A FINGERPRINT'S
+#   FIELDS CAN BE CHECKED AGAINST AN A_XCHANGE_DIGEST ENTRY'S FIELDS_DIGEST.
+def get_fields_digest(field_names):
+   return hashlib.md5(",".join([normalize_value(i).upper() for i in field_names])).hexdigest()
+
+#THIS FUNCTION READS A SOURCE GEODATABASE'S A_XCHANGE_DIGEST TABLE, WHICH PUBLISHES A FINGERPRINT DIGEST OF THE SOURCE
+#   GEODATABASE'S DATA OBJECTS (SEE write_digest_table()).
+#   THE ARGUMENT IS THE FULL PATH OF THE A_XCHANGE_DIGEST TABLE.
+#   RETURNS A DICTIONARY. KEYS ARE ALL-CAPS DATA-OBJECT NAMES W/ SCHEMA PREFIX. VALUES ARE DICTIONARIES W/ THESE KEYS:
+#      digest           DIGEST OF THE DATA OBJECT'S FINGERPRINT (SEE fingerprint_object() AND fingerprint_raster())
+#      row_count        NUMBER OF ROWS (NUMBER OF BLOCKS FOR A RASTER DATASET)
+#      fields_digest    DIGEST OF THE FINGERPRINTED FIELDS' NAMES (RASTER DATASET'S SIGNATURE) (SEE get_fields_digest())
+#      updated          WHEN THE ENTRY WAS UPDATED
+def read_digest_table(digest_table):
+   the_digests = {}
+   the_cursor = arcpy.da.SearchCursor(digest_table, [i[0] for i in DIGEST_TABLE_FIELDS])
+   for a_row in the_cursor:
+      if a_row[0] != None and a_row[1] != None:
+         the_digests[a_row[0].strip().upper()] = {"digest":a_row[1].strip().lower(),"row_count":a_row[2],"fields_digest":a_row[3],"updated":a_row[4]}
+   del the_cursor
+   return the_digests
+
+#THIS FUNCTION CREATES AN A_XCHANGE_DIGEST TABLE IN A GEODATABASE AND RETURNS ITS NAME (W/ SCHEMA PREFIX).
+#   THE ARGUMENT IS THE PATH OF THE GEODATABASE.
+def create_digest_table(the_gdb):
+   digest_table = arcpy.CreateTable_management(the_gdb, "A_XCHANGE_DIGEST").getOutput(0)
+   for a_field in DIGEST_TABLE_FIELDS:
+      arcpy.AddField_management(digest_table, a_field[0], a_field[1], field_length = a_field[2])
+   return digest_table[digest_table.rfind("\\") + 1:]
+
+#THIS FUNCTION UPDATES (OR ADDS) ENTRIES OF AN A_XCHANGE_DIGEST TABLE.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE A_XCHANGE_DIGEST TABLE.
+#   THE SECOND ARGUMENT IS A DICTIONARY. KEYS ARE DATA-OBJECT NAMES W/ SCHEMA PREFIX; VALUES ARE FINGERPRINTS (SEE
+#      fingerprint_object()).
+#   RETURNS THE NUMBER OF ENTRIES UPDATED OR ADDED.
+def write_digest_table(digest_table, the_fingerprints):
+   the_time = datetime.datetime.now()
+   pending_names = dict([[i.upper(), i] for i in the_fingerprints])
+   the_count = 0
+   the_cursor = arcpy.da.UpdateCursor(digest_table, [i[0] for i in DIGEST_TABLE_FIELDS])
+   for a_row in the_cursor:
+      if a_row[0] != None and a_row[0].strip().upper() in pending_names:
+         the_fingerprint = the_fingerprints[pending_names.pop(a_row[0].strip().upper())]
+         the_cursor.updateRow([a_row[0], the_fingerprint["digest"], the_fingerprint["row_count"], get_fields_digest(the_fingerprint["fields"]), the_time])
+         the_count += 1
+   del the_cursor
+   if len(pending_names) > 0:
+      the_cursor = arcpy.da.InsertCursor(digest_table, [i[0] for i in DIGEST_TABLE_FIELDS])
+      for a_name in sorted(pending_names.values()):
+         the_fingerprint = the_fingerprints[a_name]
+         the_cursor.insertRow([a_name, the_fingerprint["digest"], the_fingerprint["row_count"], get_fields_digest(the_fingerprint["fields"]), the_time])
+         the_count += 1
       del the_cursor
-      del the_row
-      make_note("Target geodatabase is a " + target_db_type + " geodatabase.", True, True)
+   return the_count
+
+#THIS FUNCTION IS RUN IN A WORKER PROCESS TO FINGERPRINT A DATA OBJECT FOR AN A_XCHANGE_DIGEST TABLE.
+#   THE ARGUMENT IS A LIST: [FULL PATH OF THE DATA OBJECT, TYPE OF DATA OBJECT ("fclass", "table", OR "raster")].
+#   RETURNS THE DATA OBJECT'S FINGERPRINT (SEE fingerprint_object() AND fingerprint_raster()). A RASTER DATASET'S
+#   FINGERPRINT IS RETURNED W/O ITS BLOCK DIGESTS.
+def fingerprint_for_digest(the_task):
+   if the_task[1] == "raster":
+      the_fingerprint = fingerprint_raster(the_task[0])
+      del the_fingerprint["blocks"]
+      return the_fingerprint
+   elif the_task[1] == "table":
+      return fingerprint_object(the_task[0], None, True, IGNORE_PARAM_T)
    else:
-      make_note("Target geodatabase doesn't have an A_README table, which is required.", True, True)
-      sys.exit()
-
-   #IF TARGET GEODATABASE IS A HUB GEODATABASE, VERIFY EXISTENCE OF ITS A_XCHANGE_LOG TABLE
-   if target_db_type == "hub":
-      make_note("Verifying target geodatabase (hub) has an A_XCHANGE_LOG table...")
-      found_it = False
-      i = 0
-      while found_it == False and i < len(the_tables):
-         if get_name(the_tables[i]).upper() == "A_XCHANGE_LOG":
-            hub_logtable_name = the_tables[i]
-            found_it = True
-         else:
-            i += 1
-      if found_it != True:
-         make_note("Target geodatabase doesn't have an A_XCHANGE_LOG table, which is required for a hub geodatabase.", True, True)
-         sys.exit()
+      return fingerprint_object(the_task[0], None, False, IGNORE_PARAM)
 
-   #LISTS THAT CAPTURE INFO ON PRE-EXISTING DATA-OBJECTS. ESTABLISH LISTS; THEN FILL THEM.
-   make_note("Collecting info on pre-existing data-objects...")
-   #(SOURCE FEATURE-CLASSES)
-   source_fclasses_prefixed_names = []
-   source_fclasses_prefixes = []
-   source_fclasses_names = []
-   source_fdatasets_prefixed_names = []
-   source_fdatasets_prefixes = []
-   source_fdatasets_names = []
-
-   #(SOURCE TABLES)
-   source_tables_prefixed_names = []
-   source_tables_prefixes = []
-   source_tables_names = []
-
-   #(SOURCE RASTERS)
-   source_rasters_prefixed_names = []
-   source_rasters_prefixes = []
-   source_rasters_names = []
-
-   #(TARGET FEATURE-CLASSES)
-   target_fclasses_prefixed_names = []
-   target_fclasses_prefixes = []
-   target_fclasses_names = []
-   target_fdatasets_prefixed_names = []
-   target_fdatasets_prefixes = []
-   target_fdatasets_names = []
-
-   #(TARGET TABLES)
-   target_tables_prefixed_names = []
-   target_tables_prefixes = []
-   target_tables_names = []
-
-   #(TARGET RASTERS)
-   target_rasters_prefixed_names = []
-   target_rasters_prefixes = []
-   target_rasters_names = []
-
-   #(TARGET EMPTY FEATURE-DATASET NAMES (FEATURE DATASET IS THERE BUT HAS NO FEATURE CLASSES))
-   target_empty_fdatasets = []
-
-   #(SOURCE FEATURE-CLASSES)
-   arcpy.env.workspace = source_gdb
-   the_fdatasets = arcpy.ListDatasets("*","Feature")
-   for a_fdataset in the_fdatasets:
-      the_fclasses = arcpy.ListFeatureClasses("*", "All", a_fdataset)
-      for a_fclass in the_fclasses:
-         source_fclasses_prefixed_names.append(a_fclass)
-         source_fclasses_prefixes.append(get_schema_prefix(a_fclass))
-         source_fclasses_names.append(get_name(a_fclass))
-         source_fdatasets_prefixed_names.append(a_fdataset)
-         source_fdatasets_prefixes.append(get_schema_prefix(a_fdataset))
-         source_fdatasets_names.append(get_name(a_fdataset))
-
-   the_fclasses = arcpy.ListFeatureClasses()
-   for a_fclass in the_fclasses:
-      source_fclasses_prefixed_names.append(a_fclass)
-      source_fclasses_prefixes.append(get_schema_prefix(a_fclass))
-      source_fclasses_names.append(get_name(a_fclass))
-      source_fdatasets_prefixed_names.append("")
-      source_fdatasets_prefixes.append("")
-      source_fdatasets_names.append("")
-
-   #(SOURCE TABLES)
-   the_tables = arcpy.ListTables()
-   for a_table in the_tables:
-      table_name = get_name(a_table).upper()
-      #(DON'T WANT CERTAIN TABLES IN THE LISTS)
-      if table_name != "A_README" and table_name != "A_XCHANGE_PARAMETERS" and table_name != "A_XCHANGE_LOG":
-         source_tables_prefixed_names.append(a_table)
-         source_tables_prefixes.append(get_schema_prefix(a_table))
-         source_tables_names.append(table_name)
-
-   #(SOURCE RASTERS)
-   the_rasters = arcpy.ListRasters()
-   for a_raster in the_rasters:
-      source_rasters_prefixed_names.append(a_raster)
-      source_rasters_prefixes.append(get_schema_prefix(a_raster))
-      source_rasters_names.append(get_name(a_raster))
-
-   #(TARGET FEATURE-CLASSES)
-   arcpy.env.workspace = target_gdb
-   the_fdatasets = arcpy.ListDatasets("*","Feature")
-   for a_fdataset in the_fdatasets:
-      the_fclasses = arcpy.ListFeatureClasses("*", "All", a_fdataset)
-      #IF EMPTY FEATURE DATASET...
-      if len(the_fclasses) == 0:
-         target_empty_fdatasets.append(a_fdataset)
-      #OTHERWISE...
+#THIS FUNCTION RETURNS A RASTER DATASET'S SIGNATURE: A LIST OF STRINGS W/ ITS SIZE (COLUMNS AND ROWS), BAND COUNT,
+#   PIXEL TYPE, NODATA VALUE, EXTENT, CELL SIZE, AND SPATIAL REFERENCE. RASTER DATASETS W/ THE SAME SIGNATURE LINE UP BLOCK
+#   BY BLOCK (AND THEIR BLOCKS CAN BE WRITTEN FROM ONE TO THE OTHER AS THEY ARE).
+#   THE ARGUMENT IS AN arcpy Raster OBJECT.
+def get_raster_signature(the_raster):
+   the_extent = the_raster.extent
+   return ["COLUMNS=" + str(the_raster.width), "ROWS=" + str(the_raster.height), "BANDS=" + str(the_raster.bandCount), "PIXEL_TYPE=" + str(the_raster.pixelType), "NODATA=" + repr(the_raster.noDataValue), "EXTENT=" + " ".join([repr(the_extent.XMin), repr(the_extent.YMin), repr(the_extent.XMax), repr(the_extent.YMax)]), "CELL_SIZE=" + repr(the_raster.meanCellWidth) + " " + repr(the_raster.meanCellHeight), "SPATIAL_REFERENCE=" + the_raster.spatialReference.name]
+
+#THIS FUNCTION RETURNS THE BLOCKS OF A RASTER DATASET (RASTER_BLOCK_SIZE x RASTER_BLOCK_SIZE PIXELS, SMALLER AT THE
+#   RIGHT AND BOTTOM EDGES), ROW BY ROW FROM THE TOP LEFT, AS A LIST OF [LOWER-LEFT arcpy Point, COLUMNS, ROWS] LISTS.
+#   THE ARGUMENT IS AN arcpy Raster OBJECT.
+def get_raster_blocks(the_raster):
+   the_blocks = []
+   row_start = 0
+   while row_start < the_raster.height:
+      row_count = min(RASTER_BLOCK_SIZE, the_raster.height - row_start)
+      column_start = 0
+      while column_start < the_raster.width:
+         column_count = min(RASTER_BLOCK_SIZE, the_raster.width - column_start)
+         the_corner = arcpy.Point(the_raster.extent.XMin + column_start * the_raster.meanCellWidth, the_raster.extent.YMax - (row_start + row_count) * the_raster.meanCellHeight)
+         the_blocks.append([the_corner, column_count, row_count])
+         column_start += column_count
+      row_start += row_count
+   return the_blocks
+
+#THIS FUNCTION MAKES A FINGERPRINT OF A RASTER DATASET BY READING IT ONE BLOCK AT A TIME (SEE get_raster_blocks()).
+#   THE FINGERPRINT CAN BE STORED IN THE STATE STORE AND A_XCHANGE_DIGEST TABLE LIKE A FEATURE CLASS'S OR TABLE'S.
+#   RETURNS A DICTIONARY W/ THESE KEYS:
+#      digest       DIGEST (HEX STRING) OF ALL BLOCKS.
+#      row_count    NUMBER OF BLOCKS.
+#      blocks       LIST OF BLOCK DIGESTS (HEX STRINGS), IN get_raster_blocks() ORDER.
+#      fields       THE RASTER DATASET'S SIGNATURE (SEE get_raster_signature()).
+#   THE ARGUMENT IS THE FULL PATH OF THE RASTER DATASET.
+def fingerprint_raster(the_raster):
+   raster_object = arcpy.Raster(the_raster)
+   block_digests = []
+   for a_block in get_raster_blocks(raster_object):
+      the_array = arcpy.RasterToNumPyArray(the_raster, a_block[0], a_block[1], a_block[2])
+      block_digests.append(hashlib.md5(the_array.tostring()).hexdigest())
+      del the_array
+   return {"digest":hashlib.md5(":".join(block_digests)).hexdigest(),"row_count":len(block_digests),"blocks":block_digests,"fields":get_raster_signature(raster_object)}
+
+#THIS FUNCTION COMPARES A SOURCE RASTER-DATASET TO A TARGET RASTER-DATASET BLOCK BY BLOCK (SEE fingerprint_raster()).
+#   THE STATE STORE AND A_XCHANGE_DIGEST ENTRY ARE USED THE SAME WAY AS IN compare_objects().
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE RASTER-DATASET.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET RASTER-DATASET.
+#   THE THIRD ARGUMENT IS OPTIONAL. THE RASTER DATASET'S KEY IN THE STATE STORE (SEE get_delivered_fingerprint()).
+#   THE FOURTH ARGUMENT IS OPTIONAL. THE SOURCE RASTER-DATASET'S ENTRY IN THE SOURCE GEODATABASE'S A_XCHANGE_DIGEST TABLE.
+#   RETURNS A LIST: [RESULT ("same", "different", OR "error"), DESCRIPTION OF THE COMPARISON ("" IF N/A), INDEXES OF
+#   BLOCKS THAT DIFFER (None IF N/A, OR IF THE RASTER DATASETS DON'T LINE UP), THE SOURCE RASTER-DATASET'S FINGERPRINT
+#   (None IF N/A)].
+def compare_rasters(source_raster, target_raster, state_key = None, published_digest = None):
+   try:
+      the_delivery = get_trusted_delivery(state_key)
+      #IF THE SOURCE GEODATABASE PUBLISHES THAT THE SOURCE IS WHAT WAS LAST DELIVERED, NO DATA NEEDS TO BE READ
+      if the_delivery != None and published_digest != None:
+         if published_digest["digest"] == the_delivery[0]["digest"] and published_digest["row_count"] == the_delivery[0]["row_count"] and published_digest["fields_digest"] == get_fields_digest(the_delivery[0]["fields"]):
+            return ["same", "Source's A_XCHANGE_DIGEST entry (updated " + str(published_digest["updated"]) + ") matches what was delivered/verified on " + time.strftime("%Y%m%d-%H%M", time.localtime(the_delivery[1])) + " (no data read).", None, None]
+      source_fingerprint = fingerprint_raster(source_raster)
+      #IF THE SOURCE IS WHAT WAS LAST DELIVERED, THE TARGET DOESN'T NEED TO BE READ
+      if the_delivery != None and the_delivery[0]["fields"] == source_fingerprint["fields"] and the_delivery[0]["digest"] == source_fingerprint["digest"]:
+         return ["same", "Source matches what was delivered/verified on " + time.strftime("%Y%m%d-%H%M", time.localtime(the_delivery[1])) + " (target not read).", None, source_fingerprint]
+      target_fingerprint = fingerprint_raster(target_raster)
+      if target_fingerprint["fields"] != source_fingerprint["fields"]:
+         return ["different", "Raster datasets don't line up (" + ", ".join([i for i in source_fingerprint["fields"] if i not in target_fingerprint["fields"]]) + " in source).", None, source_fingerprint]
+      changed_blocks = [k for k in range(len(source_fingerprint["blocks"])) if source_fingerprint["blocks"][k] != target_fingerprint["blocks"][k]]
+      if len(changed_blocks) == 0:
+         if state_key != None:
+            save_delivered_fingerprint(state_key, source_fingerprint)
+         return ["same", "Source matches target.", None, source_fingerprint]
+      return ["different", str(len(changed_blocks)) + " of " + str(len(source_fingerprint["blocks"])) + " blocks differ.", changed_blocks, source_fingerprint]
+   except:
+      return ["error", "", None, None]
+
+#THIS FUNCTION WRITES BLOCKS OF A SOURCE RASTER-DATASET INTO A TARGET RASTER-DATASET THAT LINES UP W/ IT (SEE
+#   compare_rasters()). EACH BLOCK IS READ W/ NODATA PIXELS AS THE SOURCE'S NODATA VALUE, CAST TO THE TARGET'S PIXEL
+#   TYPE (SEE RASTER_PIXEL_DTYPES), AND SAVED AS A RASTER DATASET IN THE SCRATCH GEODATABASE W/ THE SAME NODATA VALUE;
+#   THEN THE BLOCKS ARE MOSAICKED INTO THE TARGET RASTER-DATASET. MOSAIC DOESN'T WRITE NODATA PIXELS OVER THE TARGET'S
+#   PIXELS, SO IF A PIXEL THAT HAS A VALUE IN THE TARGET IS NODATA IN THE SOURCE, NO BLOCKS ARE WRITTEN (THE RASTER
+#   DATASET MUST BE RE-LOADED INSTEAD).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE RASTER-DATASET.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET RASTER-DATASET.
+#   THE THIRD ARGUMENT IS A LIST OF INDEXES OF BLOCKS TO WRITE (SEE get_raster_blocks()).
+#   RETURNS True IF THE BLOCKS WERE WRITTEN, OR False IF A PIXEL BECAME NODATA (THE TARGET RASTER-DATASET ISN'T CHANGED).
+def apply_raster_delta(source_raster, target_raster, changed_blocks):
+   raster_object = arcpy.Raster(source_raster)
+   nodata_value = raster_object.noDataValue
+   the_dtype = RASTER_PIXEL_DTYPES.get(str(arcpy.Raster(target_raster).pixelType))
+   the_blocks = get_raster_blocks(raster_object)
+   block_rasters = []
+   try:
+      for k in changed_blocks:
+         the_array = arcpy.RasterToNumPyArray(source_raster, the_blocks[k][0], the_blocks[k][1], the_blocks[k][2], nodata_value)
+         if the_dtype != None and str(the_array.dtype) != the_dtype:
+            the_array = the_array.astype(the_dtype)
+         if nodata_value != None and (the_array == nodata_value).any():
+            target_array = arcpy.RasterToNumPyArray(target_raster, the_blocks[k][0], the_blocks[k][1], the_blocks[k][2], nodata_value)
+            if ((the_array == nodata_value) & (target_array != nodata_value)).any():
+               make_note("Pixels of block " + str(k) + " of " + target_raster + " became NoData in the source.", True)
+               return False
+            del target_array
+         block_raster = arcpy.CreateScratchName("block", "", "RasterDataset", arcpy.env.scratchGDB)
+         arcpy.NumPyArrayToRaster(the_array, the_blocks[k][0], raster_object.meanCellWidth, raster_object.meanCellHeight, nodata_value).save(block_raster)
+         block_rasters.append(block_raster)
+         arcpy.DefineProjection_management(block_raster, raster_object.spatialReference)
+         del the_array
+      arcpy.Mosaic_management(block_rasters, target_raster, "LAST")
+   finally:
+      for block_raster in block_rasters:
+         arcpy.Delete_management(block_raster)
+   return True
+
+#THIS FUNCTION APPLIES A DELTA FROM A SOURCE DATA-OBJECT TO A TARGET DATA-OBJECT, KEYED ON A KEY FIELD: SOURCE ROWS
+#   W/ KEYS THAT AREN'T IN THE TARGET ARE INSERTED, TARGET ROWS W/ KEYS THAT AREN'T IN THE SOURCE ARE DELETED, AND TARGET
+#   ROWS THAT HAVE A DIFFERENT ROW-DIGEST (SEE get_row_digest()) THAN THE SOURCE ROW W/ THE SAME KEY ARE UPDATED. ONLY
+#   FIELDS THAT ARE IN BOTH DATA-OBJECTS (AND GEOMETRY) ARE WRITTEN. IF THE TARGET DATA-OBJECT IS VERSIONED, THE DELTA
+#   IS APPLIED IN AN EDIT SESSION.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE THIRD ARGUMENT IS THE KEY FIELD (VALUES MUST BE UNIQUE AND NOT NULL).
+#   THE FOURTH ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   THE FIFTH ARGUMENT IS OPTIONAL. KEY RANGES WHERE THE DATA OBJECTS DIFFER (SEE compare_objects()). IF GIVEN, ONLY ROWS
+#      IN THE KEY RANGES ARE READ (SEE get_key_range_clause()).
+#   RETURNS A DICTIONARY THAT DESCRIBES THE LOAD (SEE load_rows()), OR None IF THE DELTA CAN'T BE APPLIED (KEY FIELD ISN'T
+#   IN BOTH DATA-OBJECTS, OR HAS NULL OR DUPLICATE VALUES); IN THAT CASE, THE TARGET DATA-OBJECT ISN'T CHANGED.
+def apply_delta(source_obj, target_obj, key_field, non_spatial = False, key_ranges = None):
+   if non_spatial == False:
+      ignore_options = IGNORE_PARAM
+   else:
+      ignore_options = IGNORE_PARAM_T
+   #FIELDS IN BOTH DATA-OBJECTS (KEY FIELD IS READ AND WRITTEN SEPARATELY, AS THE FIRST FIELD)
+   target_fields = get_fingerprint_fields(target_obj)
+   source_fields = get_fingerprint_fields(source_obj, target_fields)
+   target_fields = get_fingerprint_fields(target_obj, source_fields)
+   if key_field.upper() not in [j.upper() for j in source_fields]:
+      return None
+   source_key = [j for j in source_fields if j.upper() == key_field.upper()][0]
+   target_key = [j for j in target_fields if j.upper() == key_field.upper()][0]
+   source_fields = [source_key] + [j for j in source_fields if j != source_key]
+   target_fields = [target_key] + [j for j in target_fields if j != target_key]
+   the_clause = get_key_range_clause(target_obj, target_key, key_ranges)
+   #READ TARGET ROW-DIGESTS BY KEY
+   target_strip_options = get_strip_options(target_obj, non_spatial, ignore_options)
+   if non_spatial == False:
+      the_cursor = arcpy.da.SearchCursor(target_obj, target_fields + ["SHAPE@WKB"], the_clause)
+   else:
+      the_cursor = arcpy.da.SearchCursor(target_obj, target_fields, the_clause)
+   target_digests = {}
+   for a_row in the_cursor:
+      if a_row[0] == None or a_row[0] in target_digests:
+         del the_cursor
+         return None
+      target_digests[a_row[0]] = get_row_digest(a_row[1:], non_spatial, target_strip_options)
+   del the_cursor
+   #READ SOURCE ROWS. ROWS THAT ARE NEW OR DIFFERENT ARE KEPT (W/ GEOMETRY AS A GEOMETRY OBJECT, FOR WRITING).
+   source_strip_options = get_strip_options(source_obj, non_spatial, ignore_options)
+   if non_spatial == False:
+      the_cursor = arcpy.da.SearchCursor(source_obj, source_fields + ["SHAPE@WKB","SHAPE@"], the_clause)
+   else:
+      the_cursor = arcpy.da.SearchCursor(source_obj, source_fields, the_clause)
+   source_keys = set()
+   changed_rows = {}
+   for a_row in the_cursor:
+      if a_row[0] == None or a_row[0] in source_keys:
+         del the_cursor
+         return None
+      source_keys.add(a_row[0])
+      if non_spatial == False:
+         row_digest = get_row_digest(a_row[1:-1], non_spatial, source_strip_options)
+         if target_digests.get(a_row[0]) != row_digest:
+            changed_rows[a_row[0]] = list(a_row[0:-2]) + [a_row[-1]]
       else:
-         for a_fclass in the_fclasses:
-            target_fclasses_prefixed_names.append(a_fclass)
-            target_fclasses_prefixes.append(get_schema_prefix(a_fclass))
-            target_fclasses_names.append(get_name(a_fclass))
-            target_fdatasets_prefixed_names.append(a_fdataset)
-            target_fdatasets_prefixes.append(get_schema_prefix(a_fdataset))
-            target_fdatasets_names.append(get_name(a_fdataset))
-
-   the_fclasses = arcpy.ListFeatureClasses()
-   for a_fclass in the_fclasses:
-      target_fclasses_prefixed_names.append(a_fclass)
-      target_fclasses_prefixes.append(get_schema_prefix(a_fclass))
-      target_fclasses_names.append(get_name(a_fclass))
-      target_fdatasets_prefixed_names.append("")
-      target_fdatasets_prefixes.append("")
-      target_fdatasets_names.append("")
-
-   #(TARGET TABLES)
-   the_tables = arcpy.ListTables()
-   for a_table in the_tables:
-      table_name = get_name(a_table).upper()
-      #(DON'T WANT CERTAIN TABLES IN THE LISTS)
-      if table_name != "A_README" and table_name != "A_XCHANGE_PARAMETERS" and table_name != "A_XCHANGE_LOG":
-         target_tables_prefixed_names.append(a_table)
-         target_tables_prefixes.append(get_schema_prefix(a_table))
-         target_tables_names.append(table_name)
-
-   #(TARGET RASTERS)
-   the_rasters = arcpy.ListRasters()
-   for a_raster in the_rasters:
-      target_rasters_prefixed_names.append(a_raster)
-      target_rasters_prefixes.append(get_schema_prefix(a_raster))
-      target_rasters_names.append(get_name(a_raster))
-
-   #PRINT LISTS
-   print "***** LISTS OF PRE-EXISTING DATA OBJECTS *****"
-   print "SOURCE FEATURE-CLASSES:"
-   i = 0
-   while i < len(source_fclasses_prefixed_names):
-      print "     " + source_fclasses_prefixed_names[i]
-      print "          PREFIX: " + source_fclasses_prefixes[i]
-      print "          NAME W/O PREFIX: " + source_fclasses_names[i]
-      print "          CONTAINING FEATURE-DATASET: " + source_fdatasets_prefixed_names[i]
-      print "          CONTAINING FEATURE-DATASET PREFIX: " + source_fdatasets_prefixes[i]
-      print "          CONTAINING FEATURE-DATASET NAME W/O PREFIX: " + source_fdatasets_names[i]
-      i += 1
-   print "SOURCE TABLES:"
-   i = 0
-   while i < len(source_tables_prefixed_names):
-      print "     " + source_tables_prefixed_names[i]
-      print "          PREFIX: " + source_tables_prefixes[i]
-      print "          NAME W/O PREFIX: " + source_tables_names[i]
-      i += 1
-   print "SOURCE RASTERS:"
-   i = 0
-   while i < len(source_rasters_prefixed_names):
-      print "     " + source_rasters_prefixed_names[i]
-      print "          PREFIX: " + source_rasters_prefixes[i]
-      print "          NAME W/O PREFIX: " + source_rasters_names[i]
-      i += 1
-
-   print "TARGET FEATURE-CLASSES:"
-   i = 0
-   while i < len(target_fclasses_prefixed_names):
-      print "     " + target_fclasses_prefixed_names[i]
-      print "          PREFIX: " + target_fclasses_prefixes[i]
-      print "          NAME W/O PREFIX: " + target_fclasses_names[i]
-      print "          CONTAINING FEATURE-DATASET: " + target_fdatasets_prefixed_names[i]
-      print "          CONTAINING FEATURE-DATASET PREFIX: " + target_fdatasets_prefixes[i]
-      print "          CONTAINING FEATURE-DATASET NAME W/O PREFIX: " + target_fdatasets_names[i]
-      i += 1
-   print "TARGET TABLES:"
-   i = 0
-   while i < len(target_tables_prefixed_names):
-      print "     " + target_tables_prefixed_names[i]
-      print "          PREFIX: " + target_tables_prefixes[i]
-      print "          NAME W/O PREFIX: " + target_tables_names[i]
-      i += 1
-   print "TARGET RASTERS:"
-   i = 0
-   while i < len(target_rasters_prefixed_names):
-      print "     " + target_rasters_prefixed_names[i]
-      print "          PREFIX: " + target_rasters_prefixes[i]
-      print "          NAME W/O PREFIX: " + target_rasters_names[i]
-      i += 1
-   print "TARGET EMPTY FEATURE-DATASETS (CONTAIN NO FEATURE CLASSES):"
-   i = 0
-   while i < len(target_empty_fdatasets):
-      print "     " + target_empty_fdatasets[i]
-      i += 1
-
-   #MAKE freight_cars LIST TO STORE DICTIONARIES THAT MANAGE AND TRACK DATA TRANSFERS
-   freight_cars = []
-
-   #START LISTS TO TRACK TARGET FEATURE-DATASETS THAT ARE CREATED BECAUSE THEY DON'T ALREADY EXIST (OR IF ALREADY EXISTS IN TARGET BUT IS EMPTY)
-   created_fdatasets_prefixed_names = []
-   created_fdatasets_names = []
-   for i in target_empty_fdatasets:
-      created_fdatasets_prefixed_names.append(i)
-      created_fdatasets_names.append(get_name(i))
-
-   #FOR SOURCE FEATURE DATASETS THAT DON'T EXIST IN TARGET GEODATABASE, CREATE THEM IN TARGET GEODATABASE
-   i = 0
-   while i < len(source_fdatasets_prefixed_names):
-      if source_fdatasets_prefixed_names[i] != "":
-         #IF TARGET GEODATABASE DIDN'T HAVE FEATURE CLASSES CONTAINED BY THAT FEATURE DATASET WHEN SCRIPT STARTED...
-         j = get_index(target_fdatasets_names, source_fdatasets_names[i])
-         #IF FEATURE DATASET HASN'T ALREADY BEEN CREATED BY THIS SCRIPT AND IT ISN'T AN EMPTY FEATURE DATASET...
-         if j == -1:
-            if get_index(created_fdatasets_names, source_fdatasets_names[i]) == -1:
-               #CREATE THE FEATURE DATASET IN THE TARGET GEODATABASE AND CAPTURE ITS INFO
-               make_note("Feature-dataset " + source_fdatasets_names[i] + " doesn't already exist in target geodatabase; creating it...", True, True)
-               arcpy.env.workspace = source_gdb
-               arcpy.CreateFeatureDataset_management(target_gdb, source_fdatasets_names[i], source_fclasses_prefixed_names[i])
-               arcpy.env.workspace = target_gdb
-               the_fdatasets = arcpy.ListDatasets("*","Feature")
-               j = 0
-               found_it = False
-               while j < len(the_fdatasets) and found_it == False:
-                  if get_name(the_fdatasets[j]).upper() == source_fdatasets_names[i].upper():
-                     created_fdatasets_prefixed_names.append(the_fdatasets[j])
-                     created_fdatasets_names.append(get_name(the_fdatasets[j]))
-                     found_it = True
-                  j += 1
-               #IF FOR SOME WEIRD REASON, FEATURE DATASET'S PREFIXED NAME CAN'T BE CAPTURED, EXIT DUE TO ERROR CONDITION
-               if found_it == False:
-                  make_note("Script encountered error condition when trying to get full name (prefixed) of feature-dataset " + source_fdatasets_names[i] + " from target geodatabase.", True, True)
-                  sys.exit()
-      i += 1
-
-   #IF SOURCE GEODATABASE IS A SPOKE GEODATABASE AND ITS A_XCHANGE_PARAMETERS TABLE HAS ROWS...
-   if source_db_type == "spoke" and params_table_has_rows == True:
-      make_note("Source geodatabase is a spoke geodatabase w/ directives in A_XCHANGE_PARAMETERS table. Analyzing A_XCHANGE_PARAMETERS table...", True, True)
-      #WORK EACH A_XCHANGE_PARAMETERS ROW
-      arcpy.env.workspace = source_gdb
-      the_cursor = arcpy.da.SearchCursor(params_table_name, ["OBJECT_NAME","IS_FDATASET","DIRECTIVE","SORT_FIELD","NOTE"])
+         row_digest = get_row_digest(a_row[1:], non_spatial, source_strip_options)
+         if target_digests.get(a_row[0]) != row_digest:
+            changed_rows[a_row[0]] = list(a_row)
+   del the_cursor
+   deleted_keys = set([j for j in target_digests if j not in source_keys])
+   inserted_keys = [j for j in changed_rows if j not in target_digests]
+   the_load = {"strategy":"delta","inserted":len(inserted_keys),"updated":len(changed_rows) - len(inserted_keys),"deleted":len(deleted_keys),"chunks":None,"source_rows":None,"target_rows":None,"bytes":None}
+   #IF ALL ROWS WERE READ, ROW COUNTS ARE KNOWN (TARGET ROWS AFTER THE DELTA ARE THE ROWS READ, PLUS INSERTED, MINUS DELETED)
+   if the_clause == None:
+      the_load["source_rows"] = len(source_keys)
+      the_load["target_rows"] = len(target_digests) + the_load["inserted"] - the_load["deleted"]
+   del target_digests
+   del source_keys
+   #WRITE THE DELTA
+   if non_spatial == False:
+      target_fields.append("SHAPE@")
+   the_editor = None
+   if getattr(arcpy.Describe(target_obj), "isVersioned", False) == True:
+      the_editor = arcpy.da.Editor(target_gdb)
+      the_editor.startEditing(False, True)
+      the_editor.startOperation()
+   try:
+      if the_load["updated"] > 0 or the_load["deleted"] > 0:
+         the_cursor = arcpy.da.UpdateCursor(target_obj, target_fields, the_clause)
+         for a_row in the_cursor:
+            if a_row[0] in deleted_keys:
+               the_cursor.deleteRow()
+            elif a_row[0] in changed_rows:
+               the_cursor.updateRow(changed_rows[a_row[0]])
+         del the_cursor
+      if the_load["inserted"] > 0:
+         the_cursor = arcpy.da.InsertCursor(target_obj, target_fields)
+         for a_key in inserted_keys:
+            the_cursor.insertRow(changed_rows[a_key])
+         del the_cursor
+      if the_editor != None:
+         the_editor.stopOperation()
+         the_editor.stopEditing(True)
+   except:
+      if the_editor != None:
+         the_editor.abortOperation()
+         the_editor.stopEditing(False)
+      raise
+   return the_load
+
+#THIS FUNCTION RETURNS A WHERE CLAUSE THAT SELECTS ROWS IN GIVEN KEY RANGES, OR None IF ALL ROWS SHOULD BE READ.
+#   ONLY NUMERIC KEY-RANGES ARE TURNED INTO A WHERE CLAUSE (A DATABASE'S ORDER OF TEXT VALUES CAN BE DIFFERENT THAN
+#   PYTHON'S), AND ONLY IF THERE AREN'T MORE THAN DELTA_MAX_KEY_RANGES OF THEM.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS THE KEY FIELD.
+#   THE THIRD ARGUMENT IS A LIST OF [FIRST KEY-VALUE, LAST KEY-VALUE] LISTS (SEE get_differing_ranges()), OR None.
+def get_key_range_clause(the_object, key_field, key_ranges):
+   if key_ranges == None or len(key_ranges) == 0 or len(key_ranges) > DELTA_MAX_KEY_RANGES:
+      return None
+   the_field = arcpy.AddFieldDelimiters(the_object, key_field)
+   the_clauses = []
+   for a_range in key_ranges:
+      for a_value in a_range:
+         if isinstance(a_value, bool) or not isinstance(a_value, (int, long, float)):
+            return None
+      the_clauses.append("(" + the_field + " >= " + normalize_value(a_range[0]) + " AND " + the_field + " <= " + normalize_value(a_range[1]) + ")")
+   return " OR ".join(the_clauses)
+
+#THIS FUNCTION RETURNS A WHERE CLAUSE THAT SELECTS ROWS W/ GIVEN KEY-VALUES, OR None IF A KEY VALUE ISN'T A NUMBER OR
+#   TEXT (ALL ROWS SHOULD BE READ).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS THE KEY FIELD.
+#   THE THIRD ARGUMENT IS A LIST OF KEY VALUES (NO MORE THAN INCREMENTAL_KEYS_PER_CLAUSE).
+def get_key_list_clause(the_object, key_field, the_keys):
+   the_values = []
+   for a_key in the_keys:
+      if isinstance(a_key, bool):
+         return None
+      elif isinstance(a_key, (int, long, float)):
+         the_values.append(normalize_value(a_key))
+      elif isinstance(a_key, basestring):
+         the_values.append("'" + a_key.replace("'", "''") + "'")
+      else:
+         return None
+   return arcpy.AddFieldDelimiters(the_object, key_field) + " IN (" + ", ".join(the_values) + ")"
+
+#THIS FUNCTION RETURNS WHERE CLAUSES THAT TOGETHER SELECT ROWS W/ GIVEN KEY-VALUES (SEE get_key_list_clause()), OR [None]
+#   IF ALL ROWS SHOULD BE READ (ONCE).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS THE KEY FIELD.
+#   THE THIRD ARGUMENT IS A LIST OF KEY VALUES.
+def get_key_list_clauses(the_object, key_field, the_keys):
+   the_clauses = []
+   for k in range(0, len(the_keys), INCREMENTAL_KEYS_PER_CLAUSE):
+      the_clause = get_key_list_clause(the_object, key_field, the_keys[k:k + INCREMENTAL_KEYS_PER_CLAUSE])
+      if the_clause == None:
+         return [None]
+      the_clauses.append(the_clause)
+   return the_clauses
+
+#THIS FUNCTION RETURNS A WATERMARK-FIELD VALUE (DATE OR NUMBER) AS A WATERMARK: A LIST [KIND ("date" OR "number"),
+#   TEXT (YYYY-MM-DD HH:MM:SS FOR A DATE)], OR None IF THE VALUE ISN'T A DATE OR NUMBER. (THE WATERMARK OF AN ARCHIVED
+#   DATA-OBJECT IS A LIST ["archive", TEXT OF THE DATE, OR None IF ITS ARCHIVE CLASS IS EMPTY]; SEE get_archive_watermark().)
+def format_watermark(the_value):
+   if isinstance(the_value, datetime.datetime):
+      return ["date", the_value.isoformat(" ")[0:19]]
+   if isinstance(the_value, (int, long, float)) and not isinstance(the_value, bool):
+      return ["number", normalize_value(the_value)]
+   return None
+
+#THIS FUNCTION RETURNS A WHERE CLAUSE THAT SELECTS ROWS W/ A WATERMARK-FIELD VALUE AT OR AFTER A WATERMARK (SEE
+#   watermark_literal), OR THAT AREN'T NULL IF THERE'S NO WATERMARK VALUE YET.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS THE WATERMARK FIELD.
+#   THE THIRD ARGUMENT IS THE WATERMARK (SEE format_watermark()), OR None.
+def get_watermark_clause(the_object, field_name, the_watermark):
+   the_field = arcpy.AddFieldDelimiters(the_object, field_name)
+   if the_watermark == None:
+      return the_field + " IS NOT NULL"
+   if the_watermark[0] == "date":
+      return the_field + " >= " + watermark_literal % the_watermark[1]
+   return the_field + " >= " + the_watermark[1]
+
+#THIS FUNCTION RETURNS THE HIGHEST VALUE OF A DATA OBJECT'S WATERMARK FIELD AS A WATERMARK (SEE format_watermark()), OR
+#   None IF ALL VALUES ARE NULL.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS THE WATERMARK FIELD.
+#   THE THIRD ARGUMENT IS OPTIONAL. A WHERE CLAUSE OF THE ROWS TO CONSIDER.
+def get_max_watermark(the_object, field_name, where_clause = None):
+   the_value = None
+   the_cursor = arcpy.da.SearchCursor(the_object, [field_name], where_clause, None, False, (None, "ORDER BY " + arcpy.AddFieldDelimiters(the_object, field_name) + " DESC"))
+   #(SOME DATABASES SORT NULLS FIRST)
+   for a_row in the_cursor:
+      if a_row[0] != None:
+         the_value = a_row[0]
+         break
+   del the_cursor
+   return format_watermark(the_value)
+
+#THIS FUNCTION RETURNS THE NAME OF A DATA OBJECT'S WATERMARK FIELD AS IT IS IN THE DATA OBJECT, OR None IF IT ISN'T A
+#   DATE OR NUMBER FIELD OF THE DATA OBJECT (SEE WATERMARK_FIELD_TYPES).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS THE WATERMARK FIELD (ANY CASE).
+def get_watermark_field_name(the_object, field_name):
+   for a_field in arcpy.ListFields(the_object):
+      if a_field.name.upper() == field_name.upper() and a_field.type in WATERMARK_FIELD_TYPES:
+         return a_field.name
+   return None
+
+#THIS FUNCTION RETURNS THE FULL PATH OF A DATA OBJECT'S ARCHIVE CLASS, OR None IF use_archive_tables IS False, THE DATA
+#   OBJECT ISN'T ARCHIVED, OR ITS ARCHIVE CLASS (NAME W/ ARCHIVE_CLASS_SUFFIX) ISN'T THERE.
+#   THE ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+def get_archive_class(the_object):
+   if use_archive_tables == False or getattr(arcpy.Describe(the_object), "isArchived", False) != True:
+      return None
+   archive_obj = the_object + ARCHIVE_CLASS_SUFFIX
+   if arcpy.Exists(archive_obj) == False:
+      return None
+   return archive_obj
+
+#THIS FUNCTION RETURNS THE LATEST DATE THAT A ROW VERSION OF AN ARCHIVE CLASS STARTED OR ENDED (NOT COUNTING CURRENT
+#   VERSIONS' ARCHIVE_OPEN_DATE) AS A WATERMARK: A LIST ["archive", TEXT (YYYY-MM-DD HH:MM:SS), OR None IF THE ARCHIVE CLASS
+#   IS EMPTY].
+#   THE ARGUMENT IS THE FULL PATH OF THE ARCHIVE CLASS.
+def get_archive_watermark(archive_obj):
+   from_watermark = get_max_watermark(archive_obj, ARCHIVE_FROM_FIELD)
+   to_watermark = get_max_watermark(archive_obj, ARCHIVE_TO_FIELD, arcpy.AddFieldDelimiters(archive_obj, ARCHIVE_TO_FIELD) + " < " + watermark_literal % ARCHIVE_OPEN_DATE)
+   the_dates = [j[1] for j in (from_watermark, to_watermark) if j != None]
+   if len(the_dates) == 0:
+      return ["archive", None]
+   return ["archive", max(the_dates)]
+
+#THIS FUNCTION RETURNS THE WATERMARK TO RECORD WHEN ALL ROWS OF AN INCREMENTAL DATA-OBJECT ARE LOADED (READ BEFORE THEY
+#   ARE LOADED): THE LATEST DATE OF ITS ARCHIVE CLASS IF IT IS ARCHIVED (SEE get_archive_class()), OTHERWISE THE HIGHEST
+#   VALUE OF ITS WATERMARK FIELD.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE WATERMARK FIELD.
+#   RETURNS A LIST [WATERMARK (SEE format_watermark())], OR None IF THE DATA OBJECT ISN'T ARCHIVED AND THE WATERMARK FIELD
+#   ISN'T A DATE OR NUMBER FIELD OF IT.
+def get_start_watermark(source_obj, watermark_field):
+   archive_obj = get_archive_class(source_obj)
+   if archive_obj != None:
+      return [get_archive_watermark(archive_obj)]
+   field_name = get_watermark_field_name(source_obj, watermark_field)
+   if field_name == None:
+      return None
+   return [get_max_watermark(source_obj, field_name)]
+
+#THIS FUNCTION LOADS THE INCREMENT OF AN INCREMENTAL DATA-OBJECT (SEE README NOTES): SOURCE ROWS W/ A WATERMARK-FIELD
+#   VALUE AT OR AFTER THE STATE STORE'S WATERMARK ARE UPSERTED INTO THE TARGET DATA-OBJECT BY KEY (SEE upsert_rows()).
+#   EVERY reconcile_days, KEYS ARE RECONCILED TOO (SEE reconcile_keys()). WRITES ARE IN AN EDIT SESSION IF THE TARGET
+#   DATA-OBJECT IS VERSIONED. IF THERE'S NO WATERMARK YET, ALL ROWS ARE LOADED (SEE load_rows()), AFTER THE SOURCE'S
+#   HIGHEST WATERMARK-VALUE IS READ (SO THAT ROWS EDITED DURING THE LOAD ARE LOADED AGAIN NEXT TIME). ONCE ROWS ARE
+#   WRITTEN, THE HIGHEST WATERMARK-VALUE READ IS RECORDED IN THE STATE STORE (SEE save_watermark()). ONLY FIELDS THAT ARE
+#   IN BOTH DATA-OBJECTS (AND GEOMETRY) ARE WRITTEN. IF THE SOURCE DATA-OBJECT IS ARCHIVED, THE INCREMENT IS READ FROM ITS
+#   ARCHIVE CLASS INSTEAD (SEE load_archive_increment()).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE THIRD ARGUMENT IS THE KEY FIELD (VALUES MUST BE UNIQUE AND NOT NULL).
+#   THE FOURTH ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   THE FIFTH ARGUMENT IS THE INCREMENT: A DICTIONARY W/ KEYS "watermark_field" AND "state_key" (SEE get_watermark()).
+#   RETURNS A DICTIONARY THAT DESCRIBES THE LOAD (SEE load_rows()), OR None IF THE INCREMENT CAN'T BE LOADED (KEY FIELD
+#   ISN'T IN BOTH DATA-OBJECTS OR HAS NULL OR DUPLICATE VALUES, OR SOURCE DATA-OBJECT ISN'T ARCHIVED AND WATERMARK FIELD
+#   ISN'T A DATE OR NUMBER FIELD OF IT); IN THAT CASE, THE TARGET DATA-OBJECT ISN'T CHANGED.
+def load_increment(source_obj, target_obj, key_field, non_spatial, the_increment):
+   #FIELDS IN BOTH DATA-OBJECTS (KEY FIELD IS READ AND WRITTEN AS THE FIRST FIELD)
+   target_fields = get_fingerprint_fields(target_obj)
+   source_fields = get_fingerprint_fields(source_obj, target_fields)
+   target_fields = get_fingerprint_fields(target_obj, source_fields)
+   if key_field == None or key_field.upper() not in [j.upper() for j in source_fields]:
+      return None
+   source_key = [j for j in source_fields if j.upper() == key_field.upper()][0]
+   target_key = [j for j in target_fields if j.upper() == key_field.upper()][0]
+   source_fields = [source_key] + [j for j in source_fields if j != source_key]
+   target_fields = [target_key] + [j for j in target_fields if j != target_key]
+   archive_obj = get_archive_class(source_obj)
+   if archive_obj == None:
+      field_name = get_watermark_field_name(source_obj, the_increment["watermark_field"])
+      if field_name == None:
+         return None
+   if non_spatial == False:
+      source_fields.append("SHAPE@")
+      target_fields.append("SHAPE@")
+   the_watermark = get_watermark(the_increment["state_key"])
+   #(A WATERMARK OF THE OTHER KIND IS OF NO USE IF ARCHIVING WAS TURNED ON OR OFF)
+   if the_watermark != None and (the_watermark[0] != None and the_watermark[0][0] == "archive") != (archive_obj != None):
+      the_watermark = None
+   #W/O A WATERMARK, ALL ROWS ARE LOADED
+   if the_watermark == None:
+      new_watermark = get_start_watermark(source_obj, the_increment["watermark_field"])[0]
+      the_load = load_rows(source_obj, target_obj, key_field, non_spatial)
+      save_watermark(the_increment["state_key"], new_watermark, time.time())
+      return the_load
+   if archive_obj != None:
+      return load_archive_increment(archive_obj, target_obj, source_fields, target_fields, the_increment, the_watermark)
+   #READ SOURCE ROWS EDITED AT OR AFTER THE WATERMARK (AT, IN CASE ROWS W/ THE SAME VALUE WERE EDITED AFTER IT WAS READ)
+   phase_start = time.time()
+   if the_watermark[0] == None:
+      the_since = "start"
+   else:
+      the_since = the_watermark[0][1]
+   the_cursor = arcpy.da.SearchCursor(source_obj, source_fields + [field_name], get_watermark_clause(source_obj, field_name, the_watermark[0]))
+   changed_rows = {}
+   max_value = None
+   bytes_read = 0
+   for a_row in the_cursor:
+      if a_row[0] == None or a_row[0] in changed_rows:
+         del the_cursor
+         return None
+      if a_row[-1] != None and (max_value == None or a_row[-1] > max_value):
+         max_value = a_row[-1]
+      changed_rows[a_row[0]] = list(a_row[0:-1])
+      bytes_read += get_row_bytes(changed_rows[a_row[0]])
+   del the_cursor
+   the_load = {"strategy":"incremental","since":the_since,"inserted":0,"updated":0,"deleted":None,"chunks":None,"source_rows":None,"target_rows":None,"bytes":bytes_read}
+   is_reconciling = the_watermark[1] == None or time.time() - the_watermark[1] >= reconcile_days * 86400
+   #WRITE THE INCREMENT (AND RECONCILE KEYS, IF IT'S TIME)
+   the_editor = None
+   if (len(changed_rows) > 0 or is_reconciling == True) and getattr(arcpy.Describe(target_obj), "isVersioned", False) == True:
+      the_editor = arcpy.da.Editor(target_gdb)
+      the_editor.startEditing(False, True)
+      the_editor.startOperation()
+   try:
+      if len(changed_rows) > 0:
+         the_load["inserted"], the_load["updated"] = upsert_rows(target_obj, target_fields, changed_rows)
+      phase_start = add_phase_time(car_phases, "incremental", phase_start)
+      if is_reconciling == True:
+         the_load["deleted"], missing_count, the_load["source_rows"], the_load["target_rows"] = reconcile_keys(source_obj, target_obj, source_fields, target_fields)
+         the_load["inserted"] += missing_count
+         add_phase_time(car_phases, "reconcile", phase_start)
+      if the_editor != None:
+         the_editor.stopOperation()
+         the_editor.stopEditing(True)
+   except:
+      if the_editor != None:
+         the_editor.abortOperation()
+         the_editor.stopEditing(False)
+      raise
+   new_watermark = format_watermark(max_value)
+   if new_watermark == None:
+      new_watermark = the_watermark[0]
+   if is_reconciling == True:
+      save_watermark(the_increment["state_key"], new_watermark, time.time())
+   else:
+      save_watermark(the_increment["state_key"], new_watermark, the_watermark[1])
+   return the_load
+
+#THIS FUNCTION LOADS THE INCREMENT OF AN ARCHIVED INCREMENTAL DATA-OBJECT FROM ITS ARCHIVE CLASS (SEE README NOTES): ROW
+#   VERSIONS THAT STARTED OR ENDED AT OR AFTER THE WATERMARK ARE READ. CURRENT VERSIONS ARE UPSERTED INTO THE TARGET
+#   DATA-OBJECT BY KEY (SEE upsert_rows()), AND KEYS W/O A CURRENT VERSION (ROWS DELETED OR RE-KEYED) ARE DELETED FROM IT
+#   (SEE delete_keys()). WRITES ARE IN AN EDIT SESSION IF THE TARGET DATA-OBJECT IS VERSIONED. ONCE ROWS ARE WRITTEN,
+#   THE LATEST DATE READ IS RECORDED IN THE STATE STORE (SEE save_watermark()).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE ARCHIVE CLASS.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE THIRD ARGUMENT IS THE LIST OF SOURCE FIELDS TO READ (KEY FIELD FIRST).
+#   THE FOURTH ARGUMENT IS THE LIST OF TARGET FIELDS TO WRITE (KEY FIELD FIRST).
+#   THE FIFTH ARGUMENT IS THE INCREMENT (SEE load_increment()).
+#   THE SIXTH ARGUMENT IS THE STATE STORE'S WATERMARK (SEE get_watermark()).
+#   RETURNS A DICTIONARY THAT DESCRIBES THE LOAD (SEE load_rows()), OR None IF A KEY VALUE OF A VERSION IS NULL OR TWO
+#   CURRENT VERSIONS HAVE THE SAME KEY VALUE; IN THAT CASE, THE TARGET DATA-OBJECT ISN'T CHANGED.
+def load_archive_increment(archive_obj, target_obj, source_fields, target_fields, the_increment, the_watermark):
+   phase_start = time.time()
+   from_field = arcpy.AddFieldDelimiters(archive_obj, ARCHIVE_FROM_FIELD)
+   to_field = arcpy.AddFieldDelimiters(archive_obj, ARCHIVE_TO_FIELD)
+   if the_watermark[0][1] == None:
+      the_since = "start"
+      the_clause = None
+   else:
+      the_since = the_watermark[0][1]
+      the_clause = from_field + " >= " + watermark_literal % the_since + " OR (" + to_field + " >= " + watermark_literal % the_since + " AND " + to_field + " < " + watermark_literal % ARCHIVE_OPEN_DATE + ")"
+   the_cursor = arcpy.da.SearchCursor(archive_obj, source_fields + [ARCHIVE_FROM_FIELD, ARCHIVE_TO_FIELD], the_clause)
+   current_rows = {}
+   ended_keys = set()
+   max_value = None
+   bytes_read = 0
+   for a_row in the_cursor:
+      if a_row[0] == None:
+         del the_cursor
+         return None
+      the_dates = [a_row[-2]]
+      #(A CURRENT VERSION ENDS ON ARCHIVE_OPEN_DATE)
+      if a_row[-1] == None or a_row[-1].year >= 9999:
+         if a_row[0] in current_rows:
+            del the_cursor
+            return None
+         current_rows[a_row[0]] = list(a_row[0:-2])
+         bytes_read += get_row_bytes(current_rows[a_row[0]])
+      else:
+         ended_keys.add(a_row[0])
+         the_dates.append(a_row[-1])
+      for a_date in the_dates:
+         if a_date != None and (max_value == None or a_date > max_value):
+            max_value = a_date
+   del the_cursor
+   deleted_keys = [j for j in ended_keys if j not in current_rows]
+   the_load = {"strategy":"archive","since":the_since,"inserted":0,"updated":0,"deleted":0,"chunks":None,"source_rows":None,"target_rows":None,"bytes":bytes_read}
+   #WRITE THE INCREMENT
+   the_editor = None
+   if (len(current_rows) > 0 or len(deleted_keys) > 0) and getattr(arcpy.Describe(target_obj), "isVersioned", False) == True:
+      the_editor = arcpy.da.Editor(target_gdb)
+      the_editor.startEditing(False, True)
+      the_editor.startOperation()
+   try:
+      if len(current_rows) > 0:
+         the_load["inserted"], the_load["updated"] = upsert_rows(target_obj, target_fields, current_rows)
+      if len(deleted_keys) > 0:
+         the_load["deleted"] = delete_keys(target_obj, target_fields[0], deleted_keys)
+      if the_editor != None:
+         the_editor.stopOperation()
+         the_editor.stopEditing(True)
+   except:
+      if the_editor != None:
+         the_editor.abortOperation()
+         the_editor.stopEditing(False)
+      raise
+   add_phase_time(car_phases, "archive", phase_start)
+   new_watermark = the_watermark[0]
+   if max_value != None:
+      new_watermark = ["archive", format_watermark(max_value)[1]]
+   save_watermark(the_increment["state_key"], new_watermark, the_watermark[1])
+   return the_load
+
+#THIS FUNCTION DELETES THE ROWS OF A TARGET DATA-OBJECT W/ GIVEN KEY-VALUES (W/ UPDATE CURSORS THAT ONLY SELECT THE
+#   GIVEN KEYS; SEE get_key_list_clauses()).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE KEY FIELD.
+#   THE THIRD ARGUMENT IS A LIST OF KEY VALUES.
+#   RETURNS THE NUMBER OF ROWS DELETED.
+def delete_keys(target_obj, key_field, the_keys):
+   deleted_count = 0
+   key_set = set(the_keys)
+   for a_clause in get_key_list_clauses(target_obj, key_field, list(key_set)):
+      the_cursor = arcpy.da.UpdateCursor(target_obj, [key_field], a_clause)
       for a_row in the_cursor:
-         the_directive = a_row[2]
-         if the_directive == None:
-            the_directive = ""
-         the_directive = the_directive.upper().strip()
-         #IF DIRECTIVE APPLIES TO A FEATURE DATASET...
-         if a_row[1] == 1 and the_directive != "STATIC":
-            #FIND OUT IF THE FEATURE DATASET EXISTS IN SOURCE GEODATABASE
-            i = get_index(source_fdatasets_prefixed_names, a_row[0])
-            #IF FEATURE DATASET DOES EXIST IN SOURCE GEODATABASE...
-            if i != -1:
-               #FOR EACH FEATURE CLASS OF THE SOURCE FEATURE-DATASET, LOAD A FREIGHT CAR
-               the_fclasses = arcpy.ListFeatureClasses("*", "All", a_row[0])
-               for a_fclass in the_fclasses:
-                  source_prefix = get_schema_prefix(a_fclass)
-                  fds = get_name(a_row[0])
-                  name = get_name(a_fclass)
-                  type = "fclass"
-                  if the_directive == "DETECT_CHANGES":
-                     detect_changes = True
-                     sort_field = a_row[3].strip()
-                  else:
-                     detect_changes = False
-                     sort_field = None
-                  i = get_index(target_fclasses_names, get_name(a_fclass))
-                  if i != -1:
-                     already_there = True
-                     target_prefix = target_fclasses_prefixes[i]
-                  else:
-                     already_there = False
-                     target_prefix = ""
-                  freight_cars.append(create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix))
-            #OTHERWISE, MAKE NOTE THAT FEATURE DATASET DOESN'T EXIST IN SOURCE GEODATABASE
-            else:
-               make_note("A_XCHANGE_PARAMETERS table has a directive for a feature dataset named " + a_row[0] + ". However source geodatabase doesn't have a feature dataset by that name. Skipping it.", True, True)
-         #OTHERWISE, DIRECTIVE APPLIES TO AN INDIVIDUAL FEATURE-CLASS, TABLE, OR RASTER DATASET
-         else:
-            #DETERMINE IF DIRECTIVE APPLIES TO A FEATURE CLASS, TABLE, RASTER DATASET, OR A DATA OBJECT THAT DOESN'T EXIST (OR DATA OBJECT TO BE SKIPPED)
-            if the_directive != "STATIC":
-               i = get_index(source_fclasses_prefixed_names, a_row[0])
-               if i != -1:
-                  applies_to = "fclass"
-               else:
-                  i = get_index(source_tables_prefixed_names, a_row[0])
-                  if i != -1:
-                     applies_to = "table"
-                  else:
-                     i = get_index(source_rasters_prefixed_names, a_row[0])
-                     if i != -1:
-                        applies_to = "raster"
-                     else:
-                        applies_to = "nothing"
-            else:
-               applies_to = "skip"
-            #IF FEATURE CLASS, LOAD A FREIGHT CAR THIS WAY
-            if applies_to == "fclass":
-               source_prefix = source_fclasses_prefixes[i]
-               if source_fdatasets_names[i] == "":
-                  fds = None
-               else:
-                  fds = source_fdatasets_names[i]
-               name = source_fclasses_names[i]
-               type = "fclass"
-               if the_directive == "DETECT_CHANGES":
-                  detect_changes = True
-                  sort_field = a_row[3].strip()
-               else:
-                  detect_changes = False
-                  sort_field = None
-               i = get_index(target_fclasses_names, name)
-               if i != -1:
-                  already_there = True
-                  target_prefix = target_fclasses_prefixes[i]
-               else:
-                  already_there = False
-                  target_prefix = ""
-               freight_cars.append(create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix))
-            #IF TABLE, LOAD A FREIGHT CAR THIS WAY
-            elif applies_to == "table":
-               source_prefix = source_tables_prefixes[i]
-               fds = None
-               name = source_tables_names[i]
-               type = "table"
-               if the_directive == "DETECT_CHANGES":
-                  detect_changes = True
-                  sort_field = a_row[3].strip()
-               else:
-                  detect_changes = False
-                  sort_field = None
-               i = get_index(target_tables_names, name)
-               if i != -1:
-                  already_there = True
-                  target_prefix = target_tables_prefixes[i]
-               else:
-                  already_there = False
-                  target_prefix = ""
-               freight_cars.append(create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix))
-            #IF RASTER DATASET, LOAD A FREIGHT CAR THIS WAY
-            elif applies_to == "raster":
-               source_prefix = source_rasters_prefixes[i]
-               fds = None
-               name = source_rasters_names[i]
-               type = "raster"
-               detect_changes = False
-               sort_field = None
-               i = get_index(target_rasters_names, name)
-               if i != -1:
-                  already_there = True
-                  target_prefix = target_rasters_prefixes[i]
-               else:
-                  already_there = False
-                  target_prefix = ""
-               freight_cars.append(create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix))
-            elif applies_to == "skip":
-               pass
-            #OTHERWISE, DATA OBJECT DOESN'T EXIST. MAKE NOTE.
-            else:
-               make_note("A_XCHANGE_PARAMETERS table has a directive for a data object named " + a_row[0] + ". However source geodatabase doesn't have a data object by that name. Skipping it.", True, True)
+         if a_row[0] in key_set:
+            the_cursor.deleteRow()
+            deleted_count += 1
       del the_cursor
-   #OTHERWISE, NOT WORKING THROUGH A_XCHANGE_PARAMETERS TABLE
+   return deleted_count
+
+#THIS FUNCTION UPSERTS ROWS INTO A TARGET DATA-OBJECT BY KEY: TARGET ROWS W/ A GIVEN KEY ARE UPDATED (W/ UPDATE CURSORS
+#   THAT ONLY SELECT THE GIVEN KEYS; SEE get_key_list_clauses()), AND ROWS W/ KEYS THAT AREN'T IN THE TARGET ARE INSERTED.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE LIST OF FIELDS TO WRITE (KEY FIELD FIRST).
+#   THE THIRD ARGUMENT IS A DICTIONARY OF ROWS (VALUES OF THE FIELDS) BY KEY.
+#   RETURNS A LIST: [ROWS INSERTED, ROWS UPDATED]
+def upsert_rows(target_obj, target_fields, the_rows):
+   the_keys = list(the_rows)
+   found_keys = set()
+   for a_clause in get_key_list_clauses(target_obj, target_fields[0], the_keys):
+      the_cursor = arcpy.da.UpdateCursor(target_obj, target_fields, a_clause)
+      for a_row in the_cursor:
+         if a_row[0] in the_rows:
+            the_cursor.updateRow(the_rows[a_row[0]])
+            found_keys.add(a_row[0])
+      del the_cursor
+   new_keys = [j for j in the_keys if j not in found_keys]
+   if len(new_keys) > 0:
+      the_cursor = arcpy.da.InsertCursor(target_obj, target_fields)
+      for a_key in new_keys:
+         the_cursor.insertRow(the_rows[a_key])
+      del the_cursor
+   return [len(new_keys), len(found_keys)]
+
+#THIS FUNCTION RECONCILES THE KEYS OF AN INCREMENTAL DATA-OBJECT: KEYS OF THE SOURCE AND TARGET DATA-OBJECTS ARE READ
+#   (KEY FIELD ONLY), TARGET ROWS WHOSE KEY ISN'T IN THE SOURCE ARE DELETED, AND SOURCE ROWS WHOSE KEY ISN'T IN THE TARGET
+#   ARE INSERTED.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE THIRD ARGUMENT IS THE LIST OF SOURCE FIELDS TO READ (KEY FIELD FIRST).
+#   THE FOURTH ARGUMENT IS THE LIST OF TARGET FIELDS TO WRITE (KEY FIELD FIRST).
+#   RETURNS A LIST: [ROWS DELETED, ROWS INSERTED, SOURCE ROW-COUNT, TARGET ROW-COUNT AFTER RECONCILING]
+def reconcile_keys(source_obj, target_obj, source_fields, target_fields):
+   source_keys = set()
+   the_cursor = arcpy.da.SearchCursor(source_obj, [source_fields[0]])
+   for a_row in the_cursor:
+      source_keys.add(a_row[0])
+   del the_cursor
+   target_keys = set()
+   target_row_count = 0
+   the_cursor = arcpy.da.SearchCursor(target_obj, [target_fields[0]])
+   for a_row in the_cursor:
+      target_keys.add(a_row[0])
+      target_row_count += 1
+   del the_cursor
+   deleted_keys = [j for j in target_keys if j not in source_keys]
+   missing_keys = [j for j in source_keys if j not in target_keys]
+   del target_keys
+   deleted_count = 0
+   if len(deleted_keys) > 0:
+      deleted_count = delete_keys(target_obj, target_fields[0], deleted_keys)
+   if len(missing_keys) > 0:
+      missing_keys = set(missing_keys)
+      insert_cursor = arcpy.da.InsertCursor(target_obj, target_fields)
+      for a_clause in get_key_list_clauses(source_obj, source_fields[0], list(missing_keys)):
+         the_cursor = arcpy.da.SearchCursor(source_obj, source_fields, a_clause)
+         for a_row in the_cursor:
+            if a_row[0] in missing_keys:
+               insert_cursor.insertRow(a_row)
+         del the_cursor
+      del insert_cursor
+   return [deleted_count, len(missing_keys), len(source_keys), target_row_count - deleted_count + len(missing_keys)]
+
+#THIS FUNCTION DELETES ROWS OF A TARGET DATA-OBJECT AND COPIES ROWS FROM A SOURCE DATA-OBJECT IN CHUNKS (IN OBJECTID
+#   ORDER). EACH CHUNK IS COMMITTED IN ITS OWN EDIT SESSION (NON-VERSIONED TOO, SO THAT A CHUNK THAT FAILS LEAVES NO ROWS
+#   IN THE TARGET DATA-OBJECT) AND THE LOAD'S PROGRESS (LAST OBJECTID LOADED) IS RECORDED IN THE STATE STORE (SEE
+#   get_load_progress()). IF A PREVIOUS LOAD INTO THE TARGET DATA-OBJECT WAS INTERRUPTED, THE SOURCE DATA-OBJECT STILL HAS
+#   THE SAME ROW COUNT AND LAST OBJECTID, AND THE TARGET DATA-OBJECT HAS JUST THE ROWS OF THE CHUNKS THAT WERE RECORDED,
+#   TARGET ROWS AREN'T DELETED; THE LOAD PICKS UP AFTER THE LAST CHUNK THAT WAS COMMITTED. CHUNKS ARE SIZED PER
+#   chunk_rows AND chunk_seconds. ONLY FIELDS THAT ARE IN BOTH DATA-OBJECTS (AND GEOMETRY) ARE COPIED.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE THIRD ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   RETURNS A DICTIONARY THAT DESCRIBES THE LOAD (SEE load_rows()).
+def load_rows_in_chunks(source_obj, target_obj, non_spatial = False):
+   #FIELDS IN BOTH DATA-OBJECTS
+   target_fields = get_fingerprint_fields(target_obj)
+   source_fields = get_fingerprint_fields(source_obj, target_fields)
+   target_fields = get_fingerprint_fields(target_obj, source_fields)
+   if non_spatial == False:
+      source_fields.append("SHAPE@")
+      target_fields.append("SHAPE@")
+   oid_field = arcpy.AddFieldDelimiters(source_obj, arcpy.Describe(source_obj).OIDFieldName)
+   target_versioned = getattr(arcpy.Describe(target_obj), "isVersioned", False)
+   #SOURCE ROW-COUNT AND LAST OBJECTID TELL IF AN INTERRUPTED LOAD CAN BE RESUMED
+   source_row_count = int(get_count(source_obj))
+   source_max_oid = None
+   the_cursor = arcpy.da.SearchCursor(source_obj, ["OID@"], sql_clause = (None, "ORDER BY " + oid_field + " DESC"))
+   for a_row in the_cursor:
+      source_max_oid = a_row[0]
+      break
+   del the_cursor
+   the_progress = get_load_progress(target_obj)
+   if the_progress != None and (the_progress["source_obj"] != source_obj or the_progress["source_row_count"] != source_row_count or the_progress["source_max_oid"] != source_max_oid):
+      the_progress = None
+   #(A CHUNK COMMITTED W/O ITS PROGRESS BEING RECORDED WOULD BE LOADED AGAIN)
+   if the_progress != None and int(get_count(target_obj)) != the_progress["rows_loaded"]:
+      make_note("Can't resume interrupted load of " + target_obj + " (its row count doesn't match the " + str(the_progress["rows_loaded"]) + " rows recorded as loaded). Re-loading all rows instead.", True, True)
+      the_progress = None
+   if the_progress != None:
+      last_oid = the_progress["last_oid"]
+      rows_loaded = the_progress["rows_loaded"]
+      make_note("Resuming interrupted load of " + target_obj + " after OBJECTID " + str(last_oid) + " (" + str(rows_loaded) + " of " + str(source_row_count) + " rows already loaded).", True, True)
    else:
-      make_note("Analyzing source data-objects...", True, True)
-      #FEATURE CLASSES
-      i = 0
-      while i < len(source_fclasses_prefixed_names):
-         source_prefix = source_fclasses_prefixes[i]
-         if source_fdatasets_names[i] == "":
-            fds = None
-         else:
-            fds = source_fdatasets_names[i]
-         name = source_fclasses_names[i]
-         type = "fclass"
-         detect_changes = False
-         sort_field = None
-         j = get_index(target_fclasses_names, name)
-         if j != -1:
-            already_there = True
-            target_prefix = target_fclasses_prefixes[j]
+      phase_start = time.time()
+      arcpy.DeleteRows_management(target_obj)
+      add_phase_time(car_phases, "delete", phase_start)
+      last_oid = None
+      rows_loaded = 0
+   save_load_progress(target_obj, {"source_obj":source_obj,"source_row_count":source_row_count,"source_max_oid":source_max_oid,"last_oid":last_oid,"rows_loaded":rows_loaded})
+   chunk_size = max(1, chunk_rows)
+   chunk_count = 0
+   bytes_streamed = 0
+   while True:
+      chunk_start = time.time()
+      if last_oid == None:
+         the_clause = None
+      else:
+         the_clause = oid_field + " > " + str(last_oid)
+      the_editor = arcpy.da.Editor(target_gdb)
+      the_editor.startEditing(False, target_versioned)
+      the_editor.startOperation()
+      try:
+         the_cursor = arcpy.da.SearchCursor(source_obj, ["OID@"] + source_fields, the_clause, sql_clause = (None, "ORDER BY " + oid_field))
+         insert_cursor = arcpy.da.InsertCursor(target_obj, target_fields)
+         row_count = 0
+         for a_row in the_cursor:
+            insert_cursor.insertRow(a_row[1:])
+            bytes_streamed += get_row_bytes(a_row[1:])
+            if row_count == 0:
+               first_oid = a_row[0]
+            chunk_last_oid = a_row[0]
+            row_count += 1
+            if row_count >= chunk_size:
+               break
+         del insert_cursor
+         del the_cursor
+         the_editor.stopOperation()
+         the_editor.stopEditing(True)
+      except:
+         the_editor.abortOperation()
+         the_editor.stopEditing(False)
+         raise
+      if row_count == 0:
+         break
+      #RECORD PROGRESS (CHUNK IS COMMITTED)
+      last_oid = chunk_last_oid
+      rows_loaded += row_count
+      chunk_count += 1
+      save_load_progress(target_obj, {"source_obj":source_obj,"source_row_count":source_row_count,"source_max_oid":source_max_oid,"last_oid":last_oid,"rows_loaded":rows_loaded})
+      chunk_time = max(time.time() - chunk_start, 0.001)
+      add_phase_time(car_phases, "append", chunk_start)
+      make_note("Loaded chunk " + str(chunk_count) + " of " + target_obj + ": OBJECTID " + str(first_oid) + " to " + str(last_oid) + ", " + str(row_count) + " rows in " + str(round(chunk_time, 1)) + " seconds (" + str(int(row_count / chunk_time)) + " rows/second). " + str(rows_loaded) + " of " + str(source_row_count) + " rows loaded.", True)
+      if row_count < chunk_size:
+         break
+      #SIZE THE NEXT CHUNK PER THIS CHUNK'S THROUGHPUT
+      if chunk_seconds > 0:
+         chunk_size = int(row_count / chunk_time * chunk_seconds)
+         chunk_size = max(max(1, chunk_rows / 10), min(chunk_size, chunk_rows * 10))
+   clear_load_progress(target_obj)
+   return {"strategy":"chunked","inserted":rows_loaded,"updated":None,"deleted":None,"chunks":chunk_count,"source_rows":source_row_count,"target_rows":rows_loaded,"bytes":bytes_streamed}
+
+#THIS FUNCTION LOADS SOURCE ROWS INTO A STAGING COPY OF A TARGET DATA-OBJECT AND SWAPS IT IN FOR THE TARGET DATA-OBJECT
+#   (SEE swap_staged_object()). THE STAGING COPY IS A NEW, NON-VERSIONED DATA-OBJECT IN THE SAME CONTAINER, CREATED W/ THE
+#   TARGET DATA-OBJECT AS A TEMPLATE, AND SOURCE ROWS ARE STREAMED INTO IT (SEE copy_rows(); IN PARTITIONS IF THE SOURCE
+#   DATA-OBJECT IS LARGE ENOUGH, SEE get_partitions(); APPENDED IF pipeline_queue_mb IS 0 AND IT ISN'T PARTITIONED); THE
+#   TARGET DATA-OBJECT'S ATTRIBUTE INDEXES ARE ADDED AFTER ROWS ARE LOADED, AND
+#   swap_viewers ARE GRANTED VIEW PRIVILEGE. THE STAGING COPY IS ONLY SWAPPED IN IF ITS ROW COUNT AND FINGERPRINT (SEE
+#   fingerprint_object()) MATCH THE SOURCE DATA-OBJECT'S (AND, IF PARTITIONED, ITS ROW COUNT MATCHES THE SOURCE
+#   ROW-COUNT THAT THE PARTITIONS WERE SPLIT FROM).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE THIRD ARGUMENT IS A BOOLEAN TO INDICATE IF THE DATA OBJECT IS NON-SPATIAL (A TABLE).
+#   THE FOURTH ARGUMENT IS OPTIONAL. THE SOURCE DATA-OBJECT'S FINGERPRINT (SEE compare_objects()). IF NOT GIVEN, THE
+#      SOURCE DATA-OBJECT IS FINGERPRINTED.
+#   THE FIFTH ARGUMENT IS OPTIONAL. THE FREIGHT CAR'S PARTITIONING (SEE get_partitioning()).
+#   RETURNS A DICTIONARY THAT DESCRIBES THE LOAD (SEE load_rows()), OR None IF THE TARGET DATA-OBJECT CAN'T BE SWAPPED
+#   (IT'S VERSIONED OR IN A RELATIONSHIP CLASS), OR IF THE STAGING COPY DIDN'T VERIFY OR COULDN'T BE SWAPPED IN; IN THAT
+#   CASE, THE TARGET DATA-OBJECT ISN'T CHANGED.
+def load_rows_by_swap(source_obj, target_obj, non_spatial = False, source_fingerprint = None, the_partitioning = None):
+   the_description = arcpy.Describe(target_obj)
+   if getattr(the_description, "isVersioned", False) == True or len(getattr(the_description, "relationshipClassNames", [])) > 0:
+      return None
+   the_container = target_obj[0:target_obj.rfind("\\")]
+   the_prefix = get_schema_prefix(target_obj[target_obj.rfind("\\") + 1:])
+   the_name = get_name(target_obj[target_obj.rfind("\\") + 1:])
+   staged_obj = the_container + "\\" + the_prefix + the_name + STAGE_NEW_SUFFIX
+   if non_spatial == False:
+      ignore_options = IGNORE_PARAM
+   else:
+      ignore_options = IGNORE_PARAM_T
+   the_partitions = get_partitions(source_obj, the_partitioning)
+   phase_start = time.time()
+   clear_staged_objects(the_container, the_prefix, the_name)
+   #CREATE AND LOAD THE STAGING COPY
+   if non_spatial == False:
+      arcpy.CreateFeatureclass_management(the_container, the_name + STAGE_NEW_SUFFIX, the_description.shapeType.upper(), target_obj, "SAME_AS_TEMPLATE", "SAME_AS_TEMPLATE", the_description.spatialReference)
+   else:
+      arcpy.CreateTable_management(the_container, the_name + STAGE_NEW_SUFFIX, target_obj)
+   bytes_streamed = None
+   if pipeline_queue_mb > 0 or the_partitions != None:
+      staged_fields = get_fingerprint_fields(staged_obj)
+      source_fields = get_fingerprint_fields(source_obj, staged_fields)
+      staged_fields = get_fingerprint_fields(staged_obj, source_fields)
+      if non_spatial == False:
+         source_fields.append("SHAPE@")
+         staged_fields.append("SHAPE@")
+      if the_partitions != None:
+         bytes_streamed = copy_partitions(source_obj, source_fields, staged_obj, staged_fields, the_partitions[0])[1]
+      else:
+         bytes_streamed = copy_rows(source_obj, source_fields, staged_obj, staged_fields)[1]
+   else:
+      arcpy.Append_management(source_obj, staged_obj, "NO_TEST")
+   for an_index in arcpy.ListIndexes(target_obj):
+      index_fields = [i.name for i in an_index.fields if i.type not in ("OID", "Geometry")]
+      if len(index_fields) == 0 or len(index_fields) < len(an_index.fields):
+         continue
+      #(INDEX NAMES ALTERNATE BETWEEN LOADS SO THAT THEY DON'T CLASH W/ THE TARGET DATA-OBJECT'S)
+      if an_index.name.upper().endswith("_SF"):
+         index_name = an_index.name[0:-3]
+      else:
+         index_name = an_index.name + "_SF"
+      if an_index.isUnique == True:
+         arcpy.AddIndex_management(staged_obj, index_fields, index_name, "UNIQUE")
+      else:
+         arcpy.AddIndex_management(staged_obj, index_fields, index_name)
+   for a_viewer in swap_viewers:
+      arcpy.ChangePrivileges_management(staged_obj, a_viewer, "GRANT")
+   phase_start = add_phase_time(car_phases, "append", phase_start)
+   #VERIFY THE STAGING COPY
+   if source_fingerprint == None:
+      source_fingerprint = fingerprint_object(source_obj, None, non_spatial, ignore_options, get_fingerprint_fields(source_obj, get_fingerprint_fields(target_obj)))
+   staged_fingerprint = fingerprint_object(staged_obj, None, non_spatial, ignore_options, get_fingerprint_fields(staged_obj, source_fingerprint["fields"]))
+   phase_start = add_phase_time(car_phases, "verify", phase_start)
+   if staged_fingerprint["row_count"] != source_fingerprint["row_count"] or staged_fingerprint["digest"] != source_fingerprint["digest"]:
+      make_note("Staging copy of " + target_obj + " doesn't match source (" + str(staged_fingerprint["row_count"]) + " of " + str(source_fingerprint["row_count"]) + " rows).", True, True)
+      arcpy.Delete_management(staged_obj)
+      return None
+   if the_partitions != None and staged_fingerprint["row_count"] != the_partitions[1]:
+      make_note("Partitioned staging copy of " + target_obj + " doesn't match source (" + str(staged_fingerprint["row_count"]) + " of " + str(the_partitions[1]) + " rows when partitioned).", True, True)
+      arcpy.Delete_management(staged_obj)
+      return None
+   #SWAP IT IN
+   the_swap = swap_staged_object(the_container, the_prefix, the_name)
+   add_phase_time(car_phases, "swap", phase_start)
+   if the_swap == False:
+      return None
+   the_load = {"strategy":"swap","inserted":staged_fingerprint["row_count"],"updated":None,"deleted":None,"chunks":None,"source_rows":source_fingerprint["row_count"],"target_rows":staged_fingerprint["row_count"],"bytes":bytes_streamed}
+   if the_partitions != None:
+      the_load["partitions"] = len(the_partitions[0])
+   return the_load
+
+#THIS FUNCTION RENAMES A DATA OBJECT, TRYING SWAP_ATTEMPTS TIMES (SWAP_WAIT_SECONDS APART) IN CASE IT IS LOCKED.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE DATA OBJECT.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE DATA OBJECT W/ ITS NEW NAME.
+#   RETURNS True IF THE DATA OBJECT WAS RENAMED, OTHERWISE False.
+def rename_object(the_object, new_object):
+   k = 0
+   while k < SWAP_ATTEMPTS:
+      if k > 0:
+         time.sleep(SWAP_WAIT_SECONDS)
+      try:
+         arcpy.Rename_management(the_object, new_object)
+         return True
+      except:
+         k += 1
+   return False
+
+#THIS FUNCTION CLEANS UP AFTER A STAGED SWAP THAT DIDN'T FINISH (SEE swap_staged_object()): A STAGED COPY IS DELETED,
+#   AND AN OLD DATA-OBJECT IS RENAMED BACK IF THE DATA OBJECT IS MISSING (OTHERWISE, THE OLD DATA-OBJECT IS DELETED).
+#   THE FIRST ARGUMENT IS THE PATH OF THE DATA OBJECT'S CONTAINER (TARGET GEODATABASE OR FEATURE DATASET).
+#   THE SECOND ARGUMENT IS THE DATA OBJECT'S SCHEMA PREFIX.
+#   THE THIRD ARGUMENT IS THE DATA OBJECT'S NAME (W/O SCHEMA PREFIX).
+def clear_staged_objects(the_container, the_prefix, the_name):
+   if arcpy.Exists(the_container + "\\" + the_prefix + the_name + STAGE_NEW_SUFFIX):
+      arcpy.Delete_management(the_container + "\\" + the_prefix + the_name + STAGE_NEW_SUFFIX)
+   if arcpy.Exists(the_container + "\\" + the_prefix + the_name + STAGE_OLD_SUFFIX):
+      if arcpy.Exists(the_container + "\\" + the_prefix + the_name):
+         arcpy.Delete_management(the_container + "\\" + the_prefix + the_name + STAGE_OLD_SUFFIX)
+      else:
+         make_note("Restoring " + the_prefix + the_name + " (left renamed by an earlier swap that didn't finish)...", True, True)
+         arcpy.Rename_management(the_container + "\\" + the_prefix + the_name + STAGE_OLD_SUFFIX, the_container + "\\" + the_name)
+
+#THIS FUNCTION SWAPS A STAGED COPY (NAME W/ STAGE_NEW_SUFFIX) IN FOR A DATA OBJECT: THE DATA OBJECT IS RENAMED W/
+#   STAGE_OLD_SUFFIX, THE STAGED COPY IS RENAMED TO THE DATA OBJECT'S NAME, AND THEN THE OLD DATA-OBJECT IS DELETED. IF
+#   THE DATA OBJECT CAN'T BE RENAMED (SEE rename_object()), THE STAGED COPY IS DELETED AND THE DATA OBJECT IS LEFT AS
+#   IT WAS. IF THE STAGED COPY CAN'T BE RENAMED, THE OLD DATA-OBJECT IS RENAMED BACK.
+#   THE FIRST ARGUMENT IS THE PATH OF THE DATA OBJECT'S CONTAINER (TARGET GEODATABASE OR FEATURE DATASET).
+#   THE SECOND ARGUMENT IS THE DATA OBJECT'S SCHEMA PREFIX.
+#   THE THIRD ARGUMENT IS THE DATA OBJECT'S NAME (W/O SCHEMA PREFIX).
+#   RETURNS True IF THE STAGED COPY WAS SWAPPED IN, OTHERWISE False.
+def swap_staged_object(the_container, the_prefix, the_name):
+   live_object = the_container + "\\" + the_prefix + the_name
+   staged_object = the_container + "\\" + the_prefix + the_name + STAGE_NEW_SUFFIX
+   old_object = the_container + "\\" + the_prefix + the_name + STAGE_OLD_SUFFIX
+   if rename_object(live_object, the_container + "\\" + the_name + STAGE_OLD_SUFFIX) == False:
+      arcpy.Delete_management(staged_object)
+      return False
+   if rename_object(staged_object, the_container + "\\" + the_name) == False:
+      arcpy.Rename_management(old_object, the_container + "\\" + the_name)
+      arcpy.Delete_management(staged_object)
+      return False
+   try:
+      arcpy.Delete_management(old_object)
+   except:
+      make_note("Couldn't delete " + old_object + " after swapping in its staged copy. It will be deleted on the next run.", True, True)
+   return True
+
+#THIS FUNCTION RETURNS SOURCE AND TARGET ROW-COUNTS (AS STRINGS) AFTER A LOAD (SEE load_rows()). COUNTS THAT WERE
+#   GATHERED ALONG THE WAY ARE USED; OTHERWISE, THE DATA OBJECT IS COUNTED (SEE get_count()).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE SOURCE DATA-OBJECT.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE TARGET DATA-OBJECT.
+#   THE THIRD ARGUMENT IS THE DICTIONARY THAT DESCRIBES THE LOAD.
+#   RETURNS A LIST: [SOURCE ROW-COUNT, TARGET ROW-COUNT]
+def get_load_counts(source_obj, target_obj, the_load):
+   if the_load.get("source_rows") != None:
+      source_row_count = str(the_load["source_rows"])
+   else:
+      source_row_count = get_count(source_obj)
+   if the_load.get("target_rows") != None:
+      target_row_count = str(the_load["target_rows"])
+   else:
+      target_row_count = get_count(target_obj)
+   return [source_row_count, target_row_count]
+
+#THIS FUNCTION RETURNS A NOTE ON THE NUMBER OF BYTES STREAMED IN A LOAD (SEE load_rows()), FOR EXAMPLE " Streamed about
+#   12.3 MB.", OR "" IF BYTES WEREN'T COUNTED.
+#   THE FIRST ARGUMENT IS THE DICTIONARY THAT DESCRIBES THE LOAD.
+def describe_bytes(the_load):
+   if the_load.get("bytes") == None:
+      return ""
+   if the_load["bytes"] < 1048576:
+      return " Streamed about " + str(int(round(the_load["bytes"] / 1024.0))) + " KB."
+   return " Streamed about " + str(round(the_load["bytes"] / 1048576.0, 1)) + " MB."
+
+#THIS FUNCTION TAKES A DATA OBJECT AND RETURNS ITS ROW COUNT (AS STRING).
+def get_count(the_data_object):
+   return arcpy.GetCount_management(the_data_object).getOutput(0)
+
+#THIS FUNCTION SENDS A GIVEN MESSAGE TO AN EMAIL DISTRIBUTION-LIST
+#   THE FIRST ARGUMENT IS THE EMAIL'S SUBJECT STRING
+#   THE SECOND ARGUMENT IS THE EMAIL'S MESSAGE-CONTENT STRING
+def send_email(the_subject = "", the_message = ""):
+   the_header = 'From:  "Python" <' + email_from + '>\n'
+   the_header += "To:  VT DataRail Tools User\n"
+   the_header += "Subject:  " + the_subject + "\n"
+   #INSTANTIATE AN SMTP OBJECT
+   smtp_serv = smtplib.SMTP(email_server + ":" + email_port)
+   #SEND THE EMAIL
+   smtp_serv.sendmail(email_from, to_list, the_header + the_message)
+   #QUIT THE SERVER CONNECTION
+   smtp_serv.quit()
+
+#THIS FUNCTION RETURNS A LIST OF FIELD NAMES OF A GIVEN TABLE OR FEATURE CLASS, EXCLUDING FIELD NAMED OBJECTID AND FIELD NAMES THAT BEGIN WITH SHAPE
+#  ARGUMENT 1: THE TABLE OR FEATURE CLASS.
+#  ARGUMENT 2: OPTIONAL. A LIST OF FIELD NAMES TO BE EXCLUDED FROM THE OUTPUT LIST. MUST USE ALL-CAPS.
+def get_field_names(the_table, exclude_list = None):
+   the_fields = arcpy.ListFields(the_table)
+   the_field_names = []
+   for i in the_fields:
+      if i.name.upper() != "OBJECTID" and i.name.upper()[0:4] != "SHAPE":
+         if exclude_list:
+            if i.name.upper() not in exclude_list:
+               the_field_names.append(i.name)
          else:
-            already_there = False
-            target_prefix = ""
-         freight_cars.append(create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix))
-         i += 1
-      #TABLES
-      i = 0
-      while i < len(source_tables_prefixed_names):
-         source_prefix = source_tables_prefixes[i]
-         fds = None
-         name = source_tables_names[i]
-         type = "table"
-         detect_changes = False
-         sort_field = None
-         j = get_index(target_tables_names, name)
-         if j != -1:
-            already_there = True
-            target_prefix = target_tables_prefixes[j]
+            the_field_names.append(i.name)
+   return the_field_names
+
+#THIS CLASS IS A RECORD OF ONE DATA OBJECT (FEATURE CLASS, TABLE, OR RASTER DATASET) IN A GEODATABASE CATALOG.
+#   (SLOTTED TO KEEP RECORDS COMPACT WHEN A GEODATABASE HAS THOUSANDS OF DATA OBJECTS.)
+#   ATTRIBUTES:
+#      prefixed_name        NAME W/ SCHEMA PREFIX
+#      prefix               SCHEMA PREFIX ("" IF N/A)
+#      name                 NAME W/O SCHEMA PREFIX (ALL-CAPS FOR TABLES)
+#      type                 "fclass", "table", OR "raster"
+#      fds_prefixed_name    CONTAINING FEATURE-DATASET W/ SCHEMA PREFIX ("" IF N/A)
+#      fds_prefix           CONTAINING FEATURE-DATASET'S SCHEMA PREFIX ("" IF N/A)
+#      fds_name             CONTAINING FEATURE-DATASET W/O SCHEMA PREFIX ("" IF N/A)
+class CatalogEntry(object):
+   __slots__ = ("prefixed_name", "prefix", "name", "type", "fds_prefixed_name", "fds_prefix", "fds_name")
+   def __init__(self, prefixed_name, type, fds_prefixed_name = ""):
+      self.prefixed_name = prefixed_name
+      self.prefix = get_schema_prefix(prefixed_name)
+      if type == "table":
+         self.name = get_name(prefixed_name).upper()
+      else:
+         self.name = get_name(prefixed_name)
+      self.type = type
+      self.fds_prefixed_name = fds_prefixed_name
+      self.fds_prefix = get_schema_prefix(fds_prefixed_name)
+      self.fds_name = get_name(fds_prefixed_name)
+
+#THIS CLASS IS A CATALOG OF A GEODATABASE'S DATA OBJECTS (ONE CatalogEntry PER DATA OBJECT) W/ CASE-INSENSITIVE
+#   HASH-INDEXES FOR FINDING DATA OBJECTS BY NAME (W/O SCHEMA PREFIX), BY PREFIXED NAME, AND BY FEATURE DATASET.
+#   WHEN 2 DATA OBJECTS OF THE SAME TYPE HAVE THE SAME NAME W/O SCHEMA PREFIX, THE FIRST ONE ADDED IS FOUND.
+class GdbCatalog(object):
+   def __init__(self):
+      #entries STORES CatalogEntry OBJECTS IN THE ORDER IN WHICH THEY WERE ADDED
+      self.entries = []
+      #INDEXES. KEYS ARE (type, ALL-CAPS NAME)
+      self.by_name = {}
+      self.by_prefixed_name = {}
+      #FEATURE DATASETS. KEYS ARE ALL-CAPS FEATURE-DATASET NAMES W/O SCHEMA PREFIX; VALUES ARE PREFIXED NAMES
+      self.fdatasets = {}
+      #FEATURE CLASSES OF EACH FEATURE DATASET. KEYS ARE ALL-CAPS FEATURE-DATASET NAMES W/O SCHEMA PREFIX
+      self.by_fds = {}
+      #FEATURE DATASETS (PREFIXED NAMES) THAT HAVE NO FEATURE CLASSES
+      self.empty_fdatasets = []
+      #SPECIAL TABLES (SEE SPECIAL_TABLES). KEYS ARE ALL-CAPS NAMES W/O SCHEMA PREFIX; VALUES ARE PREFIXED NAMES
+      self.special_tables = {}
+      #RAW LISTINGS THAT THE CATALOG WAS BUILT FROM (FOR THE CATALOG CACHE). listed_times STORES WHEN EACH PART OF
+      #THE CATALOG WAS LISTED FROM THE GEODATABASE (SECONDS SINCE EPOCH). PARTS ARE "<root>" (STAND-ALONE FEATURE
+      #CLASSES, TABLES, AND RASTER DATASETS) AND EACH FEATURE DATASET (PREFIXED NAME).
+      self.fds_listing = []
+      self.root_listing = {"fclasses":[],"tables":[],"rasters":[]}
+      self.listed_times = {}
+      #NUMBER OF PARTS LISTED FROM THE GEODATABASE AND NUMBER OF PARTS TAKEN FROM THE CATALOG CACHE
+      self.parts_listed = 0
+      self.parts_cached = 0
+      #CHEAP SIGNATURE OF THE GEODATABASE'S LIST OF DATA OBJECTS WHEN CATALOG WAS READ (SEE get_gdb_signature())
+      self.signature = None
+
+   #ADDS A FEATURE DATASET (PREFIXED NAME) TO THE CATALOG
+   def add_fdataset(self, fds_prefixed_name):
+      the_key = get_name(fds_prefixed_name).upper()
+      if the_key not in self.fdatasets:
+         self.fdatasets[the_key] = fds_prefixed_name
+         self.by_fds[the_key] = []
+
+   #ADDS A DATA OBJECT TO THE CATALOG AND RETURNS ITS CatalogEntry
+   def add(self, prefixed_name, type, fds_prefixed_name = ""):
+      the_entry = CatalogEntry(prefixed_name, type, fds_prefixed_name)
+      self.entries.append(the_entry)
+      self.by_name.setdefault((type, the_entry.name.upper()), the_entry)
+      self.by_prefixed_name.setdefault((type, prefixed_name.upper()), the_entry)
+      if fds_prefixed_name != "":
+         self.add_fdataset(fds_prefixed_name)
+         self.by_fds[the_entry.fds_name.upper()].append(the_entry)
+      return the_entry
+
+   #RETURNS CatalogEntry OF DATA OBJECT OF GIVEN TYPE AND NAME (W/O SCHEMA PREFIX), OR None IF NOT FOUND
+   def find(self, type, name):
+      return self.by_name.get((type, name.upper()))
+
+   #RETURNS CatalogEntry OF DATA OBJECT OF GIVEN TYPE AND PREFIXED NAME, OR None IF NOT FOUND
+   def find_prefixed(self, type, prefixed_name):
+      return self.by_prefixed_name.get((type, prefixed_name.upper()))
+
+   #RETURNS SCHEMA PREFIX THAT A NEW DATA-OBJECT GETS: THE PREFIX OF THE SPECIAL TABLES (SEE SPECIAL_TABLES), WHICH ARE
+   #OWNED BY THE USER THAT LOADS DATA. RETURNS None IF THE CATALOG HAS NO SPECIAL TABLES.
+   def new_prefix(self):
+      for a_table in SPECIAL_TABLES:
+         if a_table.upper() in self.special_tables:
+            return get_schema_prefix(self.special_tables[a_table.upper()])
+      return None
+
+   #RETURNS PREFIXED NAME OF FEATURE DATASET W/ GIVEN NAME (W/ OR W/O SCHEMA PREFIX), OR None IF NOT FOUND
+   def fdataset(self, fds_name):
+      return self.fdatasets.get(get_name(fds_name).upper())
+
+   #RETURNS LIST OF CatalogEntry OBJECTS OF FEATURE CLASSES IN FEATURE DATASET W/ GIVEN NAME (W/ OR W/O SCHEMA PREFIX)
+   def in_fdataset(self, fds_name):
+      return self.by_fds.get(get_name(fds_name).upper(), [])
+
+   #RETURNS LIST OF CatalogEntry OBJECTS OF GIVEN TYPE, IN THE ORDER IN WHICH THEY WERE ADDED
+   def of_type(self, type):
+      return [i for i in self.entries if i.type == type]
+
+   #MARKS THE PART OF THE CATALOG THAT HOLDS A GIVEN FEATURE DATASET (W/ OR W/O SCHEMA PREFIX), OR THE STAND-ALONE
+   #DATA-OBJECTS IF fds_name IS None, AS OUT OF DATE SO THAT IT IS LISTED FROM THE GEODATABASE NEXT TIME
+   def invalidate(self, fds_name = None):
+      if fds_name == None:
+         self.listed_times.pop("<root>", None)
+      else:
+         the_fdataset = self.fdataset(fds_name)
+         if the_fdataset != None:
+            self.listed_times.pop(the_fdataset, None)
+
+#THIS FUNCTION BUILDS AND RETURNS A GdbCatalog FROM RAW LISTINGS OF A GEODATABASE'S DATA OBJECTS
+#   THE FIRST ARGUMENT IS A LIST OF [FEATURE DATASET, LIST OF FEATURE CLASSES] LISTS (PREFIXED NAMES).
+#   THE SECOND ARGUMENT IS A DICTIONARY W/ LISTS OF STAND-ALONE "fclasses", "tables", AND "rasters" (PREFIXED NAMES).
+#   SPECIAL TABLES (A_README, A_XCHANGE_PARAMETERS, A_XCHANGE_LOG, AND A_XCHANGE_DIGEST) AREN'T CATALOGED AS DATA
+#   OBJECTS; THEY ARE KEPT IN THE CATALOG'S special_tables.
+def build_catalog(fds_listing, root_listing):
+   the_catalog = GdbCatalog()
+   the_catalog.fds_listing = fds_listing
+   the_catalog.root_listing = root_listing
+   #(FEATURE CLASSES IN FEATURE DATASETS)
+   for a_fdataset in fds_listing:
+      the_catalog.add_fdataset(a_fdataset[0])
+      if len(a_fdataset[1]) == 0:
+         the_catalog.empty_fdatasets.append(a_fdataset[0])
+      for a_fclass in a_fdataset[1]:
+         the_catalog.add(a_fclass, "fclass", a_fdataset[0])
+   #(STAND-ALONE FEATURE CLASSES)
+   for a_fclass in root_listing["fclasses"]:
+      the_catalog.add(a_fclass, "fclass")
+   #(TABLES)
+   for a_table in root_listing["tables"]:
+      table_name = get_name(a_table).upper()
+      #(DON'T WANT CERTAIN TABLES IN THE CATALOG'S DATA OBJECTS)
+      if table_name in SPECIAL_TABLES:
+         the_catalog.special_tables.setdefault(table_name, a_table)
+      else:
+         the_catalog.add(a_table, "table")
+   #(RASTERS)
+   for a_raster in root_listing["rasters"]:
+      the_catalog.add(a_raster, "raster")
+   return the_catalog
+
+#THIS FUNCTION RETURNS A CHEAP SIGNATURE OF A FILE GEODATABASE'S LIST OF DATA OBJECTS: SIZES AND MODIFICATION
+#   TIMES OF THE FILE GEODATABASE'S GDB_Items AND GDB_ItemRelationships SYSTEM-TABLES, WHICH CHANGE WHEN DATA
+#   OBJECTS ARE ADDED, RENAMED, OR DELETED.
+#   RETURNS None IF THE SIGNATURE ISN'T AVAILABLE (E.G., ENTERPRISE GEODATABASE).
+def get_gdb_signature(the_gdb):
+   the_signature = ""
+   for a_file in ("a00000004.gdbtable", "a00000006.gdbtable"):
+      the_path = os.path.join(the_gdb, a_file)
+      if os.path.isfile(the_path) == False:
+         return None
+      the_stat = os.stat(the_path)
+      the_signature += a_file + ":" + str(the_stat.st_size) + ":" + repr(the_stat.st_mtime) + ";"
+   return the_signature
+
+#THIS FUNCTION LISTS THE FEATURE CLASSES OF ONE FEATURE DATASET. IT CAN BE RUN IN A WORKER PROCESS.
+#   THE ARGUMENT IS A [GEODATABASE, FEATURE DATASET (PREFIXED NAME)] LIST.
+#   RETURNS THE LIST OF FEATURE CLASSES (PREFIXED NAMES).
+def list_fdataset_fclasses(the_task):
+   arcpy.env.workspace = the_task[0]
+   return arcpy.ListFeatureClasses("*", "All", the_task[1])
+
+#THIS FUNCTION READS THE CATALOG CACHE FILE AND RETURNS ITS CONTENTS (A DICTIONARY W/ A KEY FOR EACH
+#   GEODATABASE (ALL-CAPS PATH)). RETURNS AN EMPTY DICTIONARY IF THE FILE DOESN'T EXIST OR CAN'T BE READ.
+def load_catalog_cache(cache_path):
+   try:
+      cache_file = open(cache_path, "r")
+      try:
+         return json.load(cache_file)
+      finally:
+         cache_file.close()
+   except:
+      return {}
+
+#THIS FUNCTION WRITES GIVEN CATALOGS INTO THE CATALOG CACHE FILE (OTHER GEODATABASES' CATALOGS IN THE FILE ARE KEPT).
+#   THE FIRST ARGUMENT IS THE PATH OF THE CATALOG CACHE FILE.
+#   THE SECOND ARGUMENT IS A DICTIONARY W/ GEODATABASE PATHS AS KEYS AND GdbCatalog OBJECTS AS VALUES.
+#   THE THIRD ARGUMENT IS A LIST OF GEODATABASE PATHS THAT ARE BEING WRITTEN TO (CATALOGS OF THOSE GEODATABASES
+#      AREN'T USED FROM THE CACHE UNTIL THEY ARE WRITTEN AGAIN W/O BEING IN THIS LIST).
+def save_catalog_cache(cache_path, the_catalogs, in_progress_gdbs = []):
+   the_cache = load_catalog_cache(cache_path)
+   in_progress_keys = [i.upper() for i in in_progress_gdbs]
+   for a_gdb in the_catalogs:
+      the_catalog = the_catalogs[a_gdb]
+      the_fdatasets = {}
+      for a_fdataset in the_catalog.fds_listing:
+         if a_fdataset[0] in the_catalog.listed_times:
+            the_fdatasets[a_fdataset[0]] = {"fclasses":a_fdataset[1],"listed":the_catalog.listed_times[a_fdataset[0]]}
+      the_entry = {"signature":the_catalog.signature,"in_progress":a_gdb.upper() in in_progress_keys,"fdatasets":the_fdatasets,"fds_order":[i[0] for i in the_catalog.fds_listing],"root":None}
+      if "<root>" in the_catalog.listed_times:
+         the_entry["root"] = {"fclasses":the_catalog.root_listing["fclasses"],"tables":the_catalog.root_listing["tables"],"rasters":the_catalog.root_listing["rasters"],"listed":the_catalog.listed_times["<root>"]}
+      the_cache[a_gdb.upper()] = the_entry
+   cache_file = open(cache_path, "w")
+   json.dump(the_cache, cache_file)
+   cache_file.close()
+
+#THIS FUNCTION ENUMERATES DATA OBJECTS OF GIVEN GEODATABASES AND RETURNS THEM AS GdbCatalog OBJECTS, USING THE CATALOG
+#   CACHE FOR PARTS OF A CATALOG THAT ARE KNOWN TO BE UNCHANGED:
+#      -A FILE GEODATABASE WHOSE SIGNATURE (SEE get_gdb_signature()) HASN'T CHANGED IS TAKEN FROM THE CACHE ENTIRELY.
+#      -OTHERWISE, THE GEODATABASE'S FEATURE DATASETS ARE LISTED (CHEAP), AND FEATURE DATASETS THAT ARE NEW (OR
+#       WHOSE CACHED LISTING IS OLDER THAN max_age_hours) ARE LISTED FROM THE GEODATABASE. STAND-ALONE DATA-OBJECTS
+#       ARE LISTED FROM THE GEODATABASE IF THEIR CACHED LISTING IS OLDER THAN max_age_hours.
+#   FEATURE DATASETS THAT NEED LISTING ARE LISTED CONCURRENTLY ON A POOL OF WORKER PROCESSES (IF worker_count > 1).
+#   THE FIRST ARGUMENT IS A LIST OF GEODATABASE PATHS.
+#   THE SECOND ARGUMENT IS THE PATH OF THE CATALOG CACHE FILE.
+#   THE THIRD ARGUMENT IS THE MAXIMUM AGE (HOURS) OF A CACHED LISTING. SET TO 0 TO LIST EVERYTHING FROM THE GEODATABASES.
+#   THE FOURTH ARGUMENT IS THE NUMBER OF WORKER PROCESSES.
+#   RETURNS A DICTIONARY W/ GEODATABASE PATHS AS KEYS AND GdbCatalog OBJECTS AS VALUES.
+def read_catalogs(the_gdbs, cache_path, max_age_hours, worker_count):
+   if max_age_hours > 0:
+      the_cache = load_catalog_cache(cache_path)
+   else:
+      the_cache = {}
+   oldest_ok = time.time() - max_age_hours * 3600
+   the_listings = {}
+   the_tasks = []
+   for a_gdb in the_gdbs:
+      the_signature = get_gdb_signature(a_gdb)
+      cached = the_cache.get(a_gdb.upper())
+      if cached != None and cached.get("in_progress") == True:
+         cached = None
+      the_listing = {"signature":the_signature,"fdatasets":[],"root":None,"listed_times":{},"parts_listed":0,"parts_cached":0}
+      the_listings[a_gdb] = the_listing
+      #IF FILE GEODATABASE HASN'T CHANGED SINCE IT WAS CACHED, TAKE ALL OF IT FROM THE CACHE
+      #(ONLY IF NO PART OF THE CACHED CATALOG HAS BEEN MARKED OUT OF DATE)
+      if cached != None and the_signature != None and cached["signature"] == the_signature and cached["root"] != None and len(cached["fdatasets"]) == len(cached["fds_order"]):
+         the_listing["root"] = cached["root"]
+         the_listing["listed_times"]["<root>"] = cached["root"]["listed"]
+         the_listing["parts_cached"] += 1
+         for a_fdataset in cached["fds_order"]:
+            the_listing["fdatasets"].append([a_fdataset, cached["fdatasets"][a_fdataset]["fclasses"]])
+            the_listing["listed_times"][a_fdataset] = cached["fdatasets"][a_fdataset]["listed"]
+            the_listing["parts_cached"] += 1
+         continue
+      if cached == None:
+         cached = {"fdatasets":{},"root":None}
+      arcpy.env.workspace = a_gdb
+      #FEATURE DATASETS (CHEAP SIGNAL OF WHICH FEATURE DATASETS ARE NEW OR GONE)
+      for a_fdataset in arcpy.ListDatasets("*","Feature"):
+         cached_fdataset = cached["fdatasets"].get(a_fdataset)
+         if cached_fdataset != None and cached_fdataset["listed"] >= oldest_ok:
+            the_listing["fdatasets"].append([a_fdataset, cached_fdataset["fclasses"]])
+            the_listing["listed_times"][a_fdataset] = cached_fdataset["listed"]
+            the_listing["parts_cached"] += 1
          else:
-            already_there = False
-            target_prefix = ""
-         freight_cars.append(create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix))
-         i += 1
-      #RASTER DATASETS
-      i = 0
-      while i < len(source_rasters_prefixed_names):
-         source_prefix = source_rasters_prefixes[i]
-         fds = None
-         name = source_rasters_names[i]
-         type = "raster"
-         detect_changes = False
-         sort_field = None
-         j = get_index(target_rasters_names, name)
-         if j != -1:
-            already_there = True
-            target_prefix = target_rasters_prefixes[j]
+            the_listing["fdatasets"].append([a_fdataset, None])
+            the_tasks.append([a_gdb, a_fdataset])
+      #STAND-ALONE DATA-OBJECTS. (A CACHED LISTING W/O AN A_README TABLE ISN'T TRUSTED.)
+      cached_root = cached["root"]
+      if cached_root != None and cached_root["listed"] >= oldest_ok and len([i for i in cached_root["tables"] if get_name(i).upper() == "A_README"]) > 0:
+         the_listing["root"] = cached_root
+         the_listing["listed_times"]["<root>"] = cached_root["listed"]
+         the_listing["parts_cached"] += 1
+      else:
+         the_listing["root"] = {"fclasses":arcpy.ListFeatureClasses(),"tables":arcpy.ListTables(),"rasters":arcpy.ListRasters()}
+         the_listing["listed_times"]["<root>"] = time.time()
+         the_listing["parts_listed"] += 1
+   #LIST FEATURE CLASSES OF FEATURE DATASETS THAT NEED LISTING (CONCURRENTLY IF MORE THAN 1 WORKER PROCESS)
+   if worker_count > 1 and len(the_tasks) > 1:
+      the_pool = multiprocessing.Pool(min(worker_count, len(the_tasks)))
+      try:
+         the_results = the_pool.map(list_fdataset_fclasses, the_tasks)
+      finally:
+         the_pool.close()
+         the_pool.join()
+   else:
+      the_results = [list_fdataset_fclasses(i) for i in the_tasks]
+   the_time = time.time()
+   k = 0
+   while k < len(the_tasks):
+      the_listing = the_listings[the_tasks[k][0]]
+      for a_fdataset in the_listing["fdatasets"]:
+         if a_fdataset[0] == the_tasks[k][1]:
+            a_fdataset[1] = the_results[k]
+      the_listing["listed_times"][the_tasks[k][1]] = the_time
+      the_listing["parts_listed"] += 1
+      k += 1
+   #BUILD CATALOGS
+   the_catalogs = {}
+   for a_gdb in the_gdbs:
+      the_listing = the_listings[a_gdb]
+      the_catalog = build_catalog(the_listing["fdatasets"], {"fclasses":list(the_listing["root"]["fclasses"]),"tables":list(the_listing["root"]["tables"]),"rasters":list(the_listing["root"]["rasters"])})
+      the_catalog.listed_times = the_listing["listed_times"]
+      the_catalog.parts_listed = the_listing["parts_listed"]
+      the_catalog.parts_cached = the_listing["parts_cached"]
+      the_catalog.signature = the_listing["signature"]
+      the_catalogs[a_gdb] = the_catalog
+   return the_catalogs
+
+#THIS FUNCTION PRINTS A GdbCatalog'S DATA OBJECTS
+#   THE FIRST ARGUMENT IS THE CATALOG.
+#   THE SECOND ARGUMENT IS "SOURCE" OR "TARGET" (FOR HEADINGS).
+def print_catalog(the_catalog, the_side):
+   print the_side + " FEATURE-CLASSES:"
+   for i in the_catalog.of_type("fclass"):
+      print "     " + i.prefixed_name
+      print "          PREFIX: " + i.prefix
+      print "          NAME W/O PREFIX: " + i.name
+      print "          CONTAINING FEATURE-DATASET: " + i.fds_prefixed_name
+      print "          CONTAINING FEATURE-DATASET PREFIX: " + i.fds_prefix
+      print "          CONTAINING FEATURE-DATASET NAME W/O PREFIX: " + i.fds_name
+   print the_side + " TABLES:"
+   for i in the_catalog.of_type("table"):
+      print "     " + i.prefixed_name
+      print "          PREFIX: " + i.prefix
+      print "          NAME W/O PREFIX: " + i.name
+   print the_side + " RASTERS:"
+   for i in the_catalog.of_type("raster"):
+      print "     " + i.prefixed_name
+      print "          PREFIX: " + i.prefix
+      print "          NAME W/O PREFIX: " + i.name
+   print the_side + " EMPTY FEATURE-DATASETS (CONTAIN NO FEATURE CLASSES):"
+   for i in the_catalog.empty_fdatasets:
+      print "     " + i
+
+#THIS FUNCTION CREATES AND RETURNS A DICTIONAIRY OBJECT (A FREIGHT CAR) TO ADD TO freight_cars LIST
+#   (IF THE PARTITIONING ISN'T GIVEN, partition_rows AND partition_workers ARE USED; SEE get_partitioning())
+def create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix, watermark_field = None, the_partitioning = None):
+   if the_partitioning == None:
+      the_partitioning = get_partitioning()
+   return {"source_prefix":source_prefix,"fds":fds,"name":name,"type":type,"detect_changes":detect_changes,"sort_field":sort_field,"already_there":already_there,"target_prefix":target_prefix,"watermark_field":watermark_field,"partitioning":the_partitioning}
+
+#THIS FUNCTION CREATES AND RETURNS A FREIGHT CAR FOR A SOURCE DATA-OBJECT
+#   THE FIRST ARGUMENT IS THE SOURCE DATA-OBJECT'S CatalogEntry.
+#   THE SECOND AND THIRD ARGUMENTS ARE THE FREIGHT CAR'S detect_changes AND sort_field.
+#   THE FOURTH ARGUMENT IS THE TARGET GEODATABASE'S GdbCatalog (FOR FINDING OUT IF DATA OBJECT IS ALREADY THERE).
+#   THE FIFTH ARGUMENT IS OPTIONAL. THE FREIGHT CAR'S watermark_field (IF INCREMENTAL).
+#   THE SIXTH ARGUMENT IS OPTIONAL. THE FREIGHT CAR'S PARTITIONING (SEE get_partitioning()).
+def create_freight_car_from_entry(the_entry, detect_changes, sort_field, target_catalog, watermark_field = None, the_partitioning = None):
+   if the_entry.fds_name == "":
+      fds = None
+   else:
+      fds = the_entry.fds_name
+   target_entry = target_catalog.find(the_entry.type, the_entry.name)
+   if target_entry != None:
+      already_there = True
+      target_prefix = target_entry.prefix
+   else:
+      already_there = False
+      target_prefix = ""
+   return create_freight_car(the_entry.prefix, fds, the_entry.name, the_entry.type, detect_changes, sort_field, already_there, target_prefix, watermark_field, the_partitioning)
+
+#THIS FUNCTION SENDS ONE FREIGHT CAR (TRANSFERS ONE DATA OBJECT FROM SOURCE GEODATABASE TO TARGET GEODATABASE).
+#   THE ARGUMENT IS A FREIGHT CAR WHOSE NAMES HAVE BEEN RESOLVED BEFORE THE TRAIN LEAVES (SEE "RESOLVE
+#   NAMES OF EACH FREIGHT CAR" IN THE MAIN SECTION). THE FUNCTION ONLY RELIES ON THE FREIGHT CAR AND
+#   MAJOR VARIABLES SO THAT IT CAN BE RUN IN A WORKER PROCESS.
+#   THE FREIGHT CAR'S STATE IS RECORDED IN THE RUN JOURNAL AS IT GOES (SEE update_journal()); "verified" IF SOURCE AND
+#   TARGET ROW COUNTS (IF ANY) MATCH AFTER THE LOAD.
+#   RETURNS THE NOTE TO BE WRITTEN INTO THE HUB'S A_XCHANGE_LOG TABLE, OR None IF NOTHING WAS SENT.
+def send_freight_car(i):
+   global car_phases
+   log_note = None
+   update_journal(i, "started")
+   car_start = time.time()
+   i["row_counts"] = None
+   #PHASE TIMINGS AND ROWS/BYTES MOVED (SEE get_car_metrics())
+   car_phases = {}
+   i["phases"] = car_phases
+   i["rows_moved"] = None
+   i["bytes_moved"] = None
+   #THE DATA OBJECT'S KEY IN THE STATE STORE (SEE compare_objects()), None IF THE STATE STORE ISN'T USED
+   if state_store_days > 0:
+      state_key = [source_gdb, target_gdb, i["source_prefix"] + i["name"]]
+   else:
+      state_key = None
+   #THE INCREMENT OF AN INCREMENTAL DATA-OBJECT (SEE load_increment()), None IF THE DATA OBJECT ISN'T INCREMENTAL. (ITS
+   #WATERMARK IS ALWAYS KEPT IN THE STATE STORE.)
+   the_increment = None
+   if i["watermark_field"] != None and i["type"] != "raster":
+      the_increment = {"watermark_field":i["watermark_field"],"state_key":[source_gdb, target_gdb, i["source_prefix"] + i["name"]]}
+   #IF THE HUB'S A_XCHANGE_LOG SHOWS THE DATA OBJECT WAS DELIVERED ON A LATER DAY THAN THE STATE STORE'S FINGERPRINT OF IT
+   #WAS RECORDED OR THE SCRIPT LAST LOGGED IT (I.E., BY SOMETHING ELSE; SEE get_own_delivery_date()), THAT FINGERPRINT NO
+   #LONGER DESCRIBES THE TARGET DATA-OBJECT
+   if state_key != None and i["last_delivered"] != None:
+      the_delivery = get_delivered_fingerprint(state_key)
+      if the_delivery != None and get_own_delivery_date(state_key, the_delivery[1]) < i["last_delivered"]:
+         make_note("Hub's A_XCHANGE_LOG shows " + i["name"] + " was delivered on " + i["last_delivered"] + ", after its fingerprint in the state store was recorded. Not trusting that fingerprint.", True, True)
+         clear_delivered_fingerprint(state_key)
+   #(LIKEWISE AN INCREMENTAL DATA-OBJECT'S WATERMARK)
+   if the_increment != None and i["last_delivered"] != None:
+      the_watermark = get_watermark(the_increment["state_key"])
+      if the_watermark != None and get_own_delivery_date(the_increment["state_key"], the_watermark[2]) < i["last_delivered"]:
+         make_note("Hub's A_XCHANGE_LOG shows " + i["name"] + " was delivered on " + i["last_delivered"] + ", after its watermark in the state store was recorded. Not trusting that watermark; loading all rows.", True, True)
+         clear_watermark(the_increment["state_key"])
+   #A NEW INCREMENTAL DATA-OBJECT'S WATERMARK IS READ BEFORE IT IS COPIED (ROWS EDITED DURING THE COPY ARE LOADED AGAIN
+   #NEXT TIME)
+   new_watermark = None
+   if the_increment != None and i["already_there"] == False:
+      new_watermark = get_start_watermark(get_source_path(i), i["watermark_field"])
+      if new_watermark == None:
+         make_note("Watermark field " + i["watermark_field"] + " of " + i["name"] + " isn't a date or number field (and it isn't archived). Its rows will be re-loaded each time.", True, True)
+   #IF A FEATURE CLASS...
+   if i["type"] == "fclass":
+      #IF FEATURE CLASS DOESN'T ALREADY EXIST IN TARGET GEODATABASE...
+      if i["already_there"] == False:
+         #IF FEATURE CLASS IS IN A FEATURE DATASET...
+         if i["fds"] != None:
+            source_fds_name = i["source_fds_name"]
+            target_fds_name = i["target_fds_name"]
+            #COPY THE FEATURE CLASS FROM ONE FEATURE-DATASET TO THE OTHER
+            phase_start = time.time()
+            arcpy.Copy_management(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fds_name + "\\" + i["name"])
+            add_phase_time(car_phases, "copy", phase_start)
+            #GET ROW COUNTS
+            phase_start = time.time()
+            source_row_count = get_count(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"])
+            add_phase_time(car_phases, "count", phase_start)
+            phase_start = time.time()
+            target_row_count = get_count(target_gdb + "\\" + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"])
+            add_phase_time(car_phases, "count", phase_start)
+            i["row_counts"] = [source_row_count, target_row_count]
+            i["rows_moved"] = int(target_row_count)
+            log_note = "Copied in new feature-class " + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"]
+            make_note("Copied " + i["fds"] + "\\" + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + ".", True, True)
+         #OTHERWISE, IT'S A STAND-ALONE FEATURE-CLASS
          else:
-            already_there = False
-            target_prefix = ""
-         freight_cars.append(create_freight_car(source_prefix, fds, name, type, detect_changes, sort_field, already_there, target_prefix))
-         i += 1
-
-   #PRINT FREIGHT CAR INFO
-   print "***** HERE IS HOW THE TRAIN IS LINED UP *****"
-   for i in freight_cars:
-      print "FREIGHT CAR:"
-      print "     source_prefix: " + i["source_prefix"]
-      print "     fds: " + str(i["fds"])
-      print "     name: " + i["name"]
-      print "     type: " + i["type"]
-      print "     detect_changes: " + str(i["detect_changes"])
-      print "     sort_field: " + str(i["sort_field"])
-      print "     already_there: " + str(i["already_there"])
-      print "     target_prefix: " + i["target_prefix"]
-
-   #SEND FREIGHT DOWN THE TRACK
-   for i in freight_cars:
-      #IF A FEATURE CLASS...
-      if i["type"] == "fclass":
-         #IF FEATURE CLASS DOESN'T ALREADY EXIST IN TARGET GEODATABASE...
-         if i["already_there"] == False:
-            #IF FEATURE CLASS IS IN A FEATURE DATASET...
-            if i["fds"] != None:
-               #GET SOURCE FEATURE-DATASET NAME
-               source_fds_name = source_fdatasets_prefixed_names[get_index(source_fdatasets_names, i["fds"])]
-               #GET TARGET FEATURE-DATASET NAME
-               j = get_index(target_fdatasets_names, i["fds"])
-               if j != -1:
-                  target_fds_name = target_fdatasets_prefixed_names[j]
-               else:
-                  target_fds_name = created_fdatasets_prefixed_names[get_index(created_fdatasets_names, i["fds"])]
-               #COPY THE FEATURE CLASS FROM ONE FEATURE-DATASET TO THE OTHER
-               arcpy.Copy_management(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fds_name + "\\" + i["name"])
-               #GET ROW COUNTS
-               source_row_count = get_count(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"])
-               target_row_count = get_count(target_gdb + "\\" + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"])
-               #IF TARGET GEODATABASE IS A HUB GEODATABASE, RECORD ACTION IN ITS A_XCHANGE_LOG TABLE
-               if target_db_type == "hub":
-                  cur_log = arcpy.da.InsertCursor(target_gdb + "\\" + hub_logtable_name, ["DATE","NOTE"])
-                  the_string = tell_the_time()
-                  todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
-                  cur_log.insertRow([todays_date,"Copied in new feature-class " + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"]])
-                  del cur_log
-               make_note("Copied " + i["fds"] + "\\" + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + ".", True, True)
-            #OTHERWISE, IT'S A STAND-ALONE FEATURE-CLASS
+            #COPY FEATURE CLASS FROM SOURCE GEODATABASE TO TARGET GEODATABASE
+            phase_start = time.time()
+            arcpy.Copy_management(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["name"])
+            add_phase_time(car_phases, "copy", phase_start)
+            #GET SOURCE ROW COUNT
+            phase_start = time.time()
+            source_row_count = get_count(source_gdb + "\\" + i["source_prefix"] + i["name"])
+            add_phase_time(car_phases, "count", phase_start)
+            #SCHEMA PREFIX OF NEW FEATURE CLASS IN TARGET (SEE GdbCatalog.new_prefix()), IN ORDER TO COUNT ROWS IN TARGET
+            if i["target_name"] != None and arcpy.Exists(target_gdb + "\\" + i["target_name"]):
+               the_prefix = get_schema_prefix(i["target_name"])
+            #IF IT DIDN'T GET THAT PREFIX, NEED TO LOOP THROUGH FEATURECLASSES TO GET IT
             else:
-               #COPY FEATURE CLASS FROM SOURCE GEODATABASE TO TARGET GEODATABASE
-               arcpy.Copy_management(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["name"])
-               #GET SOURCE ROW COUNT
-               source_row_count = get_count(source_gdb + "\\" + i["source_prefix"] + i["name"])
-               #NEED TO LOOP THROUGH FEATURECLASSES TO GET SCHEMA PREFIX OF NEW FEATURE CLASS IN TARGET, IN ORDER TO COUNT ROWS IN TARGET
                arcpy.env.workspace = target_gdb
                the_fclasses = arcpy.ListFeatureClasses()
                j = 0
@@ -1042,87 +3944,100 @@ try:
                      found_it = True
                   else:
                      j += 1
-               target_row_count = get_count(target_gdb + "\\" + the_prefix + i["name"])
-               #IF TARGET GEODATABASE IS A HUB GEODATABASE, RECORD ACTION IN ITS A_XCHANGE_LOG TABLE
-               if target_db_type == "hub":
-                  cur_log = arcpy.da.InsertCursor(target_gdb + "\\" + hub_logtable_name, ["DATE","NOTE"])
-                  the_string = tell_the_time()
-                  todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
-                  cur_log.insertRow([todays_date,"Copied in new feature-class " + the_prefix + i["name"]])
-                  del cur_log
-               make_note("Copied " + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + ".", True, True)
-         #OTHERWISE, FEATURE CLASS ALREADY EXISTS IN TARGET GEODATABASE
-         else:
-            #IF FEATURE CLASS IS IN A FEATURE DATASET...
-            if i["fds"] != None:
-               #GET SOURCE FEATURE-DATASET NAME
-               source_fds_name = source_fdatasets_prefixed_names[get_index(source_fdatasets_names, i["fds"])]
-               #GET TARGET FEATURE-DATASET NAME
-               target_fds_name = target_fdatasets_prefixed_names[get_index(target_fdatasets_names, i["fds"])]
-               go_ahead = False
-               #IF ONLY UPDATING THE FEATURE CLASS IF CHANGES EXIST, DETECT CHANGES
-               if i["detect_changes"] == True:
-                  x = compare_objects(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"], i["sort_field"])
-                  if x == "different":
-                     make_note("Change detected for " + source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"] + ".", True, True)
-                     go_ahead = True
-                  elif x == "same":
-                     make_note("Change NOT detected for " + source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"] + ".", True, True)
-                  else:
-                     make_note("Error... Couldn't conduct change-detection for " + source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"] + ". Check fields. Skipping it.", True, True)
-               else:
+            phase_start = time.time()
+            target_row_count = get_count(target_gdb + "\\" + the_prefix + i["name"])
+            add_phase_time(car_phases, "count", phase_start)
+            i["row_counts"] = [source_row_count, target_row_count]
+            i["rows_moved"] = int(target_row_count)
+            log_note = "Copied in new feature-class " + the_prefix + i["name"]
+            make_note("Copied " + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + ".", True, True)
+      #OTHERWISE, FEATURE CLASS ALREADY EXISTS IN TARGET GEODATABASE
+      else:
+         #IF FEATURE CLASS IS IN A FEATURE DATASET...
+         if i["fds"] != None:
+            source_fds_name = i["source_fds_name"]
+            target_fds_name = i["target_fds_name"]
+            go_ahead = False
+            x_ranges = None
+            x_fingerprint = None
+            #IF ONLY UPDATING THE FEATURE CLASS IF CHANGES EXIST, DETECT CHANGES
+            if i["detect_changes"] == True:
+               phase_start = time.time()
+               x, x_details, x_ranges, x_fingerprint = compare_objects(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"], i["sort_field"], False, state_key, i["published_digest"])
+               add_phase_time(car_phases, "compare", phase_start)
+               if x == "different":
+                  make_note("Change detected for " + source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"] + ". " + x_details, True, True)
                   go_ahead = True
-               if go_ahead == True:
-                  load_rows(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"])
-                  #GET ROW COUNTS
-                  source_row_count = get_count(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"])
-                  target_row_count = get_count(target_gdb + "\\" + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"])
-                  #IF TARGET GEODATABASE IS A HUB GEODATABASE, RECORD ACTION IN ITS A_XCHANGE_LOG TABLE
-                  if target_db_type == "hub":
-                     cur_log = arcpy.da.InsertCursor(target_gdb + "\\" + hub_logtable_name, ["DATE","NOTE"])
-                     the_string = tell_the_time()
-                     todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
-                     cur_log.insertRow([todays_date,"Refreshed rows of feature class " + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"]])
-                     del cur_log
-                  make_note("Loaded rows of " + i["fds"] + "\\" + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + ".", True, True)
-            #OTHERWISE, IT'S A STAND-ALONE FEATURE-CLASS
-            else:
-               j = get_index(target_fclasses_names, i["name"])
-               go_ahead = False
-               #IF ONLY UPDATING THE FEATURE CLASS IF CHANGES EXIST, DETECT CHANGES
-               if i["detect_changes"] == True:
-                  x = compare_objects(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fclasses_prefixed_names[j], i["sort_field"])
-                  if x == "different":
-                     make_note("Change detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ".", True, True)
-                     go_ahead = True
-                  elif x == "same":
-                     make_note("Change NOT detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ".", True, True)
-                  else:
-                     make_note("Error... Couldn't conduct change-detection for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". Check fields. Skipping it.", True, True)
+               elif x == "same":
+                  make_note("Change NOT detected for " + source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"] + ". " + x_details, True, True)
                else:
+                  make_note("Error... Couldn't conduct change-detection for " + source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"] + ". Check fields. Skipping it.", True, True)
+            else:
+               go_ahead = True
+            if go_ahead == True:
+               the_load = load_rows(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"], i["sort_field"], False, x_ranges, x_fingerprint, the_increment, i["partitioning"])
+               #GET ROW COUNTS (COUNTED ALONG THE WAY, IF POSSIBLE)
+               phase_start = time.time()
+               source_row_count, target_row_count = get_load_counts(source_gdb + "\\" + source_fds_name + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"], the_load)
+               add_phase_time(car_phases, "count", phase_start)
+               i["row_counts"] = [source_row_count, target_row_count]
+               i["rows_moved"] = get_rows_moved(the_load, target_row_count)
+               i["bytes_moved"] = the_load.get("bytes")
+               log_note = "Refreshed rows of feature class " + target_fds_name + "\\" + get_schema_prefix(target_fds_name) + i["name"] + describe_load(the_load)
+               make_note("Loaded rows of " + i["fds"] + "\\" + i["name"] + " to target geodatabase" + describe_load(the_load) + ". Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + "." + describe_bytes(the_load), True, True)
+               #RECORD THE FINGERPRINT OF WHAT WAS DELIVERED (SEE compare_objects())
+               if x_fingerprint != None and state_key != None:
+                  save_delivered_fingerprint(state_key, x_fingerprint)
+         #OTHERWISE, IT'S A STAND-ALONE FEATURE-CLASS
+         else:
+            go_ahead = False
+            x_ranges = None
+            x_fingerprint = None
+            #IF ONLY UPDATING THE FEATURE CLASS IF CHANGES EXIST, DETECT CHANGES
+            if i["detect_changes"] == True:
+               phase_start = time.time()
+               x, x_details, x_ranges, x_fingerprint = compare_objects(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["target_name"], i["sort_field"], False, state_key, i["published_digest"])
+               add_phase_time(car_phases, "compare", phase_start)
+               if x == "different":
+                  make_note("Change detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". " + x_details, True, True)
                   go_ahead = True
-               if go_ahead == True:
-                  load_rows(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_fclasses_prefixed_names[j])
-                  #GET ROW COUNTS
-                  source_row_count = get_count(source_gdb + "\\" + i["source_prefix"] + i["name"])
-                  target_row_count = get_count(target_gdb + "\\" + target_fclasses_prefixed_names[j])
-                  #IF TARGET GEODATABASE IS A HUB GEODATABASE, RECORD ACTION IN ITS A_XCHANGE_LOG TABLE
-                  if target_db_type == "hub":
-                     cur_log = arcpy.da.InsertCursor(target_gdb + "\\" + hub_logtable_name, ["DATE","NOTE"])
-                     the_string = tell_the_time()
-                     todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
-                     cur_log.insertRow([todays_date,"Refreshed rows of feature class " + target_fclasses_prefixed_names[j]])
-                     del cur_log
-                  make_note("Loaded rows of " + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + ".", True, True)
-      #IF A TABLE...
-      elif i["type"] == "table":
-         #IF TABLE DOESN'T ALREADY EXIST IN TARGET GEODATABASE...
-         if i["already_there"] == False:
-            #COPY TABLE FROM SOURCE GEODATABASE TO TARGET GEODATABASE
-            arcpy.Copy_management(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["name"])
-            #GET SOURCE ROW COUNT
-            source_row_count = get_count(source_gdb + "\\" + i["source_prefix"] + i["name"])
-            #NEED TO LOOP THROUGH TABLES TO GET SCHEMA PREFIX OF NEW TABLE IN TARGET, IN ORDER TO COUNT ROWS IN TARGET
+               elif x == "same":
+                  make_note("Change NOT detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". " + x_details, True, True)
+               else:
+                  make_note("Error... Couldn't conduct change-detection for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". Check fields. Skipping it.", True, True)
+            else:
+               go_ahead = True
+            if go_ahead == True:
+               the_load = load_rows(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["target_name"], i["sort_field"], False, x_ranges, x_fingerprint, the_increment, i["partitioning"])
+               #GET ROW COUNTS (COUNTED ALONG THE WAY, IF POSSIBLE)
+               phase_start = time.time()
+               source_row_count, target_row_count = get_load_counts(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["target_name"], the_load)
+               add_phase_time(car_phases, "count", phase_start)
+               i["row_counts"] = [source_row_count, target_row_count]
+               i["rows_moved"] = get_rows_moved(the_load, target_row_count)
+               i["bytes_moved"] = the_load.get("bytes")
+               log_note = "Refreshed rows of feature class " + i["target_name"] + describe_load(the_load)
+               make_note("Loaded rows of " + i["name"] + " to target geodatabase" + describe_load(the_load) + ". Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + "." + describe_bytes(the_load), True, True)
+               #RECORD THE FINGERPRINT OF WHAT WAS DELIVERED (SEE compare_objects())
+               if x_fingerprint != None and state_key != None:
+                  save_delivered_fingerprint(state_key, x_fingerprint)
+   #IF A TABLE...
+   elif i["type"] == "table":
+      #IF TABLE DOESN'T ALREADY EXIST IN TARGET GEODATABASE...
+      if i["already_there"] == False:
+         #COPY TABLE FROM SOURCE GEODATABASE TO TARGET GEODATABASE
+         phase_start = time.time()
+         arcpy.Copy_management(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["name"])
+         add_phase_time(car_phases, "copy", phase_start)
+         #GET SOURCE ROW COUNT
+         phase_start = time.time()
+         source_row_count = get_count(source_gdb + "\\" + i["source_prefix"] + i["name"])
+         add_phase_time(car_phases, "count", phase_start)
+         #SCHEMA PREFIX OF NEW TABLE IN TARGET (SEE GdbCatalog.new_prefix()), IN ORDER TO COUNT ROWS IN TARGET
+         if i["target_name"] != None and arcpy.Exists(target_gdb + "\\" + i["target_name"]):
+            the_prefix = get_schema_prefix(i["target_name"])
+         #IF IT DIDN'T GET THAT PREFIX, NEED TO LOOP THROUGH TABLES TO GET IT
+         else:
             arcpy.env.workspace = target_gdb
             the_tables = arcpy.ListTables()
             j = 0
@@ -1133,91 +4048,1137 @@ try:
                   found_it = True
                else:
                   j += 1
-            target_row_count = get_count(target_gdb + "\\" + the_prefix + i["name"])
-            #IF TARGET GEODATABASE IS A HUB GEODATABASE, RECORD ACTION IN ITS A_XCHANGE_LOG TABLE
-            if target_db_type == "hub":
-               cur_log = arcpy.da.InsertCursor(target_gdb + "\\" + hub_logtable_name, ["DATE","NOTE"])
-               the_string = tell_the_time()
-               todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
-               cur_log.insertRow([todays_date,"Copied in new table " + the_prefix + i["name"]])
-               del cur_log
-            make_note("Copied table " + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count(after load): " + target_row_count + ".", True, True)
-         #OTHERWISE, TABLE ALREADY EXISTS IN TARGET GEODATABASE
+         phase_start = time.time()
+         target_row_count = get_count(target_gdb + "\\" + the_prefix + i["name"])
+         add_phase_time(car_phases, "count", phase_start)
+         i["row_counts"] = [source_row_count, target_row_count]
+         i["rows_moved"] = int(target_row_count)
+         log_note = "Copied in new table " + the_prefix + i["name"]
+         make_note("Copied table " + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count(after load): " + target_row_count + ".", True, True)
+      #OTHERWISE, TABLE ALREADY EXISTS IN TARGET GEODATABASE
+      else:
+         go_ahead = False
+         x_ranges = None
+         x_fingerprint = None
+         #IF ONLY UPDATING THE TABLE IF CHANGES EXIST, DETECT CHANGES
+         if i["detect_changes"] == True:
+            phase_start = time.time()
+            x, x_details, x_ranges, x_fingerprint = compare_objects(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["target_name"], i["sort_field"], True, state_key, i["published_digest"])
+            add_phase_time(car_phases, "compare", phase_start)
+            if x == "different":
+               make_note("Change detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". " + x_details, True, True)
+               go_ahead = True
+            elif x == "same":
+               make_note("Change NOT detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". " + x_details, True, True)
+            else:
+               make_note("Error... Couldn't conduct change-detection for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". Check fields. Skipping it.", True, True)
          else:
-            j = get_index(target_tables_names, i["name"])
-            go_ahead = False
-            #IF ONLY UPDATING THE TABLE IF CHANGES EXIST, DETECT CHANGES
-            if i["detect_changes"] == True:
-               x = compare_objects(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_tables_prefixed_names[j], i["sort_field"], True)
-               if x == "different":
-                  make_note("Change detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ".", True, True)
-                  go_ahead = True
-               elif x == "same":
-                  make_note("Change NOT detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ".", True, True)
+            go_ahead = True
+         if go_ahead == True:
+            the_load = load_rows(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["target_name"], i["sort_field"], True, x_ranges, x_fingerprint, the_increment, i["partitioning"])
+            #GET ROW COUNTS (COUNTED ALONG THE WAY, IF POSSIBLE)
+            phase_start = time.time()
+            source_row_count, target_row_count = get_load_counts(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["target_name"], the_load)
+            add_phase_time(car_phases, "count", phase_start)
+            i["row_counts"] = [source_row_count, target_row_count]
+            i["rows_moved"] = get_rows_moved(the_load, target_row_count)
+            i["bytes_moved"] = the_load.get("bytes")
+            log_note = "Refreshed rows of table " + i["target_name"] + describe_load(the_load)
+            make_note("Loaded rows of " + i["name"] + " to target geodatabase" + describe_load(the_load) + ". Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + "." + describe_bytes(the_load), True, True)
+            #RECORD THE FINGERPRINT OF WHAT WAS DELIVERED (SEE compare_objects())
+            if x_fingerprint != None and state_key != None:
+               save_delivered_fingerprint(state_key, x_fingerprint)
+   #IF A RASTER DATASET...
+   elif i["type"] == "raster":
+      #IF RASTER DATASET DOESN'T ALREADY EXIST IN TARGET GEODATABASE...
+      if i["already_there"] == False:
+         #COPY RASTER DATASET FROM SOURCE GEODATABASE TO TARGET GEODATABASE
+         phase_start = time.time()
+         arcpy.Copy_management(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["name"])
+         add_phase_time(car_phases, "copy", phase_start)
+         log_note = "Copied in new raster-dataset " + i["name"]
+         make_note("Copied raster-dataset " + i["name"] + " to target geodatabase.", True, True)
+      #OTHERWISE, RASTER DATASET ALREADY EXISTS IN TARGET GEODATABASE
+      else:
+         go_ahead = True
+         x_fingerprint = None
+         #IF ONLY WRITING BLOCKS THAT CHANGED, COMPARE RASTER DATASETS BLOCK BY BLOCK
+         if raster_load_strategy == "delta":
+            phase_start = time.time()
+            x, x_details, x_blocks, x_fingerprint = compare_rasters(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["target_name"], state_key, i["published_digest"])
+            add_phase_time(car_phases, "compare", phase_start)
+            if x == "same":
+               make_note("Change NOT detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". " + x_details, True, True)
+               go_ahead = False
+            elif x == "different" and x_blocks != None:
+               make_note("Change detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". " + x_details, True, True)
+               phase_start = time.time()
+               x_applied = apply_raster_delta(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["target_name"], x_blocks)
+               add_phase_time(car_phases, "delta", phase_start)
+               if x_applied == True:
+                  log_note = "Refreshed raster-dataset " + i["target_name"] + " (delta: " + str(len(x_blocks)) + " of " + str(x_fingerprint["row_count"]) + " blocks)"
+                  make_note("Wrote " + str(len(x_blocks)) + " of " + str(x_fingerprint["row_count"]) + " blocks of raster-dataset " + i["name"] + " to target geodatabase.", True, True)
+                  go_ahead = False
                else:
-                  make_note("Error... Couldn't conduct change-detection for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". Check fields. Skipping it.", True, True)
+                  make_note("Couldn't write NoData pixels of raster-dataset " + i["name"] + " block by block. Re-loading it.", True, True)
+            elif x == "different":
+               make_note("Change detected for " + source_gdb + "\\" + i["source_prefix"] + i["name"] + ". " + x_details + " Re-loading it.", True, True)
             else:
-               go_ahead = True
-            if go_ahead == True:
-               load_rows(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + target_tables_prefixed_names[j])
-               #GET ROW COUNTS
-               source_row_count = get_count(source_gdb + "\\" + i["source_prefix"] + i["name"])
-               target_row_count = get_count(target_gdb + "\\" + target_tables_prefixed_names[j])
-               #IF TARGET GEODATABASE IS A HUB GEODATABASE, RECORD ACTION IN ITS A_XCHANGE_LOG TABLE
-               if target_db_type == "hub":
-                  cur_log = arcpy.da.InsertCursor(target_gdb + "\\" + hub_logtable_name, ["DATE","NOTE"])
-                  the_string = tell_the_time()
-                  todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
-                  cur_log.insertRow([todays_date,"Refreshed rows of table " + target_tables_prefixed_names[j]])
-                  del cur_log
-               make_note("Loaded rows of " + i["name"] + " to target geodatabase. Source Row Count: " + source_row_count + ". Target Row Count (after load): " + target_row_count + ".", True, True)
-      #IF A RASTER DATASET...
-      elif i["type"] == "raster":
-         #IF RASTER DATASET DOESN'T ALREADY EXIST IN TARGET GEODATABASE...
-         if i["already_there"] == False:
-            #COPY RASTER DATASET FROM SOURCE GEODATABASE TO TARGET GEODATABASE
-            arcpy.Copy_management(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["name"])
-            #IF TARGET GEODATABASE IS A HUB GEODATABASE, RECORD ACTION IN ITS A_XCHANGE_LOG TABLE
-            if target_db_type == "hub":
-               cur_log = arcpy.da.InsertCursor(target_gdb + "\\" + hub_logtable_name, ["DATE","NOTE"])
-               the_string = tell_the_time()
-               todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
-               cur_log.insertRow([todays_date,"Copied in new raster-dataset " + i["name"]])
-               del cur_log
-            make_note("Copied raster-dataset " + i["name"] + " to target geodatabase.", True, True)
-         #OTHERWISE, RASTER DATASET ALREADY EXISTS IN TARGET GEODATABASE
-         else:
-            j = get_index(target_rasters_names, i["name"])
+               make_note("Couldn't compare raster-dataset " + i["name"] + " block by block. Re-loading it.", True, True)
+         #IF STAGING, COPY RASTER DATASET UNDER A STAGING NAME AND THEN SWAP IT IN (SEE swap_staged_object())
+         if go_ahead == True and stage_raster_reloads == True:
+            the_prefix = get_schema_prefix(i["target_name"])
+            try:
+               clear_staged_objects(target_gdb, the_prefix, i["name"])
+               phase_start = time.time()
+               arcpy.Copy_management(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["name"] + STAGE_NEW_SUFFIX)
+               add_phase_time(car_phases, "copy", phase_start)
+               if swap_staged_object(target_gdb, the_prefix, i["name"]) == True:
+                  log_note = "Refreshed raster-dataset " + i["target_name"] + " (staged)"
+                  make_note("Re-loaded raster-dataset " + i["name"] + " to target geodatabase (staged copy swapped in).", True, True)
+               else:
+                  make_note("Couldn't swap staged copy of raster-dataset " + i["name"] + " in after " + str(SWAP_ATTEMPTS) + " tries. A lock might be blocking the rename. Target raster-dataset wasn't changed.", True, True)
+            except:
+               make_note("Couldn't stage raster-dataset " + i["name"] + ". Target raster-dataset wasn't changed.", True, True)
+         elif go_ahead == True:
             try:
                #DELETE THE RASTER DATASET IN TARGET GEODATABASE
-               arcpy.Delete_management(target_gdb + "\\" + target_rasters_prefixed_names[j])
+               phase_start = time.time()
+               arcpy.Delete_management(target_gdb + "\\" + i["target_name"])
+               add_phase_time(car_phases, "delete", phase_start)
                #COPY RASTER DATASET FROM SOURCE GEODATABASE TO TARGET GEODATABASE
+               phase_start = time.time()
                arcpy.Copy_management(source_gdb + "\\" + i["source_prefix"] + i["name"], target_gdb + "\\" + i["name"])
-               #IF TARGET GEODATABASE IS A HUB GEODATABASE, RECORD ACTION IN ITS A_XCHANGE_LOG TABLE
-               if target_db_type == "hub":
-                  cur_log = arcpy.da.InsertCursor(target_gdb + "\\" + hub_logtable_name, ["DATE","NOTE"])
-                  the_string = tell_the_time()
-                  todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
-                  cur_log.insertRow([todays_date,"Refreshed raster-dataset " + target_rasters_prefixed_names[j]])
-                  del cur_log
+               add_phase_time(car_phases, "copy", phase_start)
+               log_note = "Refreshed raster-dataset " + i["target_name"]
                make_note("Re-loaded raster-dataset " + i["name"] + " to target geodatabase.", True, True)
             except:
                make_note("Couldn't re-load raster-dataset " + i["name"] + ". A lock might be blocking the operation. An exclusive lock is required (consult w/ a DBA for more info).", True, True)
+         #RECORD THE FINGERPRINT OF WHAT WAS DELIVERED (SEE compare_rasters())
+         if log_note != None and x_fingerprint != None and state_key != None:
+            save_delivered_fingerprint(state_key, x_fingerprint)
+   #RECORD THE WATERMARK OF A NEW INCREMENTAL DATA-OBJECT (ITS KEYS MATCH; IT WAS JUST COPIED)
+   if new_watermark != None and log_note != None:
+      save_watermark(the_increment["state_key"], new_watermark[0], time.time())
+   i["seconds"] = time.time() - car_start
+   #RECORD HOW LONG IT TOOK (FOR PLANNING THE NEXT TRAIN; SEE estimate_car_cost())
+   if log_note != None:
+      if i["row_counts"] != None:
+         save_car_timing(i, int(i["row_counts"][0]), time.time() - car_start)
       else:
+         save_car_timing(i, None, time.time() - car_start)
+   #RECORD IN RUN JOURNAL. ROW COUNTS THAT DON'T MATCH LEAVE THE FREIGHT CAR "loaded" (NOT "verified").
+   update_journal(i, "loaded", log_note)
+   if i["row_counts"] != None and i["row_counts"][0] != i["row_counts"][1]:
+      make_note("Source and target row counts of " + i["name"] + " don't match after load.", True, True)
+   else:
+      update_journal(i, "verified")
+   return log_note
+
+#THIS FUNCTION IS RUN BY EACH WORKER PROCESS OF send_freight_cars_in_parallel() WHEN IT STARTS.
+#   THE ARGUMENT IS THE QUEUE THAT FREIGHT CARS ARE REPORTED ON AS THEY'RE STARTED (SEE car_starts).
+def start_car_worker(the_queue):
+   global car_starts
+   car_starts = the_queue
+
+#THIS FUNCTION IS RUN IN A WORKER PROCESS TO SEND ONE FREIGHT CAR (SEE send_freight_car()). IT FIRST REPORTS THE
+#   FREIGHT CAR'S TASK NUMBER AND THE WORKER PROCESS'S ID ON car_starts.
+#   THE FIRST ARGUMENT IS THE FREIGHT CAR.
+#   THE SECOND ARGUMENT IS OPTIONAL. THE FREIGHT CAR'S TASK NUMBER (SEE send_freight_cars_in_parallel()).
+#   RETURNS A DICTIONARY W/ THESE KEYS:
+#      car         THE FREIGHT CAR
+#      task        THE FREIGHT CAR'S TASK NUMBER
+#      notes       NOTES MADE WHILE SENDING THE FREIGHT CAR (FOR write_note())
+#      log_note    NOTE FOR HUB'S A_XCHANGE_LOG TABLE, OR None
+#      error       None IF FREIGHT CAR WAS SENT W/O AN ERROR CONDITION. OTHERWISE, A DESCRIPTION OF THE ERROR.
+def send_freight_car_in_worker(the_car, the_task = None):
+   global note_buffer
+   if car_starts != None:
+      car_starts.put([the_task, os.getpid()])
+   note_buffer = []
+   the_result = {"car":the_car,"task":the_task,"notes":note_buffer,"log_note":None,"error":None}
+   try:
+      the_result["log_note"] = send_freight_car(the_car)
+   except:
+      the_result["error"] = traceback.format_exc() + "arcpy Messages:  " + arcpy.GetMessages()
+   note_buffer = None
+   return the_result
+
+#THIS FUNCTION WRITES ENTRIES INTO A HUB GEODATABASE'S A_XCHANGE_LOG TABLE W/ ONE INSERT CURSOR
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE A_XCHANGE_LOG TABLE
+#   THE SECOND ARGUMENT IS A LIST OF THE ENTRIES' NOTES
+#   RETURNS THE ENTRIES' DATE (YYYY-MM-DD)
+def write_hub_log(hub_log_table, the_notes):
+   the_string = tell_the_time()
+   todays_date = the_string[4:6] + "/" + the_string[6:8] + "/" + the_string[0:4]
+   cur_log = arcpy.da.InsertCursor(hub_log_table, ["DATE","NOTE"])
+   for a_note in the_notes:
+      cur_log.insertRow([todays_date,a_note])
+   del cur_log
+   return the_string[0:4] + "-" + the_string[4:6] + "-" + the_string[6:8]
+
+#THIS FUNCTION BUFFERS A FREIGHT CAR THAT HAS ARRIVED (OR WAS VERIFIED ON A RESUMED RUN) FOR LOGGING, AND FLUSHES THE
+#   BUFFER (SEE flush_hub_log()) ONCE IT HOLDS hub_log_batch_cars FREIGHT CARS.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE HUB'S A_XCHANGE_LOG TABLE (None IF TARGET ISN'T A HUB GEODATABASE).
+#   THE SECOND ARGUMENT IS THE FREIGHT CAR.
+#   THE THIRD ARGUMENT IS THE FREIGHT CAR'S A_XCHANGE_LOG NOTE (None IF NOTHING WAS SENT).
+def log_freight_car(hub_log_table, i, log_note):
+   hub_log_buffer.append([i, log_note])
+   if len(hub_log_buffer) >= max(1, hub_log_batch_cars):
+      flush_hub_log(hub_log_table)
+
+#THIS FUNCTION WRITES BUFFERED A_XCHANGE_LOG ENTRIES (SEE log_freight_car()) INTO THE HUB'S A_XCHANGE_LOG TABLE IN ONE
+#   BATCH (AND RECORDS THE ENTRIES' DATE FOR THEIR FREIGHT CARS IN THE STATE STORE; SEE get_own_delivery_date()), AND
+#   THEN RECORDS THE BUFFERED FREIGHT CARS AS "logged" IN THE RUN JOURNAL AND EMPTIES THE BUFFER.
+#   THE ARGUMENT IS THE FULL PATH OF THE HUB'S A_XCHANGE_LOG TABLE (None IF TARGET ISN'T A HUB GEODATABASE).
+def flush_hub_log(hub_log_table):
+   if len(hub_log_buffer) == 0:
+      return
+   phase_start = time.time()
+   the_notes = [i[1] for i in hub_log_buffer if i[1] != None]
+   if hub_log_table != None and len(the_notes) > 0:
+      the_date = write_hub_log(hub_log_table, the_notes)
+      save_hub_log_dates([i[0] for i in hub_log_buffer if i[1] != None], the_date)
+   for i in hub_log_buffer:
+      update_journal(i[0], "logged")
+   del hub_log_buffer[:]
+   add_phase_time(run_phases, "log", phase_start)
+
+#THIS FUNCTION RETURNS THE NAME (ALL CAPS, W/O FEATURE DATASET OR SCHEMA PREFIX) OF THE DATA OBJECT THAT AN
+#   A_XCHANGE_LOG NOTE IS ABOUT (SEE LOG_NOTE_PATTERN), OR None IF THE NOTE DOESN'T NAME ONE.
+#   THE ARGUMENT IS THE NOTE.
+def get_logged_object(the_note):
+   if the_note == None:
+      return None
+   the_match = LOG_NOTE_PATTERN.match(the_note.strip())
+   if the_match == None:
+      return None
+   return get_name(the_match.group("name").split("\\")[-1]).upper()
+
+#THIS FUNCTION RETURNS THE DATE (datetime.date) OF AN A_XCHANGE_LOG ENTRY, OR None IF IT CAN'T BE READ.
+#   THE ARGUMENT IS THE ENTRY'S DATE VALUE: A datetime (DATE FIELD) OR A MM/DD/YYYY (OR YYYY-MM-DD) STRING (TEXT FIELD).
+def get_log_date(the_value):
+   if isinstance(the_value, datetime.datetime):
+      return the_value.date()
+   if isinstance(the_value, datetime.date):
+      return the_value
+   for a_format in ["%m/%d/%Y", "%Y-%m-%d"]:
+      try:
+         return datetime.datetime.strptime(str(the_value).strip()[0:10], a_format).date()
+      except:
          pass
+   return None
+
+#THIS FUNCTION CREATES AN A_XCHANGE_LOG_SUMMARY TABLE IN A GEODATABASE AND RETURNS ITS NAME (W/ SCHEMA PREFIX).
+#   THE ARGUMENT IS THE PATH OF THE GEODATABASE.
+def create_log_summary_table(the_gdb):
+   summary_table = arcpy.CreateTable_management(the_gdb, "A_XCHANGE_LOG_SUMMARY").getOutput(0)
+   for a_field in LOG_SUMMARY_TABLE_FIELDS:
+      arcpy.AddField_management(summary_table, a_field[0], a_field[1], field_length = a_field[2])
+   return summary_table[summary_table.rfind("\\") + 1:]
 
-   #LOG SCRIPT COMPLETION
-   make_note("Script completed.", True, True)
+#THIS FUNCTION ADDS A HUB LOG-TABLE'S INDEX (SEE LOG_INDEXES) IF THE TABLE DOESN'T ALREADY HAVE AN INDEX ON THOSE
+#   FIELDS. RETURNS True IF THE INDEX WAS ADDED.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE TABLE.
+#   THE SECOND ARGUMENT IS THE TABLE'S NAME W/O SCHEMA PREFIX ("A_XCHANGE_LOG" OR "A_XCHANGE_LOG_SUMMARY").
+def add_log_index(the_table, table_name):
+   index_name, index_fields = LOG_INDEXES[table_name]
+   for an_index in arcpy.ListIndexes(the_table):
+      if [i.name.upper() for i in an_index.fields][0:len(index_fields)] == index_fields:
+         return False
+   arcpy.AddIndex_management(the_table, index_fields, index_name)
+   return True
+
+#THIS FUNCTION ROLLS A HUB'S A_XCHANGE_LOG ENTRIES THAT ARE OLDER THAN A RETENTION PERIOD INTO ITS A_XCHANGE_LOG_SUMMARY
+#   TABLE (ONE ROW PER DATA OBJECT PER MONTH; ENTRIES W/ NOTES THAT DON'T NAME A DATA OBJECT ARE COUNTED UNDER
+#   LOG_OTHER_NAME), AND THEN DELETES THEM FROM A_XCHANGE_LOG. ENTRIES W/ A DATE THAT CAN'T BE READ ARE KEPT.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE A_XCHANGE_LOG TABLE.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE A_XCHANGE_LOG_SUMMARY TABLE.
+#   THE THIRD ARGUMENT IS THE NUMBER OF MONTHS (BEFORE THE CURRENT MONTH) OF ENTRIES TO KEEP.
+#   RETURNS THE NUMBER OF ENTRIES ROLLED UP.
+def compact_hub_log(hub_log_table, summary_table, months):
+   #FIRST DAY OF THE OLDEST MONTH THAT IS KEPT
+   the_month = datetime.date.today().year * 12 + datetime.date.today().month - 1 - months
+   cutoff_date = datetime.date(the_month // 12, the_month % 12 + 1, 1)
+   #TALLY OLD ENTRIES BY [OBJECT NAME, MONTH]
+   the_tallies = {}
+   the_cursor = arcpy.da.SearchCursor(hub_log_table, ["DATE","NOTE"])
+   for a_row in the_cursor:
+      the_date = get_log_date(a_row[0])
+      if the_date == None or the_date >= cutoff_date:
+         continue
+      the_name = get_logged_object(a_row[1])
+      if the_name == None:
+         the_name = LOG_OTHER_NAME
+      the_key = (the_name, the_date.strftime("%Y-%m"))
+      the_tally = the_tallies.setdefault(the_key, [0, None, None])
+      the_tally[0] += 1
+      if the_tally[1] == None or the_date >= the_tally[1]:
+         the_tally[1] = the_date
+         the_tally[2] = a_row[1]
+   del the_cursor
+   if len(the_tallies) == 0:
+      return 0
+   #ADD TALLIES INTO SUMMARY (UPDATE ROWS THAT ALREADY EXIST, THEN INSERT THE REST)
+   the_cursor = arcpy.da.UpdateCursor(summary_table, [i[0] for i in LOG_SUMMARY_TABLE_FIELDS])
+   for a_row in the_cursor:
+      if a_row[0] == None or a_row[1] == None:
+         continue
+      the_tally = the_tallies.pop((a_row[0].strip().upper(), a_row[1].strip()), None)
+      if the_tally != None:
+         last_date = get_log_date(a_row[3])
+         if last_date == None or the_tally[1] >= last_date:
+            last_date = the_tally[1]
+            last_note = the_tally[2]
+         else:
+            last_note = a_row[4]
+         the_cursor.updateRow([a_row[0], a_row[1], (a_row[2] or 0) + the_tally[0], datetime.datetime.combine(last_date, datetime.time()), last_note])
+   del the_cursor
+   if len(the_tallies) > 0:
+      the_cursor = arcpy.da.InsertCursor(summary_table, [i[0] for i in LOG_SUMMARY_TABLE_FIELDS])
+      for the_key in sorted(the_tallies):
+         the_tally = the_tallies[the_key]
+         the_cursor.insertRow([the_key[0], the_key[1], the_tally[0], datetime.datetime.combine(the_tally[1], datetime.time()), (the_tally[2] or "")[0:1000]])
+      del the_cursor
+   #DELETE ROLLED-UP ENTRIES
+   the_count = 0
+   the_cursor = arcpy.da.UpdateCursor(hub_log_table, ["DATE"])
+   for a_row in the_cursor:
+      the_date = get_log_date(a_row[0])
+      if the_date != None and the_date < cutoff_date:
+         the_cursor.deleteRow()
+         the_count += 1
+   del the_cursor
+   return the_count
+
+#THIS FUNCTION RETURNS WHERE CLAUSES THAT SELECT A HUB'S A_XCHANGE_LOG ENTRIES DATED ON OR AFTER A GIVEN DAY (BY THE
+#   DATE FIELD'S INDEX): ONE CLAUSE IF THE DATE FIELD IS A DATE FIELD (SEE hub_date_literal), OTHERWISE ONE PER
+#   LOG_LOOKUP_DAYS DAYS THROUGH TODAY (EACH W/ THOSE DAYS AS MM/DD/YYYY AND YYYY-MM-DD; SEE get_log_date()).
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE A_XCHANGE_LOG TABLE.
+#   THE SECOND ARGUMENT IS THE DAY (A DATE).
+def get_log_date_clauses(hub_log_table, since_date):
+   date_field = arcpy.AddFieldDelimiters(hub_log_table, "DATE")
+   if [i.type for i in arcpy.ListFields(hub_log_table) if i.name.upper() == "DATE"] == ["Date"]:
+      return [date_field + " >= " + hub_date_literal % since_date.isoformat()]
+   the_days = []
+   the_day = since_date
+   while the_day <= datetime.date.today():
+      the_days.append(the_day)
+      the_day += datetime.timedelta(1)
+   the_clauses = []
+   for k in range(0, len(the_days), LOG_LOOKUP_DAYS):
+      the_values = []
+      for a_day in the_days[k:k + LOG_LOOKUP_DAYS]:
+         the_values += ["'" + a_day.strftime("%m/%d/%Y") + "'", "'" + a_day.isoformat() + "'"]
+      the_clauses.append(date_field + " IN (" + ", ".join(the_values) + ")")
+   return the_clauses
+
+#THIS FUNCTION RETURNS THE DATE EACH DATA OBJECT WAS LAST DELIVERED TO A HUB GEODATABASE, FROM ITS A_XCHANGE_LOG TABLE
+#   AND (IF IT HAS ONE) ITS A_XCHANGE_LOG_SUMMARY TABLE. ONLY DELIVERIES ON OR AFTER A GIVEN DAY ARE LOOKED UP.
+#   THE FIRST ARGUMENT IS THE FULL PATH OF THE A_XCHANGE_LOG TABLE.
+#   THE SECOND ARGUMENT IS THE FULL PATH OF THE A_XCHANGE_LOG_SUMMARY TABLE, OR None IF THERE ISN'T ONE.
+#   THE THIRD ARGUMENT IS THE DAY (A DATE).
+#   RETURNS A DICTIONARY. KEYS ARE ALL-CAPS DATA-OBJECT NAMES W/O SCHEMA PREFIX; VALUES ARE DATES (YYYY-MM-DD).
+def get_last_deliveries(hub_log_table, summary_table, since_date):
+   the_dates = {}
+   for a_clause in get_log_date_clauses(hub_log_table, since_date):
+      the_cursor = arcpy.da.SearchCursor(hub_log_table, ["DATE","NOTE"], a_clause)
+      for a_row in the_cursor:
+         the_name = get_logged_object(a_row[1])
+         the_date = get_log_date(a_row[0])
+         if the_name != None and the_date != None and the_date >= since_date and the_date > the_dates.get(the_name, datetime.date.min):
+            the_dates[the_name] = the_date
+      del the_cursor
+   if summary_table != None:
+      #(MONTH IS YYYY-MM TEXT, SO MONTHS SINCE THE DAY'S MONTH ARE SELECTED W/O A DATE LITERAL)
+      the_cursor = arcpy.da.SearchCursor(summary_table, ["OBJECT_NAME","LAST_DATE"], arcpy.AddFieldDelimiters(summary_table, "MONTH") + " >= '" + since_date.strftime("%Y-%m") + "'")
+      for a_row in the_cursor:
+         the_date = get_log_date(a_row[1])
+         if a_row[0] != None and a_row[0].strip().upper() != LOG_OTHER_NAME and the_date != None:
+            the_name = a_row[0].strip().upper()
+            if the_date > the_dates.get(the_name, datetime.date.min):
+               the_dates[the_name] = the_date
+      del the_cursor
+   return dict([[i, the_dates[i].isoformat()] for i in the_dates])
+
+#THIS FUNCTION SENDS FREIGHT CARS ON A POOL OF WORKER PROCESSES.
+#   THE FIRST ARGUMENT IS THE LIST OF FREIGHT CARS (NAMES RESOLVED), IN THE ORDER IN WHICH THEY SHOULD BE STARTED.
+#   THE SECOND ARGUMENT IS THE NUMBER OF WORKER PROCESSES.
+#   THE THIRD ARGUMENT IS THE MAXIMUM NUMBER OF FREIGHT CARS THAT CAN BE SENT INTO THE SAME TARGET CONTAINER
+#      (FREIGHT CAR'S "target_container" KEY) AT THE SAME TIME.
+#   THE FOURTH ARGUMENT IS THE FULL PATH OF THE HUB'S A_XCHANGE_LOG TABLE, OR None IF TARGET ISN'T A HUB.
+#   NOTES AND A_XCHANGE_LOG ENTRIES ARE WRITTEN BY THIS (MAIN) PROCESS AS EACH FREIGHT CAR ARRIVES.
+#   IF A FREIGHT CAR ENCOUNTERS AN ERROR CONDITION, NO MORE FREIGHT CARS ARE STARTED; FREIGHT CARS ALREADY
+#   UNDERWAY ARE ALLOWED TO ARRIVE, AND THEN AN EXCEPTION IS RAISED. A FREIGHT CAR WHOSE WORKER PROCESS DIES (E.G., IT'S
+#   KILLED OR CRASHES IN arcpy) NEVER ARRIVES; IT'S FOUND BY ITS UNFINISHED RESULT AND THE WORKER PROCESS'S ID (SEE
+#   car_starts) AND TREATED AS AN ERROR CONDITION.
+def send_freight_cars_in_parallel(the_cars, worker_count, per_target_cap, hub_log_table):
+   waiting_cars = list(the_cars)
+   container_counts = {}
+   cars_underway = {}
+   car_pids = {}
+   task_count = 0
+   arrivals = Queue.Queue()
+   started_cars = multiprocessing.Queue()
+   the_error = None
+   workers_lost = 0
+   last_check = time.time()
+   the_pool = multiprocessing.Pool(worker_count, start_car_worker, [started_cars])
+   try:
+      while (len(waiting_cars) > 0 and the_error == None) or len(cars_underway) > 0:
+         #START AS MANY WAITING FREIGHT CARS AS WORKERS AND TARGET CAPS ALLOW. EACH IS UNDERWAY AS [FREIGHT CAR,
+         #AsyncResult] UNDER ITS TASK NUMBER.
+         k = 0
+         while the_error == None and k < len(waiting_cars) and len(cars_underway) < worker_count:
+            the_container = waiting_cars[k]["target_container"]
+            if container_counts.get(the_container, 0) < per_target_cap:
+               the_car = waiting_cars.pop(k)
+               container_counts[the_container] = container_counts.get(the_container, 0) + 1
+               task_count += 1
+               cars_underway[task_count] = [the_car, the_pool.apply_async(send_freight_car_in_worker, [the_car, task_count], callback = arrivals.put)]
+            else:
+               k += 1
+         #WAIT FOR A FREIGHT CAR TO ARRIVE (W/ A TIMEOUT SO THAT THE WAIT CAN BE INTERRUPTED)
+         try:
+            the_result = arrivals.get(True, 5)
+         except Queue.Empty:
+            the_result = None
+         #LOOK FOR FREIGHT CARS WHOSE WORKER PROCESS DIED (AT LEAST EVERY 5 SECONDS, EVEN WHILE OTHERS ARRIVE)
+         if the_result == None or time.time() - last_check >= 5:
+            last_check = time.time()
+            while True:
+               try:
+                  a_start = started_cars.get_nowait()
+               except Queue.Empty:
+                  break
+               car_pids[a_start[0]] = a_start[1]
+            live_pids = [i.pid for i in multiprocessing.active_children()]
+            for a_task in sorted(cars_underway):
+               the_car, the_handle = cars_underway[a_task]
+               if car_pids.get(a_task) == None or car_pids[a_task] in live_pids or the_handle.ready() == True:
+                  continue
+               #(ITS RESULT MIGHT STILL BE ON ITS WAY)
+               the_handle.wait(1)
+               if the_handle.ready() == True:
+                  continue
+               del cars_underway[a_task]
+               container_counts[the_car["target_container"]] -= 1
+               workers_lost += 1
+               make_note("Error condition when sending " + the_car["name"] + ":\nIts worker process (ID " + str(car_pids[a_task]) + ") exited w/o returning it.", True, True)
+               if the_error == None:
+                  the_error = the_car["name"]
+         if the_result == None or the_result["task"] not in cars_underway:
+            continue
+         del cars_underway[the_result["task"]]
+         container_counts[the_result["car"]["target_container"]] -= 1
+         for a_note in the_result["notes"]:
+            write_note(a_note[0], a_note[1], a_note[2])
+         if the_result["error"] != None:
+            make_note("Error condition when sending " + the_result["car"]["name"] + ":\n" + the_result["error"], True, True)
+            if the_error == None:
+               the_error = the_result["car"]["name"]
+         else:
+            car_metrics.append(get_car_metrics(the_result["car"]))
+            log_freight_car(hub_log_table, the_result["car"], the_result["log_note"])
+   finally:
+      #(A POOL THAT LOST A TASK W/ ITS WORKER PROCESS WOULD WAIT FOR IT FOREVER ON close())
+      if workers_lost > 0 or len(cars_underway) > 0:
+         the_pool.terminate()
+      else:
+         the_pool.close()
+      the_pool.join()
+   if the_error != None:
+      raise Exception("Freight car " + the_error + " encountered an error condition.")
+
+#THIS FUNCTION ADDS THE SECONDS SINCE A GIVEN START-TIME TO A PHASE'S TOTAL AND RETURNS THE CURRENT TIME (SO THAT
+#   THE NEXT PHASE CAN START FROM IT).
+#   THE FIRST ARGUMENT IS THE DICTIONARY OF PHASE TOTALS (run_phases OR car_phases). KEYS ARE PHASE NAMES.
+#   THE SECOND ARGUMENT IS THE PHASE'S NAME.
+#   THE THIRD ARGUMENT IS WHEN THE PHASE STARTED (SECONDS SINCE EPOCH).
+def add_phase_time(the_phases, the_phase, the_start):
+   the_time = time.time()
+   the_phases[the_phase] = the_phases.get(the_phase, 0) + the_time - the_start
+   return the_time
+
+#THIS FUNCTION RETURNS THE NUMBER OF ROWS MOVED BY A LOAD (SEE load_rows()): ROWS INSERTED, UPDATED, AND DELETED FOR A
+#   DELTA OR AN INCREMENT (INCLUDING ONE FROM AN ARCHIVE CLASS), ROWS INSERTED FOR A CHUNKED LOAD OR A SWAP, OR THE TARGET ROW-COUNT AFTER THE LOAD OTHERWISE.
+#   THE FIRST ARGUMENT IS THE DICTIONARY THAT DESCRIBES THE LOAD.
+#   THE SECOND ARGUMENT IS THE TARGET ROW-COUNT AFTER THE LOAD.
+def get_rows_moved(the_load, target_row_count):
+   if the_load["strategy"] == "delta":
+      return the_load["inserted"] + the_load["updated"] + the_load["deleted"]
+   if the_load["strategy"] in ("incremental", "archive"):
+      return the_load["inserted"] + the_load["updated"] + (the_load["deleted"] or 0)
+   if the_load["inserted"] != None:
+      return the_load["inserted"]
+   return int(target_row_count)
+
+#THIS FUNCTION RETURNS METRICS OF A FREIGHT CAR THAT HAS BEEN SENT (SEE send_freight_car()) AS A DICTIONARY W/ THESE KEYS:
+#      name                 SOURCE DATA-OBJECT'S NAME W/ SCHEMA PREFIX
+#      type                 "fclass", "table", OR "raster"
+#      seconds              SECONDS IT TOOK TO SEND THE FREIGHT CAR
+#      phases               SECONDS SPENT IN EACH PHASE (KEYS ARE PHASE NAMES, E.G., "compare", "delete", "append")
+#      rows                 ROWS MOVED (SEE get_rows_moved()), OR None
+#      bytes                APPROXIMATE BYTES MOVED (SEE get_row_bytes()), OR None
+#      rows_per_second      ROWS MOVED PER SECOND SPENT IN PHASES THAT MOVE ROWS, OR None
+#   THE ARGUMENT IS THE FREIGHT CAR.
+def get_car_metrics(i):
+   the_metrics = {"name":i["source_prefix"] + i["name"],"type":i["type"],"seconds":round(i["seconds"], 3),"phases":dict([[k, round(v, 3)] for k, v in i["phases"].items()]),"rows":i["rows_moved"],"bytes":i["bytes_moved"],"rows_per_second":None}
+   moving_seconds = sum([i["phases"].get(k, 0) for k in ("copy", "delete", "append", "delta", "incremental", "reconcile", "archive")])
+   if i["rows_moved"] != None and moving_seconds > 0:
+      the_metrics["rows_per_second"] = round(i["rows_moved"] / moving_seconds, 1)
+   return the_metrics
+
+#THIS FUNCTION RETURNS A PROMETHEUS LABEL-VALUE (IN QUOTES) W/ BACKSLASHES, QUOTES, AND LINE BREAKS ESCAPED.
+def get_metric_label(the_value):
+   return '"' + the_value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+#THIS FUNCTION WRITES METRICS OF THE RUN (run_phases AND car_metrics) INTO metrics_dir AS A PROMETHEUS TEXTFILE
+#   (vtDataRail_SendFreight.prom) AND A JSON SUMMARY (vtDataRail_SendFreight.metrics.json). EACH FILE IS WRITTEN UNDER
+#   A TEMPORARY NAME AND THEN RENAMED, SO THAT A PARTLY-WRITTEN FILE IS NEVER READ.
+#   THE FIRST ARGUMENT IS WHEN THE RUN STARTED (SECONDS SINCE EPOCH).
+#   THE SECOND ARGUMENT IS A BOOLEAN TO INDICATE IF THE RUN COMPLETED (False IF IT ENDED W/ AN ERROR CONDITION).
+#   THE THIRD ARGUMENT IS OPTIONAL. THE FILES' NAME (W/O .prom OR .metrics.json; E.G., A WORKER'S; SEE work_command()).
+def write_metrics(run_start, completed = True, file_name = "vtDataRail_SendFreight"):
+   if metrics_dir != "":
+      the_dir = metrics_dir
+   else:
+      the_dir = sys.path[0]
+   run_end = time.time()
+   the_summary = {"source_gdb":source_gdb,"target_gdb":target_gdb,"started":datetime.datetime.fromtimestamp(run_start).isoformat(),"finished":datetime.datetime.fromtimestamp(run_end).isoformat(),"completed":completed,"seconds":round(run_end - run_start, 3),"phases":dict([[k, round(v, 3)] for k, v in run_phases.items()]),"cars":car_metrics}
+   the_lines = []
+   the_metrics = [["run_completed", "1 if the last run completed, 0 if it ended w/ an error condition.", [["", int(completed)]]],
+                  ["run_timestamp_seconds", "When the last run finished (seconds since epoch).", [["", round(run_end, 3)]]],
+                  ["run_seconds", "Seconds the last run took.", [["", the_summary["seconds"]]]],
+                  ["run_phase_seconds", "Seconds the last run spent in each phase.", [["phase=" + get_metric_label(k), v] for k, v in sorted(the_summary["phases"].items())]],
+                  ["car_seconds", "Seconds it took to send each freight car (data object).", [["object=" + get_metric_label(i["name"]), i["seconds"]] for i in car_metrics]],
+                  ["car_phase_seconds", "Seconds spent in each phase of sending each freight car.", [["object=" + get_metric_label(i["name"]) + ",phase=" + get_metric_label(k), v] for i in car_metrics for k, v in sorted(i["phases"].items())]],
+                  ["car_rows", "Rows moved for each freight car.", [["object=" + get_metric_label(i["name"]), i["rows"]] for i in car_metrics if i["rows"] != None]],
+                  ["car_bytes", "Approximate bytes moved for each freight car.", [["object=" + get_metric_label(i["name"]), i["bytes"]] for i in car_metrics if i["bytes"] != None]],
+                  ["car_rows_per_second", "Rows moved per second for each freight car.", [["object=" + get_metric_label(i["name"]), i["rows_per_second"]] for i in car_metrics if i["rows_per_second"] != None]]]
+   for a_metric in the_metrics:
+      the_name = "vtdatarail_sendfreight_" + a_metric[0]
+      the_lines.append("# HELP " + the_name + " " + a_metric[1])
+      the_lines.append("# TYPE " + the_name + " gauge")
+      for a_sample in a_metric[2]:
+         if a_sample[0] != "":
+            the_lines.append(the_name + "{" + a_sample[0] + "} " + repr(a_sample[1]))
+         else:
+            the_lines.append(the_name + " " + repr(a_sample[1]))
+   for a_file in [[file_name + ".prom", "\n".join(the_lines) + "\n"], [file_name + ".metrics.json", json.dumps(the_summary, indent = 2)]]:
+      the_path = the_dir + "\\" + a_file[0]
+      the_file = open(the_path + ".tmp", "w")
+      the_file.write(a_file[1])
+      the_file.close()
+      if os.path.exists(the_path):
+         os.remove(the_path)
+      os.rename(the_path + ".tmp", the_path)
+   make_note("Wrote metrics of the run to " + the_dir + ".", True)
 
-   #EMAIL REPORT (IF APPLICABLE)
-   if email_switch == True:
-      print "EMAILING REPORT..."
-      send_email("VT DataRail Tools - SendFreight - REPORT", email_content)
+#THIS FUNCTION READS THE SCRIPT'S COMMAND-LINE ARGUMENTS. ALL ARGUMENTS ARE OPTIONAL; W/O ARGUMENTS, THE SCRIPT
+#   SENDS FREIGHT PER ITS MAJOR VARIABLES.
+def get_arguments():
+   the_parser = argparse.ArgumentParser(description = "Pushes or pulls data from a source geodatabase to a target geodatabase (EGC Geospatial Data Exchange Protocol). Set major variables in the script.")
+   the_parser.add_argument("--dry-run", action = "store_true", help = "Don't send freight. Instead, plan the train (estimated cost of each freight car, order, and total time) and write the plan (JSON) to vtDataRail_SendFreight.plan.json in the script's directory.")
+   the_parser.add_argument("--resume", action = "store_true", help = "If the last run between the geodatabases didn't complete, pick up where it left off (see the run journal in README NOTES): skip freight cars that were delivered and verify again freight cars that were started.")
+   the_parser.add_argument("--write-digest", nargs = "*", metavar = "OBJECT_NAME", help = "Don't send freight. Instead, update the source geodatabase's A_XCHANGE_DIGEST table (creating it if needed) for the given data objects (names w/ schema prefix), or for all of the source geodatabase's feature classes, tables, and raster datasets if no names are given.")
+   the_parser.add_argument("--publish", action = "store_true", help = "Don't send freight. Instead, plan the train, start the run, and publish the freight cars into the state store's freight queue for workers (see --work and README NOTES).")
+   the_parser.add_argument("--work", action = "store_true", help = "Don't plan a train. Instead, work the state store's freight queue: claim published freight cars (of any source/target pair) one at a time under a lease, send them, and report their results, until the queue has been empty for worker_idle_minutes.")
+   return the_parser.parse_args()
 
-except:
-   make_note("Script encountered error condition and terminated.", True, True)
-   make_note("arcpy Messages:  " + arcpy.GetMessages())
-   if email_switch == True:
-      send_email("VT DataRail Tools - SendFreight - ERROR", email_content)
+#THIS FUNCTION SENDS A FREIGHT CAR THAT A WORKER CLAIMED FROM THE FREIGHT QUEUE (SEE claim_queued_car()), WRITES ITS
+#   A_XCHANGE_LOG ENTRY (NOT BUFFERED; SEE flush_hub_log()), AND REPORTS ITS RESULT (SEE complete_queued_car()). THE WORKER
+#   TAKES ON THE MAJOR VARIABLES PUBLISHED W/ THE FREIGHT CAR FIRST, AND HOLDS ITS LEASE W/ A LeaseKeeper WHILE IT IS
+#   SENT. AS W/ --resume, A FREIGHT CAR THAT THE RUN JOURNAL SHOWS WAS LOGGED ISN'T SENT AGAIN, AND ONE THAT WAS STARTED
+#   (E.G., BY A WORKER THAT DIED) IS VERIFIED AGAIN (SEE reverify_freight_car()) AND ONLY SENT IF SOURCE AND TARGET DIFFER.
+#   THE FIRST ARGUMENT IS THE FREIGHT CAR'S ENTRY (SEE claim_queued_car()).
+#   THE SECOND ARGUMENT IS THE WORKER'S NAME.
+#   RETURNS True IF THE FREIGHT CAR IS DONE, OR False IF IT ENCOUNTERED AN ERROR CONDITION.
+def send_queued_car(the_entry, worker_name):
+   for a_name, a_value in the_entry["settings"].items():
+      globals()[a_name] = a_value
+   i = the_entry["car"]
+   hub_log_table = the_entry["hub_log_table"]
+   if the_entry["last_worker"] != None:
+      make_note("Lease of worker " + the_entry["last_worker"] + " on " + i["name"] + " ran out. Claimed it again (attempt " + str(the_entry["attempts"]) + " of " + str(QUEUE_ATTEMPTS) + ").", True, True)
+   make_note("Sending " + i["name"] + " from " + source_gdb + " to " + target_gdb + " (run " + str(i.get("run_id")) + ")...", True, True)
+   the_keeper = LeaseKeeper(the_entry["queue_id"], worker_name)
+   the_error = None
+   try:
+      the_journal = get_journal_entry(i)
+      if the_journal != None and the_journal[0] == "logged":
+         make_note("Skipping " + i["name"] + " (delivered before its last worker stopped).", True, True)
+      elif the_journal != None and the_journal[0] != "planned" and (the_journal[0] == "verified" or reverify_freight_car(i) == True):
+         make_note("Verified " + i["name"] + " (" + the_journal[0] + " before its last worker stopped). Not sending it again.", True, True)
+         log_freight_car(hub_log_table, i, the_journal[1])
+      else:
+         log_note = send_freight_car(i)
+         car_metrics.append(get_car_metrics(i))
+         log_freight_car(hub_log_table, i, log_note)
+      flush_hub_log(hub_log_table)
+   except:
+      the_error = traceback.format_exc() + "arcpy Messages:  " + arcpy.GetMessages()
+      del hub_log_buffer[:]
+   lease_kept = the_keeper.stop()
+   if the_error != None:
+      make_note("Error condition when sending " + i["name"] + ":\n" + the_error, True, True)
+      reported = complete_queued_car(the_entry, worker_name, "failed", the_error)
+   else:
+      reported = complete_queued_car(the_entry, worker_name, "done", "Delivered by worker " + worker_name + ".")
+   if lease_kept == False or reported == False:
+      make_note("WARNING: Lease on " + i["name"] + " ran out while it was being sent (another worker might send it again).", True, True)
+   return the_error == None
+
+#THIS FUNCTION IS THE SCRIPT'S WORKER COMMAND (--work): IT CLAIMS FREIGHT CARS FROM THE STATE STORE'S FREIGHT QUEUE ONE
+#   AT A TIME AND SENDS THEM (SEE send_queued_car()). WHEN NO FREIGHT CAR CAN BE CLAIMED, IT CHECKS AGAIN EVERY
+#   QUEUE_POLL_SECONDS WHILE FREIGHT CARS ARE LEASED BY OTHER WORKERS (THEIR LEASES MIGHT RUN OUT) OR FOR
+#   worker_idle_minutes, AND THEN STOPS. A FREIGHT CAR THAT ENCOUNTERS AN ERROR CONDITION IS MARKED "failed" W/O STOPPING
+#   THE WORKER. THE WORKER WRITES ITS OWN LOG FILE AND METRICS FILES (SEE write_metrics()), NAMED FOR ITS HOST AND
+#   PROCESS ID, SO THAT WORKERS DON'T APPEND TO AND ROTATE THE SAME LOG FILE.
+def work_command():
+   global log_path
+   worker_name = socket.gethostname() + ":" + str(os.getpid())
+   worker_file_name = "vtDataRail_SendFreight.worker-" + socket.gethostname() + "-" + str(os.getpid())
+   log_path = sys.path[0] + "\\" + worker_file_name + ".log"
+   run_start = time.time()
+   try:
+      clear_worker_files()
+      make_note("Working freight queue of state store " + state_store_path + " as worker " + worker_name + "...", True, True)
+      cars_done = 0
+      cars_failed = 0
+      idle_since = None
+      phase_start = time.time()
+      while True:
+         the_entry = claim_queued_car(worker_name)
+         if the_entry != None:
+            idle_since = None
+            if send_queued_car(the_entry, worker_name) == True:
+               cars_done += 1
+            else:
+               cars_failed += 1
+            phase_start = add_phase_time(run_phases, "send", phase_start)
+            continue
+         if idle_since == None:
+            idle_since = time.time()
+         if get_queue_counts()["leased"] == 0 and time.time() - idle_since >= worker_idle_minutes * 60:
+            break
+         time.sleep(QUEUE_POLL_SECONDS)
+         phase_start = add_phase_time(run_phases, "idle", phase_start)
+      the_counts = get_queue_counts()
+      make_note("Worker " + worker_name + " sent " + str(cars_done) + " freight car(s); " + str(cars_failed) + " failed. Freight queue: " + ", ".join([str(the_counts[i]) + " " + i for i in QUEUE_STATES]) + ".", True, True)
+      write_metrics(run_start, True, worker_file_name)
+      make_note("Script completed.", True, True)
+      if email_switch == True:
+         print "EMAILING REPORT..."
+         send_email("VT DataRail Tools - SendFreight - WORKER REPORT", email_content)
+   except:
+      make_note("Script encountered error condition and terminated.", True, True)
+      make_note(traceback.format_exc() + "arcpy Messages:  " + arcpy.GetMessages())
+      if len(car_metrics) > 0:
+         write_metrics(run_start, False, worker_file_name)
+      if email_switch == True:
+         send_email("VT DataRail Tools - SendFreight - ERROR", email_content)
+
+#THIS FUNCTION DELETES WORKERS' OWN LOG FILES (INCLUDING ROTATED ONES) AND METRICS FILES (SEE work_command()) THAT
+#   HAVEN'T BEEN WRITTEN FOR WORKER_FILE_DAYS DAYS. FILES THAT CAN'T BE DELETED (E.G., IN USE) ARE LEFT.
+def clear_worker_files():
+   the_dirs = [sys.path[0]]
+   if metrics_dir != "":
+      the_dirs.append(metrics_dir)
+   oldest_ok = time.time() - WORKER_FILE_DAYS * 86400
+   for a_dir in the_dirs:
+      for a_path in glob.glob(a_dir + "\\vtDataRail_SendFreight.worker-*"):
+         try:
+            if os.path.getmtime(a_path) < oldest_ok:
+               os.remove(a_path)
+         except:
+            pass
+
+#THIS FUNCTION IS THE SCRIPT'S COMPANION COMMAND (--write-digest): IT FINGERPRINTS DATA OBJECTS OF THE SOURCE
+#   GEODATABASE AND UPDATES THE SOURCE GEODATABASE'S A_XCHANGE_DIGEST TABLE, WHICH TELLS SUBSCRIBERS (SCRIPTS THAT
+#   PULL FROM THE SOURCE GEODATABASE) WHETHER DATA OBJECTS HAVE CHANGED W/O READING THEM. RUN IT AFTER EDITS.
+#   THE ARGUMENT IS A LIST OF DATA-OBJECT NAMES (W/ SCHEMA PREFIX). IF EMPTY, ALL FEATURE CLASSES, TABLES, AND RASTER
+#   DATASETS.
+def write_digest_command(object_names):
+   try:
+      make_note("Verifying geodatabase connection...")
+      if arcpy.Exists(source_gdb) != True:
+         make_note("Can't connect to source geodatabase:  " + source_gdb, True, True)
+         return
+      make_note("Updating A_XCHANGE_DIGEST table of geodatabase: " + source_gdb, True, True)
+      catalog_cache_path = sys.path[0] + "\\vtDataRail_SendFreight.catalog.json"
+      the_catalogs = read_catalogs([source_gdb], catalog_cache_path, catalog_cache_hours, parallel_workers)
+      source_catalog = the_catalogs[source_gdb]
+      #CREATE THE A_XCHANGE_DIGEST TABLE IF IT DOESN'T EXIST
+      if "A_XCHANGE_DIGEST" not in source_catalog.special_tables:
+         make_note("Geodatabase doesn't have an A_XCHANGE_DIGEST table; creating it...", True, True)
+         source_catalog.special_tables["A_XCHANGE_DIGEST"] = create_digest_table(source_gdb)
+         source_catalog.invalidate()
+      digest_table = source_gdb + "\\" + source_catalog.special_tables["A_XCHANGE_DIGEST"]
+      #DATA OBJECTS TO FINGERPRINT
+      the_entries = []
+      if len(object_names) > 0:
+         for a_name in object_names:
+            the_entry = source_catalog.find_prefixed("fclass", a_name)
+            if the_entry == None:
+               the_entry = source_catalog.find_prefixed("table", a_name)
+            if the_entry == None:
+               the_entry = source_catalog.find_prefixed("raster", a_name)
+            if the_entry != None:
+               the_entries.append(the_entry)
+            else:
+               make_note("Geodatabase doesn't have a feature class, table, or raster dataset named " + a_name + ". Skipping it.", True, True)
+      else:
+         the_entries = source_catalog.of_type("fclass") + source_catalog.of_type("table") + source_catalog.of_type("raster")
+      the_tasks = []
+      for the_entry in the_entries:
+         if the_entry.fds_prefixed_name != "":
+            the_tasks.append([source_gdb + "\\" + the_entry.fds_prefixed_name + "\\" + the_entry.prefixed_name, the_entry.type])
+         else:
+            the_tasks.append([source_gdb + "\\" + the_entry.prefixed_name, the_entry.type])
+      #FINGERPRINT (CONCURRENTLY IF parallel_workers IS MORE THAN 1)
+      if parallel_workers > 1 and len(the_tasks) > 1:
+         the_pool = multiprocessing.Pool(min(parallel_workers, len(the_tasks)))
+         try:
+            the_results = the_pool.map(fingerprint_for_digest, the_tasks)
+         finally:
+            the_pool.close()
+            the_pool.join()
+      else:
+         the_results = [fingerprint_for_digest(i) for i in the_tasks]
+      the_fingerprints = {}
+      k = 0
+      while k < len(the_entries):
+         the_fingerprints[the_entries[k].prefixed_name] = the_results[k]
+         make_note("Fingerprinted " + the_entries[k].prefixed_name + ". Row Count: " + str(the_results[k]["row_count"]) + ". Digest: " + the_results[k]["digest"] + ".", True, True)
+         k += 1
+      the_count = write_digest_table(digest_table, the_fingerprints)
+      save_catalog_cache(catalog_cache_path, the_catalogs)
+      make_note("Updated " + str(the_count) + " A_XCHANGE_DIGEST entries.", True, True)
+      make_note("Script completed.", True, True)
+      if email_switch == True:
+         print "EMAILING REPORT..."
+         send_email("VT DataRail Tools - SendFreight - DIGEST REPORT", email_content)
+   except:
+      make_note("Script encountered error condition and terminated.", True, True)
+      make_note(traceback.format_exc() + "arcpy Messages:  " + arcpy.GetMessages())
+      if email_switch == True:
+         send_email("VT DataRail Tools - SendFreight - ERROR", email_content)
+
+if __name__ == "__main__":
+   the_arguments = get_arguments()
+
+#COMPANION COMMAND (SEE write_digest_command()) AND WORKER COMMAND (SEE work_command())
+if __name__ == "__main__" and the_arguments.write_digest != None:
+   write_digest_command(the_arguments.write_digest)
+elif __name__ == "__main__" and the_arguments.work == True:
+   work_command()
+elif __name__ == "__main__":
+   try:
+      #TIME EACH PHASE OF THE RUN (SEE add_phase_time() AND write_metrics())
+      run_start = time.time()
+      phase_start = run_start
+
+      #VERIFY GEODATABASE CONNECTIONS
+      make_note("Verifying geodatabase connections...")
+      if arcpy.Exists(source_gdb) != True:
+         make_note("Can't connect to source geodatabase:  " + source_gdb, True, True)
+         sys.exit()
+      if arcpy.Exists(target_gdb) != True:
+         make_note("Can't connect to target geodatabase:  " + target_gdb, True, True)
+         sys.exit()
+      make_note("Source geodatabase: " + source_gdb, True, True)
+      make_note("Target geodatabase: " + target_gdb, True, True)
+      phase_start = add_phase_time(run_phases, "connections", phase_start)
+
+      #CATALOGS OF PRE-EXISTING DATA-OBJECTS (SEE GdbCatalog CLASS AND read_catalogs())
+      make_note("Collecting info on pre-existing data-objects...")
+      catalog_cache_path = sys.path[0] + "\\vtDataRail_SendFreight.catalog.json"
+      enumeration_start = time.time()
+      the_catalogs = read_catalogs([source_gdb, target_gdb], catalog_cache_path, catalog_cache_hours, parallel_workers)
+      source_catalog = the_catalogs[source_gdb]
+      target_catalog = the_catalogs[target_gdb]
+      make_note("Enumerated data objects in " + str(round(time.time() - enumeration_start, 1)) + " seconds (source geodatabase: " + str(source_catalog.parts_listed) + " part(s) listed, " + str(source_catalog.parts_cached) + " from cache; target geodatabase: " + str(target_catalog.parts_listed) + " part(s) listed, " + str(target_catalog.parts_cached) + " from cache).", True, True)
+      #(TARGET GEODATABASE'S CACHED CATALOG ISN'T TRUSTED AGAIN UNTIL THIS RUN COMPLETES)
+      save_catalog_cache(catalog_cache_path, the_catalogs, [target_gdb])
+      phase_start = add_phase_time(run_phases, "catalog", phase_start)
+
+      #READ AND ANALYZE SOURCE-GEODATABASE'S A_README TABLE
+      make_note("Reading and analyzing source-geodatabase's A_README table...")
+      arcpy.env.workspace = source_gdb
+      if "A_README" in source_catalog.special_tables:
+         the_cursor = arcpy.da.SearchCursor(source_catalog.special_tables["A_README"], ["PROTOCOL","DB_TYPE","CONSTRAINTS","NOTE"])
+         the_row = the_cursor.next()
+         if the_row[0].strip().upper() != "EGC GEOSPATIAL DATA EXCHANGE PROTOCOL":
+            make_note("Source geodatabase's A_README table isn't attributed for EGC Geospatial Data Exchange Protocol. Check its A_README table's PROTOCOL field.", True, True)
+            sys.exit()
+         if the_row[1].strip().upper() == "HUB":
+            source_db_type = "hub"
+         elif the_row[1].strip().upper() == "SPOKE":
+            source_db_type = "spoke"
+         else:
+            make_note("Source geodatabase's A_README table isn't properly attributed. DB_TYPE field should be 'hub' or 'spoke'.", True, True)
+            sys.exit()
+         del the_cursor
+         del the_row
+         make_note("Source geodatabase is a " + source_db_type + " geodatabase.", True, True)
+      else:
+         make_note("Source geodatabase doesn't have an A_README table, which is required.", True, True)
+         sys.exit()
+
+      #IF SOURCE GEODATABASE IS A SPOKE GEODATABASE, VERIFY EXISTENCE OF ITS A_XCHANGE_PARAMETERS TABLE
+      #(GET ITS NAME. FIND OUT IF IT HAS ROWS.)
+      params_table_name = ""
+      params_table_has_rows = False
+      if source_db_type == "spoke":
+         make_note("Verifying source geodatabase (spoke) has an A_XCHANGE_PARAMETERS table...")
+         if "A_XCHANGE_PARAMETERS" in source_catalog.special_tables:
+            params_table_name = source_catalog.special_tables["A_XCHANGE_PARAMETERS"]
+            if int(get_count(params_table_name)) > 0:
+               params_table_has_rows = True
+         else:
+            make_note("Source geodatabase doesn't have an A_XCHANGE_PARAMETERS table, which is required for a spoke geodatabase (can be an empty table if optional special directives aren't used).", True, True)
+            sys.exit()
+
+      #READ AND ANALYZE TARGET-GEODATABASE'S A_README TABLE
+      make_note("Reading and analyzing target-geodatabase's A_README table...")
+      arcpy.env.workspace = target_gdb
+      if "A_README" in target_catalog.special_tables:
+         the_cursor = arcpy.da.SearchCursor(target_catalog.special_tables["A_README"], ["PROTOCOL","DB_TYPE","CONSTRAINTS","NOTE"])
+         the_row = the_cursor.next()
+         if the_row[0].strip().upper() != "EGC GEOSPATIAL DATA EXCHANGE PROTOCOL":
+            make_note("Target geodatabase's A_README table isn't attributed for EGC Geospatial Data Exchange Protocol. Check its A_README table's PROTOCOL field.", True, True)
+            sys.exit()
+         if the_row[1].strip().upper() == "HUB":
+            target_db_type = "hub"
+         elif the_row[1].strip().upper() == "SPOKE":
+            target_db_type = "spoke"
+         else:
+            make_note("Target geodatabase's A_README table isn't properly attributed. DB_TYPE field should be 'hub' or 'spoke'.", True, True)
+            sys.exit()
+         del the_cursor
+         del the_row
+         make_note("Target geodatabase is a " + target_db_type + " geodatabase.", True, True)
+      else:
+         make_note("Target geodatabase doesn't have an A_README table, which is required.", True, True)
+         sys.exit()
+
+      #IF TARGET GEODATABASE IS A HUB GEODATABASE, VERIFY EXISTENCE OF ITS A_XCHANGE_LOG TABLE
+      if target_db_type == "hub":
+         make_note("Verifying target geodatabase (hub) has an A_XCHANGE_LOG table...")
+         if "A_XCHANGE_LOG" in target_catalog.special_tables:
+            hub_logtable_name = target_catalog.special_tables["A_XCHANGE_LOG"]
+         else:
+            make_note("Target geodatabase doesn't have an A_XCHANGE_LOG table, which is required for a hub geodatabase.", True, True)
+            sys.exit()
+
+      #IF SOURCE GEODATABASE PUBLISHES AN A_XCHANGE_DIGEST TABLE, READ IT (SEE compare_objects())
+      source_digests = {}
+      if use_digest_table == True and state_store_days > 0 and "A_XCHANGE_DIGEST" in source_catalog.special_tables:
+         make_note("Reading source-geodatabase's A_XCHANGE_DIGEST table...")
+         source_digests = read_digest_table(source_gdb + "\\" + source_catalog.special_tables["A_XCHANGE_DIGEST"])
+         make_note("Source geodatabase's A_XCHANGE_DIGEST table has " + str(len(source_digests)) + " entries.", True, True)
+
+      phase_start = add_phase_time(run_phases, "readme", phase_start)
+
+      #PRINT CATALOGS
+      print "***** LISTS OF PRE-EXISTING DATA OBJECTS *****"
+      print_catalog(source_catalog, "SOURCE")
+      print_catalog(target_catalog, "TARGET")
+
+      #MAKE freight_cars LIST TO STORE DICTIONARIES THAT MANAGE AND TRACK DATA TRANSFERS
+      freight_cars = []
+
+      #FOR SOURCE FEATURE DATASETS THAT DON'T EXIST IN TARGET GEODATABASE, CREATE THEM IN TARGET GEODATABASE
+      #(TARGET FEATURE-DATASETS THAT ARE CREATED ARE ADDED TO THE TARGET CATALOG)
+      #(ON A DRY RUN, FEATURE DATASETS AREN'T CREATED)
+      missing_fdatasets = []
+      for a_fclass in source_catalog.of_type("fclass"):
+         if a_fclass.fds_name != "" and target_catalog.fdataset(a_fclass.fds_name) == None and the_arguments.dry_run == True:
+            if a_fclass.fds_name.upper() not in missing_fdatasets:
+               missing_fdatasets.append(a_fclass.fds_name.upper())
+               make_note("Feature-dataset " + a_fclass.fds_name + " doesn't already exist in target geodatabase (dry run; not creating it).", True, True)
+         elif a_fclass.fds_name != "" and target_catalog.fdataset(a_fclass.fds_name) == None:
+            #CREATE THE FEATURE DATASET IN THE TARGET GEODATABASE AND CAPTURE ITS INFO
+            make_note("Feature-dataset " + a_fclass.fds_name + " doesn't already exist in target geodatabase; creating it...", True, True)
+            arcpy.env.workspace = source_gdb
+            arcpy.CreateFeatureDataset_management(target_gdb, a_fclass.fds_name, a_fclass.prefixed_name)
+            arcpy.env.workspace = target_gdb
+            found_it = False
+            for a_fdataset in arcpy.ListDatasets("*","Feature"):
+               if found_it == False and get_name(a_fdataset).upper() == a_fclass.fds_name.upper():
+                  target_catalog.add_fdataset(a_fdataset)
+                  found_it = True
+            #IF FOR SOME WEIRD REASON, FEATURE DATASET'S PREFIXED NAME CAN'T BE CAPTURED, EXIT DUE TO ERROR CONDITION
+            if found_it == False:
+               make_note("Script encountered error condition when trying to get full name (prefixed) of feature-dataset " + a_fclass.fds_name + " from target geodatabase.", True, True)
+               sys.exit()
+
+      phase_start = add_phase_time(run_phases, "fdatasets", phase_start)
+
+      #IF SOURCE GEODATABASE IS A SPOKE GEODATABASE AND ITS A_XCHANGE_PARAMETERS TABLE HAS ROWS...
+      if source_db_type == "spoke" and params_table_has_rows == True:
+         make_note("Source geodatabase is a spoke geodatabase w/ directives in A_XCHANGE_PARAMETERS table. Analyzing A_XCHANGE_PARAMETERS table...", True, True)
+         #WORK EACH A_XCHANGE_PARAMETERS ROW
+         arcpy.env.workspace = source_gdb
+         #(PARTITION_ROWS AND PARTITION_WORKERS ARE OPTIONAL FIELDS)
+         params_fields = [i.name.upper() for i in arcpy.ListFields(params_table_name)]
+         partition_fields = [i for i in PARTITION_PARAM_FIELDS if i in params_fields]
+         the_cursor = arcpy.da.SearchCursor(params_table_name, ["OBJECT_NAME","IS_FDATASET","DIRECTIVE","SORT_FIELD","NOTE"] + partition_fields)
+         for a_row in the_cursor:
+            the_values = dict(zip(partition_fields, a_row[5:]))
+            the_partitioning = get_partitioning(the_values.get("PARTITION_ROWS"), the_values.get("PARTITION_WORKERS"))
+            the_directive = a_row[2]
+            if the_directive == None:
+               the_directive = ""
+            the_directive = the_directive.upper().strip()
+            the_watermark_field = None
+            if the_directive == "DETECT_CHANGES":
+               detect_changes = True
+               sort_field = a_row[3].strip()
+            #(INCREMENTAL OR INCREMENTAL:<WATERMARK FIELD>; SORT_FIELD IS THE KEY FIELD)
+            elif the_directive == "INCREMENTAL" or the_directive.startswith("INCREMENTAL:"):
+               detect_changes = False
+               sort_field = (a_row[3] or "").strip()
+               the_watermark_field = the_directive[len("INCREMENTAL:"):].strip()
+               if the_watermark_field == "":
+                  the_watermark_field = watermark_field
+            else:
+               detect_changes = False
+               sort_field = None
+            #IF DIRECTIVE APPLIES TO A FEATURE DATASET...
+            if a_row[1] == 1 and the_directive != "STATIC":
+               #FIND OUT IF THE FEATURE DATASET EXISTS IN SOURCE GEODATABASE
+               the_fdataset = source_catalog.fdataset(a_row[0])
+               #IF FEATURE DATASET DOES EXIST IN SOURCE GEODATABASE...
+               if the_fdataset != None and the_fdataset.upper() == a_row[0].upper():
+                  #FOR EACH FEATURE CLASS OF THE SOURCE FEATURE-DATASET, LOAD A FREIGHT CAR
+                  for a_fclass in source_catalog.in_fdataset(the_fdataset):
+                     freight_cars.append(create_freight_car_from_entry(a_fclass, detect_changes, sort_field, target_catalog, the_watermark_field, the_partitioning))
+               #OTHERWISE, MAKE NOTE THAT FEATURE DATASET DOESN'T EXIST IN SOURCE GEODATABASE
+               else:
+                  make_note("A_XCHANGE_PARAMETERS table has a directive for a feature dataset named " + a_row[0] + ". However source geodatabase doesn't have a feature dataset by that name. Skipping it.", True, True)
+            #OTHERWISE, DIRECTIVE APPLIES TO AN INDIVIDUAL FEATURE-CLASS, TABLE, OR RASTER DATASET
+            elif the_directive != "STATIC":
+               #DETERMINE IF DIRECTIVE APPLIES TO A FEATURE CLASS, TABLE, RASTER DATASET, OR A DATA OBJECT THAT DOESN'T EXIST
+               the_entry = source_catalog.find_prefixed("fclass", a_row[0])
+               if the_entry == None:
+                  the_entry = source_catalog.find_prefixed("table", a_row[0])
+               if the_entry == None:
+                  the_entry = source_catalog.find_prefixed("raster", a_row[0])
+               if the_entry != None:
+                  #(CHANGE DETECTION ISN'T IN-PLAY FOR RASTER DATASETS)
+                  if the_entry.type == "raster":
+                     freight_cars.append(create_freight_car_from_entry(the_entry, False, None, target_catalog))
+                  else:
+                     freight_cars.append(create_freight_car_from_entry(the_entry, detect_changes, sort_field, target_catalog, the_watermark_field, the_partitioning))
+               #OTHERWISE, DATA OBJECT DOESN'T EXIST. MAKE NOTE.
+               else:
+                  make_note("A_XCHANGE_PARAMETERS table has a directive for a data object named " + a_row[0] + ". However source geodatabase doesn't have a data object by that name. Skipping it.", True, True)
+         del the_cursor
+      #OTHERWISE, NOT WORKING THROUGH A_XCHANGE_PARAMETERS TABLE
+      else:
+         make_note("Analyzing source data-objects...", True, True)
+         #FEATURE CLASSES, TABLES, AND RASTER DATASETS
+         for a_type in ("fclass", "table", "raster"):
+            for the_entry in source_catalog.of_type(a_type):
+               freight_cars.append(create_freight_car_from_entry(the_entry, False, None, target_catalog))
+
+      #IF TARGET GEODATABASE IS A HUB GEODATABASE, LOOK UP WHEN EACH DATA OBJECT WAS LAST DELIVERED (SEE get_last_deliveries()).
+      #ONLY DELIVERIES SINCE THE OLDEST STATE-STORE RECORD OF THE DATA OBJECTS ARE CHECKED AGAINST IT (SEE send_freight_car()),
+      #SO NOTHING IS LOOKED UP IF THE STATE STORE HAS NO RECORDS OF THEM.
+      last_deliveries = {}
+      if target_db_type == "hub":
+         oldest_record = get_oldest_state_record([i["source_prefix"] + i["name"] for i in freight_cars])
+         if oldest_record == None:
+            make_note("State store has no fingerprints or watermarks of these data objects. Not looking up last deliveries in hub's A_XCHANGE_LOG.")
+         else:
+            since_date = datetime.date.fromtimestamp(oldest_record)
+            make_note("Looking up last deliveries since " + since_date.isoformat() + " in hub's A_XCHANGE_LOG...")
+            hub_summary_table = None
+            if "A_XCHANGE_LOG_SUMMARY" in target_catalog.special_tables:
+               hub_summary_table = target_gdb + "\\" + target_catalog.special_tables["A_XCHANGE_LOG_SUMMARY"]
+            last_deliveries = get_last_deliveries(target_gdb + "\\" + hub_logtable_name, hub_summary_table, since_date)
+
+      #RESOLVE NAMES OF EACH FREIGHT CAR
+      #(FULL NAMES OF FEATURE DATASETS AND PRE-EXISTING TARGET DATA-OBJECTS ARE CAPTURED NOW SO THAT
+      #A FREIGHT CAR CAN BE SENT W/O THE CATALOGS--E.G., BY A WORKER PROCESS)
+      for i in freight_cars:
+         i["source_fds_name"] = None
+         i["target_fds_name"] = None
+         i["target_name"] = None
+         i["published_digest"] = source_digests.get((i["source_prefix"] + i["name"]).upper())
+         i["last_delivered"] = last_deliveries.get(i["name"].upper())
+         if i["fds"] != None:
+            #GET SOURCE AND TARGET FEATURE-DATASET NAMES (FEATURE DATASETS THAT DIDN'T ALREADY EXIST HAVE BEEN CREATED BY NOW)
+            i["source_fds_name"] = source_catalog.fdataset(i["fds"])
+            i["target_fds_name"] = target_catalog.fdataset(i["fds"])
+         if i["already_there"] == True:
+            if i["type"] == "fclass" and i["fds"] != None:
+               i["target_name"] = get_schema_prefix(i["target_fds_name"]) + i["name"]
+            else:
+               i["target_name"] = target_catalog.find(i["type"], i["name"]).prefixed_name
+         #(A NEW STAND-ALONE DATA-OBJECT'S NAME IS EXPECTED TO GET THE SAME SCHEMA PREFIX AS THE SPECIAL TABLES)
+         elif i["fds"] == None and target_catalog.new_prefix() != None:
+            i["target_name"] = target_catalog.new_prefix() + i["name"]
+         #TARGET CONTAINER IS USED FOR CAPPING CONCURRENT LOADS INTO THE SAME TARGET CONTAINER
+         if i["target_fds_name"] != None:
+            i["target_container"] = i["target_fds_name"].upper()
+         else:
+            i["target_container"] = ""
+
+      phase_start = add_phase_time(run_phases, "analysis", phase_start)
+
+      #PLAN THE TRAIN (SEE plan_train()). ON A DRY RUN, WRITE THE PLAN AND STOP.
+      make_note("Planning the train...")
+      #(SOURCE DATA-OBJECTS ARE ONLY COUNTED IF THE ESTIMATE IS USED)
+      estimate_train = the_arguments.dry_run == True or parallel_workers > 1 or window_minutes > 0
+      freight_cars, the_plan = plan_train(freight_cars, parallel_workers, estimate_train)
+      if estimate_train == True:
+         make_note("Train of " + str(len(freight_cars)) + " freight car(s) is estimated to take " + str(round(the_plan["estimated_seconds"] / 60.0, 1)) + " minutes w/ " + str(the_plan["workers"]) + " worker process(es).", True, True)
+      if window_minutes > 0 and the_plan["estimated_seconds"] > window_minutes * 60:
+         make_note("WARNING: Estimated time is longer than the " + str(window_minutes) + "-minute window.", True, True)
+
+      #PRINT FREIGHT CAR INFO
+      print "***** HERE IS HOW THE TRAIN IS LINED UP *****"
+      for i in freight_cars:
+         print "FREIGHT CAR:"
+         print "     source_prefix: " + i["source_prefix"]
+         print "     fds: " + str(i["fds"])
+         print "     name: " + i["name"]
+         print "     type: " + i["type"]
+         print "     detect_changes: " + str(i["detect_changes"])
+         print "     sort_field: " + str(i["sort_field"])
+         print "     watermark_field: " + str(i["watermark_field"])
+         print "     partitioning: " + str(i["partitioning"]) + " (" + str(i["cost"]["partitions"]) + " partition(s))"
+         print "     already_there: " + str(i["already_there"])
+         print "     target_prefix: " + i["target_prefix"]
+         print "     estimated_seconds: " + str(i["cost"]["seconds"]) + " (" + i["cost"]["basis"] + ")"
+         print "     last_delivered: " + str(i["last_delivered"])
+
+      phase_start = add_phase_time(run_phases, "planning", phase_start)
+
+      #ON A DRY RUN, WRITE THE PLAN INSTEAD OF SENDING FREIGHT
+      if the_arguments.dry_run == True:
+         plan_path = sys.path[0] + "\\vtDataRail_SendFreight.plan.json"
+         the_file = open(plan_path, "w")
+         json.dump(the_plan, the_file, indent = 2)
+         the_file.close()
+         #(NOTHING WAS WRITTEN TO THE TARGET GEODATABASE, SO ITS CACHED CATALOG CAN BE TRUSTED AGAIN)
+         save_catalog_cache(catalog_cache_path, the_catalogs)
+         make_note("Dry run: wrote train plan to " + plan_path + ". No freight sent.", True, True)
+      else:
+         #FULL PATH OF HUB'S A_XCHANGE_LOG TABLE (None IF TARGET GEODATABASE ISN'T A HUB GEODATABASE)
+         if target_db_type == "hub":
+            hub_log_table = target_gdb + "\\" + hub_logtable_name
+         else:
+            hub_log_table = None
+
+         #RUN JOURNAL (SEE start_run()). IF RESUMING AN INTERRUPTED RUN, FREIGHT CARS THAT WERE DELIVERED ARE TAKEN OFF THE
+         #TRAIN; FREIGHT CARS THAT WERE STARTED BUT NOT LOGGED ARE VERIFIED AGAIN AND ONLY SENT IF SOURCE AND TARGET DIFFER.
+         the_run = None
+         if the_arguments.resume == True:
+            the_run = get_unfinished_run()
+            if the_run == None:
+               make_note("No interrupted run to resume. Sending all freight cars.", True, True)
+         if the_run != None:
+            run_id = the_run[0]
+            make_note("Resuming run " + str(run_id) + " (started " + time.strftime("%Y%m%d-%H%M", time.localtime(the_run[1])) + ")...", True, True)
+            freight_cars_to_send = []
+            for i in freight_cars:
+               the_state, log_note = the_run[2].get(i["source_prefix"] + i["name"], ["planned", None])
+               i["run_id"] = run_id
+               if the_state == "logged":
+                  make_note("Skipping " + i["name"] + " (delivered before run was interrupted).", True, True)
+               elif the_state != "planned" and (the_state == "verified" or reverify_freight_car(i) == True):
+                  make_note("Verified " + i["name"] + " (" + the_state + " before run was interrupted). Not sending it again.", True, True)
+                  log_freight_car(hub_log_table, i, log_note)
+               else:
+                  freight_cars_to_send.append(i)
+         else:
+            run_id = start_run()
+            freight_cars_to_send = freight_cars
+         plan_run(run_id, freight_cars_to_send)
+
+         phase_start = add_phase_time(run_phases, "journal", phase_start)
+
+         #SEND FREIGHT DOWN THE TRACK
+         #(ALL TARGET FEATURE-DATASETS THAT FREIGHT CARS DEPEND ON HAVE BEEN CREATED ABOVE, BEFORE ANY FREIGHT CAR LEAVES)
+         #(IF TARGET GEODATABASE IS A HUB GEODATABASE, ACTIONS ARE RECORDED IN ITS A_XCHANGE_LOG TABLE IN BATCHES; SEE
+         #log_freight_car(). ENTRIES THAT ARE STILL BUFFERED ARE WRITTEN AT THE END, EVEN IF A FREIGHT CAR FAILED.)
+         #(W/ --publish, FREIGHT CARS ARE PUBLISHED INTO THE FREIGHT QUEUE FOR WORKERS INSTEAD; SEE publish_freight_cars())
+         log_seconds = run_phases.get("log", 0)
+         cars_published = 0
+         try:
+            if the_arguments.publish == True:
+               cars_published = publish_freight_cars(freight_cars_to_send, hub_log_table)
+               the_counts = get_queue_counts()
+               make_note("Published " + str(cars_published) + " freight car(s) into the freight queue of state store " + state_store_path + " (" + str(the_counts["queued"]) + " queued and " + str(the_counts["leased"]) + " leased in all).", True, True)
+            elif parallel_workers > 1 and len(freight_cars_to_send) > 1:
+               make_note("Sending freight cars w/ " + str(parallel_workers) + " worker processes (up to " + str(max_cars_per_target) + " at a time per target container)...", True, True)
+               send_freight_cars_in_parallel(freight_cars_to_send, parallel_workers, max_cars_per_target, hub_log_table)
+            else:
+               for i in freight_cars_to_send:
+                  log_note = send_freight_car(i)
+                  car_metrics.append(get_car_metrics(i))
+                  log_freight_car(hub_log_table, i, log_note)
+         finally:
+            flush_hub_log(hub_log_table)
+
+         #(A_XCHANGE_LOG WRITES ARE TIMED AS THEIR OWN PHASE, "log")
+         phase_start = add_phase_time(run_phases, "send", phase_start)
+         run_phases["send"] -= run_phases.get("log", 0) - log_seconds
+
+         #ROLL OLD A_XCHANGE_LOG ENTRIES INTO A_XCHANGE_LOG_SUMMARY (SEE compact_hub_log()). THE FREIGHT HAS BEEN DELIVERED
+         #BY NOW, SO A PROBLEM HERE IS NOTED W/O STOPPING THE RUN.
+         if hub_log_table != None and hub_log_months > 0:
+            make_note("Compacting hub's A_XCHANGE_LOG table...")
+            try:
+               if "A_XCHANGE_LOG_SUMMARY" not in target_catalog.special_tables:
+                  make_note("Hub geodatabase doesn't have an A_XCHANGE_LOG_SUMMARY table; creating it...", True, True)
+                  target_catalog.special_tables["A_XCHANGE_LOG_SUMMARY"] = create_log_summary_table(target_gdb)
+                  target_catalog.invalidate()
+               hub_summary_table = target_gdb + "\\" + target_catalog.special_tables["A_XCHANGE_LOG_SUMMARY"]
+               for a_table in [[hub_log_table, "A_XCHANGE_LOG"], [hub_summary_table, "A_XCHANGE_LOG_SUMMARY"]]:
+                  if add_log_index(a_table[0], a_table[1]) == True:
+                     make_note("Added index " + LOG_INDEXES[a_table[1]][0] + " to hub's " + a_table[1] + " table.", True, True)
+               the_count = compact_hub_log(hub_log_table, hub_summary_table, hub_log_months)
+               if the_count > 0:
+                  make_note("Rolled " + str(the_count) + " A_XCHANGE_LOG entries older than " + str(hub_log_months) + " month(s) into A_XCHANGE_LOG_SUMMARY.", True, True)
+            except:
+               make_note("WARNING: Couldn't compact hub's A_XCHANGE_LOG table. " + traceback.format_exc() + "arcpy Messages:  " + arcpy.GetMessages(), True, True)
+            phase_start = add_phase_time(run_phases, "compaction", phase_start)
+
+         #UPDATE CATALOG CACHE. PARTS OF TARGET CATALOG THAT RECEIVED NEW DATA-OBJECTS ARE LISTED AGAIN NEXT TIME.
+         for i in freight_cars:
+            if i["already_there"] == False:
+               target_catalog.invalidate(i["fds"])
+         save_catalog_cache(catalog_cache_path, the_catalogs)
+
+         #RECORD RUN AS COMPLETED IN RUN JOURNAL (A PUBLISHED RUN IS RECORDED AS COMPLETED BY THE WORKER THAT FINISHES ITS
+         #LAST FREIGHT CAR; SEE complete_queued_car())
+         if cars_published == 0:
+            finish_run(run_id)
+         add_phase_time(run_phases, "finish", phase_start)
+
+         #WRITE METRICS OF THE RUN
+         write_metrics(run_start)
+
+      #LOG SCRIPT COMPLETION
+      make_note("Script completed.", True, True)
+
+      #EMAIL REPORT (IF APPLICABLE)
+      if email_switch == True:
+         print "EMAILING REPORT..."
+         send_email("VT DataRail Tools - SendFreight - REPORT", email_content)
+
+   except:
+      make_note("Script encountered error condition and terminated.", True, True)
+      make_note("arcpy Messages:  " + arcpy.GetMessages())
+      #WRITE METRICS OF THE RUN SO FAR (IF IT GOT TO SENDING FREIGHT)
+      if len(car_metrics) > 0:
+         write_metrics(run_start, False)
+      if email_switch == True:
+         send_email("VT DataRail Tools - SendFreight - ERROR", email_content)
 
 